@@ -19,15 +19,20 @@ from .routes.scanner import router as scanner_router
 from .auth import get_current_user
 from .middleware.rate_limiting import add_rate_limiting, health_rate_limit
 from .middleware.abuse_protection import add_abuse_protection_middleware
+from .middleware.admission import add_admission_control, configure_threadpool
 from .middleware.security import (
     add_security_headers_middleware,
     add_request_validation_middleware,
 )
 from .middleware.observability import (
     ObservabilityMiddleware,
+    get_gauge_values,
     init_sentry_if_configured,
 )
+from .middleware import metrics as metrics_registry
+import hmac
 import logging
+import threading
 from pathlib import Path
 import os
 from starlette.responses import Response, JSONResponse
@@ -236,6 +241,26 @@ def simple_health(request: Request):
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+@health_rate_limit()
+async def metrics(request: Request):
+    """Prometheus scrape endpoint (async: answers even when the threadpool is saturated)."""
+    if not metrics_registry.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = metrics_registry.METRICS_AUTH_TOKEN
+    if not token and os.getenv("ENVIRONMENT", "").lower() in ("prod", "production"):
+        logging.warning("[METRICS] /metrics is enabled without METRICS_AUTH_TOKEN in prod; not serving")
+        raise HTTPException(status_code=404, detail="Not Found")
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return PlainTextResponse(
+        metrics_registry.render_metrics(get_gauge_values()),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 @app.get("/api/warmup")
 @health_rate_limit()
 def warmup_endpoint(request: Request):
@@ -389,6 +414,9 @@ if _ENABLE_DEBUG_ENDPOINTS:
 async def startup_event():
     logging.info("[STARTUP] WooCombine API starting up...")
 
+    # Worker threads for sync routes (AnyIO's limiter is per event loop)
+    configure_threadpool()
+
     # Don't initialize Firestore on startup - do it lazily
     logging.info("[STARTUP] Using lazy Firestore initialization for faster cold starts")
 
@@ -407,6 +435,13 @@ async def startup_event():
             "[STARTUP] Set DELETE_TOKEN_SECRET_KEY environment variable to enable secure token system"
         )
 
+    # Pick up player import jobs queued or interrupted before this process started
+    from .services.import_jobs import resume_pending_jobs
+
+    threading.Thread(
+        target=resume_pending_jobs, name="import-job-resume", daemon=True
+    ).start()
+
     # Just log environment status quickly
     critical_vars = ["GOOGLE_CLOUD_PROJECT", "FIREBASE_PROJECT_ID"]
     for var in critical_vars:
@@ -438,3 +473,7 @@ async def serve_api_info(request: Request):
         "frontend": "served separately",
         "api_prefix": "/api",
     }
+
+
+# Admission control wraps each route, so it goes last, once every route is registered
+add_admission_control(app)
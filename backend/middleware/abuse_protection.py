@@ -11,17 +11,31 @@ Environment variables:
 - ABUSE_MAX_REQUESTS: max allowed requests per window (default: 10)
 - ABUSE_CHALLENGE_DIFFICULTY: number of leading hex zeros required (default: 4)
 - ABUSE_SENSITIVE_PATH_PREFIXES: comma-separated list of prefixes (default: /api/users,/api/test-auth)
+- ABUSE_STATE_STORAGE_URI: where request windows and allowlist entries live
+  (default: RATE_LIMIT_STORAGE_URI, i.e. in process; see middleware.shared_state)
+- ABUSE_MAX_TRACKED_CLIENTS / ABUSE_MAX_ALLOWLISTED_CLIENTS: in-process ceilings
+  on tracked clients (oldest evicted first)
+
+A shared store makes blocking network round trips, so its calls run in worker
+threads (at most ABUSE_STORE_THREADS at once) rather than on the event loop;
+a slow Redis then delays only sensitive requests.
 """
 
-from starlette.middleware.base import BaseHTTPMiddleware
+from anyio import CapacityLimiter, to_thread
 from fastapi import Request
 from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 import time
 import os
 import hashlib
 import secrets
 import logging
-from collections import deque, defaultdict
+
+from .observability import register_gauge
+from .shared_state import MemoryAbuseStateStore, create_abuse_state_store
+
+# Concurrent store calls per worker when the store blocks (see module docstring)
+ABUSE_STORE_THREADS = 8
 
 
 def _parse_bool(value: str, default: bool = False) -> bool:
@@ -45,9 +59,11 @@ def _get_client_identifier(request: Request) -> str:
     return f"{client_ip}:{ua_hash}"
 
 
-class AbuseProtectionMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
+class AbuseProtectionMiddleware:
+    """Raw ASGI middleware; requests that pass are forwarded untouched."""
+
+    def __init__(self, app: ASGIApp, store=None):
+        self.app = app
 
         env = os.getenv("ENVIRONMENT", "").lower()
         default_enabled = env in ("prod", "production")
@@ -69,46 +85,58 @@ class AbuseProtectionMiddleware(BaseHTTPMiddleware):
             p.strip() for p in prefixes_env.split(",") if p.strip()
         ]
 
-        # per-client request timestamps
-        self.client_requests = defaultdict(deque)
-        # per-client allowlist expiry after successful challenge
-        self.client_allow_until = {}
+        # per-client request windows and allowlist expiry after a solved challenge
+        self.store = store or create_abuse_state_store()
+        self._store_blocks = not isinstance(self.store, MemoryAbuseStateStore)
+        self._store_limiter = None  # created on first use, inside the event loop
+        for stat in ("tracked_clients", "allowlisted_clients", "evictions"):
+            register_gauge(
+                f"abuse_{stat}", lambda stat=stat: self.store.stats().get(stat, 0)
+            )
 
         logging.info(
-            f"[ABUSE] enabled={self.enabled}, window={self.window_seconds}s, max={self.max_requests}, diff={self.difficulty}, prefixes={self.sensitive_prefixes}"
+            f"[ABUSE] enabled={self.enabled}, window={self.window_seconds}s, max={self.max_requests}, diff={self.difficulty}, prefixes={self.sensitive_prefixes}, store={type(self.store).__name__}"
         )
 
-    async def dispatch(self, request: Request, call_next):
-        if not self.enabled or not self._is_sensitive_path(request.url.path):
-            return await call_next(request)
-
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and self.enabled:
+            request = Request(scope)
+            if self._is_sensitive_path(request.url.path):
+                if self._store_blocks:
+                    if self._store_limiter is None:
+                        self._store_limiter = CapacityLimiter(ABUSE_STORE_THREADS)
+                    challenge = await to_thread.run_sync(
+                        self._challenge_for, request, limiter=self._store_limiter
+                    )
+                else:
+                    challenge = self._challenge_for(request)
+                if challenge is not None:
+                    await challenge(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
+
+    def _challenge_for(self, request: Request):
+        """Return a 429 challenge response, or None to let the request through."""
         now = time.time()
         client_id = _get_client_identifier(request)
 
-        # If client solved a recent challenge, allow until expiry
-        allow_until = self.client_allow_until.get(client_id, 0)
-        if allow_until and now < allow_until:
-            return await call_next(request)
-
         # Verify proof-of-work answer if provided
         client_answer = request.headers.get("X-Abuse-Answer")
         client_nonce = request.headers.get("X-Abuse-Nonce")
         if client_answer and client_nonce:
             if self._verify_pow(client_nonce, client_answer):
                 # allow for 2 minutes after successful solve
-                self.client_allow_until[client_id] = now + 120
-                return await call_next(request)
+                self.store.allow(client_id, now + 120)
+                return None
             # fall through (invalid answer -> treat as no answer)
 
-        # Sliding window accounting
-        timestamps = self.client_requests[client_id]
-        timestamps.append(now)
-        # prune old entries
-        cutoff = now - self.window_seconds
-        while timestamps and timestamps[0] < cutoff:
-            timestamps.popleft()
+        # If client solved a recent challenge, allow until expiry; otherwise
+        # count the request in the sliding window
+        allowlisted, recent_requests = self.store.hit(client_id, now, self.window_seconds)
+        if allowlisted:
+            return None
 
-        if len(timestamps) > self.max_requests:
+        if recent_requests > self.max_requests:
             # Issue challenge
             nonce = secrets.token_hex(16)
             challenge = {
@@ -128,7 +156,7 @@ class AbuseProtectionMiddleware(BaseHTTPMiddleware):
                 headers=headers,
             )
 
-        return await call_next(request)
+        return None
 
     def _is_sensitive_path(self, path: str) -> bool:
         path_lower = path.lower()
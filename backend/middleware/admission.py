@@ -0,0 +1,216 @@
+"""
+Admission control for API routes.
+
+Sync routes run on AnyIO's worker threadpool and block there on Firestore.
+Without a bound per kind of work, a burst of bulk imports or reads can hold
+every thread, so everything (including /health) queues behind it. Each route
+is assigned a class that mirrors RATE_LIMITS (read / write / bulk / health):
+
+- a class admits at most ADMISSION_LIMITS[class] concurrent requests;
+- further requests wait in a bounded FIFO queue for up to
+  ADMISSION_QUEUE_TIMEOUT_SECONDS;
+- when the queue is full (or the wait times out) the request gets an
+  immediate 503 with Retry-After instead of piling onto the pool.
+
+Class limits should add up to less than THREADPOOL_SIZE so health checks
+always find a thread. The gate runs in the event loop after routing (each
+route's ASGI app is wrapped), so the class is known without re-matching the
+path. Time spent queued is logged as ``queue_ms`` in the request log line.
+
+Environment variables:
+- ADMISSION_CONTROL_ENABLED: true/false (default: true)
+- THREADPOOL_SIZE: AnyIO worker threads for sync routes (default: 40)
+- ADMISSION_LIMIT_READ / _WRITE / _BULK / _HEALTH: concurrent requests per
+  class (defaults: 20 / 10 / 4 / 4)
+- ADMISSION_QUEUE_SIZE: waiting requests per class before shedding (default: 50)
+- ADMISSION_QUEUE_TIMEOUT_SECONDS: max time queued (default: 5)
+- ADMISSION_RETRY_AFTER_SECONDS: Retry-After on 503 (default: 2)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .observability import admission_queue_ms_var, register_gauge, route_class_var
+from .rate_limiting import ROUTE_LIMIT_CLASSES
+
+
+def _parse_bool(value: str, default: bool = False) -> bool:
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+ADMISSION_CONTROL_ENABLED = _parse_bool(os.getenv("ADMISSION_CONTROL_ENABLED"), True)
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
+ADMISSION_LIMITS = {
+    "read": int(os.getenv("ADMISSION_LIMIT_READ", "20")),
+    "write": int(os.getenv("ADMISSION_LIMIT_WRITE", "10")),
+    "bulk": int(os.getenv("ADMISSION_LIMIT_BULK", "4")),
+    "health": int(os.getenv("ADMISSION_LIMIT_HEALTH", "4")),
+}
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "50"))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "5"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "2"))
+
+_READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class AdmissionGate:
+    """Concurrency limit with a bounded FIFO wait queue for one route class.
+
+    Only touched from the event loop, so plain counters suffice. A released
+    slot is handed directly to the oldest waiter, which keeps arrivals from
+    overtaking queued requests.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, timeout: float):
+        self.name = name
+        self.limit = max(1, limit)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self.in_flight = 0
+        self.rejected = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+            return True
+        except asyncio.TimeoutError:
+            # The slot may have been handed over just as the wait expired.
+            if waiter.done():
+                return True
+            return False
+        except asyncio.CancelledError:
+            if waiter.done():
+                self.release()
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        # Hand the slot to the next live waiter; in_flight stays the same.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def wrap(self, app: ASGIApp) -> ASGIApp:
+        async def admitted_app(scope: Scope, receive: Receive, send: Send) -> None:
+            start = time.perf_counter()
+            admitted = await self.acquire()
+            route_class_var.set(self.name)
+            admission_queue_ms_var.set((time.perf_counter() - start) * 1000.0)
+            if not admitted:
+                self.rejected += 1
+                logging.warning(
+                    f"[ADMISSION] Shedding {scope.get('method')} {scope.get('path')}: "
+                    f"{self.name} saturated (in_flight={self.in_flight}, queued={self.queued})"
+                )
+                response = JSONResponse(
+                    {
+                        "detail": "Server is busy. Please retry shortly.",
+                        "category": "overloaded",
+                    },
+                    status_code=503,
+                    headers={"Retry-After": str(ADMISSION_RETRY_AFTER_SECONDS)},
+                )
+                await response(scope, receive, send)
+                return
+            try:
+                await app(scope, receive, send)
+            finally:
+                self.release()
+
+        return admitted_app
+
+
+def route_class_for(route: APIRoute) -> str:
+    """read / write / bulk / health, from the route's rate-limit decorator."""
+    endpoint = route.endpoint
+    limit_class = ROUTE_LIMIT_CLASSES.get(f"{endpoint.__module__}.{endpoint.__name__}")
+    if limit_class in ADMISSION_LIMITS:
+        return limit_class
+    # auth/users limits and undecorated routes: classify by method
+    return "read" if set(route.methods or ()) <= _READ_METHODS else "write"
+
+
+_gates: Dict[str, AdmissionGate] = {}
+_threadpool_limiter: Optional[Any] = None
+
+
+def get_admission_gates() -> Dict[str, AdmissionGate]:
+    return dict(_gates)
+
+
+def configure_threadpool(size: int = None) -> None:
+    """Resize AnyIO's default thread limiter; call from the running event loop."""
+    global _threadpool_limiter
+    from anyio.to_thread import current_default_thread_limiter
+
+    _threadpool_limiter = current_default_thread_limiter()
+    _threadpool_limiter.total_tokens = max(1, size or THREADPOOL_SIZE)
+    logging.info(f"[ADMISSION] threadpool size={_threadpool_limiter.total_tokens}")
+
+
+def _threadpool_stat(attr: str) -> float:
+    return getattr(_threadpool_limiter, attr) if _threadpool_limiter is not None else 0
+
+
+def add_admission_control(app, limits: Dict[str, int] = None) -> None:
+    """Gate every API route registered on ``app`` so far by its class."""
+    if not ADMISSION_CONTROL_ENABLED:
+        logging.info("[ADMISSION] disabled")
+        return
+
+    for name, limit in (limits or ADMISSION_LIMITS).items():
+        gate = AdmissionGate(
+            name, limit, ADMISSION_QUEUE_SIZE, ADMISSION_QUEUE_TIMEOUT_SECONDS
+        )
+        _gates[name] = gate
+        register_gauge(f"admission_{name}_in_flight", lambda g=gate: g.in_flight)
+        register_gauge(f"admission_{name}_queued", lambda g=gate: g.queued)
+        register_gauge(f"admission_{name}_rejected", lambda g=gate: g.rejected)
+    register_gauge("threadpool_size", lambda: _threadpool_stat("total_tokens"))
+    register_gauge("threadpool_in_use", lambda: _threadpool_stat("borrowed_tokens"))
+
+    gated = 0
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            route.app = _gates[route_class_for(route)].wrap(route.app)
+            gated += 1
+
+    total = sum(gate.limit for gate in _gates.values())
+    if total >= THREADPOOL_SIZE:
+        logging.warning(
+            f"[ADMISSION] class limits add up to {total} >= THREADPOOL_SIZE={THREADPOOL_SIZE}; "
+            "health checks may wait for threads"
+        )
+    logging.info(
+        f"[ADMISSION] {gated} routes gated, limits={ {n: g.limit for n, g in _gates.items()} }, "
+        f"queue={ADMISSION_QUEUE_SIZE}, timeout={ADMISSION_QUEUE_TIMEOUT_SECONDS}s"
+    )
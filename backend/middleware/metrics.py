@@ -0,0 +1,396 @@
+"""
+In-process metrics registry rendered in the Prometheus text format.
+
+The JSON request log line carries one request's numbers; these are the
+aggregates a scraper needs for rates and p95/p99:
+
+- woo_http_request_duration_seconds{method,route}: latency histogram, by
+  route template (``/api/players/{player_id}``) so label sets stay bounded
+- woo_http_requests_total{method,route,status}
+- woo_firestore_call_duration_seconds: one observation per
+  execute_with_timeout call (record_firestore_call)
+- woo_firestore_calls_per_request: histogram of calls made by each request
+- woo_cache_hits_total / woo_cache_misses_total and woo_cache_hit_ratio
+- every gauge registered with observability.register_gauge (threadpool,
+  admission queues, abuse-protection tracking, ...) as woo_<name>
+
+Counters and histogram buckets are plain floats updated under one short
+lock. With several uvicorn workers, set METRICS_MULTIPROC_DIR: each worker
+then keeps its values in its own memory-mapped file in that directory (one
+writer per file, so no cross-process locking), and a scrape served by any
+worker sums all files. Gauges are per worker and get a ``pid`` label; those
+of exited workers are dropped, counters are kept. Empty the directory when
+the service starts, before workers are forked.
+
+Environment variables:
+- METRICS_ENABLED: expose /metrics (default: false)
+- METRICS_AUTH_TOKEN: if set, /metrics requires ``Authorization: Bearer <token>``;
+  when ENVIRONMENT is prod/production, /metrics stays off until it is set
+- METRICS_MULTIPROC_DIR: directory for cross-worker aggregation (default: unset)
+"""
+
+import bisect
+import glob
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").strip().lower() in ("1", "true", "yes", "on")
+METRICS_AUTH_TOKEN = os.getenv("METRICS_AUTH_TOKEN", "")
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+METRICS_PREFIX = "woo"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CALLS_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_BUCKETS = {
+    "http_request_duration_seconds": LATENCY_BUCKETS,
+    "firestore_call_duration_seconds": LATENCY_BUCKETS,
+    "firestore_calls_per_request": CALLS_BUCKETS,
+}
+
+_HELP = {
+    "http_request_duration_seconds": ("histogram", "Request latency by route template"),
+    "http_requests_total": ("counter", "Requests by route template and status"),
+    "firestore_call_duration_seconds": ("histogram", "Duration of individual Firestore calls"),
+    "firestore_calls_per_request": ("histogram", "Firestore calls made per request"),
+    "cache_hits_total": ("counter", "Cache hits"),
+    "cache_misses_total": ("counter", "Cache misses"),
+}
+
+# A series key: (metric, sample suffix, sorted label pairs)
+SeriesKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+class _LocalValues:
+    """Series values in a dict, for a single worker."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[SeriesKey, float] = defaultdict(float)
+
+    def inc(self, increments: Iterable[Tuple[SeriesKey, float]]) -> None:
+        with self._lock:
+            for key, amount in increments:
+                self._values[key] += amount
+
+    def items(self) -> List[Tuple[SeriesKey, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+_HEADER = struct.Struct("<I4x")
+_KEY_LENGTH = struct.Struct("<I")
+_VALUE = struct.Struct("<d")
+_INITIAL_FILE_SIZE = 64 * 1024
+
+
+def _encode_key(key: SeriesKey) -> bytes:
+    return json.dumps([key[0], key[1], [list(pair) for pair in key[2]]]).encode("utf-8")
+
+
+def _decode_key(raw: bytes) -> SeriesKey:
+    metric, suffix, labels = json.loads(raw.decode("utf-8"))
+    return metric, suffix, tuple(tuple(pair) for pair in labels)
+
+
+def _read_entries(data: bytes) -> Iterator[Tuple[bytes, int]]:
+    """Yield (encoded key, value offset) for each entry of a values file.
+
+    Layout: [uint32 used bytes][pad] then entries of
+    [uint32 key length][key, padded to 8 bytes][float64 value].
+    """
+    used = _HEADER.unpack_from(data, 0)[0] if len(data) >= _HEADER.size else 0
+    pos = _HEADER.size
+    while pos < used:
+        length = _KEY_LENGTH.unpack_from(data, pos)[0]
+        key_start = pos + _KEY_LENGTH.size
+        value_pos = key_start + length + (-(_KEY_LENGTH.size + length) % 8)
+        yield data[key_start:key_start + length], value_pos
+        pos = value_pos + _VALUE.size
+
+
+class _MmapValues:
+    """Series values in a memory-mapped file written only by this process."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a+b")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _INITIAL_FILE_SIZE:
+            self._file.truncate(_INITIAL_FILE_SIZE)
+            size = _INITIAL_FILE_SIZE
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._used = _HEADER.unpack_from(self._map, 0)[0] or _HEADER.size
+        self._offsets = {
+            _decode_key(raw): pos for raw, pos in _read_entries(self._map[: self._used])
+        }
+
+    def _append(self, key: SeriesKey) -> int:
+        raw = _encode_key(key)
+        padding = -(_KEY_LENGTH.size + len(raw)) % 8
+        entry = _KEY_LENGTH.pack(len(raw)) + raw + b"\0" * padding + _VALUE.pack(0.0)
+        if self._used + len(entry) > len(self._map):
+            new_size = max(len(self._map) * 2, self._used + len(entry))
+            self._map.close()
+            self._file.truncate(new_size)
+            self._map = mmap.mmap(self._file.fileno(), new_size)
+        self._map[self._used:self._used + len(entry)] = entry
+        value_pos = self._used + len(entry) - _VALUE.size
+        self._used += len(entry)
+        # Publish the entry only once it is fully written.
+        _HEADER.pack_into(self._map, 0, self._used)
+        self._offsets[key] = value_pos
+        return value_pos
+
+    def inc(self, increments: Iterable[Tuple[SeriesKey, float]]) -> None:
+        with self._lock:
+            for key, amount in increments:
+                pos = self._offsets.get(key)
+                if pos is None:
+                    pos = self._append(key)
+                _VALUE.pack_into(self._map, pos, _VALUE.unpack_from(self._map, pos)[0] + amount)
+
+    def set(self, key: SeriesKey, value: float) -> None:
+        with self._lock:
+            pos = self._offsets.get(key)
+            if pos is None:
+                pos = self._append(key)
+            _VALUE.pack_into(self._map, pos, value)
+
+    def items(self) -> List[Tuple[SeriesKey, float]]:
+        with self._lock:
+            return [(key, _VALUE.unpack_from(self._map, pos)[0]) for key, pos in self._offsets.items()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._map[: self._used] = b"\0" * self._used
+            self._used = _HEADER.size
+            self._offsets.clear()
+
+
+def _read_values_file(path: str) -> List[Tuple[SeriesKey, float]]:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return []
+    return [
+        (_decode_key(raw), _VALUE.unpack_from(data, pos)[0])
+        for raw, pos in _read_entries(data)
+    ]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class MetricsRegistry:
+    """Counters and histograms for this worker, optionally shared on disk."""
+
+    def __init__(self, multiproc_dir: Optional[str] = None):
+        self.multiproc_dir = multiproc_dir or ""
+        self._pid: Optional[int] = None
+        self._values = None
+        self._gauges = None
+        self._gauges_refreshed = 0.0
+        self._init_lock = threading.Lock()
+
+    def _stores(self):
+        # Opened lazily and per pid: files must not be shared with a forked child.
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._init_lock:
+                if self._pid != pid:
+                    if self.multiproc_dir:
+                        os.makedirs(self.multiproc_dir, exist_ok=True)
+                        self._values = _MmapValues(
+                            os.path.join(self.multiproc_dir, f"values_{pid}.db")
+                        )
+                        self._gauges = _MmapValues(
+                            os.path.join(self.multiproc_dir, f"gauges_{pid}.db")
+                        )
+                    else:
+                        self._values = _LocalValues()
+                    self._pid = pid
+        return self._values, self._gauges
+
+    def inc(self, metric: str, amount: float = 1.0, **labels: str) -> None:
+        values, _ = self._stores()
+        values.inc([((metric, "", tuple(sorted(labels.items()))), amount)])
+
+    def observe(self, metric: str, value: float, buckets: Iterable[float], **labels: str) -> None:
+        """Histogram observation: non-cumulative bucket count, _sum and _count."""
+        values, _ = self._stores()
+        label_pairs = tuple(sorted(labels.items()))
+        bounds, les = _bucket_bounds(tuple(buckets))
+        le = les[bisect.bisect_left(bounds, value)]
+        values.inc(
+            [
+                ((metric, "_bucket", label_pairs + (("le", le),)), 1.0),
+                ((metric, "_sum", label_pairs), float(value)),
+                ((metric, "_count", label_pairs), 1.0),
+            ]
+        )
+
+    def refresh_gauges(
+        self, read_gauges: Callable[[], Dict[str, float]], min_interval: float = 1.0
+    ) -> None:
+        """Publish this worker's gauges for scrapes served by other workers."""
+        _, store = self._stores()
+        now = time.monotonic()
+        if store is None or now - self._gauges_refreshed < min_interval:
+            return
+        self._gauges_refreshed = now
+        for name, value in read_gauges().items():
+            store.set((name, "", ()), value)
+
+    def collect(self, gauges: Dict[str, float]) -> Tuple[Dict[SeriesKey, float], Dict[SeriesKey, float]]:
+        """Return (summed counter/histogram series, gauge series)."""
+        values, _ = self._stores()
+        totals: Dict[SeriesKey, float] = defaultdict(float)
+        gauge_series: Dict[SeriesKey, float] = {}
+        if not self.multiproc_dir:
+            for key, value in values.items():
+                totals[key] += value
+            for name, value in gauges.items():
+                gauge_series[(name, "", ())] = value
+            return totals, gauge_series
+
+        self.refresh_gauges(lambda: gauges, min_interval=0)
+        for path in glob.glob(os.path.join(self.multiproc_dir, "values_*.db")):
+            for key, value in _read_values_file(path):
+                totals[key] += value
+        for path in glob.glob(os.path.join(self.multiproc_dir, "gauges_*.db")):
+            pid = os.path.basename(path)[len("gauges_"):-len(".db")]
+            if not pid.isdigit() or not _pid_alive(int(pid)):
+                continue
+            for (name, suffix, labels), value in _read_values_file(path):
+                gauge_series[(name, suffix, labels + (("pid", pid),))] = value
+        return totals, gauge_series
+
+    def reset(self) -> None:
+        values, gauges = self._stores()
+        values.clear()
+        if gauges is not None:
+            gauges.clear()
+
+
+@lru_cache(maxsize=None)
+def _bucket_bounds(buckets: Tuple[float, ...]) -> Tuple[Tuple[float, ...], Tuple[str, ...]]:
+    bounds = tuple(sorted(float(b) for b in buckets))
+    return bounds, tuple(_format_value(b) for b in bounds) + ("+Inf",)
+
+
+def _format_value(value: float) -> str:
+    return "+Inf" if value == math.inf else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return "{" + pairs + "}" if pairs else ""
+
+
+def render(totals: Dict[SeriesKey, float], gauges: Dict[SeriesKey, float]) -> str:
+    lines: List[str] = []
+    by_metric: Dict[str, Dict[SeriesKey, float]] = defaultdict(dict)
+    for key, value in totals.items():
+        by_metric[key[0]][key] = value
+
+    for metric in sorted(by_metric):
+        kind, help_text = _HELP.get(metric, ("untyped", metric))
+        name = f"{METRICS_PREFIX}_{metric}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        series = by_metric[metric]
+        if kind != "histogram":
+            for (_, _, labels), value in sorted(series.items()):
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+            continue
+
+        # Buckets are stored per bound; Prometheus wants every bound, cumulative.
+        bounds = [_format_value(b) for b in _BUCKETS.get(metric, ())] + ["+Inf"]
+        counts: Dict[Tuple[Tuple[str, str], ...], Dict[str, float]] = defaultdict(dict)
+        for (_, suffix, labels), value in series.items():
+            if suffix == "_bucket":
+                base = tuple(pair for pair in labels if pair[0] != "le")
+                counts[base][dict(labels)["le"]] = value
+        for base in sorted(counts):
+            cumulative = 0.0
+            for le in bounds:
+                cumulative += counts[base].get(le, 0.0)
+                lines.append(
+                    f"{name}_bucket{_format_labels(base + (('le', le),))} {_format_value(cumulative)}"
+                )
+            lines.append(f"{name}_sum{_format_labels(base)} {_format_value(series.get((metric, '_sum', base), 0.0))}")
+            lines.append(f"{name}_count{_format_labels(base)} {_format_value(series.get((metric, '_count', base), 0.0))}")
+
+    hits = sum(v for k, v in totals.items() if k[0] == "cache_hits_total")
+    misses = sum(v for k, v in totals.items() if k[0] == "cache_misses_total")
+    gauge_series = dict(gauges)
+    if hits + misses:
+        gauge_series[("cache_hit_ratio", "", ())] = hits / (hits + misses)
+    previous = None
+    for key in sorted(gauge_series):
+        name = f"{METRICS_PREFIX}_{key[0]}"
+        if name != previous:
+            lines.append(f"# TYPE {name} gauge")
+            previous = name
+        lines.append(f"{name}{_format_labels(key[2])} {_format_value(gauge_series[key])}")
+    return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry(METRICS_MULTIPROC_DIR)
+
+
+def observe_request(method: str, route: str, status: int, duration_s: float, firestore_calls: int) -> None:
+    try:
+        REGISTRY.observe("http_request_duration_seconds", duration_s, LATENCY_BUCKETS, method=method, route=route)
+        REGISTRY.inc("http_requests_total", method=method, route=route, status=str(status))
+        REGISTRY.observe("firestore_calls_per_request", firestore_calls, CALLS_BUCKETS)
+    except Exception:
+        pass
+
+
+def observe_firestore_call(duration_ms: float) -> None:
+    try:
+        REGISTRY.observe("firestore_call_duration_seconds", duration_ms / 1000.0, LATENCY_BUCKETS)
+    except Exception:
+        pass
+
+
+def count_cache(hits: int = 0, misses: int = 0) -> None:
+    try:
+        if hits:
+            REGISTRY.inc("cache_hits_total", hits)
+        if misses:
+            REGISTRY.inc("cache_misses_total", misses)
+    except Exception:
+        pass
+
+
+def render_metrics(gauges: Dict[str, float]) -> str:
+    totals, gauge_series = REGISTRY.collect(gauges)
+    return render(totals, gauge_series)
@@ -2,17 +2,20 @@ import hashlib
 import json
 import logging
 import os
+import threading
 import time
 import uuid
-from typing import Optional
+from typing import Callable, Dict, Optional
 
 from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 import contextvars
 import importlib
 
+from .metrics import REGISTRY, count_cache, observe_firestore_call, observe_request
+
 
 def _import_sentry():
     try:
@@ -29,17 +32,40 @@ request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar(
 user_id_hash_var: contextvars.ContextVar[str] = contextvars.ContextVar(
     "user_id_hash", default=""
 )
-firestore_calls_var: contextvars.ContextVar[int] = contextvars.ContextVar(
-    "firestore_calls", default=0
-)
-firestore_total_ms_var: contextvars.ContextVar[float] = contextvars.ContextVar(
-    "firestore_total_ms", default=0.0
+
+
+class RequestCounters:
+    """Per-request totals that worker threads can add to.
+
+    Sync routes and their background tasks run in AnyIO worker threads on a
+    copy of the request's context, so a ContextVar.set() made there never
+    reaches the middleware. The middleware puts one of these in
+    request_counters_var instead, and every copy of the context shares it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: Dict[str, float] = {}
+
+    def add(self, **deltas: float) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                self._values[name] = self._values.get(name, 0) + delta
+
+    def get(self, name: str, default: float = 0) -> float:
+        with self._lock:
+            return self._values.get(name, default)
+
+
+request_counters_var: contextvars.ContextVar[Optional[RequestCounters]] = contextvars.ContextVar(
+    "request_counters", default=None
 )
-cache_hits_delta_var: contextvars.ContextVar[int] = contextvars.ContextVar(
-    "cache_hits_delta", default=0
+# Set by admission control (middleware.admission) before the route runs
+route_class_var: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "route_class", default=""
 )
-cache_misses_delta_var: contextvars.ContextVar[int] = contextvars.ContextVar(
-    "cache_misses_delta", default=0
+admission_queue_ms_var: contextvars.ContextVar[float] = contextvars.ContextVar(
+    "admission_queue_ms", default=0.0
 )
 
 
@@ -62,26 +88,87 @@ def set_user_id_for_request(user_id: Optional[str]) -> None:
 
 def record_firestore_call(duration_ms: float) -> None:
     try:
-        firestore_calls = firestore_calls_var.get()
-        firestore_total = firestore_total_ms_var.get()
-        firestore_calls_var.set(firestore_calls + 1)
-        firestore_total_ms_var.set(firestore_total + float(duration_ms))
+        counters = request_counters_var.get()
+        if counters is not None:
+            counters.add(firestore_calls=1, firestore_total_ms=float(duration_ms))
     except Exception:
         pass
+    observe_firestore_call(float(duration_ms))
+
+
+# Process-wide write fan-out per named operation (e.g. "draft.rosters").
+_write_fanout_lock = threading.Lock()
+_write_fanout: Dict[str, Dict[str, int]] = {}
+
+
+def record_firestore_writes(operation: str, writes: int, commits: int = 1) -> None:
+    """Count document writes and the commits (batches/transactions) carrying them."""
+    try:
+        counters = request_counters_var.get()
+        if counters is not None:
+            counters.add(firestore_writes=int(writes), firestore_commits=int(commits))
+        with _write_fanout_lock:
+            stats = _write_fanout.setdefault(
+                operation, {"operations": 0, "writes": 0, "commits": 0, "max_writes": 0}
+            )
+            stats["operations"] += 1
+            stats["writes"] += int(writes)
+            stats["commits"] += int(commits)
+            stats["max_writes"] = max(stats["max_writes"], int(writes))
+    except Exception:
+        pass
+
+
+def get_write_fanout_stats() -> Dict[str, Dict[str, int]]:
+    with _write_fanout_lock:
+        return {operation: dict(stats) for operation, stats in _write_fanout.items()}
+
+
+# Process-wide gauges: name -> callable returning the current value.
+_gauges: Dict[str, Callable[[], float]] = {}
+
+
+def register_gauge(name: str, read: Callable[[], float]) -> None:
+    """Register (or replace) a gauge read on demand, e.g. a structure's size."""
+    _gauges[name] = read
+
+
+def get_gauge_values() -> Dict[str, float]:
+    values = {}
+    for name, read in list(_gauges.items()):
+        try:
+            values[name] = float(read())
+        except Exception:
+            continue
+    return values
 
 
 def add_cache_deltas(hits_delta: int = 0, misses_delta: int = 0) -> None:
     try:
-        cache_hits_delta_var.set(cache_hits_delta_var.get() + int(hits_delta))
-        cache_misses_delta_var.set(cache_misses_delta_var.get() + int(misses_delta))
+        counters = request_counters_var.get()
+        if counters is not None:
+            counters.add(cache_hits=int(hits_delta), cache_misses=int(misses_delta))
     except Exception:
         pass
+    count_cache(hits_delta, misses_delta)
+
+
+class ObservabilityMiddleware:
+    """Middleware to add request id, structured logging, and basic timings.
 
+    Raw ASGI (no BaseHTTPMiddleware): the response is streamed straight
+    through, only the start message is touched to add X-Request-ID.
+    """
 
-class ObservabilityMiddleware(BaseHTTPMiddleware):
-    """Middleware to add request id, structured logging, and basic timings."""
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next):  # type: ignore[override]
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         # Accept client correlation ID or generate one
         req_id = (
             request.headers.get("X-Request-ID")
@@ -89,6 +176,8 @@ class ObservabilityMiddleware(BaseHTTPMiddleware):
             or str(uuid.uuid4())
         )
         request_id_var.set(req_id)
+        counters = RequestCounters()
+        request_counters_var.set(counters)
 
         # Attach to Sentry scope and set common tags
         _s = _import_sentry()
@@ -98,36 +187,43 @@ class ObservabilityMiddleware(BaseHTTPMiddleware):
                     os.getenv("RELEASE")
                     or f"backend@{os.getenv('GIT_COMMIT','unknown')}"
                 )
-                with _s.configure_scope() as scope:  # type: ignore[attr-defined]
-                    scope.set_tag("request_id", req_id)
-                    scope.set_tag("endpoint", request.url.path)
-                    scope.set_tag("method", request.method)
+                with _s.configure_scope() as sentry_scope:  # type: ignore[attr-defined]
+                    sentry_scope.set_tag("request_id", req_id)
+                    sentry_scope.set_tag("endpoint", request.url.path)
+                    sentry_scope.set_tag("method", request.method)
                     if release:
-                        scope.set_tag("release", release)
+                        sentry_scope.set_tag("release", release)
             except Exception:
                 pass
 
         start_time = time.perf_counter()
         status_code = 500
         error_code = None
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                try:
+                    MutableHeaders(scope=message)["X-Request-ID"] = req_id
+                except Exception:
+                    pass
+            await send(message)
+
         try:
-            response: Response = await call_next(request)
-            status_code = response.status_code
-            try:
-                response.headers["X-Request-ID"] = req_id
-            except Exception:
-                pass
-            return response
+            await self.app(scope, receive, send_with_request_id)
         except Exception as exc:  # Ensure we still log on exceptions
             error_code = type(exc).__name__
             raise
         finally:
             duration_ms = (time.perf_counter() - start_time) * 1000.0
-            firestore_calls = firestore_calls_var.get()
-            firestore_total_ms = firestore_total_ms_var.get()
+            firestore_calls = counters.get("firestore_calls")
+            firestore_total_ms = counters.get("firestore_total_ms")
+            firestore_writes = counters.get("firestore_writes")
+            firestore_commits = counters.get("firestore_commits")
             user_hash = user_id_hash_var.get() or ""
-            cache_hits = cache_hits_delta_var.get()
-            cache_misses = cache_misses_delta_var.get()
+            cache_hits = counters.get("cache_hits")
+            cache_misses = counters.get("cache_misses")
 
             log_payload = {
                 "request_id": req_id,
@@ -138,11 +234,27 @@ class ObservabilityMiddleware(BaseHTTPMiddleware):
                 "user_id_hash": user_hash,
                 "firestore_calls": firestore_calls,
                 "firestore_total_ms": round(firestore_total_ms, 2),
+                "firestore_writes": firestore_writes,
+                "firestore_commits": firestore_commits,
                 "cache_hits": cache_hits,
                 "cache_misses": cache_misses,
+                "route_class": route_class_var.get(),
+                "queue_ms": round(admission_queue_ms_var.get(), 2),
                 "error_code": error_code,
             }
 
+            # Route template, not the raw path, to keep metric labels bounded
+            route = scope.get("route")
+            observe_request(
+                request.method,
+                getattr(route, "path", "unmatched"),
+                status_code,
+                duration_ms / 1000.0,
+                firestore_calls,
+            )
+            if REGISTRY.multiproc_dir:
+                REGISTRY.refresh_gauges(get_gauge_values)
+
             # Log as a single line JSON for easy ingestion by log processors
             try:
                 logging.info(json.dumps(log_payload))
@@ -189,7 +301,13 @@ __all__ = [
     "init_sentry_if_configured",
     "request_id_var",
     "user_id_hash_var",
+    "route_class_var",
+    "admission_queue_ms_var",
     "set_user_id_for_request",
     "record_firestore_call",
+    "record_firestore_writes",
+    "get_write_fanout_stats",
+    "register_gauge",
+    "get_gauge_values",
     "add_cache_deltas",
 ]
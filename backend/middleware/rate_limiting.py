@@ -6,12 +6,19 @@ Implements request rate limiting to prevent abuse and ensure fair usage
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
-from fastapi import Request
+from slowapi.middleware import SlowAPIASGIMiddleware
+from slowapi.wrappers import Limit
+from fastapi import HTTPException, Request
+from functools import wraps
+from limits import parse
+from typing import Any, Callable, Dict
+import asyncio
 import hashlib
 import logging
 import os
 
+from .shared_state import RATE_LIMIT_STORAGE_URI, SHARED_STATE_KEY_PREFIX, is_shared_uri
+
 
 def _normalize_rate_string(rate_value: str, default_value: str) -> str:
     """Normalize human-friendly rate strings like '5/min' to slowapi format '5/minute'."""
@@ -35,6 +42,8 @@ _DEFAULTS = {
     "write": "120/minute",
     "bulk": "30/minute",
     "health": "600/minute",
+    # Units (rows, ids, undo entries) per user across a bulk endpoint's calls
+    "bulk_cost": "5000/minute",
 }
 
 # Rate limiting configurations for different endpoint types (env-overridable)
@@ -63,6 +72,10 @@ RATE_LIMITS = {
     "health": _normalize_rate_string(
         os.getenv("RATE_LIMITS_HEALTH", ""), _DEFAULTS["health"]
     ),
+    # Payload-size budget for bulk endpoints (see bulk_cost_limit)
+    "bulk_cost": _normalize_rate_string(
+        os.getenv("RATE_LIMITS_BULK_COST", ""), _DEFAULTS["bulk_cost"]
+    ),
 }
 
 
@@ -88,8 +101,20 @@ def get_client_identifier(request: Request) -> str:
     return f"{client_ip}:{ua_hash}"
 
 
-# Create limiter with custom key function
-limiter = Limiter(key_func=get_client_identifier)
+# fixed-window (SlowAPI's default), moving-window or sliding-window-counter
+RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "fixed-window").strip() or "fixed-window"
+
+# Create limiter with custom key function. Counters live in
+# RATE_LIMIT_STORAGE_URI (see middleware.shared_state); with a shared store,
+# limits hold across workers and fall back to per-process counting if the
+# store is unreachable rather than failing requests.
+limiter = Limiter(
+    key_func=get_client_identifier,
+    strategy=RATE_LIMIT_STRATEGY,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    key_prefix=f"{SHARED_STATE_KEY_PREFIX}:rl" if is_shared_uri(RATE_LIMIT_STORAGE_URI) else "",
+    in_memory_fallback_enabled=is_shared_uri(RATE_LIMIT_STORAGE_URI),
+)
 
 
 def create_rate_limit_handler():
@@ -134,35 +159,149 @@ def create_rate_limit_handler():
     return rate_limit_handler
 
 
+# Endpoint ("module.function") -> RATE_LIMITS key it was decorated with; lets
+# admission control (middleware.admission) put routes in the same classes.
+ROUTE_LIMIT_CLASSES: Dict[str, str] = {}
+
+
+def _class_rate_limit(limit_class: str):
+    limit = limiter.limit(RATE_LIMITS[limit_class])
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        ROUTE_LIMIT_CLASSES[f"{func.__module__}.{func.__name__}"] = limit_class
+        return limit(func)
+
+    return decorator
+
+
 # Decorators for different rate limiting levels
 def auth_rate_limit():
     """Rate limit for authentication endpoints"""
-    return limiter.limit(RATE_LIMITS["auth"])
+    return _class_rate_limit("auth")
 
 
 def user_rate_limit():
     """Rate limit for user management endpoints"""
-    return limiter.limit(RATE_LIMITS["users"])
+    return _class_rate_limit("users")
 
 
 def read_rate_limit():
     """Rate limit for read operations"""
-    return limiter.limit(RATE_LIMITS["read"])
+    return _class_rate_limit("read")
 
 
 def write_rate_limit():
     """Rate limit for write operations"""
-    return limiter.limit(RATE_LIMITS["write"])
+    return _class_rate_limit("write")
 
 
 def bulk_rate_limit():
     """Rate limit for bulk operations"""
-    return limiter.limit(RATE_LIMITS["bulk"])
+    return _class_rate_limit("bulk")
 
 
 def health_rate_limit():
     """Rate limit for health check endpoints"""
-    return limiter.limit(RATE_LIMITS["health"])
+    return _class_rate_limit("health")
+
+
+def _cost_limit_key(kwargs: Dict[str, Any]) -> str:
+    current_user = kwargs.get("current_user") or {}
+    if current_user.get("uid"):
+        return f"user:{current_user['uid']}"
+    request = kwargs.get("request")
+    return get_client_identifier(request) if request is not None else "unknown"
+
+
+def bulk_cost_limit(cost: Callable[[Dict[str, Any]], int]):
+    """
+    Debit a per-user budget (RATE_LIMITS["bulk_cost"]) by the size of a bulk
+    payload, on top of bulk_rate_limit's per-request count.
+
+    ``cost`` receives the endpoint kwargs (parsed body included), like
+    require_permission's target_getter, and returns e.g. the number of rows.
+    The budget is keyed by the authenticated user's uid and lives in the
+    limiter's storage, so it is shared across workers when that storage is.
+    A single payload larger than the whole budget is rejected with a 413.
+
+    The budget is debited with one ``hit`` (no separate ``test``), so
+    concurrent requests can't both pass a check and then overdraw it. With
+    the fixed-window strategy a rejected hit is still counted until the
+    window resets; moving-window only counts accepted hits.
+
+    Place it below require_permission so unauthorized callers get their 403
+    without spending anyone's budget. Storage errors fail open like the rest
+    of the limiter: with a shared store the in-memory fallback takes over,
+    otherwise the payload is let through uncharged.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        scope = f"{func.__module__}.{func.__name__}:cost"
+
+        def check(kwargs: Dict[str, Any]) -> None:
+            if not limiter.enabled:
+                return
+            item = parse(RATE_LIMITS["bulk_cost"])
+            try:
+                units = max(1, int(cost(kwargs)))
+            except Exception:
+                units = 1
+            if units > item.amount:
+                raise HTTPException(
+                    status_code=413,
+                    detail=(
+                        f"Payload of {units} items exceeds the bulk limit of "
+                        f"{item.amount} per {item.GRANULARITY.name}"
+                    ),
+                )
+            args = [_cost_limit_key(kwargs), scope]
+            if limiter._key_prefix:
+                args = [limiter._key_prefix] + args
+            try:
+                allowed = limiter.limiter.hit(item, *args, cost=units)
+            except Exception as e:
+                if not limiter._in_memory_fallback_enabled or limiter._storage_dead:
+                    logging.warning(f"Bulk cost storage unavailable, not charging {scope}: {e}")
+                    return
+                logging.warning(f"Bulk cost storage unavailable, using in-memory fallback: {e}")
+                # Same flag SlowAPI sets; its middleware clears it once storage is back.
+                limiter._storage_dead = True
+                allowed = limiter.limiter.hit(item, *args, cost=units)
+            if not allowed:
+                logging.warning(
+                    f"Bulk cost budget {item} exceeded for {args[-2]} on {scope} (cost={units})"
+                )
+                raise RateLimitExceeded(
+                    Limit(
+                        limit=item,
+                        key_func=_cost_limit_key,
+                        scope=scope,
+                        per_method=False,
+                        methods=None,
+                        error_message=f"{item} payload units",
+                        exempt_when=None,
+                        cost=units,
+                        override_defaults=True,
+                    )
+                )
+
+        if asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                check(kwargs)
+                return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            check(kwargs)
+            return func(*args, **kwargs)
+
+        return sync_wrapper
+
+    return decorator
 
 
 # Function to add rate limiting to FastAPI app
@@ -174,6 +313,11 @@ def add_rate_limiting(app):
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, create_rate_limit_handler())
     # Ensure middleware is added so limits actually apply
-    app.add_middleware(SlowAPIMiddleware)
-
-    logging.info("Rate limiting middleware configured with limits: %s", RATE_LIMITS)
+    app.add_middleware(SlowAPIASGIMiddleware)
+
+    logging.info(
+        "Rate limiting middleware configured with limits: %s (strategy=%s, shared=%s)",
+        RATE_LIMITS,
+        RATE_LIMIT_STRATEGY,
+        is_shared_uri(RATE_LIMIT_STORAGE_URI),
+    )
@@ -4,23 +4,32 @@ Implements security headers and policies to protect against common attacks
 """
 
 from fastapi import Request, Response
+from starlette.datastructures import MutableHeaders
 from starlette.responses import RedirectResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import os
-from starlette.middleware.base import BaseHTTPMiddleware
 import logging
 from .. import __version__
 
+# Raw ASGI middlewares (no BaseHTTPMiddleware): responses stream straight
+# through and only the response start message is touched.
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+
+class SecurityHeadersMiddleware:
     """
     Middleware to add security headers to all responses
     """
 
-    def __init__(self, app, config=None):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, config=None):
+        self.app = app
         self.config = config or {}
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         # Let CORSMiddleware own all CORS behavior (avoid duplicate/conflicting headers)
         # Still handle OPTIONS by passing through; CORSMiddleware will reply appropriately
 
@@ -47,7 +56,9 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
                 and request.url.scheme == "http"
             ):
                 https_url = str(request.url).replace("http://", "https://", 1)
-                return RedirectResponse(url=https_url, status_code=308)
+                redirect = RedirectResponse(url=https_url, status_code=308)
+                await redirect(scope, receive, send)
+                return
         except Exception:
             # Never block requests if redirect computation fails
             pass
@@ -60,21 +71,23 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "/api/health",
         ] or request.url.path.startswith("/api/leagues/me")
 
-        response = await call_next(request)
-
-        if is_auth_endpoint:
-            # Minimal headers for auth endpoints (faster processing)
-            response.headers["X-API-Version"] = __version__
-            response.headers["X-Content-Type-Options"] = "nosniff"
-            if "Server" in response.headers:
-                del response.headers["Server"]
-        else:
-            # Full security headers for other endpoints
-            self.add_security_headers(response, request)
-
-        return response
-
-    def add_security_headers(self, response: Response, request: Request):
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if is_auth_endpoint:
+                    # Minimal headers for auth endpoints (faster processing)
+                    headers["X-API-Version"] = __version__
+                    headers["X-Content-Type-Options"] = "nosniff"
+                    if "Server" in headers:
+                        del headers["Server"]
+                else:
+                    # Full security headers for other endpoints
+                    self.add_security_headers(headers, request)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def add_security_headers(self, headers: MutableHeaders, request: Request):
         """Add comprehensive security headers"""
 
         # Content Security Policy - Protect against XSS (report-only in staging)
@@ -141,19 +154,19 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             if report_only
             else "Content-Security-Policy"
         )
-        response.headers[csp_header_name] = "; ".join(csp_directives)
+        headers[csp_header_name] = "; ".join(csp_directives)
 
         # X-Frame-Options - Protect against clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
+        headers["X-Frame-Options"] = "DENY"
 
         # X-Content-Type-Options - Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
+        headers["X-Content-Type-Options"] = "nosniff"
 
         # X-XSS-Protection - legacy header; harmless for older browsers
-        response.headers["X-XSS-Protection"] = "1; mode=block"
+        headers["X-XSS-Protection"] = "1; mode=block"
 
         # Referrer-Policy - Control referrer information
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
 
         # Strict-Transport-Security - Enforce HTTPS (consider proxy headers)
         forwarded_proto = None
@@ -164,7 +177,7 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         if request.url.scheme == "https" or (
             forwarded_proto and forwarded_proto.lower() == "https"
         ):
-            response.headers["Strict-Transport-Security"] = (
+            headers["Strict-Transport-Security"] = (
                 "max-age=31536000; includeSubDomains; preload"
             )
 
@@ -179,30 +192,42 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "payment=()",
             "usb=()",
         ]
-        response.headers["Permissions-Policy"] = ", ".join(permissions_policies)
+        headers["Permissions-Policy"] = ", ".join(permissions_policies)
 
         # Remove server information
-        if "Server" in response.headers:
-            del response.headers["Server"]
+        if "Server" in headers:
+            del headers["Server"]
 
         # Add custom security header for API identification
-        response.headers["X-API-Version"] = __version__
-        response.headers["X-Security-Headers"] = "enabled"
+        headers["X-API-Version"] = __version__
+        headers["X-Security-Headers"] = "enabled"
 
 
-class RequestValidationMiddleware(BaseHTTPMiddleware):
+class RequestValidationMiddleware:
     """
     Middleware for request validation and security checks
     """
 
-    def __init__(self, app, config=None):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, config=None):
+        self.app = app
         self.config = config or {}
         self.max_request_size = self.config.get(
             "max_request_size", 10 * 1024 * 1024
         )  # 10MB
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rejection = self.validate(Request(scope))
+        if rejection is not None:
+            await rejection(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+    def validate(self, request: Request):
+        """Return an error response for a rejected request, else None."""
         # PERFORMANCE OPTIMIZATION: Skip validation for auth endpoints to reduce latency
         is_auth_endpoint = request.url.path in [
             "/api/users/me",
@@ -249,8 +274,7 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
                     headers={"Content-Type": "text/plain"},
                 )
 
-        response = await call_next(request)
-        return response
+        return None
 
     def is_suspicious_path(self, path: str) -> bool:
         """Check if the request path contains suspicious patterns"""
@@ -0,0 +1,189 @@
+"""
+Storage for rate-limit and abuse-protection state.
+
+With several uvicorn workers, per-process counters multiply every limit by
+the worker count, and a solved proof-of-work only unlocks the worker that
+verified it. Pointing RATE_LIMIT_STORAGE_URI at a Redis-protocol server
+(``redis://host:6379/0``) shares both across workers:
+
+- SlowAPI limits use the ``limits`` storage for that URI (single-script
+  INCR/EXPIRE, moving-window or sliding-window-counter operations).
+- Abuse protection uses RedisAbuseStateStore below: each request is one
+  MULTI/EXEC pipeline (allow-marker lookup + sliding-window log update).
+
+The default ``memory://`` keeps everything in process, as before.
+
+Environment variables:
+- RATE_LIMIT_STORAGE_URI: ``memory://`` (default) or ``redis://...`` / ``rediss://...``
+- ABUSE_STATE_STORAGE_URI: override for abuse state (defaults to RATE_LIMIT_STORAGE_URI)
+- ABUSE_MAX_TRACKED_CLIENTS: in-memory ceiling on clients with a request window (default 50000)
+- ABUSE_MAX_ALLOWLISTED_CLIENTS: in-memory ceiling on allowlisted clients (default 10000)
+"""
+
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://").strip() or "memory://"
+ABUSE_STATE_STORAGE_URI = (
+    os.getenv("ABUSE_STATE_STORAGE_URI", "").strip() or RATE_LIMIT_STORAGE_URI
+)
+SHARED_STATE_KEY_PREFIX = os.getenv("SHARED_STATE_KEY_PREFIX", "woo")
+ABUSE_MAX_TRACKED_CLIENTS = int(os.getenv("ABUSE_MAX_TRACKED_CLIENTS", "50000"))
+ABUSE_MAX_ALLOWLISTED_CLIENTS = int(os.getenv("ABUSE_MAX_ALLOWLISTED_CLIENTS", "10000"))
+
+
+def is_shared_uri(uri: str) -> bool:
+    return not uri.startswith("memory://")
+
+
+class MemoryAbuseStateStore:
+    """Per-process abuse state with a hard ceiling on tracked clients.
+
+    A scan from many IPs/user agents must not grow worker memory, so each
+    client is a fixed-size two-bucket sliding-window counter
+    ``[window start, previous window count, current window count]`` in an
+    LRU. Entries whose windows have fully elapsed are dropped as the LRU is
+    touched, and the least recently seen client is evicted once
+    ``max_clients`` is reached. Solved challenges live in a second, smaller
+    LRU ordered by expiry.
+
+    The counter weights the previous window by how much of it still
+    overlaps the sliding window, the usual approximation of a request log.
+    """
+
+    def __init__(
+        self,
+        max_clients: int = ABUSE_MAX_TRACKED_CLIENTS,
+        max_allowlisted: int = ABUSE_MAX_ALLOWLISTED_CLIENTS,
+    ):
+        self.max_clients = max(1, max_clients)
+        self.max_allowlisted = max(1, max_allowlisted)
+        self._windows: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._allow_until: "OrderedDict[str, float]" = OrderedDict()
+        self.evictions = 0
+
+    def hit(self, client_id: str, now: float, window_seconds: int) -> Tuple[bool, int]:
+        """Count a request unless the client is allowlisted.
+
+        Returns (allowlisted, requests in the sliding window).
+        """
+        allow_until = self._allow_until.get(client_id)
+        if allow_until is not None:
+            if now < allow_until:
+                return True, 0
+            del self._allow_until[client_id]
+
+        entry = self._windows.get(client_id)
+        if entry is None:
+            entry = [now, 0, 0]
+            self._windows[client_id] = entry
+            self._prune_windows(now, window_seconds)
+        else:
+            self._windows.move_to_end(client_id)
+            elapsed = now - entry[0]
+            if elapsed >= window_seconds:
+                # Roll forward; after two windows nothing overlaps any more.
+                entry[1] = entry[2] if elapsed < 2 * window_seconds else 0
+                entry[2] = 0
+                entry[0] += window_seconds * (elapsed // window_seconds)
+
+        entry[2] += 1
+        overlap = 1.0 - (now - entry[0]) / window_seconds
+        return False, int(entry[2] + entry[1] * overlap)
+
+    def allow(self, client_id: str, until: float) -> None:
+        now = time.time()
+        self._allow_until[client_id] = until
+        self._allow_until.move_to_end(client_id)
+        while self._allow_until:
+            oldest_id, oldest_until = next(iter(self._allow_until.items()))
+            if oldest_until > now and len(self._allow_until) <= self.max_allowlisted:
+                break
+            del self._allow_until[oldest_id]
+            if oldest_until > now:
+                self.evictions += 1
+
+    def _prune_windows(self, now: float, window_seconds: int) -> None:
+        # Least recently seen first: stop at the first window still in use.
+        while self._windows:
+            oldest = next(iter(self._windows.values()))
+            if now - oldest[0] < 2 * window_seconds and len(self._windows) <= self.max_clients:
+                break
+            evicted = now - oldest[0] < 2 * window_seconds
+            self._windows.popitem(last=False)
+            self.evictions += evicted
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "tracked_clients": len(self._windows),
+            "allowlisted_clients": len(self._allow_until),
+            "evictions": self.evictions,
+        }
+
+
+class RedisAbuseStateStore:
+    """Abuse state in a Redis-protocol server, shared by all workers.
+
+    The sliding window is a sorted set of request timestamps per client; the
+    allowlist is a key with a TTL. ``hit`` is a single MULTI/EXEC round trip;
+    an allowlisted client's request is removed from the window again so it
+    doesn't count, matching the in-memory store. Connection errors fail open
+    (the request is not challenged), like the rest of the security middleware.
+    """
+
+    def __init__(self, client: Any, prefix: str = SHARED_STATE_KEY_PREFIX):
+        self.client = client
+        self.prefix = prefix
+
+    def _window_key(self, client_id: str) -> str:
+        return f"{self.prefix}:abuse:req:{client_id}"
+
+    def _allow_key(self, client_id: str) -> str:
+        return f"{self.prefix}:abuse:allow:{client_id}"
+
+    def hit(self, client_id: str, now: float, window_seconds: int) -> Tuple[bool, int]:
+        window_key = self._window_key(client_id)
+        member = f"{now:.6f}:{secrets.token_hex(4)}"
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.get(self._allow_key(client_id))
+            pipe.zremrangebyscore(window_key, 0, f"({now - window_seconds}")
+            pipe.zadd(window_key, {member: now})
+            pipe.zcard(window_key)
+            pipe.expire(window_key, int(window_seconds) + 1)
+            allow_until, _, _, count, _ = pipe.execute()
+            if allow_until is not None and now < float(allow_until):
+                self.client.zrem(window_key, member)
+                return True, 0
+            return False, int(count)
+        except Exception as e:
+            logging.warning(f"[ABUSE] Shared state unavailable, not counting request: {e}")
+            return False, 0
+
+    def stats(self) -> Dict[str, float]:
+        # Entries live (and expire) in the shared server.
+        return {}
+
+    def allow(self, client_id: str, until: float) -> None:
+        ttl = max(1, int(until - time.time()) + 1)
+        try:
+            self.client.set(self._allow_key(client_id), repr(until), ex=ttl)
+        except Exception as e:
+            logging.warning(f"[ABUSE] Shared state unavailable, allowlist not stored: {e}")
+
+
+def create_abuse_state_store(uri: str = None):
+    uri = uri or ABUSE_STATE_STORAGE_URI
+    if not is_shared_uri(uri):
+        return MemoryAbuseStateStore()
+    try:
+        import redis  # type: ignore
+    except ImportError as e:  # pragma: no cover
+        raise RuntimeError(
+            f"ABUSE_STATE_STORAGE_URI={uri!r} requires the 'redis' package"
+        ) from e
+    return RedisAbuseStateStore(redis.Redis.from_url(uri, socket_timeout=0.25))
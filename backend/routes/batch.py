@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, Query
 from typing import List, Dict, Any
 from pydantic import BaseModel
 from ..auth import get_current_user
-from ..middleware.rate_limiting import bulk_rate_limit
+from ..middleware.rate_limiting import bulk_cost_limit, bulk_rate_limit
 from ..firestore_client import db
 from ..utils.database import execute_with_timeout
 from ..utils.authorization import ensure_event_access, ensure_league_access
@@ -41,6 +41,7 @@ class BatchEventsByIdsRequest(BaseModel):
     target="event",
     target_getter=lambda kwargs: (kwargs.get("payload").event_ids or [None])[0],
 )
+@bulk_cost_limit(lambda kwargs: len(kwargs["payload"].event_ids))
 def get_batch_players(
     request: Request,
     payload: BatchPlayerRequest,
@@ -155,6 +156,7 @@ def get_batch_players(
     target="league",
     target_getter=lambda kwargs: (kwargs.get("payload").league_ids or [None])[0],
 )
+@bulk_cost_limit(lambda kwargs: len(kwargs["payload"].league_ids))
 def get_batch_events(
     request: Request,
     payload: BatchEventRequest,
@@ -266,6 +268,7 @@ def get_batch_events(
     target="event",
     target_getter=lambda kwargs: (kwargs.get("payload").event_ids or [None])[0],
 )
+@bulk_cost_limit(lambda kwargs: len(kwargs["payload"].event_ids))
 def get_batch_events_by_ids(
     request: Request,
     payload: BatchEventsByIdsRequest,
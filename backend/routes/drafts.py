@@ -4,14 +4,32 @@ Handles draft creation, management, picks, and real-time state.
 """
 
 import secrets
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict
 from datetime import datetime, timezone, timedelta
 from ..auth import get_current_user
 from ..firestore_client import get_firestore_client
+from ..middleware.observability import record_firestore_writes
 from ..routes.players import calculate_composite_score
+from ..services.draft_events import (
+    draft_cursor,
+    event_doc_id,
+    list_draft_events,
+    load_draft_state,
+    next_event_seq,
+    snapshot_if_due,
+    stage_draft_event,
+)
+from ..services.draft_simulation import (
+    DEFAULT_RANDOMNESS,
+    MAX_ITERATIONS,
+    build_simulation_state,
+    simulate_availability,
+)
+from ..services.team_balancer import generate_balanced_teams
 from ..utils.authorization import ensure_event_access, ensure_league_access
+from ..utils.database import commit_batched_writes
 from ..utils.event_schema import get_event_schema
 from ..utils.star_rating import (
     build_canonical_drill_metrics_for_cohort,
@@ -251,6 +269,12 @@ class TradeCreate(BaseModel):
     receiving_player_id: str
 
 
+class TeamGenerationRequest(BaseModel):
+    apply: bool = False  # False = preview only
+    time_budget_ms: int = Field(1500, ge=50, le=10000)
+    seed: Optional[int] = None
+
+
 class TradeUpdate(BaseModel):
     status: str  # "approved" | "rejected"
 
@@ -313,6 +337,7 @@ def _load_draft_player_pool(db, draft_data: dict) -> Dict[str, dict]:
             for p in players_query.stream():
                 pdata = p.to_dict() or {}
                 pdata.setdefault("id", p.id)
+                pdata.setdefault("event_id", event_id)
                 if age_group and _normalize_age_group(pdata.get("age_group")) != age_group:
                     continue
                 all_players[p.id] = pdata
@@ -633,8 +658,10 @@ def _apply_pick_unit_atomically(
     total_picks = int(live_draft_data.get("num_rounds", 1)) * num_teams
     next_pick = overall_pick + len(assignment_unit)
     last_assigned_pick = overall_pick + len(assignment_unit) - 1
+    event_seq = next_event_seq(live_draft_data)
 
     first_pick_data = None
+    unit_picks: List[dict] = []
     for offset, player_id in enumerate(assignment_unit):
         pick_number = overall_pick + offset
         pick_round = ((pick_number - 1) // num_teams) + 1
@@ -650,23 +677,22 @@ def _apply_pick_unit_atomically(
             "player_id": player_id,
             "picked_by": picked_by,
             "pick_type": pick_type,
+            "event_seq": event_seq,
             "created_at": now_iso(),
         }
         if first_pick_data is None:
             first_pick_data = dict(pick_data)
+        unit_picks.append(pick_data)
         transaction.set(db.collection("draft_picks").document(pick_id), pick_data)
 
     completed = next_pick > total_picks
     if completed:
-        transaction.update(
-            draft_ref,
-            {
-                "status": "completed",
-                "completed_at": now_iso(),
-                "current_pick": last_assigned_pick,
-                "pick_deadline": None,
-            },
-        )
+        draft_updates = {
+            "status": "completed",
+            "completed_at": now_iso(),
+            "current_pick": last_assigned_pick,
+            "pick_deadline": None,
+        }
     else:
         next_round = ((next_pick - 1) // num_teams) + 1
         next_team_id = get_pick_team(live_draft_data, next_pick)
@@ -676,17 +702,33 @@ def _apply_pick_unit_atomically(
                 datetime.now(timezone.utc)
                 + timedelta(seconds=live_draft_data["pick_timer_seconds"])
             ).isoformat()
-        transaction.update(
-            draft_ref,
-            {
-                "current_round": next_round,
-                "current_pick": next_pick,
-                "current_team_id": next_team_id,
-                "pick_deadline": pick_deadline,
-            },
-        )
+        draft_updates = {
+            "current_round": next_round,
+            "current_pick": next_pick,
+            "current_team_id": next_team_id,
+            "pick_deadline": pick_deadline,
+        }
+
+    # A new pick invalidates anything that was waiting to be redone.
+    draft_updates["redo_event_seqs"] = []
+    stage_draft_event(
+        transaction,
+        draft_ref,
+        live_draft_data,
+        "pick",
+        {
+            "picks": unit_picks,
+            "cursor_before": draft_cursor(live_draft_data),
+            "cursor_after": draft_cursor({**live_draft_data, **draft_updates}),
+        },
+        actor=picked_by,
+        draft_updates=draft_updates,
+    )
 
     transaction.commit()
+    # One pick doc per unit member, plus the event and the draft update.
+    record_firestore_writes("draft.pick", len(unit_picks) + 2)
+    snapshot_if_due(draft_ref, live_draft_data, event_seq)
 
     response_pick = first_pick_data or {}
     response_pick["assigned_player_ids"] = assignment_unit
@@ -760,19 +802,27 @@ def _is_draft_admin(user: dict, draft_data: dict) -> bool:
         return False
 
 
-def _get_user_league_roles(db, uid: str) -> Dict[str, str]:
+def _get_user_league_memberships(db, uid: str) -> Dict[str, dict]:
     membership_doc = db.collection("user_memberships").document(uid).get()
     if not membership_doc.exists:
         return {}
     leagues_data = (membership_doc.to_dict() or {}).get("leagues", {}) or {}
+    return {str(league_id): membership or {} for league_id, membership in leagues_data.items()}
+
+
+def _league_roles_from_memberships(memberships: Dict[str, dict]) -> Dict[str, str]:
     roles: Dict[str, str] = {}
-    for league_id, membership in leagues_data.items():
-        role = ((membership or {}).get("role") or "").lower()
+    for league_id, membership in memberships.items():
+        role = (membership.get("role") or "").lower()
         if role:
-            roles[str(league_id)] = role
+            roles[league_id] = role
     return roles
 
 
+def _get_user_league_roles(db, uid: str) -> Dict[str, str]:
+    return _league_roles_from_memberships(_get_user_league_memberships(db, uid))
+
+
 def _user_has_scoped_organizer_membership(db, uid: str) -> bool:
     return any(role == "organizer" for role in _get_user_league_roles(db, uid).values())
 
@@ -882,15 +932,17 @@ def _get_team_for_draft(db, draft_id: str, team_id: str) -> dict:
     return team_data
 
 
-def _get_pick_for_player(db, draft_id: str, player_id: str):
+def _get_pick_for_player(db, draft_id: str, player_id: str, *, transaction=None):
     pick_query = (
         db.collection("draft_picks")
         .where(filter=FieldFilter("draft_id", "==", draft_id))
         .where(filter=FieldFilter("player_id", "==", player_id))
         .limit(1)
-        .stream()
     )
-    picks = list(pick_query)
+    if transaction is not None:
+        picks = list(transaction.get(pick_query))
+    else:
+        picks = list(pick_query.stream())
     return picks[0] if picks else None
 
 
@@ -901,9 +953,34 @@ def _execute_trade_swap(
     receiving_player_id: str,
     offering_team_id: str,
     receiving_team_id: str,
+    *,
+    trade_id: Optional[str] = None,
+    actor: Optional[str] = None,
+    trade_ref=None,
+    trade_data: Optional[dict] = None,
 ):
-    offering_pick = _get_pick_for_player(db, draft_id, offering_player_id)
-    receiving_pick = _get_pick_for_player(db, draft_id, receiving_player_id)
+    """Swap two picks' teams, log the trade and write ``trade_data`` to
+    ``trade_ref`` (merged) in a single transaction.
+
+    An existing trade record must still be pending, so two approvals racing
+    each other cannot both swap.
+    """
+    draft_ref = db.collection("drafts").document(draft_id)
+    transaction = db.transaction()
+    draft_snapshot = transaction.get(draft_ref)
+    if not draft_snapshot.exists:
+        raise HTTPException(status_code=404, detail="Draft not found")
+    if trade_ref is not None:
+        trade_snapshot = transaction.get(trade_ref)
+        if trade_snapshot.exists and (trade_snapshot.to_dict() or {}).get("status") != "pending":
+            raise HTTPException(status_code=400, detail="Trade already resolved")
+
+    offering_pick = _get_pick_for_player(
+        db, draft_id, offering_player_id, transaction=transaction
+    )
+    receiving_pick = _get_pick_for_player(
+        db, draft_id, receiving_player_id, transaction=transaction
+    )
 
     if not offering_pick or not receiving_pick:
         raise HTTPException(
@@ -922,14 +999,59 @@ def _execute_trade_swap(
             status_code=400, detail="Receiving player is not on the receiving team"
         )
 
-    batch = db.batch()
-    batch.update(
+    transaction.update(
         offering_pick.reference, {"team_id": receiving_team_id, "updated_at": now_iso()}
     )
-    batch.update(
+    transaction.update(
         receiving_pick.reference, {"team_id": offering_team_id, "updated_at": now_iso()}
     )
-    batch.commit()
+    stage_draft_event(
+        transaction,
+        draft_ref,
+        draft_snapshot.to_dict() or {},
+        "trade",
+        {
+            "trade_id": trade_id,
+            "offering_team_id": offering_team_id,
+            "receiving_team_id": receiving_team_id,
+            "offering_player_id": offering_player_id,
+            "receiving_player_id": receiving_player_id,
+        },
+        actor=actor,
+    )
+    writes = 4
+    if trade_ref is not None and trade_data is not None:
+        transaction.set(trade_ref, trade_data, merge=True)
+        writes += 1
+    transaction.commit()
+    record_firestore_writes("draft.trade", writes)
+
+
+def _commit_draft_event(
+    db,
+    draft_ref,
+    event_type: str,
+    payload: dict,
+    *,
+    actor: Optional[str],
+    draft_updates: Optional[dict] = None,
+) -> dict:
+    """Append a draft event and apply ``draft_updates`` in one transaction."""
+    transaction = db.transaction()
+    draft_snapshot = transaction.get(draft_ref)
+    if not draft_snapshot.exists:
+        raise HTTPException(status_code=404, detail="Draft not found")
+    event = stage_draft_event(
+        transaction,
+        draft_ref,
+        draft_snapshot.to_dict() or {},
+        event_type,
+        payload,
+        actor=actor,
+        draft_updates=draft_updates,
+    )
+    transaction.commit()
+    return event
 
 
 # ============================================================================
@@ -1129,7 +1251,10 @@ async def list_drafts(
     """List drafts, optionally filtered by event, league, or owned by user."""
     db = get_firestore_client()
     uid = user["uid"]
-    user_league_roles = _get_user_league_roles(db, uid)
+    # One membership read per request; roles, staff leagues and visibility
+    # all derive from it.
+    user_memberships = _get_user_league_memberships(db, uid)
+    user_league_roles = _league_roles_from_memberships(user_memberships)
 
     def _staff_league_ids() -> set[str]:
         return {
@@ -1152,6 +1277,27 @@ async def list_drafts(
             seen_ids.add(did)
         drafts.append(data)
 
+    coach_draft_ids: Optional[set] = None
+
+    def _coach_draft_ids() -> set:
+        # Drafts where this user coaches a team; one query per request.
+        nonlocal coach_draft_ids
+        if coach_draft_ids is None:
+            coach_teams = (
+                db.collection("draft_teams")
+                .where(filter=FieldFilter("coach_user_id", "==", uid))
+                .stream()
+            )
+            coach_draft_ids = {t.to_dict().get("draft_id") for t in coach_teams} - {None}
+        return coach_draft_ids
+
+    def _add_coach_team_drafts():
+        missing = sorted(did for did in _coach_draft_ids() if did not in seen_ids)
+        if missing:
+            refs = [db.collection("drafts").document(did) for did in missing]
+            for doc in db.get_all(refs):
+                _add_doc(doc)
+
     # Primary list query
     if event_id:
         # Support both legacy event_id field and newer event_ids[]
@@ -1171,60 +1317,85 @@ async def list_drafts(
         for d in q.stream():
             _add_doc(d)
         # Also drafts where user is a team coach
-        coach_teams = (
-            db.collection("draft_teams")
-            .where(filter=FieldFilter("coach_user_id", "==", user["uid"]))
-            .stream()
-        )
-        coach_draft_ids = {t.to_dict().get("draft_id") for t in coach_teams}
-        for did in coach_draft_ids:
-            if did and did not in seen_ids:
-                _add_doc(db.collection("drafts").document(did).get())
+        _add_coach_team_drafts()
     else:
-        for scoped_league_id in _staff_league_ids():
+        staff_league_ids = sorted(_staff_league_ids())
+        # Firestore allows up to 30 values in an "in" filter.
+        for start in range(0, len(staff_league_ids), 30):
             q = db.collection("drafts").where(
-                filter=FieldFilter("league_id", "==", scoped_league_id)
+                filter=FieldFilter("league_id", "in", staff_league_ids[start : start + 30])
             )
             for d in q.stream():
                 _add_doc(d)
         q = db.collection("drafts").where(filter=FieldFilter("created_by", "==", uid))
         for d in q.stream():
             _add_doc(d)
-        coach_teams = (
-            db.collection("draft_teams")
-            .where(filter=FieldFilter("coach_user_id", "==", uid))
-            .stream()
-        )
-        coach_draft_ids = {t.to_dict().get("draft_id") for t in coach_teams}
-        for did in coach_draft_ids:
-            if did and did not in seen_ids:
-                _add_doc(db.collection("drafts").document(did).get())
-
-    visible: List[dict] = []
-    for draft in drafts:
-        draft_id = draft.get("id")
-        league_id_val = draft.get("league_id")
-
-        if league_id_val:
+        _add_coach_team_drafts()
+
+    # Visibility is decided once per league (membership) and once per linked
+    # event (scope), not once per draft.
+    league_memberships: Dict[str, Optional[dict]] = {}
+    event_visible: Dict[str, bool] = {}
+
+    def _league_membership(league_id_val: str) -> Optional[dict]:
+        if league_id_val in league_memberships:
+            return league_memberships[league_id_val]
+        membership = user_memberships.get(league_id_val)
+        if membership:
+            # Same checks ensure_league_access applies to this document.
+            league_memberships[league_id_val] = (
+                None if membership.get("disabled") is True else membership
+            )
+        else:
+            # Legacy leagues/{id}/members records are only reachable this way.
             try:
-                membership = ensure_league_access(
+                league_memberships[league_id_val] = ensure_league_access(
                     uid,
                     league_id_val,
                     allowed_roles={"organizer", "coach", "viewer"},
                     operation_name="list drafts",
                 )
-                _enforce_draft_scope_for_membership(
-                    user_id=uid,
-                    draft_data=draft,
-                    membership=membership,
+            except HTTPException:
+                league_memberships[league_id_val] = None
+        return league_memberships[league_id_val]
+
+    def _event_in_scope(scoped_event_id: str) -> bool:
+        if scoped_event_id not in event_visible:
+            try:
+                ensure_event_access(
+                    uid,
+                    scoped_event_id,
+                    allowed_roles={"organizer", "coach", "viewer"},
                     operation_name="list drafts",
                 )
-                visible.append(draft)
+                event_visible[scoped_event_id] = True
             except HTTPException:
-                pass
+                event_visible[scoped_event_id] = False
+        return event_visible[scoped_event_id]
+
+    def _league_draft_visible(draft: dict) -> bool:
+        # Mirrors _enforce_draft_scope_for_membership with memoized lookups.
+        membership = _league_membership(draft["league_id"])
+        if membership is None:
+            return False
+        role = (membership.get("role") or "").lower()
+        if role not in {"organizer", "coach", "viewer"}:
+            return False
+        if role == "organizer":
+            return True
+        return all(_event_in_scope(eid) for eid in _get_draft_event_ids(draft))
+
+    visible: List[dict] = []
+    for draft in drafts:
+        draft_id = draft.get("id")
+
+        if draft.get("league_id"):
+            if _league_draft_visible(draft):
+                visible.append(draft)
             continue
 
-        if draft_id and _has_explicit_draft_access(db, draft_id, uid, draft):
+        # Same rule as _has_explicit_draft_access, answered from one query.
+        if draft_id and (draft.get("created_by") == uid or draft_id in _coach_draft_ids()):
             visible.append(draft)
 
     return visible
@@ -1297,7 +1468,14 @@ async def start_draft(draft_id: str, user: dict = Depends(get_current_user)):
         "started_at": now_iso(),
     }
 
-    draft_ref.update(updates)
+    _commit_draft_event(
+        db,
+        draft_ref,
+        "start",
+        {"cursor_after": draft_cursor(updates)},
+        actor=user["uid"],
+        draft_updates=updates,
+    )
 
     logger.info(
         f"Draft started: {draft_id} with {len(teams)} teams, {num_rounds} rounds"
@@ -1329,7 +1507,7 @@ async def reset_draft(draft_id: str, user: dict = Depends(get_current_user)):
     for roster in rosters:
         roster.reference.delete()
 
-    draft_ref.update({
+    updates = {
         "status": "setup",
         "current_round": None,
         "current_pick": None,
@@ -1340,7 +1518,16 @@ async def reset_draft(draft_id: str, user: dict = Depends(get_current_user)):
         "pick_deadline": None,
         "started_at": None,
         "completed_at": None,
-    })
+        "redo_event_seqs": [],
+    }
+    _commit_draft_event(
+        db,
+        draft_ref,
+        "reset",
+        {"cursor_after": draft_cursor(updates)},
+        actor=user["uid"],
+        draft_updates=updates,
+    )
 
     return {"status": "reset", "draft_id": draft_id}
 
@@ -1538,7 +1725,10 @@ async def reorder_teams(
 
 @router.post("/{draft_id}/picks")
 async def make_pick(
-    draft_id: str, pick_in: PickCreate, user: dict = Depends(get_current_user)
+    draft_id: str,
+    pick_in: PickCreate,
+    background_tasks: BackgroundTasks,
+    user: dict = Depends(get_current_user),
 ):
     """Make a draft pick."""
     db = get_firestore_client()
@@ -1612,7 +1802,8 @@ async def make_pick(
     )
 
     if response_pick.get("completed"):
-        await _create_team_rosters(db, draft_id, draft_data)
+        # Rosters are written after the response so the final pick returns fast.
+        background_tasks.add_task(_create_team_rosters, db, draft_id, draft_data)
         logger.info(
             f"Draft completed: {draft_id} (pick unit size={len(assignment_unit)})"
         )
@@ -1658,7 +1849,11 @@ async def list_picks(draft_id: str, user: dict = Depends(get_current_user)):
 
 
 @router.post("/{draft_id}/picks/auto")
-async def auto_pick(draft_id: str, user: dict = Depends(get_current_user)):
+async def auto_pick(
+    draft_id: str,
+    background_tasks: BackgroundTasks,
+    user: dict = Depends(get_current_user),
+):
     """
     Trigger auto-pick for the current team if timer has expired.
     Uses coach's rankings if available, otherwise uses composite score.
@@ -1801,7 +1996,7 @@ async def auto_pick(draft_id: str, user: dict = Depends(get_current_user)):
     )
 
     if base_pick.get("completed"):
-        await _create_team_rosters(db, draft_id, draft_data)
+        background_tasks.add_task(_create_team_rosters, db, draft_id, draft_data)
         logger.info(
             f"Draft completed via auto-pick: {draft_id} "
             f"(pick unit size={len(assignment_unit)})"
@@ -1820,11 +2015,17 @@ async def auto_pick(draft_id: str, user: dict = Depends(get_current_user)):
 
 @router.post("/{draft_id}/picks/undo")
 async def undo_last_pick(draft_id: str, user: dict = Depends(get_current_user)):
-    """Undo the last pick. Admin only."""
+    """Undo the last pick (the whole sibling unit it assigned). Admin only."""
     db = get_firestore_client()
-    draft_ref, draft_data = _verify_draft_access(db, draft_id, user, require_admin=True)
+    draft_ref, _ = _verify_draft_access(db, draft_id, user, require_admin=True)
 
-    if draft_data.get("status") not in ["active", "paused"]:
+    transaction = db.transaction()
+    draft_snapshot = transaction.get(draft_ref)
+    if not draft_snapshot.exists:
+        raise HTTPException(status_code=404, detail="Draft not found")
+    live_draft_data = draft_snapshot.to_dict() or {}
+
+    if live_draft_data.get("status") not in ["active", "paused"]:
         raise HTTPException(
             status_code=400, detail="Cannot undo picks in current draft state"
         )
@@ -1835,41 +2036,580 @@ async def undo_last_pick(draft_id: str, user: dict = Depends(get_current_user)):
         .where(filter=FieldFilter("draft_id", "==", draft_id))
         .order_by("pick_number", direction="DESCENDING")
         .limit(1)
-        .stream()
     )
-
-    picks = list(picks_query)
+    picks = list(transaction.get(picks_query))
     if len(picks) == 0:
         raise HTTPException(status_code=400, detail="No picks to undo")
 
     last_pick = picks[0]
     last_pick_data = last_pick.to_dict()
 
-    # Delete the pick
-    last_pick.reference.delete()
+    # Picks written with the event log carry the sequence of the pick event that
+    # created them; undo removes that whole unit. Older picks are undone singly.
+    unit_snapshots = [last_pick]
+    if last_pick_data.get("event_seq"):
+        unit_query = (
+            db.collection("draft_picks")
+            .where(filter=FieldFilter("draft_id", "==", draft_id))
+            .where(filter=FieldFilter("event_seq", "==", last_pick_data["event_seq"]))
+        )
+        unit_snapshots = list(transaction.get(unit_query)) or [last_pick]
+    unit_picks = sorted(
+        (snap.to_dict() for snap in unit_snapshots),
+        key=lambda pick: pick.get("pick_number") or 0,
+    )
 
     # Revert draft state
-    num_teams = draft_data.get("num_teams", 1)
-    reverted_pick = last_pick_data.get("pick_number")
+    num_teams = live_draft_data.get("num_teams", 1)
+    reverted_pick = unit_picks[0].get("pick_number")
     reverted_round = ((reverted_pick - 1) // num_teams) + 1
-    reverted_team_id = last_pick_data.get("team_id")
+    reverted_team_id = get_pick_team(live_draft_data, reverted_pick) or unit_picks[0].get(
+        "team_id"
+    )
 
-    draft_ref.update(
+    for snap in unit_snapshots:
+        transaction.delete(snap.reference)
+
+    draft_updates = {
+        "current_round": reverted_round,
+        "current_pick": reverted_pick,
+        "current_team_id": reverted_team_id,
+        "status": (
+            "active"
+            if live_draft_data.get("status") == "completed"
+            else live_draft_data.get("status")
+        ),
+    }
+    event_seq = next_event_seq(live_draft_data)
+    draft_updates["redo_event_seqs"] = list(live_draft_data.get("redo_event_seqs") or []) + [
+        event_seq
+    ]
+    stage_draft_event(
+        transaction,
+        draft_ref,
+        live_draft_data,
+        "undo",
         {
-            "current_round": reverted_round,
-            "current_pick": reverted_pick,
-            "current_team_id": reverted_team_id,
-            "status": (
-                "active"
-                if draft_data.get("status") == "completed"
-                else draft_data.get("status")
-            ),
-        }
+            "picks": unit_picks,
+            "cursor_before": draft_cursor(live_draft_data),
+            "cursor_after": draft_cursor({**live_draft_data, **draft_updates}),
+        },
+        actor=user["uid"],
+        draft_updates=draft_updates,
     )
+    transaction.commit()
 
     logger.info(f"Pick undone: {last_pick_data.get('id')} from draft {draft_id}")
 
-    return {"status": "undone", "pick_id": last_pick_data.get("id")}
+    return {
+        "status": "undone",
+        "pick_id": last_pick_data.get("id"),
+        "undone_pick_ids": [pick.get("id") for pick in unit_picks],
+        "event_seq": event_seq,
+    }
+
+
+@router.post("/{draft_id}/picks/redo")
+async def redo_pick(draft_id: str, user: dict = Depends(get_current_user)):
+    """Re-apply the most recently undone pick. Admin only."""
+    db = get_firestore_client()
+    draft_ref, _ = _verify_draft_access(db, draft_id, user, require_admin=True)
+
+    transaction = db.transaction()
+    draft_snapshot = transaction.get(draft_ref)
+    if not draft_snapshot.exists:
+        raise HTTPException(status_code=404, detail="Draft not found")
+    live_draft_data = draft_snapshot.to_dict() or {}
+
+    if live_draft_data.get("status") not in ["active", "paused"]:
+        raise HTTPException(
+            status_code=400, detail="Cannot redo picks in current draft state"
+        )
+
+    redo_event_seqs = list(live_draft_data.get("redo_event_seqs") or [])
+    if not redo_event_seqs:
+        raise HTTPException(status_code=400, detail="No undone picks to redo")
+
+    undo_seq = redo_event_seqs[-1]
+    undo_snapshot = transaction.get(
+        draft_ref.collection("events").document(event_doc_id(undo_seq))
+    )
+    undo_event = undo_snapshot.to_dict() if undo_snapshot.exists else None
+    if not undo_event or undo_event.get("type") != "undo":
+        raise HTTPException(status_code=409, detail="Undo event missing from draft log")
+
+    undo_payload = undo_event.get("payload") or {}
+    restored_cursor = undo_payload.get("cursor_before") or {}
+    expected_cursor = undo_payload.get("cursor_after") or {}
+    if live_draft_data.get("current_pick") != expected_cursor.get("current_pick"):
+        raise HTTPException(
+            status_code=409,
+            detail="Draft board changed since the undo. Refresh and try again.",
+        )
+
+    unit_picks = undo_payload.get("picks") or []
+    picks_query = db.collection("draft_picks").where(
+        filter=FieldFilter("draft_id", "==", draft_id)
+    )
+    drafted_player_ids = {
+        snap.to_dict().get("player_id") for snap in transaction.get(picks_query)
+    }
+    if any(pick.get("player_id") in drafted_player_ids for pick in unit_picks):
+        raise HTTPException(
+            status_code=409,
+            detail="A player from the undone pick has since been drafted",
+        )
+
+    for pick in unit_picks:
+        transaction.set(db.collection("draft_picks").document(pick["id"]), pick)
+
+    draft_updates = {
+        "current_round": restored_cursor.get("current_round"),
+        "current_pick": restored_cursor.get("current_pick"),
+        "current_team_id": restored_cursor.get("current_team_id"),
+        "redo_event_seqs": redo_event_seqs[:-1],
+    }
+    event = stage_draft_event(
+        transaction,
+        draft_ref,
+        live_draft_data,
+        "redo",
+        {
+            "undo_seq": undo_seq,
+            "picks": unit_picks,
+            "cursor_before": draft_cursor(live_draft_data),
+            "cursor_after": draft_cursor({**live_draft_data, **draft_updates}),
+        },
+        actor=user["uid"],
+        draft_updates=draft_updates,
+    )
+    transaction.commit()
+
+    logger.info(f"Pick redone from undo event {undo_seq} in draft {draft_id}")
+
+    return {
+        "status": "redone",
+        "redone_pick_ids": [pick.get("id") for pick in unit_picks],
+        "event_seq": event["seq"],
+    }
+
+
+# ============================================================================
+# Event Log
+# ============================================================================
+
+
+@router.get("/{draft_id}/events")
+async def list_events(
+    draft_id: str,
+    after_seq: int = Query(0, ge=0),
+    limit: int = Query(200, ge=1, le=1000),
+    user: dict = Depends(get_current_user),
+):
+    """List draft log events after ``after_seq`` (audit view / incremental sync)."""
+    db = get_firestore_client()
+    draft_ref, draft_data = _verify_draft_access(db, draft_id, user)
+    events = list_draft_events(draft_ref, after_seq=after_seq, limit=limit)
+    return {
+        "draft_id": draft_id,
+        "latest_seq": int(draft_data.get("event_seq") or 0),
+        "events": events,
+    }
+
+
+@router.get("/{draft_id}/events/state")
+async def get_replayed_state(draft_id: str, user: dict = Depends(get_current_user)):
+    """Return draft state derived by replaying the event log."""
+    db = get_firestore_client()
+    draft_ref, draft_data = _verify_draft_access(db, draft_id, user)
+    return load_draft_state(draft_ref, draft_data)
+
+
+@router.post("/{draft_id}/events/rebuild")
+async def rebuild_from_events(draft_id: str, user: dict = Depends(get_current_user)):
+    """Rewrite picks, board position and pre-slots from the event log. Admin only.
+
+    Draft status is left untouched because pause/resume are not logged.
+    """
+    db = get_firestore_client()
+    draft_ref, draft_data = _verify_draft_access(db, draft_id, user, require_admin=True)
+
+    state = load_draft_state(draft_ref, draft_data, persist_snapshot=True)
+    if not state.get("seq"):
+        raise HTTPException(status_code=400, detail="Draft has no event log to rebuild from")
+
+    writes = []
+    existing_picks = (
+        db.collection("draft_picks")
+        .where(filter=FieldFilter("draft_id", "==", draft_id))
+        .stream()
+    )
+    removed = 0
+    preserved = 0
+    for snap in existing_picks:
+        if snap.id in state["picks"]:
+            continue
+        # Picks made before the event log existed have no event and must be
+        # kept; only picks the log wrote (and later undid) are reconciled.
+        if (snap.to_dict() or {}).get("event_seq") or snap.id in state.get("logged_pick_ids", ()):
+            writes.append(("delete", snap.reference, None))
+            removed += 1
+        else:
+            preserved += 1
+    for pick_id, pick in state["picks"].items():
+        writes.append(("set", db.collection("draft_picks").document(pick_id), pick))
+    for team_id, player_ids in state["pre_slots"].items():
+        writes.append(
+            (
+                "update",
+                db.collection("draft_teams").document(team_id),
+                {"pre_slotted_player_ids": player_ids},
+            )
+        )
+    cursor = state["cursor"]
+    writes.append(
+        (
+            "update",
+            draft_ref,
+            {
+                "current_round": cursor.get("current_round"),
+                "current_pick": cursor.get("current_pick"),
+                "current_team_id": cursor.get("current_team_id"),
+                "redo_event_seqs": state["redo_event_seqs"],
+            },
+        )
+    )
+
+    commit_batched_writes(db, writes, operation="draft.rebuild")
+
+    logger.info(
+        f"Draft {draft_id} rebuilt from event log at seq {state['seq']} "
+        f"({len(state['picks'])} picks, {removed} removed, {preserved} pre-log kept)"
+    )
+
+    return {
+        "status": "rebuilt",
+        "draft_id": draft_id,
+        "seq": state["seq"],
+        "picks": len(state["picks"]),
+        "removed_picks": removed,
+        "preserved_picks": preserved,
+    }
+
+
+# ============================================================================
+# Mock Draft Simulation
+# ============================================================================
+
+
+def _attach_composite_scores(all_players: Dict[str, dict]) -> None:
+    """Fill composite_score for combine players using their event schema."""
+    schemas: Dict[str, object] = {}
+    for pdata in all_players.values():
+        if pdata.get("composite_score") is not None:
+            continue
+        event_id = pdata.get("event_id")
+        if not event_id:
+            continue
+        if event_id not in schemas:
+            schemas[event_id] = get_event_schema(event_id)
+        pdata["composite_score"] = calculate_composite_score(pdata, schema=schemas[event_id])
+
+
+@router.get("/{draft_id}/simulate")
+def simulate_draft(
+    draft_id: str,
+    team_id: Optional[str] = Query(None),
+    iterations: int = Query(2000, ge=1, le=MAX_ITERATIONS),
+    randomness: float = Query(DEFAULT_RANDOMNESS, ge=0.0, le=0.95),
+    top: int = Query(25, ge=1, le=500),
+    seed: Optional[int] = Query(None),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Monte Carlo mock draft: probability each player is still available at the
+    team's upcoming picks. Defaults to the caller's team, else the team on the clock.
+
+    Sync route on purpose: the CPU work runs off the event loop.
+    """
+    db = get_firestore_client()
+    _, draft_data = _verify_draft_access(db, draft_id, user)
+    _require_draft_staff(db, user, draft_data, operation_name="Draft simulation")
+
+    if draft_data.get("status") not in ["active", "paused"]:
+        raise HTTPException(status_code=400, detail="Draft is not in progress")
+
+    team_order = list(draft_data.get("team_order") or [])
+    teams = {
+        t.id: t.to_dict() or {}
+        for t in db.collection("draft_teams")
+        .where(filter=FieldFilter("draft_id", "==", draft_id))
+        .stream()
+    }
+    if not team_id:
+        team_id = next(
+            (
+                tid
+                for tid in team_order
+                if (teams.get(tid) or {}).get("coach_user_id") == user["uid"]
+            ),
+            draft_data.get("current_team_id"),
+        )
+    if team_id not in team_order:
+        raise HTTPException(status_code=400, detail="Team not in this draft")
+
+    rankings_by_coach = {
+        r.get("coach_user_id"): r.get("ranked_player_ids") or []
+        for r in (
+            doc.to_dict() or {}
+            for doc in db.collection("coach_rankings")
+            .where(filter=FieldFilter("draft_id", "==", draft_id))
+            .stream()
+        )
+    }
+    team_rankings = {
+        tid: rankings_by_coach.get((teams.get(tid) or {}).get("coach_user_id")) or []
+        for tid in team_order
+    }
+
+    all_players = _load_draft_player_pool(db, draft_data)
+    _attach_composite_scores(all_players)
+    draft_picks = _list_draft_picks(db, draft_id)
+    drafted_team_by_player = {
+        p.get("player_id"): p.get("team_id") for p in draft_picks if p.get("player_id")
+    }
+
+    num_teams = int(draft_data.get("num_teams") or len(team_order) or 1)
+    current_pick = int(draft_data.get("current_pick") or 1)
+    total_picks = num_teams * int(draft_data.get("num_rounds") or 0)
+    pick_team_ids = [get_pick_team(draft_data, p) for p in range(current_pick, total_picks + 1)]
+    tracked_picks = [
+        current_pick + offset
+        for offset, tid in enumerate(pick_team_ids)
+        if tid == team_id
+    ]
+    if not tracked_picks:
+        return {"draft_id": draft_id, "team_id": team_id, "iterations": 0, "picks": []}
+
+    state = build_simulation_state(
+        players=all_players,
+        drafted_team_by_player=drafted_team_by_player,
+        team_order=team_order,
+        pick_team_ids=pick_team_ids,
+        current_pick=current_pick,
+        team_rankings=team_rankings,
+        team_cap=_resolve_team_cap(draft_data),
+        composite_for=_player_composite_for_balance,
+        normalize_name=_normalize_player_name_for_match,
+    )
+    availability = simulate_availability(
+        state,
+        tracked_picks=tracked_picks,
+        iterations=iterations,
+        randomness=randomness,
+        seed=seed,
+    )
+
+    picks = []
+    for j, pick_number in enumerate(tracked_picks):
+        ranked = sorted(
+            (
+                (probabilities[j], pid)
+                for pid, probabilities in availability.items()
+                if probabilities[j] > 0
+            ),
+            key=lambda item: (-item[0], item[1]),
+        )[:top]
+        picks.append(
+            {
+                "pick_number": pick_number,
+                "round": ((pick_number - 1) // num_teams) + 1,
+                "players": [
+                    {
+                        "player_id": pid,
+                        "name": (all_players.get(pid) or {}).get("name"),
+                        "probability": round(probability, 4),
+                    }
+                    for probability, pid in ranked
+                ],
+            }
+        )
+
+    return {
+        "draft_id": draft_id,
+        "team_id": team_id,
+        "iterations": iterations,
+        "randomness": randomness,
+        "picks": picks,
+    }
+
+
+# ============================================================================
+# Balanced Team Generation
+# ============================================================================
+
+
+@router.post("/{draft_id}/generate-teams")
+def generate_teams(
+    draft_id: str,
+    request_in: TeamGenerationRequest,
+    background_tasks: BackgroundTasks,
+    user: dict = Depends(get_current_user),
+):
+    """
+    Build balanced teams directly instead of running a live draft. Admin only.
+
+    Minimizes the composite average gap, keeps forced sibling groups together,
+    honors the team cap and pre-slots, and rewards buddy matches. With
+    apply=false this is a preview; with apply=true the result is written as
+    picks, the draft is completed and rosters are created. Applying is refused
+    while the cap leaves players unassigned.
+
+    Sync route on purpose: the search runs off the event loop.
+    """
+    db = get_firestore_client()
+    draft_ref, draft_data = _verify_draft_access(db, draft_id, user, require_admin=True)
+
+    if draft_data.get("status") != "setup":
+        raise HTTPException(
+            status_code=400, detail="Teams can only be generated before the draft starts"
+        )
+    if request_in.apply:
+        _check_payment_gate(db, draft_id, draft_data)
+
+    teams = [
+        t.to_dict()
+        for t in db.collection("draft_teams")
+        .where(filter=FieldFilter("draft_id", "==", draft_id))
+        .stream()
+    ]
+    if len(teams) < 2:
+        raise HTTPException(status_code=400, detail="Need at least 2 teams to generate teams")
+    teams.sort(key=lambda t: t.get("pick_order", 999))
+    team_order = [t["id"] for t in teams]
+
+    all_players = _load_draft_player_pool(db, draft_data)
+    if not all_players:
+        raise HTTPException(status_code=400, detail="Cannot generate teams with 0 players")
+    _attach_composite_scores(all_players)
+
+    pinned = {
+        pid: t["id"]
+        for t in teams
+        for pid in (t.get("pre_slotted_player_ids") or [])
+        if pid in all_players
+    }
+    result = generate_balanced_teams(
+        players=all_players,
+        team_ids=team_order,
+        team_cap=_resolve_team_cap(draft_data),
+        composite_for=_player_composite_for_balance,
+        normalize_name=_normalize_player_name_for_match,
+        pinned=pinned,
+        time_budget_seconds=request_in.time_budget_ms / 1000.0,
+        seed=request_in.seed,
+    )
+    result["draft_id"] = draft_id
+    result["applied"] = False
+
+    if not request_in.apply:
+        return result
+    if result["unassigned_player_ids"]:
+        # Completing the draft would drop these players from every roster.
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"{len(result['unassigned_player_ids'])} players do not fit under the team cap; "
+                "raise the cap or add teams before applying"
+            ),
+        )
+
+    num_teams = len(team_order)
+    num_rounds = max(1, max(len(ids) for ids in result["teams"].values()))
+    # Lay each roster out as the picks a snake draft would have produced so the
+    # board, trades and event replay treat it like any completed draft.
+    picks: List[dict] = []
+    for round_num in range(1, num_rounds + 1):
+        order = (
+            calculate_snake_order(team_order, round_num)
+            if draft_data.get("draft_type") == "snake"
+            else team_order
+        )
+        for slot, team_id in enumerate(order):
+            player_ids = result["teams"][team_id]
+            if round_num > len(player_ids):
+                continue
+            pick_number = (round_num - 1) * num_teams + slot + 1
+            picks.append(
+                {
+                    "id": generate_id("pick_"),
+                    "draft_id": draft_id,
+                    "round": round_num,
+                    "pick_number": pick_number,
+                    "pick_in_round": slot + 1,
+                    "team_id": team_id,
+                    "player_id": player_ids[round_num - 1],
+                    "picked_by": user["uid"],
+                    "pick_type": "generated",
+                    "created_at": now_iso(),
+                }
+            )
+
+    updates = {
+        "status": "completed",
+        "team_order": team_order,
+        "num_teams": num_teams,
+        "num_rounds": num_rounds,
+        "current_round": num_rounds,
+        "current_pick": num_teams * num_rounds,
+        "current_team_id": None,
+        "pick_deadline": None,
+        "started_at": now_iso(),
+        "completed_at": now_iso(),
+        "redo_event_seqs": [],
+    }
+
+    # Log first: if a pick batch fails afterwards, /events/rebuild restores it.
+    transaction = db.transaction()
+    draft_snapshot = transaction.get(draft_ref)
+    live_draft_data = draft_snapshot.to_dict() or {}
+    if live_draft_data.get("status") != "setup":
+        raise HTTPException(status_code=409, detail="Draft changed. Refresh and try again.")
+    event_seq = next_event_seq(live_draft_data)
+    for pick in picks:
+        pick["event_seq"] = event_seq
+    stage_draft_event(
+        transaction,
+        draft_ref,
+        live_draft_data,
+        "generate",
+        {
+            "picks": picks,
+            "cursor_before": draft_cursor(live_draft_data),
+            "cursor_after": draft_cursor({**live_draft_data, **updates}),
+            "composite_avg_gap": result["composite_avg_gap"],
+        },
+        actor=user["uid"],
+        draft_updates=updates,
+    )
+    transaction.commit()
+
+    commit_batched_writes(
+        db,
+        [("set", db.collection("draft_picks").document(p["id"]), p) for p in picks],
+        operation="draft.generate_teams",
+    )
+    background_tasks.add_task(
+        _create_team_rosters, db, draft_id, {**draft_data, **updates}, created_from="generated"
+    )
+
+    logger.info(
+        f"Draft {draft_id} teams generated: {len(picks)} players, {num_teams} teams, "
+        f"gap {result['composite_avg_gap']}"
+    )
+
+    result["applied"] = True
+    return result
 
 
 # ============================================================================
@@ -2185,6 +2925,49 @@ async def review_sibling_group(
 # ============================================================================
 
 
+def _update_pre_slot(
+    db,
+    *,
+    draft_id: str,
+    team_id: str,
+    player_id: str,
+    add: bool,
+    actor: str,
+    reason: Optional[str] = None,
+) -> bool:
+    """Add/remove a pre-slotted player and log the change. Returns True if changed."""
+    draft_ref = db.collection("drafts").document(draft_id)
+    team_ref = db.collection("draft_teams").document(team_id)
+    transaction = db.transaction()
+    draft_snapshot = transaction.get(draft_ref)
+    team_snapshot = transaction.get(team_ref)
+    if not draft_snapshot.exists:
+        raise HTTPException(status_code=404, detail="Draft not found")
+
+    pre_slotted = list((team_snapshot.to_dict() or {}).get("pre_slotted_player_ids") or [])
+    if add == (player_id in pre_slotted):
+        return False
+    if add:
+        pre_slotted.append(player_id)
+    else:
+        pre_slotted.remove(player_id)
+
+    transaction.update(team_ref, {"pre_slotted_player_ids": pre_slotted})
+    payload = {"team_id": team_id, "player_id": player_id}
+    if reason:
+        payload["reason"] = reason
+    stage_draft_event(
+        transaction,
+        draft_ref,
+        draft_snapshot.to_dict() or {},
+        "pre_slot_add" if add else "pre_slot_remove",
+        payload,
+        actor=actor,
+    )
+    transaction.commit()
+    return True
+
+
 @router.post("/{draft_id}/pre-slots")
 async def add_pre_slot(
     draft_id: str, slot_in: PreSlotCreate, user: dict = Depends(get_current_user)
@@ -2200,13 +2983,16 @@ async def add_pre_slot(
 
     _check_payment_gate(db, draft_id, draft_data)
 
-    team_ref = db.collection("draft_teams").document(slot_in.team_id)
-    team_data = _get_team_for_draft(db, draft_id, slot_in.team_id)
-    pre_slotted = team_data.get("pre_slotted_player_ids", [])
-
-    if slot_in.player_id not in pre_slotted:
-        pre_slotted.append(slot_in.player_id)
-        team_ref.update({"pre_slotted_player_ids": pre_slotted})
+    _get_team_for_draft(db, draft_id, slot_in.team_id)
+    _update_pre_slot(
+        db,
+        draft_id=draft_id,
+        team_id=slot_in.team_id,
+        player_id=slot_in.player_id,
+        add=True,
+        actor=user["uid"],
+        reason=slot_in.reason,
+    )
 
     return {
         "status": "added",
@@ -2230,13 +3016,15 @@ async def remove_pre_slot(
 
     _check_payment_gate(db, draft_id, draft_data)
 
-    team_ref = db.collection("draft_teams").document(team_id)
-    team_data = _get_team_for_draft(db, draft_id, team_id)
-    pre_slotted = team_data.get("pre_slotted_player_ids", [])
-
-    if player_id in pre_slotted:
-        pre_slotted.remove(player_id)
-        team_ref.update({"pre_slotted_player_ids": pre_slotted})
+    _get_team_for_draft(db, draft_id, team_id)
+    _update_pre_slot(
+        db,
+        draft_id=draft_id,
+        team_id=team_id,
+        player_id=player_id,
+        add=False,
+        actor=user["uid"],
+    )
 
     return {"status": "removed", "team_id": team_id, "player_id": player_id}
 
@@ -2303,16 +3091,6 @@ async def create_trade(
     created_at = now_iso()
     resolved_at = created_at if status == "approved" else None
 
-    if status == "approved":
-        _execute_trade_swap(
-            db,
-            draft_id,
-            trade_in.offering_player_id,
-            trade_in.receiving_player_id,
-            trade_in.offering_team_id,
-            trade_in.receiving_team_id,
-        )
-
     trade_data = {
         "id": trade_id,
         "offering_team_id": trade_in.offering_team_id,
@@ -2325,7 +3103,22 @@ async def create_trade(
         "resolved_at": resolved_at,
     }
 
-    draft_ref.collection("trades").document(trade_id).set(trade_data)
+    trade_ref = draft_ref.collection("trades").document(trade_id)
+    if status == "approved":
+        _execute_trade_swap(
+            db,
+            draft_id,
+            trade_in.offering_player_id,
+            trade_in.receiving_player_id,
+            trade_in.offering_team_id,
+            trade_in.receiving_team_id,
+            trade_id=trade_id,
+            actor=user["uid"],
+            trade_ref=trade_ref,
+            trade_data=trade_data,
+        )
+    else:
+        trade_ref.set(trade_data)
 
     return trade_data
 
@@ -2371,6 +3164,7 @@ async def update_trade(
         raise HTTPException(status_code=400, detail="Trade already resolved")
 
     resolved_at = now_iso()
+    updates = {"status": trade_in.status, "resolved_at": resolved_at}
 
     if trade_in.status == "approved":
         _execute_trade_swap(
@@ -2380,11 +3174,13 @@ async def update_trade(
             trade_data.get("receiving_player_id"),
             trade_data.get("offering_team_id"),
             trade_data.get("receiving_team_id"),
+            trade_id=trade_id,
+            actor=user["uid"],
+            trade_ref=trade_ref,
+            trade_data=updates,
         )
-
-    updates = {"status": trade_in.status, "resolved_at": resolved_at}
-
-    trade_ref.update(updates)
+    else:
+        trade_ref.update(updates)
 
     return {**trade_data, **updates}
 
@@ -2394,8 +3190,11 @@ async def update_trade(
 # ============================================================================
 
 
-async def _create_team_rosters(db, draft_id: str, draft_data: dict):
-    """Create team roster records when draft completes."""
+def _create_team_rosters(db, draft_id: str, draft_data: dict, *, created_from: str = "draft"):
+    """Create team roster records when draft completes.
+
+    Runs as a background task after the completing pick has been returned.
+    """
 
     # Get all picks grouped by team
     picks_query = (
@@ -2423,11 +3222,11 @@ async def _create_team_rosters(db, draft_id: str, draft_data: dict):
     teams = {t.id: t.to_dict() for t in teams_query}
 
     # Create roster records
+    event_ids = _get_draft_event_ids(draft_data)
+    writes = []
     for team_id, player_ids in team_players.items():
         team_data = teams.get(team_id, {})
 
-        event_ids = _get_draft_event_ids(draft_data)
-
         roster_id = generate_id("roster_")
         roster_data = {
             "id": roster_id,
@@ -2440,11 +3239,12 @@ async def _create_team_rosters(db, draft_id: str, draft_data: dict):
             "coach_name": team_data.get("coach_name"),
             "player_ids": player_ids,
             "created_at": now_iso(),
-            "created_from": "draft",
+            "created_from": created_from,
         }
 
-        db.collection("team_rosters").document(roster_id).set(roster_data)
+        writes.append(("set", db.collection("team_rosters").document(roster_id), roster_data))
 
+    commit_batched_writes(db, writes, operation="draft.rosters")
     logger.info(f"Created {len(team_players)} team rosters from draft {draft_id}")
 
 
@@ -2513,6 +3313,7 @@ async def add_draft_players_bulk(
         raise HTTPException(status_code=400, detail="Can only add players during setup")
 
     added = []
+    writes = []
     for p in bulk_in.players:
         player_id = generate_id("dplayer_")
         player_data = {
@@ -2527,9 +3328,11 @@ async def add_draft_players_bulk(
             "created_at": now_iso(),
             "created_by": user["uid"],
         }
-        db.collection("draft_players").document(player_id).set(player_data)
+        writes.append(("set", db.collection("draft_players").document(player_id), player_data))
         added.append(player_data)
 
+    commit_batched_writes(db, writes, operation="draft.players_bulk")
+
     return {"added": len(added), "players": added}
 
 
@@ -1,18 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File, Form
 from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional
 from types import SimpleNamespace
 from pydantic import BaseModel
 import csv
 import io
+import json
 import logging
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from ..auth import require_verified_user
 from ..middleware.rate_limiting import write_rate_limit, read_rate_limit
-from ..utils.importers import DataImporter
+from ..utils.importers import DataImporter, ImportContext, STREAM_CHUNK_SIZE
 from ..utils.data_integrity import enforce_event_league_relationship
 from ..utils.database import execute_with_timeout
 from ..utils.identity import generate_player_id
+from ..utils.identity_index import get_identity_index
 from ..firestore_client import db
 from ..security.access_matrix import require_permission
 from ..services.schema_registry import SchemaRegistry
@@ -30,6 +37,109 @@ class ImportParseResponse(BaseModel):
     sheets: List[Dict[str, Any]] = []
 
 
+def _load_event_import_config(event_id: str):
+    """Return (disabled_drills, event_sport) for an event, tolerating fetch failures."""
+    disabled_drills = []
+    event_sport = None
+    try:
+        event_ref = db.collection("events").document(event_id)
+        event_doc = execute_with_timeout(lambda: event_ref.get(), timeout=5)
+        if event_doc.exists:
+            event_data = event_doc.to_dict()
+            disabled_drills = event_data.get("disabled_drills", [])
+            event_sport = event_data.get("drillTemplate") or event_data.get(
+                "sport"
+            )  # Use actual event sport
+            logging.info(f"[IMPORT] Event {event_id} has sport: {event_sport}")
+    except Exception as e:
+        # Fallback if fetch fails, proceed with full schema
+        logging.warning(f"[IMPORT] Failed to fetch event config: {e}")
+    return disabled_drills, event_sport
+
+
+def _annotate_duplicates(rows: List[Dict[str, Any]], event_id: str, identities: Dict[str, Any]) -> None:
+    """Flag rows matching an existing player (see utils.identity_index.get_identity_index)."""
+    existing_ids = identities["ids"]
+    external_ids = identities["external_ids"]
+    for row in rows:
+        data = row["data"]
+        first = data.get("first_name", "")
+        last = data.get("last_name", "")
+
+        # Robust parsing for player number to match players.py logic
+        try:
+            raw_num = data.get("jersey_number")
+            number = (
+                int(float(str(raw_num).strip()))
+                if raw_num not in (None, "")
+                else None
+            )
+        except Exception:
+            number = None
+
+        # Generate ID deterministically
+        pid = generate_player_id(event_id, first, last, number)
+        # Uploads match on external id first, so previews do too.
+        external_match = external_ids.get(str(data.get("external_id") or "").strip())
+
+        if external_match or pid in existing_ids:
+            row["is_duplicate"] = True
+            row["existing_player_id"] = external_match or pid
+            # We could also fetch the existing data to show diffs,
+            # but that might be too much data for this response.
+        else:
+            row["is_duplicate"] = False
+            row["existing_player_id"] = None
+
+
+_PARSEABLE_EXTENSIONS = (".csv", ".xls", ".xlsx", ".jpg", ".jpeg", ".png", ".heic")
+
+_PARSE_POOL: Optional[ThreadPoolExecutor] = None
+_PARSE_POOL_LOCK = threading.Lock()
+
+
+def _get_parse_pool() -> ThreadPoolExecutor:
+    """Shared pool for multi-file uploads (IMPORT_PARSE_WORKERS, default 4)."""
+    global _PARSE_POOL
+    with _PARSE_POOL_LOCK:
+        if _PARSE_POOL is None:
+            try:
+                workers = max(1, int(os.getenv("IMPORT_PARSE_WORKERS", "4")))
+            except ValueError:
+                workers = 4
+            _PARSE_POOL = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="import-parse"
+            )
+        return _PARSE_POOL
+
+
+def _parse_upload(upload: UploadFile, sheet_name: Optional[str], context: ImportContext):
+    content = upload.file.read()
+    filename = (upload.filename or "").lower()
+
+    if filename.endswith(".csv"):
+        return DataImporter.parse_csv(
+            content,
+            event_id=context.event_id,
+            disabled_drills=context.disabled_drills,
+            context=context,
+        )
+    if filename.endswith((".xls", ".xlsx")):
+        return DataImporter.parse_excel(
+            content,
+            sheet_name=sheet_name,
+            event_id=context.event_id,
+            disabled_drills=context.disabled_drills,
+            context=context,
+        )
+    return DataImporter.parse_image(
+        content,
+        event_id=context.event_id,
+        disabled_drills=context.disabled_drills,
+        context=context,
+    )
+
+
 @router.post("/events/{event_id}/parse-import")
 @write_rate_limit()
 @require_permission("events", "update", target="event", target_param="event_id")
@@ -61,22 +171,7 @@ def parse_import_file(
         result = None
 
         # Fetch event configuration (disabled drills + actual sport)
-        disabled_drills = []
-        event_sport = None
-        try:
-            event_ref = db.collection("events").document(event_id)
-            event_doc = execute_with_timeout(lambda: event_ref.get(), timeout=5)
-            if event_doc.exists:
-                event_data = event_doc.to_dict()
-                disabled_drills = event_data.get("disabled_drills", [])
-                event_sport = event_data.get("drillTemplate") or event_data.get(
-                    "sport"
-                )  # Use actual event sport
-                logging.info(f"[IMPORT] Event {event_id} has sport: {event_sport}")
-        except Exception as e:
-            # Fallback if fetch fails, proceed with full schema
-            logging.warning(f"[IMPORT] Failed to fetch event config: {e}")
-            pass
+        disabled_drills, event_sport = _load_event_import_config(event_id)
 
         upload_files: List[UploadFile] = []
         if files:
@@ -84,6 +179,9 @@ def parse_import_file(
         if file:
             upload_files.append(file)
 
+        # One schema fetch and header-map cache shared by every file below
+        context = ImportContext(event_id, disabled_drills)
+
         if upload_files:
             result = SimpleNamespace(
                 valid_rows=[],
@@ -94,30 +192,25 @@ def parse_import_file(
             )
 
             for upload in upload_files:
-                content = upload.file.read()
-                filename = (upload.filename or "").lower()
-
-                if filename.endswith(".csv"):
-                    parsed_result = DataImporter.parse_csv(
-                        content, event_id=event_id, disabled_drills=disabled_drills
-                    )
-                elif filename.endswith((".xls", ".xlsx")):
-                    parsed_result = DataImporter.parse_excel(
-                        content,
-                        sheet_name=sheet_name,
-                        event_id=event_id,
-                        disabled_drills=disabled_drills,
-                    )
-                elif filename.endswith((".jpg", ".jpeg", ".png", ".heic")):
-                    parsed_result = DataImporter.parse_image(
-                        content, event_id=event_id, disabled_drills=disabled_drills
-                    )
-                else:
+                if not (upload.filename or "").lower().endswith(_PARSEABLE_EXTENSIONS):
                     raise HTTPException(
                         status_code=400,
                         detail="Unsupported file format. Please use CSV, Excel, or Image.",
                     )
 
+            if len(upload_files) == 1:
+                parsed_results = [_parse_upload(upload_files[0], sheet_name, context)]
+            else:
+                pool = _get_parse_pool()
+                futures = [
+                    pool.submit(_parse_upload, upload, sheet_name, context)
+                    for upload in upload_files
+                ]
+                # Merge in upload order regardless of completion order
+                parsed_results = [future.result() for future in futures]
+
+            for upload, parsed_result in zip(upload_files, parsed_results):
+
                 # Multi-sheet Excel selection is supported for single-file flow only.
                 if parsed_result.sheets and len(upload_files) > 1:
                     raise HTTPException(
@@ -149,14 +242,20 @@ def parse_import_file(
                 content = fetch_url_content(url)
                 # Assume CSV content from URL
                 result = DataImporter.parse_csv(
-                    content, event_id=event_id, disabled_drills=disabled_drills
+                    content,
+                    event_id=event_id,
+                    disabled_drills=disabled_drills,
+                    context=context,
                 )
             except ValueError as e:
                 raise HTTPException(status_code=400, detail=str(e))
 
         elif text:
             result = DataImporter.parse_text(
-                text, event_id=event_id, disabled_drills=disabled_drills
+                text,
+                event_id=event_id,
+                disabled_drills=disabled_drills,
+                context=context,
             )
 
         else:
@@ -176,46 +275,7 @@ def parse_import_file(
             }
 
         # --- DUPLICATE DETECTION ---
-        # Fetch existing players to check for conflicts
-        # This is efficient for typical event sizes (< 500 players)
-        players_ref = db.collection("events").document(event_id).collection("players")
-        existing_players = execute_with_timeout(
-            lambda: list(players_ref.stream()),
-            timeout=10,
-            operation_name="fetch players for duplicate check",
-        )
-
-        # Create a set of existing IDs for fast lookup
-        existing_ids = {p.id for p in existing_players}
-
-        # Check each valid row
-        for row in result.valid_rows:
-            data = row["data"]
-            first = data.get("first_name", "")
-            last = data.get("last_name", "")
-
-            # Robust parsing for player number to match players.py logic
-            try:
-                raw_num = data.get("jersey_number")
-                number = (
-                    int(float(str(raw_num).strip()))
-                    if raw_num not in (None, "")
-                    else None
-                )
-            except Exception:
-                number = None
-
-            # Generate ID deterministically
-            pid = generate_player_id(event_id, first, last, number)
-
-            if pid in existing_ids:
-                row["is_duplicate"] = True
-                row["existing_player_id"] = pid
-                # We could also fetch the existing data to show diffs,
-                # but that might be too much data for this response.
-            else:
-                row["is_duplicate"] = False
-                row["existing_player_id"] = None
+        _annotate_duplicates(result.valid_rows, event_id, get_identity_index(event_id))
 
         return {
             "valid_rows": result.valid_rows,
@@ -243,6 +303,121 @@ def parse_import_file(
         )
 
 
+# Block size used when copying uploads for streaming parses.
+STREAM_COPY_BUFSIZE = 1024 * 1024
+
+
+def _ndjson_line(payload: Dict[str, Any]) -> bytes:
+    return (json.dumps(payload, default=str) + "\n").encode("utf-8")
+
+
+@router.post("/events/{event_id}/parse-import/stream")
+@write_rate_limit()
+@require_permission("events", "update", target="event", target_param="event_id")
+def parse_import_stream(
+    request: Request,
+    event_id: str,
+    file: UploadFile = File(...),
+    sheet_name: Optional[str] = Form(None),
+    chunk_size: int = Query(STREAM_CHUNK_SIZE, ge=50, le=5000),
+    current_user=Depends(require_verified_user),
+):
+    """
+    Streaming variant of parse-import for large CSV/Excel exports.
+
+    Rows are parsed, normalized, validated and duplicate-checked in bounded
+    chunks and written back as NDJSON as they are produced:
+
+    - ``{"type": "meta", ...}`` once, with the detected sport
+    - ``{"type": "chunk", "valid_rows": [...], "errors": [...]}`` per chunk
+    - ``{"type": "summary", "summary": {...}}`` last
+
+    Multi-sheet workbooks without ``sheet_name`` get ``sheets`` previews on the
+    meta line and no rows, as in parse-import.
+
+    The upload is copied to a temp file in blocks, never held in memory whole.
+    """
+    enforce_event_league_relationship(event_id=event_id)
+
+    filename = (file.filename or "").lower()
+    if not filename.endswith((".csv", ".xls", ".xlsx")):
+        raise HTTPException(
+            status_code=400, detail="Streaming import supports CSV and Excel files only."
+        )
+
+    disabled_drills, event_sport = _load_event_import_config(event_id)
+
+    # The framework closes the upload once this handler returns, before the
+    # body is streamed, so copy it (in bounded blocks) to a file we own.
+    spooled = tempfile.TemporaryFile()
+    shutil.copyfileobj(file.file, spooled, STREAM_COPY_BUFSIZE)
+    spooled.seek(0)
+    source_file = file.filename
+
+    if filename.endswith(".csv"):
+        parsed = DataImporter.stream_csv(
+            spooled,
+            event_id=event_id,
+            disabled_drills=disabled_drills,
+            chunk_size=chunk_size,
+        )
+    else:
+        parsed = DataImporter.stream_excel(
+            spooled,
+            sheet_name=sheet_name,
+            event_id=event_id,
+            disabled_drills=disabled_drills,
+            chunk_size=chunk_size,
+        )
+    identities = get_identity_index(event_id)
+
+    def generate():
+        valid_count = 0
+        error_count = 0
+        duplicate_count = 0
+        try:
+            yield _ndjson_line(
+                {
+                    "type": "meta",
+                    "detected_sport": event_sport if event_sport else parsed.detected_sport,
+                    "confidence": "event" if event_sport else parsed.confidence,
+                    "sheets": parsed.sheets,
+                }
+            )
+            if parsed.errors:
+                error_count += len(parsed.errors)
+                yield _ndjson_line({"type": "chunk", "valid_rows": [], "errors": parsed.errors})
+
+            for chunk in parsed.chunks:
+                _annotate_duplicates(chunk.valid_rows, event_id, identities)
+                for row in chunk.valid_rows:
+                    row["source_file"] = source_file
+                for row in chunk.errors:
+                    row["source_file"] = source_file
+                valid_count += len(chunk.valid_rows)
+                error_count += len(chunk.errors)
+                duplicate_count += sum(1 for row in chunk.valid_rows if row["is_duplicate"])
+                yield _ndjson_line(
+                    {"type": "chunk", "valid_rows": chunk.valid_rows, "errors": chunk.errors}
+                )
+
+            yield _ndjson_line(
+                {
+                    "type": "summary",
+                    "summary": {
+                        "total_rows": valid_count + error_count,
+                        "valid_count": valid_count,
+                        "error_count": error_count,
+                        "duplicate_count": duplicate_count,
+                    },
+                }
+            )
+        finally:
+            spooled.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.get("/meta/schema")
 @read_rate_limit()
 def get_import_schema(
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request, Query
 from typing import List, Dict, Any, Optional
 from collections import defaultdict
 from pydantic import BaseModel
 from ..auth import get_current_user, require_verified_user
-from ..middleware.rate_limiting import read_rate_limit, write_rate_limit, bulk_rate_limit
+from ..middleware.rate_limiting import (
+    read_rate_limit,
+    write_rate_limit,
+    bulk_rate_limit,
+    bulk_cost_limit,
+)
 import logging
 from ..firestore_client import db
 from datetime import datetime
@@ -17,9 +22,16 @@ from ..utils.data_integrity import (
     ensure_league_document,
 )
 from ..utils.identity import generate_player_id
+from ..utils.identity_index import bump_roster_version
 from ..utils.lock_validation import check_write_permission
 from ..security.access_matrix import require_permission
 from ..services.player_bulk_upload import upload_players_service
+from ..services.import_jobs import (
+    get_job_store,
+    job_status,
+    run_import_job,
+    submit_import_job,
+)
 from ..utils.star_rating import (
     build_canonical_drill_metrics_for_cohort,
     get_star_rating_from_percentile,
@@ -252,6 +264,7 @@ def create_player(
             lambda: player_doc.set(player_data, merge=True),
             timeout=5
         )
+        bump_roster_version(event_id)
         
         logging.info(f"[CREATE_PLAYER] Player created successfully")
         
@@ -338,10 +351,66 @@ class UploadRequest(BaseModel):
     target="event",
     target_getter=lambda kwargs: getattr(kwargs.get("req"), "event_id", None),
 )
+@bulk_cost_limit(lambda kwargs: len(kwargs["req"].players))
 def upload_players(request: Request, req: UploadRequest, current_user=Depends(require_verified_user)):
     return upload_players_service(request=request, req=req, current_user=current_user)
 
 
+@router.post("/players/upload/jobs", status_code=202)
+@bulk_rate_limit()
+@require_permission(
+    "players",
+    "upload",
+    target="event",
+    target_getter=lambda kwargs: getattr(kwargs.get("req"), "event_id", None),
+)
+@bulk_cost_limit(lambda kwargs: len(kwargs["req"].players))
+def submit_upload_job(
+    request: Request,
+    req: UploadRequest,
+    background_tasks: BackgroundTasks,
+    current_user=Depends(require_verified_user),
+):
+    """
+    Queue a player upload as a background job (same payload as /players/upload).
+    Poll GET /players/upload/jobs/{job_id} for progress, errors and the undo log.
+    """
+    job = submit_import_job(req=req, current_user=current_user)
+    background_tasks.add_task(run_import_job, job["job_id"])
+    return job
+
+
+def _get_owned_job(job_id: str, current_user) -> Dict[str, Any]:
+    job = get_job_store().get(job_id)
+    # Jobs are private to their submitter; don't reveal other users' job ids.
+    if not job or job["user_id"] != current_user["uid"]:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
+@router.get("/players/upload/jobs/{job_id}")
+@read_rate_limit()
+def get_upload_job(request: Request, job_id: str, current_user=Depends(require_verified_user)):
+    return job_status(_get_owned_job(job_id, current_user))
+
+
+@router.post("/players/upload/jobs/{job_id}/resume", status_code=202)
+@bulk_rate_limit()
+def resume_upload_job(
+    request: Request,
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    current_user=Depends(require_verified_user),
+):
+    """Retry a failed or stalled job from its last committed chunk."""
+    _get_owned_job(job_id, current_user)
+    store = get_job_store()
+    if not store.requeue(job_id):
+        raise HTTPException(status_code=400, detail="Only failed or stalled import jobs can be resumed")
+    background_tasks.add_task(run_import_job, job_id)
+    return job_status(store.get(job_id))
+
+
 class RevertRequest(BaseModel):
     event_id: str
     undo_log: List[Dict[str, Any]]
@@ -354,6 +423,7 @@ class RevertRequest(BaseModel):
     target="event",
     target_getter=lambda kwargs: getattr(kwargs.get("req"), "event_id", None),
 )
+@bulk_cost_limit(lambda kwargs: len(kwargs["req"].undo_log))
 def revert_import(request: Request, req: RevertRequest, current_user=Depends(require_verified_user)):
     """
     Revert a previous import using the provided undo log.
@@ -394,6 +464,7 @@ def revert_import(request: Request, req: RevertRequest, current_user=Depends(req
                 
         if batch_count > 0:
             execute_with_timeout(lambda: batch.commit(), timeout=10)
+        bump_roster_version(event_id)
             
         # Log the revert in audit log?
         try:
@@ -439,6 +510,7 @@ def reset_players(event_id: str = Query(...), current_user=Depends(require_verif
         # Delete all players
         for player in players_stream:
             player.reference.delete()
+        bump_roster_version(str(event_id))
             
         # Reset Live Entry status
         event_ref = db.collection("events").document(str(event_id))
@@ -1,16 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile, status
+from typing import Any, Dict, List, Optional
 import logging
+import os
 import re
 
 from ..auth import require_verified_user
-from ..middleware.rate_limiting import write_rate_limit
+from ..firestore_client import db
+from ..middleware.rate_limiting import bulk_rate_limit, write_rate_limit
 from ..utils.authorization import ensure_event_access
 from ..utils.data_integrity import enforce_event_league_relationship
+from ..utils.database import execute_with_timeout
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+# A station photographs one display per player; 30 covers a full group.
+MAX_IMAGES_PER_BATCH = 30
+# Shared by all batch requests, so concurrent batches can't multiply OCR load.
+BATCH_OCR_CONCURRENCY = int(os.getenv("SCANNER_BATCH_CONCURRENCY", "4"))
+_IN_QUERY_LIMIT = 30
+
+_batch_pool = ThreadPoolExecutor(
+    max_workers=max(1, BATCH_OCR_CONCURRENCY), thread_name_prefix="scanner-batch"
+)
+
+# Bib cards in frame ("#23", "BIB 23", "No. 23"). An explicit marker is
+# required so the measurement itself is never mistaken for a bib.
+_BIB_RE = re.compile(r"(?:#|\bbib\b|\bno\.|\bnumber\b)\s*:?\s*(\d{1,4})\b", re.IGNORECASE)
+
 
 def _extract_numbers(raw_text: str) -> list[float]:
     """Extract candidate numeric values from OCR text.
@@ -187,54 +207,29 @@ def _pick_best_value(numbers: list[float], drill_type: str) -> float | None:
     return candidates[0]
 
 
-@router.post("/ocr", response_model=dict)
-@write_rate_limit()
-async def ocr_image(
-    request: Request,
-    image: UploadFile = File(...),
-    event_id: str = Form(...),
-    drill_type: str = Form(...),
-    current_user=Depends(require_verified_user),
-):
-    """OCR an uploaded image and extract the most likely numeric value."""
-    enforce_event_league_relationship(event_id=event_id)
-    ensure_event_access(
-        current_user["uid"],
-        event_id,
-        allowed_roles=("organizer", "coach"),
-        operation_name="scanner OCR",
-    )
+_EMPTY_RESULT = {"value": None, "confidence": 0.0, "raw_text": "", "all_numbers": []}
 
-    if not image.content_type or not image.content_type.startswith("image/"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid file type. Please upload an image.",
-        )
 
-    content = await image.read()
-    if not content:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Empty image upload"
-        )
-
-    max_bytes = 10 * 1024 * 1024
-    if len(content) > max_bytes:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail="Image too large (max 10MB)",
-        )
+def _scan_image(content: bytes, drill_type: str) -> dict:
+    """Run OCR on one image and pick the most likely value for ``drill_type``.
 
+    Blocking (preprocessing + Vision round trip); call from a sync route or a
+    worker thread, never directly on the event loop.
+    """
     try:
-        from ..utils.ocr import OCRProcessor
+        from ..utils import ocr
+        from ..utils.ocr import OCRProcessor, OCRScan
 
         kind = _classify_drill(drill_type)
+        # One Vision round trip per image, shared by every strategy below.
+        scan = OCRScan(content, policy=ocr.OCR_ENGINE)
 
         # Timed drills (sprint/shuttle) also render the true time in a large font.
-        # Use Vision text_annotations bounding boxes to pick the largest seconds value.
+        # Use Vision word bounding boxes to pick the largest seconds value.
         if kind == "seconds":
             try:
                 value, confidence2, raw_text2, candidates2 = (
-                    OCRProcessor.extract_largest_seconds_value_from_image(content)
+                    OCRProcessor.extract_largest_seconds_value_from_image(scan)
                 )
                 if value is not None:
                     return {
@@ -252,7 +247,7 @@ async def ocr_image(
         # Use Vision text_annotations bounding boxes to pick the largest inches value.
         if _is_vertical_jump(drill_type):
             value, confidence, raw_text, candidates = (
-                OCRProcessor.extract_largest_inches_value_from_image(content)
+                OCRProcessor.extract_largest_inches_value_from_image(scan)
             )
             return {
                 "value": value,
@@ -261,13 +256,13 @@ async def ocr_image(
                 "all_numbers": candidates,
             }
 
-        lines, confidence = OCRProcessor.extract_rows_from_image(content)
+        lines, confidence = OCRProcessor.extract_rows_from_image(scan)
         raw_text = "\n".join(lines)
 
         # Auto-detect vertical based on OCR text if drill_type is ambiguous
         if _is_vertical_jump(drill_type, raw_text=raw_text):
             value, _, raw_text2, candidates = (
-                OCRProcessor.extract_largest_inches_value_from_image(content)
+                OCRProcessor.extract_largest_inches_value_from_image(scan)
             )
             return {
                 "value": value,
@@ -285,14 +280,163 @@ async def ocr_image(
             "raw_text": raw_text,
             "all_numbers": numbers,
         }
-    except HTTPException:
-        raise
     except Exception as e:
         # Graceful failure for bad photos/OCR issues
         logger.warning(f"[SCANNER] OCR failed: {e}")
-        return {
-            "value": None,
-            "confidence": 0.0,
-            "raw_text": "",
-            "all_numbers": [],
-        }
+        return dict(_EMPTY_RESULT)
+
+
+def _read_image(image: UploadFile) -> bytes:
+    if not image.content_type or not image.content_type.startswith("image/"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file type. Please upload an image.",
+        )
+
+    content = image.file.read()
+    if not content:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Empty image upload"
+        )
+
+    if len(content) > MAX_IMAGE_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Image too large (max 10MB)",
+        )
+    return content
+
+
+def _authorize_scan(current_user: dict, event_id: str, operation_name: str) -> None:
+    enforce_event_league_relationship(event_id=event_id)
+    ensure_event_access(
+        current_user["uid"],
+        event_id,
+        allowed_roles=("organizer", "coach"),
+        operation_name=operation_name,
+    )
+
+
+def _extract_bib(raw_text: str) -> Optional[str]:
+    match = _BIB_RE.search(raw_text or "")
+    if not match:
+        return None
+    return match.group(1).lstrip("0") or "0"
+
+
+def _players_by_bib(event_id: str, bibs: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Look up players for all bibs at once (check-in stores int or str numbers)."""
+    values: List[Any] = []
+    for bib in sorted(set(bibs)):
+        values.extend([bib, int(bib)])
+    players_ref = db.collection("events").document(event_id).collection("players")
+
+    matches: Dict[str, List[Dict[str, Any]]] = {}
+    for start in range(0, len(values), _IN_QUERY_LIMIT):
+        chunk = values[start : start + _IN_QUERY_LIMIT]
+        docs = execute_with_timeout(
+            lambda chunk=chunk: list(players_ref.where("number", "in", chunk).stream()),
+            timeout=10,
+            operation_name="scanner bib lookup",
+        )
+        for doc in docs:
+            data = doc.to_dict() or {}
+            bib = str(data.get("number")).strip().lstrip("0") or "0"
+            matches.setdefault(bib, []).append(
+                {
+                    "id": doc.id,
+                    "name": data.get("name"),
+                    "number": data.get("number"),
+                    "age_group": data.get("age_group"),
+                }
+            )
+    return matches
+
+
+def _attach_player_matches(event_id: str, results: List[Dict[str, Any]]) -> None:
+    """Add ``bib``, ``player`` and ``player_match`` to each scan result."""
+    bibs = [_extract_bib(result["raw_text"]) for result in results]
+    found = [bib for bib in bibs if bib]
+    players = _players_by_bib(event_id, found) if found else {}
+    for result, bib in zip(results, bibs):
+        candidates = players.get(bib, []) if bib else []
+        if not bib:
+            match = "no_bib"
+        elif not candidates:
+            match = "not_found"
+        elif len(candidates) > 1:
+            # Same number in several age groups; let the coach pick.
+            match = "ambiguous"
+        else:
+            match = "matched"
+        result["bib"] = bib
+        result["player"] = candidates[0] if match == "matched" else None
+        result["player_match"] = match
+
+
+@router.post("/ocr", response_model=dict)
+@write_rate_limit()
+def ocr_image(
+    request: Request,
+    image: UploadFile = File(...),
+    event_id: str = Form(...),
+    drill_type: str = Form(...),
+    current_user=Depends(require_verified_user),
+):
+    """OCR an uploaded image and extract the most likely numeric value."""
+    # Sync route: FastAPI runs it in its threadpool, so image preprocessing
+    # and the Vision call don't block the event loop.
+    _authorize_scan(current_user, event_id, "scanner OCR")
+    content = _read_image(image)
+    return _scan_image(content, drill_type)
+
+
+@router.post("/ocr/batch", response_model=dict)
+@bulk_rate_limit()
+def ocr_images_batch(
+    request: Request,
+    images: List[UploadFile] = File(...),
+    event_id: str = Form(...),
+    drill_type: str = Form(...),
+    match_players: bool = Form(False),
+    current_user=Depends(require_verified_user),
+):
+    """OCR up to MAX_IMAGES_PER_BATCH photos of one drill in a single request.
+
+    Access is checked once for the batch; images are scanned concurrently
+    (BATCH_OCR_CONCURRENCY). Each result has the same fields as /ocr plus
+    ``index`` and ``filename``; a rejected image gets an ``error`` instead of
+    failing the batch. With ``match_players``, a bib found in the image
+    ("#23", "BIB 23") is resolved to the event's player with that number.
+    """
+    _authorize_scan(current_user, event_id, "scanner batch OCR")
+    if len(images) > MAX_IMAGES_PER_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Maximum {MAX_IMAGES_PER_BATCH} images per batch",
+        )
+
+    results: List[Dict[str, Any]] = []
+    futures = {}
+    for index, image in enumerate(images):
+        result: Dict[str, Any] = {"index": index, "filename": image.filename}
+        results.append(result)
+        try:
+            content = _read_image(image)
+        except HTTPException as exc:
+            result.update(_EMPTY_RESULT, error=exc.detail)
+            continue
+        futures[index] = _batch_pool.submit(_scan_image, content, drill_type)
+
+    for index, future in futures.items():
+        results[index].update(future.result())
+
+    if match_players:
+        _attach_player_matches(event_id, [r for r in results if "error" not in r])
+
+    return {
+        "event_id": event_id,
+        "drill_type": drill_type,
+        "count": len(results),
+        "results": results,
+    }
@@ -0,0 +1,248 @@
+"""Append-only draft event log.
+
+Every pick, undo, redo, trade, pre-slot change and generated team set is
+recorded as a sequenced document under drafts/{draft_id}/events. Draft state
+can be rebuilt by replaying the log on top of the latest snapshot stored
+under drafts/{draft_id}/event_snapshots, so reconstruction only touches the
+events written since that snapshot.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from copy import deepcopy
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+
+DRAFT_EVENT_TYPES = {
+    "start",
+    "pick",
+    "undo",
+    "redo",
+    "trade",
+    "pre_slot_add",
+    "pre_slot_remove",
+    "reset",
+    "generate",
+}
+
+SNAPSHOT_INTERVAL = max(1, int(os.getenv("DRAFT_EVENT_SNAPSHOT_INTERVAL", "50")))
+
+_PICK_EVENT_TYPES = {"pick", "undo", "redo", "generate"}
+
+CURSOR_FIELDS = ("status", "current_round", "current_pick", "current_team_id")
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def event_doc_id(seq: int) -> str:
+    # Zero-padded so document ids sort in sequence order.
+    return f"{int(seq):010d}"
+
+
+def draft_cursor(draft_data: dict) -> Dict[str, Any]:
+    return {field: draft_data.get(field) for field in CURSOR_FIELDS}
+
+
+def next_event_seq(draft_data: dict) -> int:
+    return int(draft_data.get("event_seq") or 0) + 1
+
+
+def stage_draft_event(
+    transaction,
+    draft_ref,
+    draft_data: dict,
+    event_type: str,
+    payload: dict,
+    *,
+    actor: Optional[str],
+    draft_updates: Optional[dict] = None,
+) -> dict:
+    """Stage an event write plus the draft update inside a transaction/batch.
+
+    ``draft_data`` must be the draft as read inside the same transaction so the
+    sequence number cannot be handed out twice.
+    """
+    if event_type not in DRAFT_EVENT_TYPES:
+        raise ValueError(f"Unknown draft event type: {event_type}")
+
+    seq = next_event_seq(draft_data)
+    event = {
+        "seq": seq,
+        "draft_id": draft_data.get("id") or draft_ref.id,
+        "type": event_type,
+        "actor": actor,
+        "payload": payload,
+        "created_at": _now_iso(),
+    }
+    transaction.set(draft_ref.collection("events").document(event_doc_id(seq)), event)
+    transaction.update(draft_ref, {**(draft_updates or {}), "event_seq": seq})
+    return event
+
+
+# ============================================================================
+# Pure replay
+# ============================================================================
+
+
+def empty_draft_state() -> Dict[str, Any]:
+    return {
+        "seq": 0,
+        "cursor": {field: None for field in CURSOR_FIELDS},
+        "picks": {},
+        "pre_slots": {},
+        "redo_event_seqs": [],
+        # Every pick id any event has written or removed
+        "logged_pick_ids": [],
+    }
+
+
+def apply_draft_event(state: Dict[str, Any], event: dict) -> Dict[str, Any]:
+    """Apply one event to ``state`` in place and return it."""
+    event_type = event.get("type")
+    payload = event.get("payload") or {}
+    picks: Dict[str, dict] = state["picks"]
+    logged = state.setdefault("logged_pick_ids", [])
+    for pick in payload.get("picks", []) if event_type in _PICK_EVENT_TYPES else ():
+        if pick.get("id") and pick["id"] not in logged:
+            logged.append(pick["id"])
+
+    if event_type == "start":
+        state["cursor"] = dict(payload.get("cursor_after") or {})
+    elif event_type == "pick":
+        for pick in payload.get("picks", []):
+            picks[pick["id"]] = dict(pick)
+        state["cursor"] = dict(payload.get("cursor_after") or {})
+        state["redo_event_seqs"] = []
+    elif event_type == "undo":
+        for pick in payload.get("picks", []):
+            picks.pop(pick["id"], None)
+        state["cursor"] = dict(payload.get("cursor_after") or {})
+        state["redo_event_seqs"].append(event.get("seq"))
+    elif event_type == "redo":
+        for pick in payload.get("picks", []):
+            picks[pick["id"]] = dict(pick)
+        state["cursor"] = dict(payload.get("cursor_after") or {})
+        undo_seq = payload.get("undo_seq")
+        if undo_seq in state["redo_event_seqs"]:
+            state["redo_event_seqs"].remove(undo_seq)
+    elif event_type == "trade":
+        team_by_player = {
+            payload.get("offering_player_id"): payload.get("receiving_team_id"),
+            payload.get("receiving_player_id"): payload.get("offering_team_id"),
+        }
+        for pick in picks.values():
+            new_team_id = team_by_player.get(pick.get("player_id"))
+            if new_team_id:
+                pick["team_id"] = new_team_id
+    elif event_type == "pre_slot_add":
+        slotted = state["pre_slots"].setdefault(payload.get("team_id"), [])
+        if payload.get("player_id") not in slotted:
+            slotted.append(payload.get("player_id"))
+    elif event_type == "pre_slot_remove":
+        slotted = state["pre_slots"].get(payload.get("team_id"), [])
+        if payload.get("player_id") in slotted:
+            slotted.remove(payload.get("player_id"))
+    elif event_type == "generate":
+        state["picks"] = {pick["id"]: dict(pick) for pick in payload.get("picks", [])}
+        state["cursor"] = dict(payload.get("cursor_after") or {})
+        state["redo_event_seqs"] = []
+    elif event_type == "reset":
+        state["picks"] = {}
+        state["cursor"] = dict(payload.get("cursor_after") or {})
+        state["redo_event_seqs"] = []
+
+    state["seq"] = max(int(state.get("seq") or 0), int(event.get("seq") or 0))
+    return state
+
+
+def replay_draft_events(
+    events: Iterable[dict], base_state: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    state = deepcopy(base_state) if base_state else empty_draft_state()
+    for event in sorted(events, key=lambda e: int(e.get("seq") or 0)):
+        if int(event.get("seq") or 0) <= int(state.get("seq") or 0):
+            continue
+        apply_draft_event(state, event)
+    return state
+
+
+# ============================================================================
+# Firestore access
+# ============================================================================
+
+
+def list_draft_events(draft_ref, *, after_seq: int = 0, limit: Optional[int] = None) -> List[dict]:
+    query = (
+        draft_ref.collection("events")
+        .where("seq", ">", int(after_seq))
+        .order_by("seq")
+    )
+    if limit:
+        query = query.limit(int(limit))
+    return [doc.to_dict() for doc in query.stream()]
+
+
+def load_draft_state(
+    draft_ref, draft_data: dict, *, persist_snapshot: bool = False
+) -> Dict[str, Any]:
+    """Rebuild draft state from the latest snapshot plus the events after it.
+
+    Read-only unless ``persist_snapshot``: write paths pass it to store a fresh
+    snapshot once SNAPSHOT_INTERVAL events have accumulated past the previous one.
+    """
+    base_state = None
+    snapshot_seq = int(draft_data.get("event_snapshot_seq") or 0)
+    if snapshot_seq:
+        snapshot_doc = (
+            draft_ref.collection("event_snapshots").document(event_doc_id(snapshot_seq)).get()
+        )
+        if snapshot_doc.exists:
+            base_state = (snapshot_doc.to_dict() or {}).get("state")
+        else:
+            snapshot_seq = 0
+
+    tail = list_draft_events(draft_ref, after_seq=snapshot_seq)
+    state = replay_draft_events(tail, base_state)
+
+    if persist_snapshot and len(tail) >= SNAPSHOT_INTERVAL:
+        draft_ref.collection("event_snapshots").document(event_doc_id(state["seq"])).set(
+            {"seq": state["seq"], "state": state, "created_at": _now_iso()}
+        )
+        draft_ref.update({"event_snapshot_seq": state["seq"]})
+
+    return state
+
+
+def snapshot_if_due(draft_ref, draft_data: dict, seq: int) -> None:
+    """After a committed write, snapshot if SNAPSHOT_INTERVAL events are unsnapshotted.
+
+    ``draft_data`` is the draft as read before the write; failures are logged
+    only, since the log itself is already committed.
+    """
+    if int(seq) - int(draft_data.get("event_snapshot_seq") or 0) < SNAPSHOT_INTERVAL:
+        return
+    try:
+        load_draft_state(draft_ref, draft_data, persist_snapshot=True)
+    except Exception as e:
+        logging.warning(f"[DRAFT] Snapshot at seq {seq} failed for {draft_ref.id}: {e}")
+
+
+__all__ = [
+    "DRAFT_EVENT_TYPES",
+    "SNAPSHOT_INTERVAL",
+    "apply_draft_event",
+    "draft_cursor",
+    "empty_draft_state",
+    "event_doc_id",
+    "list_draft_events",
+    "load_draft_state",
+    "next_event_seq",
+    "replay_draft_events",
+    "snapshot_if_due",
+    "stage_draft_event",
+]
@@ -0,0 +1,362 @@
+"""Monte Carlo mock-draft simulator.
+
+Plays the remaining picks of a draft many times from its current state and
+reports, for a team's upcoming picks, how likely each player is to still be on
+the board. Each simulated team picks like auto-pick does (coach rankings
+first, composite score otherwise, buddy bonus, sibling hard constraints and
+roster cap) but passes over its top candidate with probability
+``randomness`` to model human variance.
+
+The player pool is flattened into integer-indexed arrays so the hot loop never
+touches player dicts, and iteration chunks run on a process pool.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+# Must stay in step with routes/drafts.py::_calculate_buddy_preference_bonus.
+BUDDY_DIRECT_BONUS = 0.5
+BUDDY_REVERSE_BONUS = 0.25
+RANKED_BASE = 100000.0
+
+MAX_ITERATIONS = 20000
+DEFAULT_RANDOMNESS = 0.35
+# Below this many iterations the pool round trip costs more than it saves.
+MIN_ITERATIONS_FOR_POOL = 1000
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+
+
+def _configured_workers() -> int:
+    raw = os.getenv("DRAFT_SIM_WORKERS")
+    if raw is not None:
+        try:
+            return max(0, int(raw))
+        except ValueError:
+            pass
+    return min(4, os.cpu_count() or 1)
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL, _POOL_WORKERS
+    if _POOL is None or _POOL_WORKERS != workers:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False)
+        # spawn: forking a process that holds gRPC channels is unsafe.
+        _POOL = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        _POOL_WORKERS = workers
+    return _POOL
+
+
+def build_simulation_state(
+    *,
+    players: Dict[str, dict],
+    drafted_team_by_player: Dict[str, str],
+    team_order: Sequence[str],
+    pick_team_ids: Sequence[str],
+    current_pick: int,
+    team_rankings: Dict[str, List[str]],
+    team_cap: Optional[int],
+    composite_for: Callable[[dict], float],
+    normalize_name: Callable[[Optional[str]], Optional[str]],
+) -> Dict[str, Any]:
+    """Flatten draft data into the compact, picklable form the workers use.
+
+    ``pick_team_ids[i]`` is the team holding overall pick ``current_pick + i``.
+    """
+    player_ids = sorted(players)
+    index_of = {pid: i for i, pid in enumerate(player_ids)}
+    team_index = {team_id: t for t, team_id in enumerate(team_order)}
+    n = len(player_ids)
+
+    name_ids: Dict[str, int] = {}
+
+    def _intern(value: Optional[str]) -> int:
+        normalized = normalize_name(value)
+        if not normalized:
+            return -1
+        return name_ids.setdefault(normalized, len(name_ids))
+
+    name_id = array("i", [-1] * n)
+    buddy_id = array("i", [-1] * n)
+    sib_group = array("i", [-1] * n)
+    group_ids: Dict[str, int] = {}
+    group_members: List[List[int]] = []
+    composite = array("d", [0.0] * n)
+    for i, pid in enumerate(player_ids):
+        pdata = players[pid] or {}
+        name_id[i] = _intern(pdata.get("name"))
+        buddy_id[i] = _intern(pdata.get("buddyRequestNormalized"))
+        composite[i] = composite_for(pdata)
+        group = pdata.get("siblingGroupId")
+        if group and bool(pdata.get("forceSameTeamWithSibling")):
+            g = group_ids.setdefault(group, len(group_ids))
+            if g == len(group_members):
+                group_members.append([])
+            group_members[g].append(i)
+            sib_group[i] = g
+
+    taken = bytearray(n)
+    team_counts = [0] * len(team_order)
+    team_name_counts: List[Dict[int, int]] = [{} for _ in team_order]
+    team_buddy_counts: List[Dict[int, int]] = [{} for _ in team_order]
+    sibling_team: Dict[int, int] = {}
+    for pid, team_id in drafted_team_by_player.items():
+        t = team_index.get(team_id)
+        i = index_of.get(pid)
+        if t is None:
+            continue
+        team_counts[t] += 1
+        if i is None:
+            continue
+        taken[i] = 1
+        if name_id[i] >= 0:
+            team_name_counts[t][name_id[i]] = team_name_counts[t].get(name_id[i], 0) + 1
+        if buddy_id[i] >= 0:
+            team_buddy_counts[t][buddy_id[i]] = team_buddy_counts[t].get(buddy_id[i], 0) + 1
+        if sib_group[i] >= 0:
+            sibling_team[sib_group[i]] = t
+
+    # Per-team preference: coach ranking position first, composite otherwise.
+    team_base: List[array] = []
+    team_prefs: List[array] = []
+    available = [i for i in range(n) if not taken[i]]
+    for team_id in team_order:
+        ranking_index = {
+            pid: pos for pos, pid in enumerate(team_rankings.get(team_id) or [])
+        }
+        base = array("d", composite)
+        for pid, pos in ranking_index.items():
+            i = index_of.get(pid)
+            if i is not None:
+                base[i] = RANKED_BASE - float(pos)
+        team_base.append(base)
+        team_prefs.append(array("i", sorted(available, key=lambda i: (-base[i], i))))
+
+    buddy_names = {b for b in buddy_id if b >= 0}
+    has_buddy_links = any(nid in buddy_names for nid in name_id if nid >= 0)
+
+    return {
+        "player_ids": player_ids,
+        "name_id": name_id,
+        "buddy_id": buddy_id,
+        "sib_group": sib_group,
+        "group_members": [tuple(m) for m in group_members],
+        "taken": bytes(taken),
+        "team_counts": team_counts,
+        "team_name_counts": team_name_counts,
+        "team_buddy_counts": team_buddy_counts,
+        "sibling_team": sibling_team,
+        "team_base": team_base,
+        "team_prefs": team_prefs,
+        "pick_teams": array("i", [team_index.get(t, -1) for t in pick_team_ids]),
+        "current_pick": int(current_pick),
+        "team_cap": team_cap,
+        "max_bonus": (BUDDY_DIRECT_BONUS + BUDDY_REVERSE_BONUS) if has_buddy_links else 0.0,
+    }
+
+
+def _run_iterations(
+    state: Dict[str, Any],
+    tracked_picks: Sequence[int],
+    iterations: int,
+    seed: int,
+    randomness: float,
+) -> List[int]:
+    """Simulate ``iterations`` drafts; return a flat (player, bucket) histogram.
+
+    Bucket ``b`` counts runs where exactly ``b`` of the tracked picks came at or
+    before the player's draft slot, i.e. the player was available at the first
+    ``b`` tracked picks.
+    """
+    rng = random.Random(seed)
+    rand = rng.random
+    n = len(state["player_ids"])
+    buckets = len(tracked_picks) + 1
+    hist = [0] * (n * buckets)
+    name_id = state["name_id"]
+    buddy_id = state["buddy_id"]
+    sib_group = state["sib_group"]
+    group_members = state["group_members"]
+    team_base = state["team_base"]
+    team_prefs = state["team_prefs"]
+    pick_teams = state["pick_teams"]
+    first_pick = state["current_pick"]
+    total_pick = first_pick + len(pick_teams) - 1
+    team_cap = state["team_cap"]
+    max_bonus = state["max_bonus"]
+    undrafted_slot = total_pick + 1
+    tracked = list(tracked_picks)
+    team_total = len(team_prefs)
+
+    pref_lengths = [len(prefs) for prefs in team_prefs]
+    cap = team_cap if team_cap is not None else n + 1
+    initial_taken = state["taken"]
+    no_cutoff = float("-inf")
+
+    for _ in range(iterations):
+        taken = bytearray(initial_taken)
+        drafted_at = [undrafted_slot] * n
+        team_counts = list(state["team_counts"])
+        name_counts = [dict(d) for d in state["team_name_counts"]]
+        buddy_counts = [dict(d) for d in state["team_buddy_counts"]]
+        sibling_team = dict(state["sibling_team"])
+        heads = [0] * team_total
+
+        pick = first_pick
+        while pick <= total_pick:
+            t = pick_teams[pick - first_pick]
+            if t < 0:
+                pick += 1
+                continue
+            prefs = team_prefs[t]
+            base = team_base[t]
+            skip = 0
+            while rand() < randomness:
+                skip += 1
+            remaining = total_pick - pick + 1
+            room = cap - team_counts[t]
+            team_names = name_counts[t]
+            team_buddies = buddy_counts[t]
+
+            head = heads[t]
+            end = pref_lengths[t]
+            while head < end and taken[prefs[head]]:
+                head += 1
+            heads[t] = head
+
+            # Candidates are (-score, walk position, player) so a plain sort
+            # ranks by score and keeps preference order for ties. Once ``need``
+            # are held, nothing scoring below cutoff can displace them.
+            candidates: List[tuple] = []
+            need = skip + 1
+            cutoff = no_cutoff
+            for j in range(head, end):
+                i = prefs[j]
+                if taken[i]:
+                    continue
+                b = base[i]
+                if b < cutoff:
+                    break
+                g = sib_group[i]
+                unit_size = 1
+                if g >= 0:
+                    owner = sibling_team.get(g)
+                    if owner is not None and owner != t:
+                        continue
+                    unit_size = 0
+                    for m in group_members[g]:
+                        if not taken[m]:
+                            unit_size += 1
+                    if unit_size > remaining:
+                        continue
+                if unit_size > room:
+                    continue
+                if max_bonus:
+                    if buddy_id[i] >= 0 and team_names.get(buddy_id[i], 0) == 1:
+                        b += BUDDY_DIRECT_BONUS
+                    if name_id[i] >= 0 and team_buddies.get(name_id[i], 0) >= 1:
+                        b += BUDDY_REVERSE_BONUS
+                candidates.append((-b, j, i))
+                if len(candidates) >= need:
+                    candidates.sort()
+                    cutoff = -candidates[need - 1][0] - max_bonus
+
+            if not candidates:
+                break
+            candidates.sort()
+            chosen = candidates[skip if skip < len(candidates) else -1][2]
+
+            g = sib_group[chosen]
+            if g >= 0:
+                unit = sorted(m for m in group_members[g] if not taken[m])
+                sibling_team[g] = t
+            else:
+                unit = (chosen,)
+            for m in unit:
+                taken[m] = 1
+                drafted_at[m] = pick
+                pick += 1
+                if name_id[m] >= 0:
+                    team_names[name_id[m]] = team_names.get(name_id[m], 0) + 1
+                if buddy_id[m] >= 0:
+                    team_buddies[buddy_id[m]] = team_buddies.get(buddy_id[m], 0) + 1
+            team_counts[t] += len(unit)
+
+        for i in range(n):
+            if not initial_taken[i]:
+                hist[i * buckets + bisect_right(tracked, drafted_at[i])] += 1
+
+    return hist
+
+
+def simulate_availability(
+    state: Dict[str, Any],
+    *,
+    tracked_picks: Sequence[int],
+    iterations: int,
+    randomness: float = DEFAULT_RANDOMNESS,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, List[float]]:
+    """Return {player_id: [P(available at tracked_picks[j]) for j]} for undrafted players."""
+    iterations = max(1, min(int(iterations), MAX_ITERATIONS))
+    randomness = min(max(float(randomness), 0.0), 0.95)
+    tracked = sorted(int(p) for p in tracked_picks)
+    base_seed = seed if seed is not None else random.SystemRandom().randrange(1 << 30)
+    workers = _configured_workers() if workers is None else max(0, int(workers))
+
+    if workers > 1 and iterations >= MIN_ITERATIONS_FOR_POOL:
+        chunk = -(-iterations // workers)
+        sizes = [min(chunk, iterations - k * chunk) for k in range(workers)]
+        sizes = [s for s in sizes if s > 0]
+        try:
+            pool = _get_pool(workers)
+            futures = [
+                pool.submit(_run_iterations, state, tracked, size, base_seed + k, randomness)
+                for k, size in enumerate(sizes)
+            ]
+            partials = [f.result() for f in futures]
+        except Exception as exc:
+            logging.warning(f"[DRAFT_SIM] Process pool unavailable, running inline: {exc}")
+            partials = [_run_iterations(state, tracked, iterations, base_seed, randomness)]
+    else:
+        partials = [_run_iterations(state, tracked, iterations, base_seed, randomness)]
+
+    hist = [sum(values) for values in zip(*partials)]
+    buckets = len(tracked) + 1
+    result: Dict[str, List[float]] = {}
+    for i, pid in enumerate(state["player_ids"]):
+        if state["taken"][i]:
+            continue
+        row = hist[i * buckets : (i + 1) * buckets]
+        # Available at tracked pick j when the bucket index is greater than j.
+        probabilities = []
+        available = iterations
+        for j in range(len(tracked)):
+            available -= row[j]
+            probabilities.append(available / iterations)
+        result[pid] = probabilities
+    return result
+
+
+__all__ = [
+    "BUDDY_DIRECT_BONUS",
+    "BUDDY_REVERSE_BONUS",
+    "DEFAULT_RANDOMNESS",
+    "MAX_ITERATIONS",
+    "build_simulation_state",
+    "simulate_availability",
+]
@@ -0,0 +1,462 @@
+"""Background player import jobs.
+
+``POST /players/upload`` does everything inside one request, so large imports
+can outlive the proxy timeout and leave partial writes behind. A job runs the
+same validation/dedupe/write pipeline (services/player_bulk_upload.py) in
+chunks outside the request, and checkpoints after every committed chunk in a
+local SQLite database. A job that crashes resumes from its last checkpoint
+rather than starting over.
+
+Crash safety for a chunk works like this:
+1. Before committing, the chunk's pre-import snapshots (its undo entries) are
+   stored as ``pending``.
+2. The Firestore writes for the chunk are committed.
+3. The checkpoint advances and ``pending`` is cleared.
+
+If the process dies between steps 2 and 3, the replayed chunk reuses the
+stored snapshots. Its undo log and created/updated counts therefore still
+describe the state before the import. The Firestore writes are idempotent
+merges keyed by player id.
+
+The queue is single-node: it lives in a file on local disk
+(``IMPORT_JOBS_DB``).
+
+A worker that claims a job records itself as the job's owner (pid plus a
+per-boot nonce) and only writes progress while it still owns the job. At
+startup, running jobs whose owner process is gone are put back in the queue
+without waiting for their lease to expire, so a fast restart doesn't strand
+them. Jobs owned by another live process are left alone until their heartbeat
+lease runs out.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..firestore_client import db
+from ..utils.database import commit_batched_writes
+from ..utils.identity_index import bump_roster_version
+from .player_bulk_upload import (
+    finalize_upload,
+    new_upload_state,
+    prepare_upload,
+    process_upload_rows,
+)
+
+# One chunk is one Firestore batch (utils.database.WRITE_BATCH_SIZE).
+IMPORT_JOB_CHUNK_SIZE = 400
+# A running job whose heartbeat is older than this is presumed dead.
+JOB_LEASE_SECONDS = 120
+
+# Distinguishes this process from an earlier one that had the same pid.
+_BOOT_NONCE = uuid.uuid4().hex[:12]
+
+
+class JobOwnershipLost(Exception):
+    """Another worker reclaimed the job while this one was running it."""
+
+
+def current_owner() -> str:
+    # Computed per call so forked workers get their own pid.
+    return f"{os.getpid()}:{_BOOT_NONCE}"
+
+
+def _owner_is_alive(owner: str) -> bool:
+    if owner == current_owner():
+        return True
+    pid_text, _, _nonce = owner.partition(":")
+    try:
+        pid = int(pid_text)
+    except ValueError:
+        return False
+    if pid == os.getpid():
+        # Our pid with another nonce: a previous boot of this process.
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    # Pid exists; it may have been reused, but only the lease can tell.
+    return True
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS import_jobs (
+    id TEXT PRIMARY KEY,
+    event_id TEXT NOT NULL,
+    user_id TEXT,
+    status TEXT NOT NULL,
+    mode TEXT,
+    method TEXT,
+    filename TEXT,
+    skipped_count INTEGER,
+    context TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    total_rows INTEGER NOT NULL,
+    processed_rows INTEGER NOT NULL DEFAULT 0,
+    chunk_size INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    pending TEXT,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    heartbeat REAL,
+    owner TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+)
+"""
+
+_JSON_COLUMNS = ("context", "payload", "state", "pending", "result")
+# Everything except the (large) payload.
+_STATUS_COLUMNS = (
+    "id, event_id, user_id, status, mode, method, filename, skipped_count, context, "
+    "total_rows, processed_rows, chunk_size, state, pending, result, error, attempts, "
+    "heartbeat, owner, created_at, updated_at"
+)
+
+
+def _default_db_path() -> str:
+    return os.getenv("IMPORT_JOBS_DB") or os.path.join(
+        tempfile.gettempdir(), "woo_import_jobs.sqlite3"
+    )
+
+
+class ImportJobStore:
+    """SQLite-backed job table. One connection per call, so it is thread-safe."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(import_jobs)")}
+            if "owner" not in columns:
+                conn.execute("ALTER TABLE import_jobs ADD COLUMN owner TEXT")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def _update(self, job_id: str, sql: str, params: tuple, owner: Optional[str] = None) -> int:
+        where, where_params = "id = ?", (job_id,)
+        if owner is not None:
+            where, where_params = "id = ? AND status = 'running' AND owner = ?", (job_id, owner)
+        with self._connect() as conn:
+            cur = conn.execute(
+                f"UPDATE import_jobs SET {sql}, updated_at = ? WHERE {where}",
+                params + (datetime.utcnow().isoformat(),) + where_params,
+            )
+            return cur.rowcount
+
+    def _owned_update(self, job_id: str, owner: str, sql: str, params: tuple) -> None:
+        if self._update(job_id, sql, params, owner=owner) != 1:
+            raise JobOwnershipLost(f"job {job_id} is no longer owned by {owner}")
+
+    def create(self, job: Dict[str, Any]) -> str:
+        now = datetime.utcnow().isoformat()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO import_jobs (id, event_id, user_id, status, mode, method, filename, "
+                "skipped_count, context, payload, total_rows, chunk_size, state, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job["id"],
+                    job["event_id"],
+                    job["user_id"],
+                    job["mode"],
+                    job["method"],
+                    job["filename"],
+                    job["skipped_count"],
+                    json.dumps(job["context"]),
+                    json.dumps(job["payload"]),
+                    len(job["payload"]),
+                    job["chunk_size"],
+                    json.dumps(new_upload_state()),
+                    now,
+                    now,
+                ),
+            )
+        return job["id"]
+
+    def get(self, job_id: str, *, include_payload: bool = False) -> Optional[Dict[str, Any]]:
+        columns = "*" if include_payload else _STATUS_COLUMNS
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {columns} FROM import_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        for column in _JSON_COLUMNS:
+            if job.get(column) is not None:
+                job[column] = json.loads(job[column])
+        return job
+
+    def claim(
+        self, job_id: str, owner: Optional[str] = None, lease_seconds: int = JOB_LEASE_SECONDS
+    ) -> bool:
+        """Atomically take a queued job, or a running one whose lease expired."""
+        now = time.time()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE import_jobs SET status = 'running', owner = ?, heartbeat = ?, "
+                "attempts = attempts + 1, error = NULL, updated_at = ? WHERE id = ? AND "
+                "(status = 'queued' OR (status = 'running' AND (heartbeat IS NULL OR heartbeat < ?)))",
+                (owner or current_owner(), now, datetime.utcnow().isoformat(), job_id, now - lease_seconds),
+            )
+            return cur.rowcount == 1
+
+    # The writes below are made by the job's worker and raise JobOwnershipLost
+    # once another worker has reclaimed the job.
+
+    def heartbeat(self, job_id: str, owner: str) -> None:
+        self._owned_update(job_id, owner, "heartbeat = ?", (time.time(),))
+
+    def save_pending(self, job_id: str, owner: str, pending: Dict[str, Any]) -> None:
+        self._owned_update(job_id, owner, "pending = ?, heartbeat = ?", (json.dumps(pending), time.time()))
+
+    def checkpoint(self, job_id: str, owner: str, processed_rows: int, state: Dict[str, Any]) -> None:
+        self._owned_update(
+            job_id,
+            owner,
+            "processed_rows = ?, state = ?, pending = NULL, heartbeat = ?",
+            (processed_rows, json.dumps(state), time.time()),
+        )
+
+    def finish(self, job_id: str, owner: str, result: Dict[str, Any]) -> None:
+        self._owned_update(
+            job_id, owner, "status = 'completed', owner = NULL, result = ?", (json.dumps(result, default=str),)
+        )
+
+    def fail(self, job_id: str, owner: str, error: str) -> None:
+        self._owned_update(job_id, owner, "status = 'failed', owner = NULL, error = ?", (error,))
+
+    def requeue(self, job_id: str, lease_seconds: int = JOB_LEASE_SECONDS) -> bool:
+        """Put a failed or stalled job back in the queue; it resumes from its checkpoint.
+
+        A running job counts as stalled once its lease has expired.
+        """
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE import_jobs SET status = 'queued', owner = NULL, updated_at = ? "
+                "WHERE id = ? AND (status = 'failed' OR "
+                "(status = 'running' AND (heartbeat IS NULL OR heartbeat < ?)))",
+                (datetime.utcnow().isoformat(), job_id, time.time() - lease_seconds),
+            )
+            return cur.rowcount == 1
+
+    def reclaim_dead_owners(self) -> List[str]:
+        """Requeue running jobs whose owner process no longer exists."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, owner FROM import_jobs WHERE status = 'running' AND owner IS NOT NULL"
+            ).fetchall()
+            reclaimed = []
+            for row in rows:
+                if _owner_is_alive(row["owner"]):
+                    continue
+                cur = conn.execute(
+                    "UPDATE import_jobs SET status = 'queued', owner = NULL, updated_at = ? "
+                    "WHERE id = ? AND status = 'running' AND owner = ?",
+                    (datetime.utcnow().isoformat(), row["id"], row["owner"]),
+                )
+                if cur.rowcount == 1:
+                    reclaimed.append(row["id"])
+        return reclaimed
+
+    def resumable_job_ids(self, lease_seconds: int = JOB_LEASE_SECONDS) -> List[str]:
+        stale_before = time.time() - lease_seconds
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id FROM import_jobs WHERE status = 'queued' OR "
+                "(status = 'running' AND (heartbeat IS NULL OR heartbeat < ?)) ORDER BY created_at",
+                (stale_before,),
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+
+_STORE: Optional[ImportJobStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_job_store() -> ImportJobStore:
+    global _STORE
+    path = _default_db_path()
+    with _STORE_LOCK:
+        if _STORE is None or _STORE.path != path:
+            _STORE = ImportJobStore(path)
+        return _STORE
+
+
+def submit_import_job(*, req: Any, current_user: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate synchronously (same 400/403s as /players/upload) and queue the job."""
+    context = prepare_upload(req=req, current_user=current_user)
+    store = get_job_store()
+    job_id = store.create(
+        {
+            "id": uuid.uuid4().hex,
+            "event_id": context["event_id"],
+            "user_id": current_user["uid"] if current_user else None,
+            "mode": context["mode"],
+            "method": req.method,
+            "filename": req.filename,
+            "skipped_count": req.skipped_count,
+            "context": {
+                "drill_fields": context["drill_fields"],
+                "first_row_keys": context["first_row_keys"],
+            },
+            "payload": req.players,
+            "chunk_size": IMPORT_JOB_CHUNK_SIZE,
+        }
+    )
+    logging.info(
+        f"[IMPORT_JOB] Queued job={job_id} event={context['event_id']} rows={len(req.players)}"
+    )
+    return job_status(store.get(job_id))
+
+
+def run_import_job(job_id: str) -> None:
+    """Process a job from its last checkpoint. No-op if another worker holds it."""
+    store = get_job_store()
+    owner = current_owner()
+    if not store.claim(job_id, owner):
+        return
+    job = store.get(job_id, include_payload=True)
+    event_id = job["event_id"]
+    context = job["context"]
+    players = job["payload"]
+    state = job["state"]
+    pending = job["pending"]
+    start = job["processed_rows"]
+    chunk_size = job["chunk_size"]
+
+    try:
+        while start < len(players):
+            end = min(start + chunk_size, len(players))
+            replaying = bool(pending and pending.get("start") == start)
+            writes, undo_entries = process_upload_rows(
+                event_id=event_id,
+                mode=job["mode"],
+                drill_fields=context["drill_fields"],
+                players=players[start:end],
+                start_index=start,
+                state=state,
+                previous_overrides=pending["undo"] if replaying else None,
+            )
+            if not replaying:
+                store.save_pending(
+                    job_id,
+                    owner,
+                    {
+                        "start": start,
+                        "undo": {e["player_id"]: e["previous_data"] for e in undo_entries},
+                    },
+                )
+            commit_batched_writes(db, writes, operation="players.upload_job")
+            bump_roster_version(event_id)
+            store.checkpoint(job_id, owner, end, state)
+            pending = None
+            start = end
+
+        # Finalizing can take a while; renew the lease (and confirm we still own the job).
+        store.heartbeat(job_id, owner)
+        result = finalize_upload(
+            event_id=event_id,
+            mode=job["mode"],
+            drill_fields=context["drill_fields"],
+            state=state,
+            players_received=len(players),
+            first_row_keys=context["first_row_keys"],
+            current_user={"uid": job["user_id"]} if job["user_id"] else None,
+            method=job["method"],
+            filename=job["filename"],
+            skipped_count=job["skipped_count"],
+        )
+        store.finish(job_id, owner, result)
+        logging.info(f"[IMPORT_JOB] Completed job={job_id} event={event_id} rows={len(players)}")
+    except JobOwnershipLost:
+        logging.warning(f"[IMPORT_JOB] Job {job_id} was reclaimed at row {start}; stopping")
+    except Exception as e:
+        logging.error(f"[IMPORT_JOB] Job {job_id} failed at row {start}: {e}")
+        try:
+            store.fail(job_id, owner, str(e))
+        except JobOwnershipLost:
+            logging.warning(f"[IMPORT_JOB] Job {job_id} was reclaimed; not marking it failed")
+
+
+def resume_pending_jobs() -> int:
+    """Run queued jobs and jobs whose worker died. Returns how many were picked up."""
+    store = get_job_store()
+    for job_id in store.reclaim_dead_owners():
+        logging.info(f"[IMPORT_JOB] Reclaimed job={job_id} from a dead worker")
+    job_ids = store.resumable_job_ids()
+    for job_id in job_ids:
+        logging.info(f"[IMPORT_JOB] Resuming job={job_id}")
+        run_import_job(job_id)
+    return len(job_ids)
+
+
+def job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    state = job["state"]
+    total = job["total_rows"]
+    undo_log = list(state["undo_log"])
+    if job["pending"]:
+        # The pending chunk may already be committed; reverting it is harmless if not.
+        undo_log.extend(
+            {"player_id": pid, "previous_data": previous}
+            for pid, previous in job["pending"]["undo"].items()
+        )
+    body = {
+        "job_id": job["id"],
+        "event_id": job["event_id"],
+        "status": job["status"],
+        "total_rows": total,
+        "processed_rows": job["processed_rows"],
+        "progress": round(job["processed_rows"] / total, 4) if total else 1.0,
+        "added": state["added"],
+        "created_players": state["created_players"],
+        "updated_players": state["updated_players"],
+        "rejected_count": len(state["errors"]),
+        "errors": state["errors"],
+        # Usable with /players/revert-import even for partial (failed) jobs.
+        "undo_log": undo_log,
+        "error": job["error"],
+        "attempts": job["attempts"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
+    if job["status"] == "completed":
+        body["result"] = job["result"]
+    return body
+
+
+__all__ = [
+    "IMPORT_JOB_CHUNK_SIZE",
+    "JOB_LEASE_SECONDS",
+    "ImportJobStore",
+    "JobOwnershipLost",
+    "current_owner",
+    "get_job_store",
+    "job_status",
+    "resume_pending_jobs",
+    "run_import_job",
+    "submit_import_job",
+]
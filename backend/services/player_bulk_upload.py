@@ -3,15 +3,16 @@ from __future__ import annotations
 import logging
 from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, Request
 
 from ..firestore_client import db
 from ..utils.data_integrity import enforce_event_league_relationship
-from ..utils.database import execute_with_timeout
+from ..utils.database import commit_batched_writes, execute_with_timeout
 from ..utils.event_schema import get_event_schema
 from ..utils.identity import generate_player_id
+from ..utils.identity_index import bump_roster_version
 from ..utils.lock_validation import check_write_permission
 from ..utils.participant_matching import (
     has_explicit_sibling_separation_request,
@@ -76,18 +77,112 @@ def _derive_household_and_buddy_fields(player: Dict[str, Any]) -> Dict[str, Any]
     }
 
 
-def _recalculate_sibling_groups(event_id: str) -> None:
+# Uploads touching more players than this recalculate the whole event instead;
+# past that point the household queries cost more than one full stream.
+INCREMENTAL_SIBLING_MAX_TOUCHED = 500
+# Firestore "in" filters accept at most 30 values.
+_IN_QUERY_LIMIT = 30
+# Fields whose shared values can put two players in the same sibling group.
+_HOUSEHOLD_FIELDS = (
+    "parentEmailNormalized",
+    "cellPhoneNormalized",
+    "streetNormalized",
+    "siblingGroupId",
+)
+
+
+def _household_values(player: Dict[str, Any]) -> Dict[str, Any]:
+    values = {
+        "parentEmailNormalized": player.get("parentEmailNormalized"),
+        "cellPhoneNormalized": player.get("cellPhoneNormalized"),
+        # The street only links players together with the parent last name.
+        "streetNormalized": player.get("streetNormalized")
+        if player.get("parentLastNameNormalized")
+        else None,
+        # Current members of a group must be re-evaluated with it.
+        "siblingGroupId": player.get("siblingGroupId"),
+    }
+    return {field: value for field, value in values.items() if value}
+
+
+def _load_affected_household_players(
+    players_ref, touched_player_ids: List[str], previous_states: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Load every player whose sibling group can change because of the touched
+    rows: the closure over shared household keys and existing group ids,
+    seeded with the touched players' current and pre-import data. Each
+    loaded player's whole component is loaded, so recomputing only this set
+    yields the same assignments as a full recalculation.
+    """
+    loaded: Dict[str, Dict[str, Any]] = {}
+    wanted: Dict[str, set] = {field: set() for field in _HOUSEHOLD_FIELDS}
+    queried: Dict[str, set] = {field: set() for field in _HOUSEHOLD_FIELDS}
+
+    def absorb(player: Dict[str, Any]) -> None:
+        for field, value in _household_values(player).items():
+            wanted[field].add(value)
+
+    for previous in previous_states:
+        absorb(previous)
+
+    unique_ids = list(dict.fromkeys(touched_player_ids))
+    for i in range(0, len(unique_ids), 100):
+        refs = [players_ref.document(pid) for pid in unique_ids[i : i + 100]]
+        for doc in db.get_all(refs):
+            if doc.exists:
+                pdata = doc.to_dict() or {}
+                pdata["id"] = doc.id
+                loaded[doc.id] = pdata
+                absorb(pdata)
+
+    while True:
+        fresh = {field: list(wanted[field] - queried[field]) for field in _HOUSEHOLD_FIELDS}
+        if not any(fresh.values()):
+            break
+        for field, values in fresh.items():
+            queried[field].update(values)
+            for i in range(0, len(values), _IN_QUERY_LIMIT):
+                for doc in players_ref.where(field, "in", values[i : i + _IN_QUERY_LIMIT]).stream():
+                    if doc.id in loaded:
+                        continue
+                    pdata = doc.to_dict() or {}
+                    pdata["id"] = doc.id
+                    loaded[doc.id] = pdata
+                    absorb(pdata)
+
+    return list(loaded.values())
+
+
+def _recalculate_sibling_groups(
+    event_id: str,
+    touched_player_ids: Optional[List[str]] = None,
+    previous_states: Optional[List[Dict[str, Any]]] = None,
+) -> None:
+    """
+    Recompute sibling groups and write only players whose assignment changed.
+
+    With ``touched_player_ids`` only the households those players belong (or
+    belonged) to are loaded and recomputed; without it the whole event is.
+    """
     players_ref = db.collection("events").document(event_id).collection("players")
-    player_docs = list(players_ref.stream())
-    if not player_docs:
+    incremental = (
+        touched_player_ids is not None
+        and len(touched_player_ids) <= INCREMENTAL_SIBLING_MAX_TOUCHED
+    )
+    if incremental:
+        players = _load_affected_household_players(
+            players_ref, touched_player_ids, previous_states or []
+        )
+    else:
+        players = []
+        for doc in players_ref.stream():
+            pdata = doc.to_dict() or {}
+            pdata["id"] = doc.id
+            players.append(pdata)
+    if not players:
         return
 
-    players = []
-    for doc in player_docs:
-        pdata = doc.to_dict() or {}
-        pdata["id"] = doc.id
-        players.append(pdata)
-
     assignments = infer_sibling_group_assignments(players, event_id=event_id)
 
     suspicious_groups = {}
@@ -124,9 +219,7 @@ def _recalculate_sibling_groups(event_id: str) -> None:
             sorted(group["player_ids"]),
         )
 
-    batch = db.batch()
-    batch_count = 0
-    updates_applied = 0
+    writes = []
     for player in players:
         player_id = player.get("id")
         if not player_id:
@@ -157,572 +250,677 @@ def _recalculate_sibling_groups(event_id: str) -> None:
         ):
             continue
 
-        batch.set(
-            players_ref.document(player_id),
-            {
-                "siblingGroupId": assignment["siblingGroupId"],
-                "forceSameTeamWithSibling": assignment["forceSameTeamWithSibling"],
-                "siblingInferenceSignals": assignment.get("siblingInferenceSignals", []),
-                "siblingInferenceSuspicious": bool(
-                    assignment.get("siblingInferenceSuspicious")
-                ),
-                "siblingInferenceSuspicionReasons": assignment.get(
-                    "siblingInferenceSuspicionReasons", []
-                ),
-                "siblingGroupSize": assignment.get("siblingGroupSize", 1),
-            },
-            merge=True,
+        writes.append(
+            (
+                "merge",
+                players_ref.document(player_id),
+                {
+                    "siblingGroupId": assignment["siblingGroupId"],
+                    "forceSameTeamWithSibling": assignment["forceSameTeamWithSibling"],
+                    "siblingInferenceSignals": assignment.get("siblingInferenceSignals", []),
+                    "siblingInferenceSuspicious": bool(
+                        assignment.get("siblingInferenceSuspicious")
+                    ),
+                    "siblingInferenceSuspicionReasons": assignment.get(
+                        "siblingInferenceSuspicionReasons", []
+                    ),
+                    "siblingGroupSize": assignment.get("siblingGroupSize", 1),
+                },
+            )
         )
-        batch_count += 1
-        updates_applied += 1
 
-        if batch_count >= 400:
-            execute_with_timeout(lambda: batch.commit(), timeout=10)
-            batch = db.batch()
-            batch_count = 0
-
-    if batch_count > 0:
-        execute_with_timeout(lambda: batch.commit(), timeout=10)
+    updates_applied = len(writes)
+    if writes:
+        execute_with_timeout(
+            lambda: commit_batched_writes(db, writes, operation="players.sibling_groups"),
+            timeout=30,
+        )
 
     logging.info(
-        f"[SIBLING_INFERENCE] Event={event_id} updated_players={updates_applied}"
+        f"[SIBLING_INFERENCE] Event={event_id} scope={'households' if incremental else 'event'} "
+        f"loaded_players={len(players)} updated_players={updates_applied}"
     )
 
 
-def upload_players_service(*, request: Request, req: Any, current_user: Dict[str, Any]):
-    try:
-        enforce_event_league_relationship(event_id=req.event_id)
-        
-        # Check scoped write permission (membership role is authoritative).
-        check_write_permission(
-            event_id=req.event_id,
-            user_id=current_user["uid"],
-            operation_name="upload players"
-        )
-            
-        event_id = req.event_id
-        
-        # FETCH SCHEMA FOR VALIDATION
-        schema = get_event_schema(event_id)
-        
-        players = req.players
-        required_fields = ["first_name", "last_name"]
-        
-        # DYNAMIC DRILL FIELDS FROM SCHEMA
-        drill_fields = [d.key for d in schema.drills]
-        
-        # --- PRE-FLIGHT GUARD: PREVENT SILENT FAILURE ---
-        # If mode is 'scores_only', strictly require that the payload contains at least one drill key.
-        # This prevents the "Success (0 scores)" bug where users map to the wrong template.
-        if req.mode == 'scores_only' and len(players) > 0:
-            p0 = players[0]
-            has_potential_scores = False
-            
-            # 1. Check nested scores
-            if p0.get("scores") and isinstance(p0.get("scores"), dict) and len(p0.get("scores")) > 0:
-                has_potential_scores = True
-            
-            # 2. Check flat keys against schema
-            if not has_potential_scores:
-                for k in p0.keys():
-                    if k in drill_fields:
-                        has_potential_scores = True
-                        break
-            
-            if not has_potential_scores:
-                logging.warning(f"[IMPORT_GUARD] Blocked import. Mode={req.mode}, Payload Keys={list(p0.keys())}, Schema Keys={drill_fields}")
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Import blocked: No valid drill scores found. Your column mappings do not match this event's schema ({len(drill_fields)} drills). Please check that you are importing into the correct Event Type (e.g. Basketball vs Football)."
-                )
+# Rows accepted per upload (sync or job).
+MAX_UPLOAD_ROWS = 5000
 
-        errors = []
-        
-        if players and isinstance(players, list) and len(players) > 0 and isinstance(players[0], dict):
-            # Log minimal debug info for support (schema mismatch diagnosis) without flooding logs
-             p0 = players[0]
-             # Only log if we suspect an issue (e.g. no scores found in a roster+scores import)
-             # or just log the keys once per batch for traceability
-             logging.info(f"[IMPORT_START] Event={event_id}, Mode={req.mode}, Rows={len(players)}, Schema={drill_fields}, Row1_Keys={list(p0.keys())}")
-        added = 0
-        created_players = 0
-        updated_players = 0
-        players_matched = 0
-        scores_written_total = 0
-        scores_written_by_drill = defaultdict(int)
-        
-        MAX_ROWS = 5000
-        if len(players) > MAX_ROWS:
-            raise HTTPException(status_code=400, detail=f"Too many rows: max {MAX_ROWS}")
+# Aliases checked, in order, when a row has no canonical "number".
+_PREFETCH_NUMBER_ALIASES = ["player_number", "jersey", "number", "no", "No", "#", "Jersey #"]
+_ROW_NUMBER_ALIASES = ["player_number", "jersey", "jersey_number", "no", "No", "#", "Jersey #"]
 
-        # Local duplicate detection within upload batch
-        # Track first occurrence row number and player data for better error messages
-        seen_keys = {}  # Changed from set() to dict: key -> (row_number, player_data)
-        
-        # CAPTURE PREVIOUS STATE FOR UNDO
-        undo_log = []
-        
-        # First, identify all player IDs we are about to touch
-        ids_to_fetch = []
-        external_ids_to_fetch = []
-        
-        # We need to iterate through players to generate IDs, similar to validation loop below
-        for p in players:
-            # Capture External ID for robust matching
-            if p.get("external_id") and str(p.get("external_id")).strip():
-                external_ids_to_fetch.append(str(p.get("external_id")).strip())
-
-            # Only generate ID if required fields present
-            if p.get("first_name") and p.get("last_name"):
-                try:
-                     # Robust number parsing (handle "12.0", "12", 12, 12.0)
-                     raw_num = p.get("jersey_number")
-                     if raw_num is None:
-                         # Try common synonyms (including player_number which is common in CSVs)
-                         for alias in ["player_number", "jersey", "number", "no", "No", "#", "Jersey #"]:
-                             if p.get(alias) is not None:
-                                 raw_num = p.get(alias)
-                                 break
-                                 
-                     num = int(float(str(raw_num).strip())) if raw_num not in (None, "") else None
-                     
-                     # Even if num is None, we can generate an ID
-                     pid = generate_player_id(event_id, p.get("first_name"), p.get("last_name"), num)
-                     ids_to_fetch.append(pid)
-                except:
-                    pass
-        
-        # Fetch existing documents in batches (Firestore limit 10-30 per getAll? No, supports more but better chunked)
-        existing_docs_map = {}
-        external_id_map = {}
 
-            # 1. Fetch by External ID (Priority Match)
-        if external_ids_to_fetch:
-            unique_exts = list(set(external_ids_to_fetch))
-            
-            # Firestore 'in' query limit is 10
-            for i in range(0, len(unique_exts), 10):
-                chunk = unique_exts[i:i+10]
-                try:
-                    q = db.collection("events").document(event_id).collection("players").where("external_id", "in", chunk)
-                    docs = q.stream()
-                    for doc in docs:
-                        data = doc.to_dict()
-                        data['id'] = doc.id
-                        ext_key = str(data.get('external_id')).strip()
-                        external_id_map[ext_key] = data
-                        existing_docs_map[doc.id] = data # Also populate ID map
-                except Exception as e:
-                    logging.warning(f"Failed to fetch by external_id chunk: {e}")
-
-        # 2. Fetch by Generated ID (Name+Number Fallback)
-        if ids_to_fetch:
-            # Unique IDs only
-            unique_ids = list(set(ids_to_fetch))
-            
-            # Fetch in chunks of 100
-            for i in range(0, len(unique_ids), 100):
-                chunk = unique_ids[i:i+100]
-                refs = [db.collection("events").document(event_id).collection("players").document(pid) for pid in chunk]
-                docs = db.get_all(refs)
+def new_upload_state() -> Dict[str, Any]:
+    """Running totals for one upload; JSON-serializable so jobs can checkpoint it."""
+    return {
+        "added": 0,
+        "created_players": 0,
+        "updated_players": 0,
+        "players_matched": 0,
+        "scores_written_total": 0,
+        "scores_written_by_drill": {},
+        "errors": [],
+        "undo_log": [],
+        # identity key -> [first row number, age_group] for in-upload duplicates
+        "seen_keys": {},
+    }
+
+
+def _identity_key(first_name: str, last_name: str, num: Optional[int]) -> str:
+    return "\x1f".join((first_name.lower(), last_name.lower(), "" if num is None else str(num)))
+
+
+def prepare_upload(*, req: Any, current_user: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Access checks and pre-flight validation shared by the synchronous upload
+    and import jobs. Raises HTTPException; returns the upload context.
+    """
+    enforce_event_league_relationship(event_id=req.event_id)
+
+    # Check scoped write permission (membership role is authoritative).
+    check_write_permission(
+        event_id=req.event_id,
+        user_id=current_user["uid"],
+        operation_name="upload players"
+    )
+
+    event_id = req.event_id
+
+    # FETCH SCHEMA FOR VALIDATION
+    schema = get_event_schema(event_id)
+
+    players = req.players
+
+    # DYNAMIC DRILL FIELDS FROM SCHEMA
+    drill_fields = [d.key for d in schema.drills]
+
+    # --- PRE-FLIGHT GUARD: PREVENT SILENT FAILURE ---
+    # If mode is 'scores_only', strictly require that the payload contains at least one drill key.
+    # This prevents the "Success (0 scores)" bug where users map to the wrong template.
+    if req.mode == 'scores_only' and len(players) > 0:
+        p0 = players[0]
+        has_potential_scores = False
+
+        # 1. Check nested scores
+        if p0.get("scores") and isinstance(p0.get("scores"), dict) and len(p0.get("scores")) > 0:
+            has_potential_scores = True
+
+        # 2. Check flat keys against schema
+        if not has_potential_scores:
+            for k in p0.keys():
+                if k in drill_fields:
+                    has_potential_scores = True
+                    break
+
+        if not has_potential_scores:
+            logging.warning(f"[IMPORT_GUARD] Blocked import. Mode={req.mode}, Payload Keys={list(p0.keys())}, Schema Keys={drill_fields}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"Import blocked: No valid drill scores found. Your column mappings do not match this event's schema ({len(drill_fields)} drills). Please check that you are importing into the correct Event Type (e.g. Basketball vs Football)."
+            )
+
+    if players and isinstance(players, list) and len(players) > 0 and isinstance(players[0], dict):
+        # Log minimal debug info for support (schema mismatch diagnosis) without flooding logs
+        p0 = players[0]
+        # Only log if we suspect an issue (e.g. no scores found in a roster+scores import)
+        # or just log the keys once per batch for traceability
+        logging.info(f"[IMPORT_START] Event={event_id}, Mode={req.mode}, Rows={len(players)}, Schema={drill_fields}, Row1_Keys={list(p0.keys())}")
+
+    if len(players) > MAX_UPLOAD_ROWS:
+        raise HTTPException(status_code=400, detail=f"Too many rows: max {MAX_UPLOAD_ROWS}")
+
+    return {
+        "event_id": event_id,
+        "mode": req.mode,
+        "drill_fields": drill_fields,
+        "first_row_keys": list(players[0].keys()) if players else [],
+    }
+
+
+def _fetch_previous_states(event_id: str, players: List[Dict[str, Any]]):
+    """Look up existing player docs touched by ``players`` (by external id and generated id)."""
+    # First, identify all player IDs we are about to touch
+    ids_to_fetch = []
+    external_ids_to_fetch = []
+
+    # We need to iterate through players to generate IDs, similar to validation loop below
+    for p in players:
+        # Capture External ID for robust matching
+        if p.get("external_id") and str(p.get("external_id")).strip():
+            external_ids_to_fetch.append(str(p.get("external_id")).strip())
+
+        # Only generate ID if required fields present
+        if p.get("first_name") and p.get("last_name"):
+            try:
+                 # Robust number parsing (handle "12.0", "12", 12, 12.0)
+                 raw_num = p.get("jersey_number")
+                 if raw_num is None:
+                     # Try common synonyms (including player_number which is common in CSVs)
+                     for alias in _PREFETCH_NUMBER_ALIASES:
+                         if p.get(alias) is not None:
+                             raw_num = p.get(alias)
+                             break
+
+                 num = int(float(str(raw_num).strip())) if raw_num not in (None, "") else None
+
+                 # Even if num is None, we can generate an ID
+                 pid = generate_player_id(event_id, p.get("first_name"), p.get("last_name"), num)
+                 ids_to_fetch.append(pid)
+            except:
+                pass
+
+    # Fetch existing documents in batches (Firestore limit 10-30 per getAll? No, supports more but better chunked)
+    existing_docs_map = {}
+    external_id_map = {}
+
+    # 1. Fetch by External ID (Priority Match)
+    if external_ids_to_fetch:
+        unique_exts = list(set(external_ids_to_fetch))
+
+        for i in range(0, len(unique_exts), _IN_QUERY_LIMIT):
+            chunk = unique_exts[i:i+_IN_QUERY_LIMIT]
+            try:
+                q = db.collection("events").document(event_id).collection("players").where("external_id", "in", chunk)
+                docs = q.stream()
                 for doc in docs:
-                    if doc.exists:
-                        existing_docs_map[doc.id] = doc.to_dict()
-                    else:
-                        existing_docs_map[doc.id] = None # Explicitly mark as not existing
-
-        # DEBUG: Log first player receipt to verify frontend→backend payload integrity
-        if players:
-            first_player = players[0]
-            logging.info(f"[UPLOAD_RECEIPT] Received {len(players)} players for event {event_id}")
-            logging.info(f"[UPLOAD_RECEIPT] First player raw keys: {list(first_player.keys())}")
-            logging.info(f"[UPLOAD_RECEIPT] First player identity fields: first_name={first_player.get('first_name')}, last_name={first_player.get('last_name')}, number={first_player.get('number')}")
+                    data = doc.to_dict()
+                    # Also populate ID map (same shape as the get_all path below)
+                    existing_docs_map[doc.id] = dict(data)
+                    data['id'] = doc.id
+                    ext_key = str(data.get('external_id')).strip()
+                    external_id_map[ext_key] = data
+            except Exception as e:
+                logging.warning(f"Failed to fetch by external_id chunk: {e}")
+
+    # 2. Fetch by Generated ID (Name+Number Fallback)
+    if ids_to_fetch:
+        # Unique IDs only; docs already matched by external id are not re-read
+        unique_ids = list(set(ids_to_fetch) - set(existing_docs_map))
+
+        # Fetch in chunks of 100
+        for i in range(0, len(unique_ids), 100):
+            chunk = unique_ids[i:i+100]
+            refs = [db.collection("events").document(event_id).collection("players").document(pid) for pid in chunk]
+            docs = db.get_all(refs)
+            for doc in docs:
+                if doc.exists:
+                    existing_docs_map[doc.id] = doc.to_dict()
+                else:
+                    existing_docs_map[doc.id] = None # Explicitly mark as not existing
+
+    return existing_docs_map, external_id_map
+
+
+def process_upload_rows(
+    *,
+    event_id: str,
+    mode: str,
+    drill_fields: List[str],
+    players: List[Dict[str, Any]],
+    start_index: int,
+    state: Dict[str, Any],
+    previous_overrides: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Tuple[str, Any, Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    Validate, dedupe and build writes for ``players`` (rows ``start_index + 1``
+    onward), updating ``state`` in place. Returns ``(writes, undo_entries)``;
+    nothing is written here.
+
+    ``previous_overrides`` (player_id -> previous data) replaces the looked-up
+    state for players whose pre-import snapshot was already recorded, so a
+    chunk replayed after a crash reports the same undo data and counts.
+    """
+    required_fields = ["first_name", "last_name"]
+    errors = state["errors"]
+    seen_keys = state["seen_keys"]
+    scores_written_by_drill = state["scores_written_by_drill"]
+    previous_overrides = previous_overrides or {}
+    undo_entries = []
+    writes = []
+
+    existing_docs_map, external_id_map = _fetch_previous_states(event_id, players)
+
+    # DEBUG: Log first player receipt to verify frontend→backend payload integrity
+    if players and start_index == 0:
+        first_player = players[0]
+        logging.info(f"[UPLOAD_RECEIPT] Received {len(players)} players for event {event_id}")
+        logging.info(f"[UPLOAD_RECEIPT] First player raw keys: {list(first_player.keys())}")
+        logging.info(f"[UPLOAD_RECEIPT] First player identity fields: first_name={first_player.get('first_name')}, last_name={first_player.get('last_name')}, number={first_player.get('number')}")
+
+    for idx, player in enumerate(players, start=start_index):
+        # CRITICAL: Normalize jersey_number to number (backward compatibility)
+        # Backend canonical is 'number' but accept legacy 'jersey_number' from older clients
+        if "jersey_number" in player and "number" not in player:
+            player["number"] = player["jersey_number"]
+        elif "jersey_number" in player and "number" in player:
+            # Both present - keep number as canonical, remove jersey_number
+            del player["jersey_number"]
         
-        batch = db.batch()
-        batch_count = 0
+        row_errors = []
+        for field in required_fields:
+            if player.get(field) in (None, ""):
+                row_errors.append(f"Missing {field}")
         
-        for idx, player in enumerate(players):
-            # CRITICAL: Normalize jersey_number to number (backward compatibility)
-            # Backend canonical is 'number' but accept legacy 'jersey_number' from older clients
-            if "jersey_number" in player and "number" not in player:
-                player["number"] = player["jersey_number"]
-            elif "jersey_number" in player and "number" in player:
-                # Both present - keep number as canonical, remove jersey_number
-                del player["jersey_number"]
-            
-            row_errors = []
-            for field in required_fields:
-                if player.get(field) in (None, ""):
-                    row_errors.append(f"Missing {field}")
+        num = None
+        num_source = None
+        try:
+            # UPDATED: Check 'number' first (canonical field), then fall back to aliases
+            raw_num = player.get("number")
+            num_source = "number" if raw_num is not None else None
             
-            num = None
-            num_source = None
-            try:
-                # UPDATED: Check 'number' first (canonical field), then fall back to aliases
-                raw_num = player.get("number")
-                num_source = "number" if raw_num is not None else None
-                
-                if raw_num is None:
-                    # Try common synonyms for backward compatibility
-                    for alias in ["player_number", "jersey", "jersey_number", "no", "No", "#", "Jersey #"]:
-                        if player.get(alias) is not None:
-                            raw_num = player.get(alias)
-                            num_source = alias
-                            break
-                            
-                num = int(float(str(raw_num).strip())) if raw_num not in (None, "") else None
-                
-                # DEBUG: Log number extraction for first player
-                if idx == 0:
-                    logging.info(f"[NUMBER_EXTRACT] Row 1: Extracted {num} from field '{num_source}' (raw: {raw_num})")
-                
-                # DEBUG: Log number extraction details
-                if num is None:
-                    logging.warning(f"[NUMBER_EXTRACT] Row {idx + 1}: No number found! Checked: number, player_number, jersey, jersey_number, etc. Player data keys: {list(player.keys())}")
-                else:
-                    logging.info(f"[NUMBER_EXTRACT] Row {idx + 1}: Extracted {num} from field '{num_source}' (raw_value='{raw_num}')")
-                
-                # Validation: number is OPTIONAL, but if present must be valid
-                if num is not None and (num < 0 or num > 9999):
-                    row_errors.append("number must be between 0 and 9999")
-            except Exception as e:
-                logging.warning(f"[NUMBER_EXTRACT] Row {idx + 1}: Could not parse number (non-fatal, treating as None): {e}, player keys: {list(player.keys())}")
-                num = None  # Number is optional — don't fail the row
-                
-            if row_errors:
-                errors.append({"row": idx + 1, "message": ", ".join(row_errors)})
-                continue
-
-            # Generate ID for deduplication (Default / Fallback)
-            first_name = (player.get("first_name") or "").strip()
-            last_name = (player.get("last_name") or "").strip()
+            if raw_num is None:
+                # Try common synonyms for backward compatibility
+                for alias in _ROW_NUMBER_ALIASES:
+                    if player.get(alias) is not None:
+                        raw_num = player.get(alias)
+                        num_source = alias
+                        break
+                        
+            num = int(float(str(raw_num).strip())) if raw_num not in (None, "") else None
             
-            # Determine Target Player ID with Priority Matching
-            player_id = None
-            previous_state = None
+            # DEBUG: Log number extraction for first player
+            if idx == 0:
+                logging.info(f"[NUMBER_EXTRACT] Row 1: Extracted {num} from field '{num_source}' (raw: {raw_num})")
             
-            # Priority 1: External ID Match
-            incoming_ext_id = str(player.get("external_id") or "").strip()
-            if incoming_ext_id and incoming_ext_id in external_id_map:
-                previous_state = external_id_map[incoming_ext_id]
-                player_id = previous_state['id']
+            # DEBUG: Log number extraction details
+            if num is None:
+                logging.warning(f"[NUMBER_EXTRACT] Row {idx + 1}: No number found! Checked: number, player_number, jersey, jersey_number, etc. Player data keys: {list(player.keys())}")
             else:
-                # Priority 2: Name + Number Match (Deterministic ID)
-                player_id = generate_player_id(event_id, first_name, last_name, num)
-                previous_state = existing_docs_map.get(player_id)
+                logging.info(f"[NUMBER_EXTRACT] Row {idx + 1}: Extracted {num} from field '{num_source}' (raw_value='{raw_num}')")
             
-            # Check local batch duplicates
-            # Note: We use Name+Number key for local dup check usually, but what if ext_id matches?
-            # Let's keep the name+number check for simplicity, or should we check ID?
-            key = (first_name.lower(), last_name.lower(), num)
+            # Validation: number is OPTIONAL, but if present must be valid
+            if num is not None and (num < 0 or num > 9999):
+                row_errors.append("number must be between 0 and 9999")
+        except Exception as e:
+            logging.warning(f"[NUMBER_EXTRACT] Row {idx + 1}: Could not parse number (non-fatal, treating as None): {e}, player keys: {list(player.keys())}")
+            num = None  # Number is optional — don't fail the row
             
-            # DEBUG: Log identity key for duplicate detection
-            logging.info(f"[DEDUPE] Row {idx + 1}: Identity key = {key} (first={first_name}, last={last_name}, number={num})")
+        if row_errors:
+            errors.append({"row": idx + 1, "message": ", ".join(row_errors)})
+            continue
+
+        # Generate ID for deduplication (Default / Fallback)
+        first_name = (player.get("first_name") or "").strip()
+        last_name = (player.get("last_name") or "").strip()
+        
+        # Determine Target Player ID with Priority Matching
+        player_id = None
+        previous_state = None
+        
+        # Priority 1: External ID Match
+        incoming_ext_id = str(player.get("external_id") or "").strip()
+        if incoming_ext_id and incoming_ext_id in external_id_map:
+            previous_state = external_id_map[incoming_ext_id]
+            player_id = previous_state['id']
+        else:
+            # Priority 2: Name + Number Match (Deterministic ID)
+            player_id = generate_player_id(event_id, first_name, last_name, num)
+            previous_state = existing_docs_map.get(player_id)
+        if player_id in previous_overrides:
+            previous_state = previous_overrides[player_id]
+        
+        # Check local batch duplicates
+        # Note: We use Name+Number key for local dup check usually, but what if ext_id matches?
+        # Let's keep the name+number check for simplicity, or should we check ID?
+        key = _identity_key(first_name, last_name, num)
+        
+        # DEBUG: Log identity key for duplicate detection
+        logging.info(f"[DEDUPE] Row {idx + 1}: Identity key = {(first_name.lower(), last_name.lower(), num)} (first={first_name}, last={last_name}, number={num})")
+        
+        if key in seen_keys:
+            first_row_num, first_age_group = seen_keys[key]
             
-            if key in seen_keys:
-                first_row_num, first_player = seen_keys[key]
-                
-                # CRITICAL FIX: Enhanced error handling for missing jersey numbers
-                # When num is None, multiple players with the same name generate identical IDs,
-                # causing Firestore batch write failures that result in 500 errors.
-                # Return clear 400 validation error instead.
-                if num is None:
-                    error_msg = (
-                        f"Duplicate identity: {first_name} {last_name} without jersey number matches Row {first_row_num}. "
-                        f"Players with the same name MUST have unique jersey numbers for identification. "
-                        f"SOLUTION: The Import Results UI should auto-assign jersey numbers. "
-                        f"If you're seeing this error, please report it as a bug - the frontend auto-assignment failed."
-                    )
-                    errors.append({
-                        "row": idx + 1,
-                        "message": error_msg,
-                        "requires_jersey_number": True,
-                        "duplicate_of_row": first_row_num,
-                        "identity_key": {
-                            "first_name": first_name,
-                            "last_name": last_name,
-                            "jersey_number": None
-                        }
-                    })
-                    continue
-                
-                # Build detailed error message with context
-                age_group = (player.get("age_group") or "").strip()
-                jersey_display = f"#{num}" if num is not None else "(no jersey number)"
-                age_display = f"({age_group})" if age_group else ""
-                
+            # CRITICAL FIX: Enhanced error handling for missing jersey numbers
+            # When num is None, multiple players with the same name generate identical IDs,
+            # causing Firestore batch write failures that result in 500 errors.
+            # Return clear 400 validation error instead.
+            if num is None:
                 error_msg = (
-                    f"Duplicate: {first_name} {last_name} {jersey_display} {age_display} "
-                    f"matches Row {first_row_num}. "
-                    f"Players are matched by name + jersey number (age group is ignored). "
-                    f"If the same athlete plays in multiple age groups, use a different jersey number or add a suffix to the name. "
+                    f"Duplicate identity: {first_name} {last_name} without jersey number matches Row {first_row_num}. "
+                    f"Players with the same name MUST have unique jersey numbers for identification. "
+                    f"SOLUTION: The Import Results UI should auto-assign jersey numbers. "
+                    f"If you're seeing this error, please report it as a bug - the frontend auto-assignment failed."
                 )
-                
-                # Add contextual tip based on scenario
-                if num is None:
-                    error_msg += "TIP: Assign unique jersey numbers to differentiate players with the same name."
-                elif age_group and first_player.get('age_group') and age_group != first_player.get('age_group'):
-                    error_msg += f"TIP: Age groups differ ({first_player.get('age_group')} vs {age_group}) but same name+number still creates a duplicate. Change the jersey number or merge into a single row."
-                else:
-                    error_msg += "TIP: Remove this duplicate row or assign a different jersey number."
-                
                 errors.append({
-                    "row": idx + 1, 
+                    "row": idx + 1,
                     "message": error_msg,
-                    "data": player,
+                    "requires_jersey_number": True,
                     "duplicate_of_row": first_row_num,
                     "identity_key": {
                         "first_name": first_name,
                         "last_name": last_name,
-                        "jersey_number": num
+                        "jersey_number": None
                     }
                 })
                 continue
             
-            # Store first occurrence with player data for context
-            seen_keys[key] = (idx + 1, player)
-
-            # Record Undo State
-            # previous_state is already set above
+            # Build detailed error message with context
+            age_group = (player.get("age_group") or "").strip()
+            jersey_display = f"#{num}" if num is not None else "(no jersey number)"
+            age_display = f"({age_group})" if age_group else ""
             
-            # --- SCORES ONLY MODE CHECK ---
-            if req.mode == "scores_only" and not previous_state:
-                # In scores_only mode, we strictly require the player to exist
-                errors.append({"row": idx + 1, "message": f"Player match not found for {first_name} {last_name} (#{num}). strictly requiring existing player."})
-                continue
+            error_msg = (
+                f"Duplicate: {first_name} {last_name} {jersey_display} {age_display} "
+                f"matches Row {first_row_num}. "
+                f"Players are matched by name + jersey number (age group is ignored). "
+                f"If the same athlete plays in multiple age groups, use a different jersey number or add a suffix to the name. "
+            )
             
-            if previous_state:
-                players_matched += 1
-                updated_players += 1
+            # Add contextual tip based on scenario
+            if num is None:
+                error_msg += "TIP: Assign unique jersey numbers to differentiate players with the same name."
+            elif age_group and first_age_group and age_group != first_age_group:
+                error_msg += f"TIP: Age groups differ ({first_age_group} vs {age_group}) but same name+number still creates a duplicate. Change the jersey number or merge into a single row."
             else:
-                created_players += 1
-                # Also log why it might have failed - check if we tried to fetch it?
-                if player_id not in ids_to_fetch and not incoming_ext_id:
-                     pass
-
-            undo_log.append({
-                "player_id": player_id,
-                "previous_data": previous_state # None if didn't exist, dict if existed
+                error_msg += "TIP: Remove this duplicate row or assign a different jersey number."
+            
+            errors.append({
+                "row": idx + 1, 
+                "message": error_msg,
+                "data": player,
+                "duplicate_of_row": first_row_num,
+                "identity_key": {
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "jersey_number": num
+                }
             })
+            continue
+        
+        # Store first occurrence with player data for context
+        seen_keys[key] = [idx + 1, player.get("age_group")]
 
-            full_name = f"{first_name} {last_name}".strip()
-            
-            # BASE PLAYER DATA
-            player_data = {
-                "name": full_name,
-                "first": first_name,
-                "last": last_name,
-                "number": num,
-                "age_group": (str(player.get("age_group")).strip() if str(player.get("age_group") or "").strip() != "" else None),
-                "external_id": (player.get("external_id") or None),
-                "team_name": (player.get("team_name") or None),
-                "position": (player.get("position") or None),
-                "notes": (player.get("notes") or None),
-                "photo_url": None,
-                "event_id": event_id,
-                "created_at": datetime.utcnow().isoformat(),
-                "scores": {} # Start with empty scores
-            }
-            player_data.update(_derive_household_and_buddy_fields(player))
-
-            # PROCESS DYNAMIC SCORES
-            
-            # 1. Start with existing scores if we are merging (or overwrite if empty)
-            scores = {}
-            if previous_state and previous_state.get("scores"):
-                scores = previous_state.get("scores").copy()
-            
-            # 2. Extract incoming scores from payload
-            incoming_scores = {}
-            
-            # 2a. Check nested 'scores' dict first (highest priority if present)
-            if player.get("scores") and isinstance(player.get("scores"), dict):
-                incoming_scores.update(player.get("scores"))
-                
-            # 2b. Check flat keys for any drills in the schema (merges/overrides)
-            # This handles the "flat" payload sent by the frontend importer
-            for drill_key in drill_fields:
-                # Explicit check for existence in top-level dict (handles None/0/empty string if key exists)
-                if drill_key in player:
-                    val = player.get(drill_key)
-                    # Only add if not None (allow 0 or empty string to be processed by validation logic)
-                    if val is not None:
-                        incoming_scores[drill_key] = val
-            
-            # Debug log for first player to diagnose why scores might be dropped
-            if idx == 0 and len(incoming_scores) == 0 and len(drill_fields) > 0:
-                 # Only warn if we expected scores but found none
-                 pass
-
-            # 3. Process and validate all incoming scores
-            for drill_key, raw_val in incoming_scores.items():
-                if raw_val is not None and str(raw_val).strip() != "":
-                    try:
-                        val_float = float(raw_val)
-                        scores[drill_key] = val_float
-                        
-                        # Only count as "written" if it's in the current schema or we want to track all?
-                        # Let's track all valid numbers written to 'scores'
-                        scores_written_total += 1
-                        scores_written_by_drill[drill_key] += 1
-                        
-                        # Also set legacy field for football compatibility if it matches
-                        if drill_key in ["40m_dash", "vertical_jump", "catching", "throwing", "agility"]:
-                            player_data[drill_key] = val_float
-                    except (ValueError, TypeError):
-                        pass
-            
-            player_data["scores"] = scores
-            
-            # DEBUG: Log first player storage data
-            if idx == 0:
-                logging.info(f"[STORAGE] Row 1 player_data being written:")
-                logging.info(f"[STORAGE]   - player_id: {player_id}")
-                logging.info(f"[STORAGE]   - name: {player_data.get('name')}")
-                logging.info(f"[STORAGE]   - first: {player_data.get('first')}")
-                logging.info(f"[STORAGE]   - last: {player_data.get('last')}")
-                logging.info(f"[STORAGE]   - number: {player_data.get('number')}")
-                logging.info(f"[STORAGE]   - age_group: {player_data.get('age_group')}")
-                logging.info(f"[STORAGE]   - scores keys: {list(player_data.get('scores', {}).keys())}")
-                logging.info(f"[STORAGE]   - operation: {'UPDATE (merge with existing)' if previous_state else 'CREATE (new player)'}")
-            
-            # --- IMPROVED DUPLICATE HANDLING (MERGE LOGIC) ---
-            # Strategy: 'overwrite' (default) or 'merge'
-            strategy = player.get("merge_strategy", "overwrite")
+        # Record Undo State
+        # previous_state is already set above
+        
+        # --- SCORES ONLY MODE CHECK ---
+        if mode == "scores_only" and not previous_state:
+            # In scores_only mode, we strictly require the player to exist
+            errors.append({"row": idx + 1, "message": f"Player match not found for {first_name} {last_name} (#{num}). strictly requiring existing player."})
+            continue
+        
+        if previous_state:
+            state["players_matched"] += 1
+            state["updated_players"] += 1
+        else:
+            state["created_players"] += 1
+
+        undo_entries.append({
+            "player_id": player_id,
+            "previous_data": previous_state # None if didn't exist, dict if existed
+        })
+
+        full_name = f"{first_name} {last_name}".strip()
+        
+        # BASE PLAYER DATA
+        player_data = {
+            "name": full_name,
+            "first": first_name,
+            "last": last_name,
+            "number": num,
+            "age_group": (str(player.get("age_group")).strip() if str(player.get("age_group") or "").strip() != "" else None),
+            "external_id": (player.get("external_id") or None),
+            "team_name": (player.get("team_name") or None),
+            "position": (player.get("position") or None),
+            "notes": (player.get("notes") or None),
+            "photo_url": None,
+            "event_id": event_id,
+            "created_at": datetime.utcnow().isoformat(),
+            "scores": {} # Start with empty scores
+        }
+        player_data.update(_derive_household_and_buddy_fields(player))
+
+        # PROCESS DYNAMIC SCORES
+        
+        # 1. Start with existing scores if we are merging (or overwrite if empty)
+        scores = {}
+        if previous_state and previous_state.get("scores"):
+            scores = previous_state.get("scores").copy()
+        
+        # 2. Extract incoming scores from payload
+        incoming_scores = {}
+        
+        # 2a. Check nested 'scores' dict first (highest priority if present)
+        if player.get("scores") and isinstance(player.get("scores"), dict):
+            incoming_scores.update(player.get("scores"))
             
-            if strategy == "merge" or (req.mode == "scores_only" and previous_state):
-                if previous_state and "created_at" in previous_state:
-                    del player_data["created_at"]
-                
-                # New Logic for Scores Only: Strictly preserve identity fields
-                if req.mode == "scores_only":
-                    # Keep only scores and non-identity fields from payload
-                    identity_fields = [
-                        "name",
-                        "first",
-                        "last",
-                        "number",
-                        "age_group",
-                        "team_name",
-                        "position",
-                        "photo_url",
-                        "external_id",
-                        "buddyRequestRaw",
-                        "buddyRequestNormalized",
-                        "siblingGroupId",
-                        "forceSameTeamWithSibling",
-                        "siblingSeparationRequested",
-                        "siblingInferenceSignals",
-                        "siblingInferenceSuspicious",
-                        "siblingInferenceSuspicionReasons",
-                        "siblingGroupSize",
-                        "parentFirstName",
-                        "parentLastName",
-                        "parentLastNameNormalized",
-                        "parentEmail",
-                        "parentEmailNormalized",
-                        "cellPhone",
-                        "cellPhoneNormalized",
-                        "street",
-                        "streetNormalized",
-                    ]
-                    for f in identity_fields:
-                        if f in player_data:
-                            del player_data[f]
-                
-                # For merge, we need to be careful not to overwrite the whole 'scores' map with a partial one
-                # Logic above already handled merging scores into existing dictionary
-                
-                # Filter out None values from payload
-                player_data = {k: v for k, v in player_data.items() if v is not None}
-
-            player_ref = db.collection("events").document(event_id).collection("players").document(player_id)
-            batch.set(player_ref, player_data, merge=True)
-            batch_count += 1
-            added += 1
-
-            # Commit batch every 400 operations
-            if batch_count >= 400:
-                execute_with_timeout(lambda: batch.commit(), timeout=10)
-                batch = db.batch()
-                batch_count = 0
-
-        # Commit remaining
-        if batch_count > 0:
-            execute_with_timeout(lambda: batch.commit(), timeout=10)
-
-        # Recompute sibling groups against the full event roster so partial uploads
-        # still converge to consistent family group assignments.
-        _recalculate_sibling_groups(event_id)
+        # 2b. Check flat keys for any drills in the schema (merges/overrides)
+        # This handles the "flat" payload sent by the frontend importer
+        for drill_key in drill_fields:
+            # Explicit check for existence in top-level dict (handles None/0/empty string if key exists)
+            if drill_key in player:
+                val = player.get(drill_key)
+                # Only add if not None (allow 0 or empty string to be processed by validation logic)
+                if val is not None:
+                    incoming_scores[drill_key] = val
+        
+        # Debug log for first player to diagnose why scores might be dropped
+        if idx == 0 and len(incoming_scores) == 0 and len(drill_fields) > 0:
+             # Only warn if we expected scores but found none
+             pass
+
+        # 3. Process and validate all incoming scores
+        for drill_key, raw_val in incoming_scores.items():
+            if raw_val is not None and str(raw_val).strip() != "":
+                try:
+                    val_float = float(raw_val)
+                    scores[drill_key] = val_float
+                    
+                    # Only count as "written" if it's in the current schema or we want to track all?
+                    # Let's track all valid numbers written to 'scores'
+                    state["scores_written_total"] += 1
+                    scores_written_by_drill[drill_key] = scores_written_by_drill.get(drill_key, 0) + 1
+                    
+                    # Also set legacy field for football compatibility if it matches
+                    if drill_key in ["40m_dash", "vertical_jump", "catching", "throwing", "agility"]:
+                        player_data[drill_key] = val_float
+                except (ValueError, TypeError):
+                    pass
         
-        # --- DETAILED IMPORT SUMMARY FOR DEBUGGING ---
-        logging.info(f"[IMPORT_SUMMARY] Event {event_id}: {scores_written_total} total scores written across {len(scores_written_by_drill)} drills")
-        for drill_key, count in scores_written_by_drill.items():
-            logging.info(f"  - {drill_key}: {count} scores")
+        player_data["scores"] = scores
         
-        # Log any drills that were expected but not received
-        # Use unified check logic against ALL processed rows to be accurate
-        # But here we only have aggregate counts.
-        # If scores_written_by_drill is empty, it means NO valid scores were parsed.
+        # DEBUG: Log first player storage data
+        if idx == 0:
+            logging.info(f"[STORAGE] Row 1 player_data being written:")
+            logging.info(f"[STORAGE]   - player_id: {player_id}")
+            logging.info(f"[STORAGE]   - name: {player_data.get('name')}")
+            logging.info(f"[STORAGE]   - first: {player_data.get('first')}")
+            logging.info(f"[STORAGE]   - last: {player_data.get('last')}")
+            logging.info(f"[STORAGE]   - number: {player_data.get('number')}")
+            logging.info(f"[STORAGE]   - age_group: {player_data.get('age_group')}")
+            logging.info(f"[STORAGE]   - scores keys: {list(player_data.get('scores', {}).keys())}")
+            logging.info(f"[STORAGE]   - operation: {'UPDATE (merge with existing)' if previous_state else 'CREATE (new player)'}")
         
-        expected_drills = set(drill_fields)
-        received_drills = set(scores_written_by_drill.keys())
-        missing_drills = expected_drills - received_drills
+        # --- IMPROVED DUPLICATE HANDLING (MERGE LOGIC) ---
+        # Strategy: 'overwrite' (default) or 'merge'
+        strategy = player.get("merge_strategy", "overwrite")
         
-        # Suppress warning if at least some scores were written, unless specific debugging is needed
-        if missing_drills and scores_written_total == 0:
-            logging.warning(f"[IMPORT_WARNING] Expected drill keys not received in any player data: {missing_drills}")
-            logging.warning(f"[IMPORT_WARNING] This could mean: 1) No players had scores for these drills, 2) CSV columns weren't mapped correctly, or 3) Column names didn't match drill keys/labels")
-            # Add detail about first row keys
-            if len(players) > 0:
-                 logging.warning(f"[IMPORT_WARNING] First row keys for debugging: {list(players[0].keys())}")
-        elif missing_drills:
-             # Just info log if we have some data but not all drills (common partial import case)
-             logging.info(f"[IMPORT_INFO] Some drills were not present in this import: {missing_drills}")
+        if strategy == "merge" or (mode == "scores_only" and previous_state):
+            if previous_state and "created_at" in previous_state:
+                del player_data["created_at"]
             
-        # --- IMPORT AUDIT LOG ---
-        try:
-            import_log_ref = db.collection("events").document(event_id).collection("imports").document()
-            log_entry = {
-                "id": import_log_ref.id,
-                "event_id": event_id,
-                "user_id": current_user["uid"] if current_user else "unknown",
-                "timestamp": datetime.utcnow().isoformat(),
-                "rows_imported": added,
-                "rows_skipped": req.skipped_count or len(errors),
-                "method": req.method,
-                "filename": req.filename,
-                "undo_available": True,
-                "errors_count": len(errors)
-            }
-            execute_with_timeout(lambda: import_log_ref.set(log_entry), timeout=5)
-        except Exception as e:
-            logging.error(f"Failed to write import audit log: {e}")
+            # New Logic for Scores Only: Strictly preserve identity fields
+            if mode == "scores_only":
+                # Keep only scores and non-identity fields from payload
+                identity_fields = [
+                    "name",
+                    "first",
+                    "last",
+                    "number",
+                    "age_group",
+                    "team_name",
+                    "position",
+                    "photo_url",
+                    "external_id",
+                    "buddyRequestRaw",
+                    "buddyRequestNormalized",
+                    "siblingGroupId",
+                    "forceSameTeamWithSibling",
+                    "siblingSeparationRequested",
+                    "siblingInferenceSignals",
+                    "siblingInferenceSuspicious",
+                    "siblingInferenceSuspicionReasons",
+                    "siblingGroupSize",
+                    "parentFirstName",
+                    "parentLastName",
+                    "parentLastNameNormalized",
+                    "parentEmail",
+                    "parentEmailNormalized",
+                    "cellPhone",
+                    "cellPhoneNormalized",
+                    "street",
+                    "streetNormalized",
+                ]
+                for f in identity_fields:
+                    if f in player_data:
+                        del player_data[f]
             
-        # FINAL SUMMARY LOG
-        logging.info(f"[UPLOAD_COMPLETE] ═══════════════════════════════════════")
-        logging.info(f"[UPLOAD_COMPLETE] Event: {event_id}")
-        logging.info(f"[UPLOAD_COMPLETE] Mode: {req.mode}")
-        logging.info(f"[UPLOAD_COMPLETE] Players received: {len(players)}")
-        logging.info(f"[UPLOAD_COMPLETE] Created (new): {created_players}")
-        logging.info(f"[UPLOAD_COMPLETE] Updated (existing): {updated_players}")
-        logging.info(f"[UPLOAD_COMPLETE] Errors/Rejected: {len(errors)}")
-        logging.info(f"[UPLOAD_COMPLETE] Total scores written: {scores_written_total}")
-        logging.info(f"[UPLOAD_COMPLETE] ═══════════════════════════════════════")
+            # For merge, we need to be careful not to overwrite the whole 'scores' map with a partial one
+            # Logic above already handled merging scores into existing dictionary
+            
+            # Filter out None values from payload
+            player_data = {k: v for k, v in player_data.items() if v is not None}
+
+        player_ref = db.collection("events").document(event_id).collection("players").document(player_id)
+        writes.append(("merge", player_ref, player_data))
+        state["added"] += 1
+
+    state["undo_log"].extend(undo_entries)
+    return writes, undo_entries
+
+
+def finalize_upload(
+    *,
+    event_id: str,
+    mode: str,
+    drill_fields: List[str],
+    state: Dict[str, Any],
+    players_received: int,
+    first_row_keys: List[str],
+    current_user: Optional[Dict[str, Any]],
+    method: Optional[str],
+    filename: Optional[str],
+    skipped_count: Optional[int],
+) -> Dict[str, Any]:
+    """Sibling recalculation, audit log and the upload response body."""
+    errors = state["errors"]
+    added = state["added"]
+    scores_written_total = state["scores_written_total"]
+    scores_written_by_drill = defaultdict(int, state["scores_written_by_drill"])
+
+    # Recompute sibling groups for the households the uploaded rows belong (or
+    # belonged) to; their full components are loaded, so the result matches a
+    # recalculation over the whole roster.
+    undo_log = state["undo_log"]
+    _recalculate_sibling_groups(
+        event_id,
+        touched_player_ids=[entry["player_id"] for entry in undo_log],
+        previous_states=[entry["previous_data"] for entry in undo_log if entry["previous_data"]],
+    )
+    
+    # --- DETAILED IMPORT SUMMARY FOR DEBUGGING ---
+    logging.info(f"[IMPORT_SUMMARY] Event {event_id}: {scores_written_total} total scores written across {len(scores_written_by_drill)} drills")
+    for drill_key, count in scores_written_by_drill.items():
+        logging.info(f"  - {drill_key}: {count} scores")
+    
+    # Log any drills that were expected but not received
+    # Use unified check logic against ALL processed rows to be accurate
+    # But here we only have aggregate counts.
+    # If scores_written_by_drill is empty, it means NO valid scores were parsed.
+    
+    expected_drills = set(drill_fields)
+    received_drills = set(scores_written_by_drill.keys())
+    missing_drills = expected_drills - received_drills
+    
+    # Suppress warning if at least some scores were written, unless specific debugging is needed
+    if missing_drills and scores_written_total == 0:
+        logging.warning(f"[IMPORT_WARNING] Expected drill keys not received in any player data: {missing_drills}")
+        logging.warning(f"[IMPORT_WARNING] This could mean: 1) No players had scores for these drills, 2) CSV columns weren't mapped correctly, or 3) Column names didn't match drill keys/labels")
+        # Add detail about first row keys
+        if players_received > 0:
+             logging.warning(f"[IMPORT_WARNING] First row keys for debugging: {first_row_keys}")
+    elif missing_drills:
+         # Just info log if we have some data but not all drills (common partial import case)
+         logging.info(f"[IMPORT_INFO] Some drills were not present in this import: {missing_drills}")
         
-        return {
-            "added": added, 
-            "created_players": created_players,
-            "updated_players": updated_players,
-            "rejected_count": len(errors),  # NEW: Count of rejected rows for UX clarity
-            "rejected_rows": errors,         # NEW: Full error details with row numbers and context
-            "errors": errors,                # Keep for backward compatibility
-            "undo_log": undo_log,
-            "players_received": len(players),
-            "players_matched": players_matched,
-            "scores_written_total": scores_written_total,
-            "scores_written_by_drill": scores_written_by_drill
+    # --- IMPORT AUDIT LOG ---
+    try:
+        import_log_ref = db.collection("events").document(event_id).collection("imports").document()
+        log_entry = {
+            "id": import_log_ref.id,
+            "event_id": event_id,
+            "user_id": current_user["uid"] if current_user else "unknown",
+            "timestamp": datetime.utcnow().isoformat(),
+            "rows_imported": added,
+            "rows_skipped": skipped_count or len(errors),
+            "method": method,
+            "filename": filename,
+            "undo_available": True,
+            "errors_count": len(errors)
         }
+        execute_with_timeout(lambda: import_log_ref.set(log_entry), timeout=5)
+    except Exception as e:
+        logging.error(f"Failed to write import audit log: {e}")
+        
+    # FINAL SUMMARY LOG
+    logging.info(f"[UPLOAD_COMPLETE] ═══════════════════════════════════════")
+    logging.info(f"[UPLOAD_COMPLETE] Event: {event_id}")
+    logging.info(f"[UPLOAD_COMPLETE] Mode: {mode}")
+    logging.info(f"[UPLOAD_COMPLETE] Players received: {players_received}")
+    logging.info(f"[UPLOAD_COMPLETE] Created (new): {state['created_players']}")
+    logging.info(f"[UPLOAD_COMPLETE] Updated (existing): {state['updated_players']}")
+    logging.info(f"[UPLOAD_COMPLETE] Errors/Rejected: {len(errors)}")
+    logging.info(f"[UPLOAD_COMPLETE] Total scores written: {scores_written_total}")
+    logging.info(f"[UPLOAD_COMPLETE] ═══════════════════════════════════════")
+    
+    return {
+        "added": added, 
+        "created_players": state["created_players"],
+        "updated_players": state["updated_players"],
+        "rejected_count": len(errors),  # NEW: Count of rejected rows for UX clarity
+        "rejected_rows": errors,         # NEW: Full error details with row numbers and context
+        "errors": errors,                # Keep for backward compatibility
+        "undo_log": state["undo_log"],
+        "players_received": players_received,
+        "players_matched": state["players_matched"],
+        "scores_written_total": scores_written_total,
+        "scores_written_by_drill": scores_written_by_drill
+    }
+
+
+def upload_players_service(*, request: Request, req: Any, current_user: Dict[str, Any]):
+    try:
+        context = prepare_upload(req=req, current_user=current_user)
+        event_id = context["event_id"]
+        players = req.players
+
+        state = new_upload_state()
+        writes, _ = process_upload_rows(
+            event_id=event_id,
+            mode=context["mode"],
+            drill_fields=context["drill_fields"],
+            players=players,
+            start_index=0,
+            state=state,
+        )
+        execute_with_timeout(
+            lambda: commit_batched_writes(db, writes, operation="players.upload"),
+            timeout=30,
+        )
+        bump_roster_version(event_id)
+
+        return finalize_upload(
+            event_id=event_id,
+            mode=context["mode"],
+            drill_fields=context["drill_fields"],
+            state=state,
+            players_received=len(players),
+            first_row_keys=context["first_row_keys"],
+            current_user=current_user,
+            method=req.method,
+            filename=req.filename,
+            skipped_count=req.skipped_count,
+        )
     except HTTPException:
         raise
     except Exception as e:
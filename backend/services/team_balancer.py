@@ -0,0 +1,410 @@
+"""Balanced team generation for drafts that skip the live draft.
+
+Players are grouped into assignment units (forced sibling groups stay
+together), seeded greedily onto teams, then improved with a local search of
+unit moves and swaps until the time budget runs out or no move helps.
+
+The objective mirrors the live draft rules: minimise the gap between the
+highest and lowest team composite average (the figure checked by the
+composite balance rule) while rewarding satisfied buddy requests. Team caps
+are hard limits; pinned units (pre-slots) never move.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# One satisfied buddy request is worth this many points of composite-average
+# gap; matches the direct buddy bonus auto-pick applies.
+BUDDY_MATCH_WEIGHT = 0.5
+# Uneven team sizes are penalised so the search does not trade roster size for
+# a better average.
+SIZE_SPREAD_WEIGHT = 5.0
+DEFAULT_TIME_BUDGET_SECONDS = 1.5
+_EPSILON = 1e-9
+
+
+class _Balancer:
+    def __init__(
+        self,
+        *,
+        players: Dict[str, dict],
+        team_ids: Sequence[str],
+        team_cap: Optional[int],
+        pinned: Dict[str, str],
+        composite_for: Callable[[dict], float],
+        normalize_name: Callable[[Optional[str]], Optional[str]],
+        buddy_weight: float,
+        rng: random.Random,
+    ):
+        self.team_ids = list(team_ids)
+        self.rng = rng
+        self.buddy_weight = buddy_weight
+        team_total = len(self.team_ids)
+        team_index = {team_id: t for t, team_id in enumerate(self.team_ids)}
+
+        # Units: forced sibling groups become one unit, everyone else alone.
+        group_units: Dict[str, int] = {}
+        self.unit_players: List[List[str]] = []
+        for pid in sorted(players):
+            pdata = players[pid] or {}
+            group = pdata.get("siblingGroupId")
+            if group and bool(pdata.get("forceSameTeamWithSibling")):
+                if group not in group_units:
+                    group_units[group] = len(self.unit_players)
+                    self.unit_players.append([])
+                self.unit_players[group_units[group]].append(pid)
+            else:
+                self.unit_players.append([pid])
+
+        unit_total = len(self.unit_players)
+        self.unit_size = [len(members) for members in self.unit_players]
+        self.unit_score = [
+            sum(composite_for(players[pid] or {}) for pid in members)
+            for members in self.unit_players
+        ]
+
+        # Pre-slots pin the whole unit; conflicting pins keep the first team.
+        self.unit_pinned: List[Optional[int]] = [None] * unit_total
+        for u, members in enumerate(self.unit_players):
+            for pid in members:
+                t = team_index.get(pinned.get(pid))
+                if t is not None and self.unit_pinned[u] is None:
+                    self.unit_pinned[u] = t
+
+        # Buddy bookkeeping by interned normalised name.
+        name_ids: Dict[str, int] = {}
+
+        def _intern(value: Optional[str]) -> int:
+            normalized = normalize_name(value)
+            if not normalized:
+                return -1
+            return name_ids.setdefault(normalized, len(name_ids))
+
+        # (name_id, buddy_id) per member; requesters_by_name lists the units
+        # whose members ask for that name.
+        self.unit_people: List[List[tuple]] = []
+        for members in self.unit_players:
+            self.unit_people.append(
+                [
+                    (
+                        _intern((players[pid] or {}).get("name")),
+                        _intern((players[pid] or {}).get("buddyRequestNormalized")),
+                    )
+                    for pid in members
+                ]
+            )
+        self.requesters_by_name: Dict[int, List[int]] = {}
+        for u, people in enumerate(self.unit_people):
+            for _, buddy in people:
+                if buddy >= 0:
+                    self.requesters_by_name.setdefault(buddy, []).append(u)
+
+        player_total = sum(self.unit_size)
+        even_size = math.ceil(player_total / team_total) if team_total else 0
+        self.hard_cap = team_cap is not None
+        self.size_limit = team_cap if team_cap is not None else even_size
+
+        self.unit_team: List[int] = [-1] * unit_total
+        self.team_units: List[set] = [set() for _ in range(team_total)]
+        self.team_count = [0] * team_total
+        self.team_sum = [0.0] * team_total
+        self.team_names: List[Dict[int, int]] = [{} for _ in range(team_total)]
+
+    # -- state changes ------------------------------------------------------
+
+    def _place(self, u: int, t: int) -> None:
+        self.unit_team[u] = t
+        self.team_units[t].add(u)
+        self.team_count[t] += self.unit_size[u]
+        self.team_sum[t] += self.unit_score[u]
+        names = self.team_names[t]
+        for name, _ in self.unit_people[u]:
+            if name >= 0:
+                names[name] = names.get(name, 0) + 1
+
+    def _remove(self, u: int) -> None:
+        t = self.unit_team[u]
+        self.unit_team[u] = -1
+        self.team_units[t].discard(u)
+        self.team_count[t] -= self.unit_size[u]
+        self.team_sum[t] -= self.unit_score[u]
+        names = self.team_names[t]
+        for name, _ in self.unit_people[u]:
+            if name >= 0:
+                names[name] -= 1
+
+    # -- objective ----------------------------------------------------------
+
+    def _unit_matches(self, u: int) -> int:
+        t = self.unit_team[u]
+        if t < 0:
+            return 0
+        names = self.team_names[t]
+        return sum(1 for _, buddy in self.unit_people[u] if buddy >= 0 and names.get(buddy, 0) == 1)
+
+    def _affected_units(self, units: Sequence[int]) -> set:
+        affected = set(units)
+        for u in units:
+            for name, _ in self.unit_people[u]:
+                if name >= 0:
+                    affected.update(self.requesters_by_name.get(name, ()))
+        return affected
+
+    def buddy_matches(self) -> int:
+        return sum(self._unit_matches(u) for u in range(len(self.unit_players)))
+
+    def gap(self) -> float:
+        averages = [s / c for s, c in zip(self.team_sum, self.team_count) if c > 0]
+        if len(averages) < 2:
+            return 0.0
+        return max(averages) - min(averages)
+
+    def _shape_cost(self) -> float:
+        counts = self.team_count
+        return self.gap() + SIZE_SPREAD_WEIGHT * (max(counts) - min(counts))
+
+    # -- seeding ------------------------------------------------------------
+
+    def seed(self) -> List[int]:
+        """Greedy seeding; returns units that fit nowhere under a hard cap."""
+        unplaced: List[int] = []
+        for u, t in enumerate(self.unit_pinned):
+            if t is not None:
+                self._place(u, t)
+
+        # Strongest units first onto the smallest, then weakest, team keeps
+        # sums level the same way a snake draft does.
+        order = sorted(
+            (u for u in range(len(self.unit_players)) if self.unit_pinned[u] is None),
+            key=lambda u: (-self.unit_size[u], -self.unit_score[u] / self.unit_size[u], u),
+        )
+        for u in order:
+            candidates = [
+                t
+                for t in range(len(self.team_ids))
+                if self.team_count[t] + self.unit_size[u] <= self.size_limit
+            ]
+            if not candidates:
+                if self.hard_cap:
+                    unplaced.append(u)
+                    continue
+                candidates = list(range(len(self.team_ids)))
+            best = min(
+                candidates,
+                key=lambda t: (
+                    self.team_count[t],
+                    -self._buddy_pull(u, t),
+                    self.team_sum[t],
+                    t,
+                ),
+            )
+            self._place(u, best)
+        return unplaced
+
+    def _buddy_pull(self, u: int, t: int) -> int:
+        names = self.team_names[t]
+        pull = sum(1 for _, buddy in self.unit_people[u] if buddy >= 0 and names.get(buddy, 0) == 1)
+        for name, _ in self.unit_people[u]:
+            for r in self.requesters_by_name.get(name, ()):
+                if self.unit_team[r] == t:
+                    pull += 1
+        return pull
+
+    # -- local search -------------------------------------------------------
+
+    def _fits(self, t: int, delta: int) -> bool:
+        if delta <= 0:
+            return True
+        limit = self.size_limit if self.hard_cap else self.size_limit + max(self.unit_size)
+        return self.team_count[t] + delta <= limit
+
+    def _try_move(self, moves: List[tuple], cost_before: float) -> Optional[float]:
+        """Apply ``[(unit, team), ...]``; keep it when the cost drops."""
+        units = [u for u, _ in moves]
+        affected = self._affected_units(units)
+        matches_before = sum(self._unit_matches(a) for a in affected)
+        origins = [(u, self.unit_team[u]) for u in units]
+        for u in units:
+            self._remove(u)
+        for u, t in moves:
+            self._place(u, t)
+        matches_after = sum(self._unit_matches(a) for a in affected)
+        cost = self._shape_cost() - self.buddy_weight * (matches_after - matches_before)
+        if cost < cost_before - _EPSILON:
+            return self._shape_cost()
+        for u in units:
+            self._remove(u)
+        for u, t in origins:
+            self._place(u, t)
+        return None
+
+    def _movable(self, t: int) -> List[int]:
+        return [u for u in self.team_units[t] if self.unit_pinned[u] is None]
+
+    def _balance_step(self, cost: float) -> Optional[float]:
+        """Best swap or move between the highest- and lowest-average teams."""
+        populated = [t for t in range(len(self.team_ids)) if self.team_count[t] > 0]
+        if len(populated) < 2:
+            return None
+        ranked = sorted(populated, key=lambda t: self.team_sum[t] / self.team_count[t])
+        partners = ranked[1:4] + ranked[-4:-1]
+        pairs = [(ranked[-1], ranked[0])]
+        pairs += [(ranked[-1], p) for p in partners] + [(p, ranked[0]) for p in partners]
+        for hi, lo in pairs:
+            if hi == lo:
+                continue
+            options = []
+            hi_units = self._movable(hi)
+            lo_units = self._movable(lo)
+            hi_avg = self.team_sum[hi] / self.team_count[hi]
+            lo_avg = self.team_sum[lo] / self.team_count[lo]
+            for x in hi_units:
+                for y in lo_units:
+                    delta = self.unit_size[y] - self.unit_size[x]
+                    if not self._fits(hi, delta) or not self._fits(lo, -delta):
+                        continue
+                    new_hi = (self.team_sum[hi] - self.unit_score[x] + self.unit_score[y]) / (
+                        self.team_count[hi] + delta
+                    )
+                    new_lo = (self.team_sum[lo] + self.unit_score[x] - self.unit_score[y]) / (
+                        self.team_count[lo] - delta
+                    )
+                    spread = abs(new_hi - new_lo)
+                    if spread < hi_avg - lo_avg - _EPSILON:
+                        options.append((spread, x, y))
+            for x in hi_units:
+                if self.team_count[hi] > self.unit_size[x] and self._fits(lo, self.unit_size[x]):
+                    options.append((None, x, None))
+            options.sort(key=lambda o: (o[0] is None, o[0] or 0.0, o[1], o[2] or 0))
+            for _, x, y in options[:8]:
+                moves = [(x, lo)] if y is None else [(x, lo), (y, hi)]
+                result = self._try_move(moves, cost)
+                if result is not None:
+                    return result
+        return None
+
+    def _buddy_step(self, cost: float) -> Optional[float]:
+        """Try to bring one unmatched buddy requester onto their buddy's team."""
+        # Units the hard cap left unplaced have no team to move from.
+        unmatched = [
+            u
+            for u, people in enumerate(self.unit_people)
+            if self.unit_pinned[u] is None
+            and self.unit_team[u] >= 0
+            and any(buddy >= 0 for _, buddy in people)
+            and self._unit_matches(u) == 0
+        ]
+        self.rng.shuffle(unmatched)
+        for u in unmatched[:16]:
+            targets = set()
+            for _, buddy in self.unit_people[u]:
+                if buddy < 0:
+                    continue
+                for t, names in enumerate(self.team_names):
+                    if names.get(buddy, 0) == 1 and t != self.unit_team[u]:
+                        targets.add(t)
+            origin = self.unit_team[u]
+            for t in sorted(targets):
+                if self._fits(t, self.unit_size[u]) and self.team_count[origin] > self.unit_size[u]:
+                    result = self._try_move([(u, t)], cost)
+                    if result is not None:
+                        return result
+                # Swap with the unit in t closest in score and size.
+                swaps = sorted(
+                    (
+                        abs(self.unit_score[v] - self.unit_score[u]),
+                        v,
+                    )
+                    for v in self._movable(t)
+                    if self._fits(t, self.unit_size[u] - self.unit_size[v])
+                    and self._fits(origin, self.unit_size[v] - self.unit_size[u])
+                )
+                for _, v in swaps[:4]:
+                    result = self._try_move([(u, t), (v, origin)], cost)
+                    if result is not None:
+                        return result
+        return None
+
+    def improve(self, deadline: float) -> int:
+        steps = 0
+        cost = self._shape_cost()
+        while time.perf_counter() < deadline:
+            result = self._balance_step(cost)
+            if result is None:
+                result = self._buddy_step(cost)
+            if result is None:
+                break
+            cost = result
+            steps += 1
+        return steps
+
+
+def generate_balanced_teams(
+    *,
+    players: Dict[str, dict],
+    team_ids: Sequence[str],
+    team_cap: Optional[int],
+    composite_for: Callable[[dict], float],
+    normalize_name: Callable[[Optional[str]], Optional[str]],
+    pinned: Optional[Dict[str, str]] = None,
+    time_budget_seconds: float = DEFAULT_TIME_BUDGET_SECONDS,
+    buddy_weight: float = BUDDY_MATCH_WEIGHT,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Assign ``players`` to ``team_ids``.
+
+    ``pinned`` maps player id -> team id for players that must stay put (the
+    whole sibling unit follows). Returns per-team player ids, players left over
+    when the hard cap leaves no room, and the achieved gap / buddy matches.
+    """
+    started = time.perf_counter()
+    if not team_ids:
+        raise ValueError("At least one team is required")
+
+    balancer = _Balancer(
+        players=players,
+        team_ids=team_ids,
+        team_cap=team_cap,
+        pinned=pinned or {},
+        composite_for=composite_for,
+        normalize_name=normalize_name,
+        buddy_weight=buddy_weight,
+        rng=random.Random(seed),
+    )
+    unplaced = balancer.seed()
+    seeded_gap = balancer.gap()
+    steps = balancer.improve(started + max(0.0, float(time_budget_seconds)))
+
+    teams: Dict[str, List[str]] = {team_id: [] for team_id in balancer.team_ids}
+    for u, t in enumerate(balancer.unit_team):
+        if t >= 0:
+            teams[balancer.team_ids[t]].extend(balancer.unit_players[u])
+    for player_ids in teams.values():
+        player_ids.sort(key=lambda pid: (-composite_for(players[pid] or {}), pid))
+
+    return {
+        "teams": teams,
+        "unassigned_player_ids": sorted(pid for u in unplaced for pid in balancer.unit_players[u]),
+        "composite_avg_gap": round(balancer.gap(), 4),
+        "seeded_composite_avg_gap": round(seeded_gap, 4),
+        "team_averages": {
+            team_id: round(balancer.team_sum[t] / balancer.team_count[t], 4)
+            if balancer.team_count[t]
+            else None
+            for t, team_id in enumerate(balancer.team_ids)
+        },
+        "buddy_matches": balancer.buddy_matches(),
+        "search_steps": steps,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+__all__ = [
+    "BUDDY_MATCH_WEIGHT",
+    "DEFAULT_TIME_BUDGET_SECONDS",
+    "generate_balanced_teams",
+]
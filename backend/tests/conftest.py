@@ -67,6 +67,8 @@ class FakeQuery:
             d = doc.to_dict() or {}
             if op == "==":
                 return d.get(field) == value
+            if op == "in":
+                return d.get(field) in (value or [])
             if op == ">":
                 try:
                     return d.get(field) is not None and d.get(field) > value
@@ -84,6 +86,19 @@ class FakeQuery:
     def limit(self, n):
         return FakeQuery(self._docs[:n])
 
+    def select(self, field_paths):
+        # Field mask: snapshots keep their ids but only the selected fields.
+        return FakeQuery(
+            [
+                FakeSnapshot(
+                    doc._store,
+                    doc._path,
+                    {k: v for k, v in (doc.to_dict() or {}).items() if k in field_paths},
+                )
+                for doc in self._docs
+            ]
+        )
+
     def stream(self):
         return list(self._docs)
 
@@ -158,6 +173,9 @@ class FakeCollection:
     def limit(self, n):
         return FakeQuery(self.stream()).limit(n)
 
+    def select(self, field_paths):
+        return FakeQuery(self.stream()).select(field_paths)
+
 
 class FakeBatch:
     def __init__(self):
@@ -252,6 +270,18 @@ class FakeFirestore:
         return [ref.get() for ref in doc_refs]
 
 
+@pytest.fixture(autouse=True)
+def isolated_content_caches(tmp_path, monkeypatch):
+    """Parsed-import and OCR cache entries must not leak between tests."""
+    monkeypatch.setenv("IMPORT_CACHE_DIR", str(tmp_path / "import_cache"))
+    monkeypatch.delenv("OCR_CACHE_DIR", raising=False)
+    from backend.utils.import_cache import clear_import_cache
+    from backend.utils.ocr import clear_ocr_cache
+
+    clear_import_cache()
+    clear_ocr_cache()
+
+
 @pytest.fixture()
 def fake_db():
     store = {}
@@ -312,6 +342,11 @@ def app_client(monkeypatch, fake_db):
             # Route modules import db directly; patch their local alias too.
             monkeypatch.setattr(module, "db", fake_db, raising=False)
 
+    # Every test gets a fresh fake store, so cached identity indexes are stale.
+    from backend.utils.identity_index import clear_identity_index_cache
+
+    clear_identity_index_cache()
+
     return TestClient(app)
 
 
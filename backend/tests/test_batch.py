@@ -11,3 +11,122 @@ def test_batch_events_by_ids(app_client, fake_db, coach_headers):
     results = r.json()["results"]
     assert results["event-1"]["success"] is True
     assert results["missing"]["success"] is False
+
+
+def test_bulk_cost_budget_is_debited_by_payload_size_per_user(
+    app_client, fake_db, coach_headers, organizer_headers, monkeypatch
+):
+    from backend.middleware.rate_limiting import RATE_LIMITS, limiter
+
+    fake_db.collection("leagues").document("league-1").set({"name": "L"})
+    fake_db.collection("events").document("event-1").set({"name": "E", "league_id": "league-1"})
+    monkeypatch.setitem(RATE_LIMITS, "bulk_cost", "5/minute")
+    limiter.reset()
+    try:
+        def fetch(headers, count):
+            return app_client.post(
+                "/api/batch/events-by-ids",
+                json={"event_ids": ["event-1"] * count},
+                headers=headers,
+            )
+
+        assert fetch(coach_headers, 3).status_code == 200
+        # Two requests, but 3 + 3 ids is over the 5-unit budget.
+        r = fetch(coach_headers, 3)
+        assert r.status_code == 429
+        assert r.json()["category"] == "rate_limit"
+        # Budgets are per user, not per IP/User-Agent.
+        assert fetch(organizer_headers, 3).status_code == 200
+        # Fixed-window counts the rejected hit too, so the coach stays limited.
+        assert fetch(coach_headers, 1).status_code == 429
+    finally:
+        limiter.reset()
+
+
+def test_bulk_payload_larger_than_budget_is_rejected(app_client, fake_db, coach_headers, monkeypatch):
+    from backend.middleware.rate_limiting import RATE_LIMITS, limiter
+
+    fake_db.collection("leagues").document("league-1").set({"name": "L"})
+    fake_db.collection("events").document("event-1").set({"name": "E", "league_id": "league-1"})
+    monkeypatch.setitem(RATE_LIMITS, "bulk_cost", "5/minute")
+    limiter.reset()
+    try:
+        r = app_client.post(
+            "/api/batch/events-by-ids",
+            json={"event_ids": ["event-1"] * 6},
+            headers=coach_headers,
+        )
+        assert r.status_code == 413
+        assert "bulk limit of 5 per minute" in r.json()["detail"]
+        # The oversize payload spent nothing.
+        r = app_client.post(
+            "/api/batch/events-by-ids",
+            json={"event_ids": ["event-1"] * 5},
+            headers=coach_headers,
+        )
+        assert r.status_code == 200, r.text
+    finally:
+        limiter.reset()
+
+
+def test_bulk_cost_is_checked_after_permissions(app_client, fake_db, coach_headers, monkeypatch):
+    from backend.middleware.rate_limiting import RATE_LIMITS, limiter
+
+    fake_db.collection("leagues").document("league-1").set({"name": "L"})
+    fake_db.collection("leagues").document("league-2").set({"name": "Other"})
+    fake_db.collection("events").document("event-1").set({"name": "E", "league_id": "league-1"})
+    fake_db.collection("events").document("event-2").set({"name": "X", "league_id": "league-2"})
+    monkeypatch.setitem(RATE_LIMITS, "bulk_cost", "5/minute")
+    limiter.reset()
+    try:
+        def fetch(event_id, count):
+            return app_client.post(
+                "/api/batch/events-by-ids", json={"event_ids": [event_id] * count}, headers=coach_headers
+            )
+
+        # Not a member of league-2: 403 first, whatever the payload size.
+        assert fetch("event-2", 6).status_code == 403
+        assert fetch("event-2", 4).status_code == 403
+        # Neither denied request spent the budget.
+        assert fetch("event-1", 5).status_code == 200
+    finally:
+        limiter.reset()
+
+
+def test_bulk_cost_storage_errors_fail_open(app_client, fake_db, coach_headers, monkeypatch):
+    from limits.storage import MemoryStorage
+    from limits.strategies import FixedWindowRateLimiter
+
+    from backend.middleware.rate_limiting import RATE_LIMITS, limiter
+
+    fake_db.collection("leagues").document("league-1").set({"name": "L"})
+    fake_db.collection("events").document("event-1").set({"name": "E", "league_id": "league-1"})
+    monkeypatch.setitem(RATE_LIMITS, "bulk_cost", "5/minute")
+
+    real_hit = limiter._limiter.hit
+
+    def unreachable_for_cost(item, *identifiers, **kwargs):
+        # Only the cost budget's storage calls fail; per-request limits still count.
+        if identifiers[-1].endswith(":cost"):
+            raise ConnectionError("storage down")
+        return real_hit(item, *identifiers, **kwargs)
+
+    monkeypatch.setattr(limiter._limiter, "hit", unreachable_for_cost)
+
+    def fetch(count):
+        return app_client.post(
+            "/api/batch/events-by-ids", json={"event_ids": ["event-1"] * count}, headers=coach_headers
+        )
+
+    # No fallback configured: the payload goes through uncharged.
+    assert fetch(5).status_code == 200
+    assert fetch(5).status_code == 200
+
+    # With a shared store, the in-memory fallback keeps enforcing the budget.
+    fallback = FixedWindowRateLimiter(MemoryStorage())
+    monkeypatch.setattr(limiter, "_in_memory_fallback_enabled", True)
+    monkeypatch.setattr(limiter, "_fallback_limiter", fallback)
+    monkeypatch.setattr(limiter, "_storage_dead", False)
+    assert fetch(5).status_code == 200
+    assert limiter._storage_dead is True
+    assert fetch(1).status_code == 429
@@ -0,0 +1,263 @@
+from backend.services import draft_events
+from backend.services.draft_events import (
+    empty_draft_state,
+    load_draft_state,
+    replay_draft_events,
+)
+
+
+def _seed_two_team_draft(fake_db, *, draft_id="log-draft", num_rounds=2):
+    fake_db.collection("drafts").document(draft_id).set(
+        {
+            "id": draft_id,
+            "name": "Log Draft",
+            "league_id": "league-1",
+            "created_by": "org-1",
+            "status": "active",
+            "draft_type": "snake",
+            "num_rounds": num_rounds,
+            "num_teams": 2,
+            "team_order": ["team-a", "team-b"],
+            "current_round": 1,
+            "current_pick": 1,
+            "current_team_id": "team-a",
+            "pick_timer_seconds": 0,
+            "pick_deadline": None,
+            "auto_pick_on_timeout": True,
+            "trades_enabled": True,
+            "trades_require_approval": False,
+            "event_id": None,
+            "event_ids": [],
+        }
+    )
+    for team_id in ("team-a", "team-b"):
+        fake_db.collection("draft_teams").document(team_id).set(
+            {"id": team_id, "draft_id": draft_id, "team_name": team_id, "coach_user_id": None}
+        )
+    for idx in range(1, 6):
+        fake_db.collection("draft_players").document(f"dp-{idx}").set(
+            {"id": f"dp-{idx}", "draft_id": draft_id, "name": f"Player {idx}"}
+        )
+    return fake_db.collection("drafts").document(draft_id)
+
+
+def _draft_pick_player_ids(fake_db, draft_id):
+    return sorted(
+        p.to_dict()["player_id"]
+        for p in fake_db.collection("draft_picks").where("draft_id", "==", draft_id).stream()
+    )
+
+
+def test_replay_applies_pick_undo_redo_and_trade():
+    pick_1 = {"id": "pick-1", "player_id": "p1", "team_id": "t1", "pick_number": 1}
+    pick_2 = {"id": "pick-2", "player_id": "p2", "team_id": "t2", "pick_number": 2}
+    events = [
+        {"seq": 1, "type": "pick", "payload": {"picks": [pick_1], "cursor_after": {"current_pick": 2}}},
+        {"seq": 2, "type": "pick", "payload": {"picks": [pick_2], "cursor_after": {"current_pick": 3}}},
+        {"seq": 3, "type": "undo", "payload": {"picks": [pick_2], "cursor_after": {"current_pick": 2}}},
+        {
+            "seq": 4,
+            "type": "redo",
+            "payload": {"undo_seq": 3, "picks": [pick_2], "cursor_after": {"current_pick": 3}},
+        },
+        {
+            "seq": 5,
+            "type": "trade",
+            "payload": {
+                "offering_player_id": "p1",
+                "offering_team_id": "t1",
+                "receiving_player_id": "p2",
+                "receiving_team_id": "t2",
+            },
+        },
+        {"seq": 6, "type": "pre_slot_add", "payload": {"team_id": "t1", "player_id": "p9"}},
+    ]
+
+    state = replay_draft_events(events)
+
+    assert state["seq"] == 6
+    assert state["cursor"] == {"current_pick": 3}
+    assert state["redo_event_seqs"] == []
+    assert {pid: p["team_id"] for pid, p in state["picks"].items()} == {
+        "pick-1": "t2",
+        "pick-2": "t1",
+    }
+    assert state["pre_slots"] == {"t1": ["p9"]}
+
+    # Replaying the tail on top of a snapshot gives the same state.
+    snapshot = replay_draft_events(events[:3])
+    assert snapshot["redo_event_seqs"] == [3]
+    assert replay_draft_events(events, snapshot) == state
+    assert replay_draft_events([], empty_draft_state())["seq"] == 0
+
+
+def test_pick_undo_redo_are_logged_and_replayable(app_client, fake_db, organizer_headers):
+    draft_ref = _seed_two_team_draft(fake_db)
+
+    for player_id in ("dp-1", "dp-2"):
+        r = app_client.post(
+            "/api/drafts/log-draft/picks", json={"player_id": player_id}, headers=organizer_headers
+        )
+        assert r.status_code == 200, r.text
+
+    r = app_client.post("/api/drafts/log-draft/picks/undo", headers=organizer_headers)
+    assert r.status_code == 200, r.text
+    assert _draft_pick_player_ids(fake_db, "log-draft") == ["dp-1"]
+    assert draft_ref.get().to_dict()["current_team_id"] == "team-b"
+
+    r = app_client.post("/api/drafts/log-draft/picks/redo", headers=organizer_headers)
+    assert r.status_code == 200, r.text
+    assert _draft_pick_player_ids(fake_db, "log-draft") == ["dp-1", "dp-2"]
+    draft = draft_ref.get().to_dict()
+    assert draft["current_pick"] == 3
+    assert draft["redo_event_seqs"] == []
+
+    r = app_client.post("/api/drafts/log-draft/picks/redo", headers=organizer_headers)
+    assert r.status_code == 400, r.text
+
+    r = app_client.get("/api/drafts/log-draft/events", headers=organizer_headers)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert [e["type"] for e in body["events"]] == ["pick", "pick", "undo", "redo"]
+    assert [e["seq"] for e in body["events"]] == [1, 2, 3, 4]
+    assert body["latest_seq"] == 4
+
+    r = app_client.get("/api/drafts/log-draft/events?after_seq=2", headers=organizer_headers)
+    assert [e["seq"] for e in r.json()["events"]] == [3, 4]
+
+    r = app_client.get("/api/drafts/log-draft/events/state", headers=organizer_headers)
+    assert r.status_code == 200, r.text
+    state = r.json()
+    assert sorted(p["player_id"] for p in state["picks"].values()) == ["dp-1", "dp-2"]
+    assert state["cursor"]["current_pick"] == 3
+
+
+def test_new_pick_clears_redo_stack(app_client, fake_db, organizer_headers):
+    draft_ref = _seed_two_team_draft(fake_db)
+    app_client.post("/api/drafts/log-draft/picks", json={"player_id": "dp-1"}, headers=organizer_headers)
+    app_client.post("/api/drafts/log-draft/picks/undo", headers=organizer_headers)
+    assert draft_ref.get().to_dict()["redo_event_seqs"] == [2]
+
+    r = app_client.post(
+        "/api/drafts/log-draft/picks", json={"player_id": "dp-3"}, headers=organizer_headers
+    )
+    assert r.status_code == 200, r.text
+    assert draft_ref.get().to_dict()["redo_event_seqs"] == []
+
+    r = app_client.post("/api/drafts/log-draft/picks/redo", headers=organizer_headers)
+    assert r.status_code == 400, r.text
+
+
+def test_rebuild_restores_corrupted_board_from_log(app_client, fake_db, organizer_headers):
+    draft_ref = _seed_two_team_draft(fake_db)
+    for player_id in ("dp-1", "dp-2", "dp-3"):
+        r = app_client.post(
+            "/api/drafts/log-draft/picks", json={"player_id": player_id}, headers=organizer_headers
+        )
+        assert r.status_code == 200, r.text
+    expected = draft_ref.get().to_dict()
+
+    # Simulate manual damage: a lost pick, a stray pick and a wrong cursor.
+    lost = next(
+        p for p in fake_db.collection("draft_picks").stream() if p.to_dict()["player_id"] == "dp-2"
+    )
+    lost.reference.delete()
+    fake_db.collection("draft_picks").document("stray").set(
+        {"id": "stray", "draft_id": "log-draft", "player_id": "dp-5", "team_id": "team-a", "event_seq": 2}
+    )
+    draft_ref.update({"current_pick": 1, "current_team_id": "team-a"})
+
+    r = app_client.post("/api/drafts/log-draft/events/rebuild", headers=organizer_headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["removed_picks"] == 1
+
+    assert _draft_pick_player_ids(fake_db, "log-draft") == ["dp-1", "dp-2", "dp-3"]
+    rebuilt = draft_ref.get().to_dict()
+    assert rebuilt["current_pick"] == expected["current_pick"]
+    assert rebuilt["current_team_id"] == expected["current_team_id"]
+
+
+def test_rebuild_keeps_picks_made_before_the_event_log(app_client, fake_db, organizer_headers):
+    draft_ref = _seed_two_team_draft(fake_db)
+    # Board state from before events were logged: two picks, no event_seq.
+    for number, (player_id, team_id) in enumerate((("dp-1", "team-a"), ("dp-2", "team-b")), 1):
+        fake_db.collection("draft_picks").document(f"legacy-{number}").set(
+            {
+                "id": f"legacy-{number}",
+                "draft_id": "log-draft",
+                "round": 1,
+                "pick_number": number,
+                "team_id": team_id,
+                "player_id": player_id,
+            }
+        )
+    draft_ref.update({"current_pick": 3, "current_team_id": "team-b", "current_round": 2})
+
+    r = app_client.post("/api/drafts/log-draft/picks", json={"player_id": "dp-3"}, headers=organizer_headers)
+    assert r.status_code == 200, r.text
+
+    r = app_client.post("/api/drafts/log-draft/events/rebuild", headers=organizer_headers)
+    assert r.status_code == 200, r.text
+    assert (r.json()["picks"], r.json()["removed_picks"], r.json()["preserved_picks"]) == (1, 0, 2)
+    assert _draft_pick_player_ids(fake_db, "log-draft") == ["dp-1", "dp-2", "dp-3"]
+
+
+def test_load_draft_state_persists_snapshot_and_replays_only_tail(
+    app_client, fake_db, organizer_headers, monkeypatch
+):
+    monkeypatch.setattr(draft_events, "SNAPSHOT_INTERVAL", 2)
+    draft_ref = _seed_two_team_draft(fake_db)
+    app_client.post("/api/drafts/log-draft/picks", json={"player_id": "dp-1"}, headers=organizer_headers)
+    monkeypatch.setattr(draft_events, "SNAPSHOT_INTERVAL", 1)
+    # Reading state never writes, even with snapshots overdue.
+    r = app_client.get("/api/drafts/log-draft/events/state", headers=organizer_headers)
+    assert r.status_code == 200, r.text
+    assert "event_snapshot_seq" not in draft_ref.get().to_dict()
+    assert list(draft_ref.collection("event_snapshots").stream()) == []
+    monkeypatch.setattr(draft_events, "SNAPSHOT_INTERVAL", 2)
+
+    # The pick that completes the interval writes the snapshot.
+    app_client.post("/api/drafts/log-draft/picks", json={"player_id": "dp-2"}, headers=organizer_headers)
+    assert draft_ref.get().to_dict()["event_snapshot_seq"] == 2
+    state = load_draft_state(draft_ref, draft_ref.get().to_dict())
+    assert state["seq"] == 2
+
+    app_client.post("/api/drafts/log-draft/picks", json={"player_id": "dp-3"}, headers=organizer_headers)
+
+    # Remove events already folded into the snapshot: replay must not need them.
+    for event in list(draft_ref.collection("events").stream()):
+        if event.to_dict()["seq"] <= 2:
+            event.reference.delete()
+
+    state = load_draft_state(draft_ref, draft_ref.get().to_dict())
+    assert state["seq"] == 3
+    assert sorted(p["player_id"] for p in state["picks"].values()) == ["dp-1", "dp-2", "dp-3"]
+
+
+def test_pre_slot_changes_are_logged(app_client, fake_db, organizer_headers):
+    draft_ref = _seed_two_team_draft(fake_db)
+    draft_ref.update({"status": "setup"})
+
+    r = app_client.post(
+        "/api/drafts/log-draft/pre-slots",
+        json={"player_id": "dp-1", "team_id": "team-a", "reason": "Coach's child"},
+        headers=organizer_headers,
+    )
+    assert r.status_code == 200, r.text
+    # Adding the same player twice is a no-op and does not log.
+    app_client.post(
+        "/api/drafts/log-draft/pre-slots",
+        json={"player_id": "dp-1", "team_id": "team-a"},
+        headers=organizer_headers,
+    )
+    r = app_client.delete("/api/drafts/log-draft/pre-slots/team-a/dp-1", headers=organizer_headers)
+    assert r.status_code == 200, r.text
+
+    events = [e.to_dict() for e in draft_ref.collection("events").stream()]
+    assert sorted((e["seq"], e["type"]) for e in events) == [
+        (1, "pre_slot_add"),
+        (2, "pre_slot_remove"),
+    ]
+    assert fake_db.collection("draft_teams").document("team-a").get().to_dict()[
+        "pre_slotted_player_ids"
+    ] == []
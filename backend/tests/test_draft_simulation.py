@@ -0,0 +1,148 @@
+from backend.routes.drafts import _calculate_buddy_preference_bonus
+from backend.services.draft_simulation import (
+    BUDDY_DIRECT_BONUS,
+    BUDDY_REVERSE_BONUS,
+    build_simulation_state,
+    simulate_availability,
+)
+
+
+def _normalize(value):
+    return value.strip().lower() if value else None
+
+
+def _state(players, *, team_order=("t1", "t2"), rounds=2, rankings=None, drafted=None, cap=None):
+    pick_team_ids = []
+    for r in range(rounds):
+        pick_team_ids.extend(team_order if r % 2 == 0 else list(reversed(team_order)))
+    drafted = drafted or {}
+    return build_simulation_state(
+        players=players,
+        drafted_team_by_player=drafted,
+        team_order=list(team_order),
+        pick_team_ids=pick_team_ids[len(drafted):],
+        current_pick=len(drafted) + 1,
+        team_rankings=rankings or {},
+        team_cap=cap,
+        composite_for=lambda p: float(p.get("composite_score") or 0.0),
+        normalize_name=_normalize,
+    )
+
+
+def test_buddy_bonus_constants_match_auto_pick():
+    context = {"team_name_counts": {"sam": 1}, "team_buddy_target_counts": {"alex": 1}}
+    bonus = _calculate_buddy_preference_bonus(
+        candidate_player={"name": "Alex", "buddyRequestNormalized": "sam"}, buddy_context=context
+    )
+    assert bonus == BUDDY_DIRECT_BONUS + BUDDY_REVERSE_BONUS
+
+
+def test_zero_randomness_follows_composite_and_rankings():
+    players = {f"p{i}": {"name": f"P{i}", "composite_score": 100 - i} for i in range(6)}
+
+    # t1 picks p0, t2 picks p1, t2 picks p2: p3 is never there at t1's second pick.
+    result = simulate_availability(
+        _state(players), tracked_picks=[1, 4], iterations=20, randomness=0.0, seed=1, workers=0
+    )
+    assert result["p0"] == [1.0, 0.0]
+    assert result["p3"] == [1.0, 1.0]
+    assert result["p2"] == [1.0, 0.0]
+
+    # t2 ranks p5 first, so p2 survives to pick 4 instead.
+    result = simulate_availability(
+        _state(players, rankings={"t2": ["p5"]}),
+        tracked_picks=[4],
+        iterations=20,
+        randomness=0.0,
+        seed=1,
+        workers=0,
+    )
+    assert result["p1"] == [0.0]
+    assert result["p5"] == [0.0]
+    assert result["p2"] == [1.0]
+
+
+def test_sibling_units_are_drafted_together_and_respect_cap():
+    players = {
+        "a": {"name": "A", "composite_score": 90, "siblingGroupId": "sg", "forceSameTeamWithSibling": True},
+        "b": {"name": "B", "composite_score": 10, "siblingGroupId": "sg", "forceSameTeamWithSibling": True},
+        "c": {"name": "C", "composite_score": 80},
+        "d": {"name": "D", "composite_score": 70},
+    }
+    # t1 takes the sibling pair with picks 1-2, so t2 sees c and d untouched.
+    result = simulate_availability(
+        _state(players, rounds=2), tracked_picks=[3], iterations=10, randomness=0.0, seed=3, workers=0
+    )
+    assert result["b"] == [0.0]
+    assert result["c"] == [1.0]
+
+    # With a one-player cap the pair can never land on a team.
+    result = simulate_availability(
+        _state(players, rounds=2, cap=1),
+        tracked_picks=[1, 2],
+        iterations=10,
+        randomness=0.0,
+        seed=3,
+        workers=0,
+    )
+    assert result["a"] == [1.0, 1.0]
+    assert result["c"] == [1.0, 0.0]
+
+
+def test_simulation_is_reproducible_with_seed():
+    players = {f"p{i}": {"name": f"P{i}", "composite_score": 50 + (i % 7)} for i in range(20)}
+    state = _state(players, team_order=("t1", "t2", "t3"), rounds=4)
+    kwargs = dict(tracked_picks=[3, 4, 9], iterations=200, randomness=0.4, seed=11, workers=0)
+    first = simulate_availability(state, **kwargs)
+    assert first == simulate_availability(state, **kwargs)
+    for probabilities in first.values():
+        assert probabilities == sorted(probabilities, reverse=True)
+
+
+def test_simulate_endpoint_reports_availability(app_client, fake_db, organizer_headers, monkeypatch):
+    monkeypatch.setenv("DRAFT_SIM_WORKERS", "0")
+    fake_db.collection("drafts").document("sim-draft").set(
+        {
+            "id": "sim-draft",
+            "name": "Sim Draft",
+            "league_id": "league-1",
+            "created_by": "org-1",
+            "status": "active",
+            "draft_type": "snake",
+            "num_rounds": 2,
+            "num_teams": 2,
+            "team_order": ["team-a", "team-b"],
+            "current_round": 1,
+            "current_pick": 2,
+            "current_team_id": "team-b",
+            "event_id": None,
+            "event_ids": [],
+        }
+    )
+    for team_id in ("team-a", "team-b"):
+        fake_db.collection("draft_teams").document(team_id).set(
+            {"id": team_id, "draft_id": "sim-draft", "team_name": team_id, "coach_user_id": None}
+        )
+    for idx, score in enumerate((90, 80, 70, 60), start=1):
+        fake_db.collection("draft_players").document(f"dp-{idx}").set(
+            {"id": f"dp-{idx}", "draft_id": "sim-draft", "name": f"Player {idx}", "composite_score": score}
+        )
+    fake_db.collection("draft_picks").document("pick-1").set(
+        {"id": "pick-1", "draft_id": "sim-draft", "player_id": "dp-1", "team_id": "team-a", "pick_number": 1}
+    )
+
+    r = app_client.get(
+        "/api/drafts/sim-draft/simulate?team_id=team-a&iterations=50&randomness=0&seed=5",
+        headers=organizer_headers,
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["team_id"] == "team-a"
+    assert [p["pick_number"] for p in body["picks"]] == [4]
+    # team-b takes dp-2 and dp-3 at picks 2-3, leaving dp-4 for team-a.
+    assert body["picks"][0]["players"] == [
+        {"player_id": "dp-4", "name": "Player 4", "probability": 1.0}
+    ]
+
+    r = app_client.get("/api/drafts/sim-draft/simulate?team_id=nope", headers=organizer_headers)
+    assert r.status_code == 400, r.text
@@ -0,0 +1,172 @@
+import contextvars
+import json
+import logging
+
+from backend.middleware.observability import get_write_fanout_stats
+from backend.utils.database import commit_batched_writes
+
+
+def _count_batches(monkeypatch, fake_db):
+    created = []
+    original = fake_db.batch
+
+    def counting_batch():
+        batch = original()
+        created.append(batch)
+        return batch
+
+    monkeypatch.setattr(fake_db, "batch", counting_batch)
+    return created
+
+
+def _seed_active_draft(fake_db, *, draft_id="write-draft", num_rounds=1):
+    fake_db.collection("drafts").document(draft_id).set(
+        {
+            "id": draft_id,
+            "name": "Write Draft",
+            "league_id": "league-1",
+            "created_by": "org-1",
+            "status": "active",
+            "draft_type": "snake",
+            "num_rounds": num_rounds,
+            "num_teams": 2,
+            "team_order": ["team-a", "team-b"],
+            "current_round": 1,
+            "current_pick": 1,
+            "current_team_id": "team-a",
+            "pick_timer_seconds": 0,
+            "trades_enabled": True,
+            "trades_require_approval": True,
+            "event_id": None,
+            "event_ids": [],
+        }
+    )
+    for team_id in ("team-a", "team-b"):
+        fake_db.collection("draft_teams").document(team_id).set(
+            {"id": team_id, "draft_id": draft_id, "team_name": team_id, "coach_user_id": None}
+        )
+    for idx in range(1, 4):
+        fake_db.collection("draft_players").document(f"dp-{idx}").set(
+            {"id": f"dp-{idx}", "draft_id": draft_id, "name": f"Player {idx}"}
+        )
+    return fake_db.collection("drafts").document(draft_id)
+
+
+def test_commit_batched_writes_chunks_and_records_fanout(fake_db, monkeypatch):
+    batches = _count_batches(monkeypatch, fake_db)
+    before = get_write_fanout_stats().get("test.chunks", {"operations": 0, "writes": 0, "commits": 0})
+
+    writes = [
+        ("set", fake_db.collection("things").document(f"t{i}"), {"i": i}) for i in range(900)
+    ]
+    writes.append(("update", fake_db.collection("things").document("t0"), {"touched": True}))
+    writes.append(("delete", fake_db.collection("things").document("t1"), None))
+    assert commit_batched_writes(fake_db, writes, operation="test.chunks") == 902
+
+    assert len(batches) == 3
+    assert all(len(b._ops) <= 400 for b in batches)
+    assert fake_db.collection("things").document("t0").get().to_dict() == {"i": 0, "touched": True}
+    assert not fake_db.collection("things").document("t1").get().exists
+
+    stats = get_write_fanout_stats()["test.chunks"]
+    assert stats["operations"] - before["operations"] == 1
+    assert stats["writes"] - before["writes"] == 902
+    assert stats["commits"] - before["commits"] == 3
+    assert stats["max_writes"] >= 902
+
+
+def test_bulk_players_are_written_in_batches(app_client, fake_db, organizer_headers, monkeypatch):
+    draft_ref = _seed_active_draft(fake_db)
+    draft_ref.update({"status": "setup"})
+    batches = _count_batches(monkeypatch, fake_db)
+
+    r = app_client.post(
+        "/api/drafts/write-draft/players/bulk",
+        json={"players": [{"name": f"Kid {i}"} for i in range(450)]},
+        headers=organizer_headers,
+    )
+    assert r.status_code == 200, r.text
+    assert r.json()["added"] == 450
+    assert len(batches) == 2
+    stored = fake_db.collection("draft_players").where("draft_id", "==", "write-draft").stream()
+    assert len(list(stored)) == 453
+
+
+def test_request_log_counts_writes_made_in_sync_routes(app_client, fake_db, organizer_headers, caplog):
+    draft_ref = _seed_active_draft(fake_db, num_rounds=2)
+    draft_ref.update({"status": "setup"})
+
+    # generate-teams is a sync route, so its writes happen in a worker thread.
+    # A fresh context, so values other tests left in context vars can't leak in.
+    with caplog.at_level(logging.INFO):
+        r = contextvars.Context().run(
+            app_client.post,
+            "/api/drafts/write-draft/generate-teams",
+            json={"apply": True},
+            headers=organizer_headers,
+        )
+    assert r.status_code == 200, r.text
+
+    lines = [json.loads(rec.getMessage()) for rec in caplog.records if rec.getMessage().startswith("{")]
+    line = next(l for l in lines if l.get("endpoint") == "/api/drafts/write-draft/generate-teams")
+    assert line["firestore_writes"] >= 3
+    assert line["firestore_commits"] >= 1
+
+
+def test_final_pick_creates_rosters_in_background(app_client, fake_db, organizer_headers):
+    _seed_active_draft(fake_db)
+
+    for player_id in ("dp-1", "dp-2"):
+        r = app_client.post(
+            "/api/drafts/write-draft/picks", json={"player_id": player_id}, headers=organizer_headers
+        )
+        assert r.status_code == 200, r.text
+    assert r.json()["completed"] is True
+
+    rosters = sorted(
+        (doc.to_dict()["team_name"], doc.to_dict()["player_ids"])
+        for doc in fake_db.collection("team_rosters").stream()
+    )
+    assert rosters == [("team-a", ["dp-1"]), ("team-b", ["dp-2"])]
+    assert get_write_fanout_stats()["draft.rosters"]["writes"] >= 2
+
+
+def test_trade_approval_swaps_and_resolves_in_one_transaction(
+    app_client, fake_db, organizer_headers
+):
+    draft_ref = _seed_active_draft(fake_db, num_rounds=2)
+    for player_id in ("dp-1", "dp-2"):
+        app_client.post(
+            "/api/drafts/write-draft/picks", json={"player_id": player_id}, headers=organizer_headers
+        )
+    draft_ref.collection("trades").document("trade-1").set(
+        {
+            "id": "trade-1",
+            "offering_team_id": "team-a",
+            "receiving_team_id": "team-b",
+            "offering_player_id": "dp-1",
+            "receiving_player_id": "dp-2",
+            "status": "pending",
+        }
+    )
+
+    r = app_client.patch(
+        "/api/drafts/write-draft/trades/trade-1",
+        json={"status": "approved"},
+        headers=organizer_headers,
+    )
+    assert r.status_code == 200, r.text
+    trade = draft_ref.collection("trades").document("trade-1").get().to_dict()
+    assert trade["status"] == "approved"
+    teams = {
+        p.to_dict()["player_id"]: p.to_dict()["team_id"]
+        for p in fake_db.collection("draft_picks").stream()
+    }
+    assert teams == {"dp-1": "team-b", "dp-2": "team-a"}
+
+    r = app_client.patch(
+        "/api/drafts/write-draft/trades/trade-1",
+        json={"status": "approved"},
+        headers=organizer_headers,
+    )
+    assert r.status_code == 400, r.text
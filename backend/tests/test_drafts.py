@@ -427,6 +427,55 @@ def test_list_drafts_viewer_with_coach_assignment_sees_league_draft(app_client,
     assert draft_ids == {"draft-explicit-viewer"}
 
 
+def _count_fake_reads(fake_db, monkeypatch) -> list:
+    drafts = fake_db.collection("drafts")
+    reads: list = []
+    for cls, name in (
+        (type(drafts.document("x")), "get"),
+        (type(drafts.where("id", "==", None)), "stream"),
+        (type(fake_db), "get_all"),
+    ):
+        original = getattr(cls, name)
+
+        def counting(self, *args, _original=original, **kwargs):
+            reads.append(name)
+            return _original(self, *args, **kwargs)
+
+        monkeypatch.setattr(cls, name, counting)
+    return reads
+
+
+def test_list_drafts_reads_do_not_grow_with_draft_count(
+    app_client, fake_db, coach_headers, monkeypatch
+):
+    fake_db.collection("events").document("event-1").set({"id": "event-1", "league_id": "league-1"})
+    for idx in range(40):
+        fake_db.collection("drafts").document(f"bulk-draft-{idx}").set(
+            {
+                "id": f"bulk-draft-{idx}",
+                "name": f"Draft {idx}",
+                "league_id": "league-1",
+                "event_ids": ["event-1"],
+                "created_by": "org-1",
+                "status": "setup",
+            }
+        )
+    fake_db.collection("drafts").document("standalone-coached").set(
+        {"id": "standalone-coached", "league_id": None, "created_by": "org-2", "status": "setup"}
+    )
+    fake_db.collection("draft_teams").document("standalone-team").set(
+        {"id": "standalone-team", "draft_id": "standalone-coached", "coach_user_id": "coach-1"}
+    )
+    reads = _count_fake_reads(fake_db, monkeypatch)
+
+    r = app_client.get("/api/drafts", headers=coach_headers)
+    assert r.status_code == 200, r.text
+    assert len(r.json()) == 41
+    # Membership, league query, owner query, coach teams, one get_all and a
+    # single event scope check: independent of the 41 drafts returned.
+    assert len(reads) <= 10
+
+
 def test_list_drafts_outsider_sees_none(app_client, fake_db):
     fake_db.collection("drafts").document("draft-league-1").set(
         {
@@ -0,0 +1,229 @@
+import time
+
+import pytest
+
+from backend.services import import_jobs
+
+
+@pytest.fixture()
+def job_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("IMPORT_JOBS_DB", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(import_jobs, "IMPORT_JOB_CHUNK_SIZE", 3)
+    return import_jobs.get_job_store()
+
+
+def _seed_event(fake_db, event_id="event-1", league_id="league-1"):
+    fake_db.collection("leagues").document(league_id).set({"name": "L"})
+    fake_db.collection("events").document(event_id).set(
+        {"name": "E", "league_id": league_id, "drillTemplate": "football"}
+    )
+
+
+def _players(count=8):
+    players = [
+        {"first_name": "Kid", "last_name": f"L{i}", "jersey_number": i, "40m_dash": 5.0 + i / 10}
+        for i in range(count)
+    ]
+    # In-upload duplicate of row 2 across a chunk boundary, and an invalid row.
+    players.append({"first_name": "Kid", "last_name": "L1", "jersey_number": 1})
+    players.append({"first_name": "", "last_name": "X"})
+    return players
+
+
+def _stored_players(fake_db):
+    return {
+        doc.id: doc.to_dict()
+        for doc in fake_db.collection("events").document("event-1").collection("players").stream()
+    }
+
+
+def test_upload_job_matches_synchronous_upload(app_client, fake_db, organizer_headers, job_store):
+    _seed_event(fake_db)
+    r = app_client.post(
+        "/api/players/upload",
+        json={"event_id": "event-1", "players": _players()},
+        headers=organizer_headers,
+    )
+    assert r.status_code == 200, r.text
+    sync_body = r.json()
+    sync_players = _stored_players(fake_db)
+    for doc in fake_db.collection("events").document("event-1").collection("players").stream():
+        doc.reference.delete()
+
+    r = app_client.post(
+        "/api/players/upload/jobs",
+        json={"event_id": "event-1", "players": _players()},
+        headers=organizer_headers,
+    )
+    assert r.status_code == 202, r.text
+    job_id = r.json()["job_id"]
+
+    # The TestClient runs background tasks before returning.
+    r = app_client.get(f"/api/players/upload/jobs/{job_id}", headers=organizer_headers)
+    assert r.status_code == 200, r.text
+    job = r.json()
+    assert job["status"] == "completed"
+    assert (job["processed_rows"], job["total_rows"], job["progress"]) == (10, 10, 1.0)
+    assert job["undo_log"] == sync_body["undo_log"]
+    for key in ("added", "created_players", "updated_players", "rejected_count", "scores_written_total"):
+        assert job["result"][key] == sync_body[key]
+    assert [e["row"] for e in job["errors"]] == [9, 10]
+    assert set(_stored_players(fake_db)) == set(sync_players)
+
+    imports = [d.to_dict() for d in fake_db.collection("events").document("event-1").collection("imports").stream()]
+    assert imports and all(i["rows_imported"] == 8 for i in imports)
+
+
+def test_upload_job_validation_errors_are_synchronous(app_client, fake_db, organizer_headers, job_store):
+    _seed_event(fake_db)
+    r = app_client.post(
+        "/api/players/upload/jobs",
+        json={"event_id": "event-1", "players": [{"first_name": "A", "last_name": "B"}], "mode": "scores_only"},
+        headers=organizer_headers,
+    )
+    assert r.status_code == 400
+    assert job_store.resumable_job_ids() == []
+
+
+def test_failed_job_resumes_from_checkpoint(
+    app_client, fake_db, organizer_headers, job_store, monkeypatch
+):
+    _seed_event(fake_db)
+    real_checkpoint = job_store.checkpoint
+    calls = []
+
+    def crash_after_second_commit(job_id, owner, processed_rows, state):
+        calls.append(processed_rows)
+        if len(calls) == 2:
+            # Chunk 2 is committed to Firestore, but its checkpoint is lost.
+            raise RuntimeError("worker died")
+        real_checkpoint(job_id, owner, processed_rows, state)
+
+    monkeypatch.setattr(job_store, "checkpoint", crash_after_second_commit)
+    r = app_client.post(
+        "/api/players/upload/jobs",
+        json={"event_id": "event-1", "players": _players()},
+        headers=organizer_headers,
+    )
+    job_id = r.json()["job_id"]
+    job = app_client.get(f"/api/players/upload/jobs/{job_id}", headers=organizer_headers).json()
+    assert job["status"] == "failed"
+    assert job["processed_rows"] == 3
+    assert job["error"] == "worker died"
+    # Committed chunk 1 plus the pending chunk 2 are revertible.
+    assert len(job["undo_log"]) == 6
+
+    r = app_client.post(f"/api/players/upload/jobs/{job_id}/resume", headers=organizer_headers)
+    assert r.status_code == 202, r.text
+    job = app_client.get(f"/api/players/upload/jobs/{job_id}", headers=organizer_headers).json()
+    assert job["status"] == "completed"
+    assert job["attempts"] == 2
+    assert calls == [3, 6, 6, 9, 10]
+    # Replayed chunk 2 still reports the pre-import state, not its own first write.
+    assert job["result"]["created_players"] == 8
+    assert job["result"]["updated_players"] == 0
+    assert all(entry["previous_data"] is None for entry in job["undo_log"])
+    assert len(_stored_players(fake_db)) == 8
+
+    r = app_client.post(f"/api/players/upload/jobs/{job_id}/resume", headers=organizer_headers)
+    assert r.status_code == 400
+
+
+def test_stale_running_job_is_resumed_and_jobs_are_private(
+    app_client, fake_db, organizer_headers, coach_headers, job_store, monkeypatch
+):
+    _seed_event(fake_db)
+    from backend.routes import players as players_routes
+
+    # Queue only; nothing runs the job in the request.
+    monkeypatch.setattr(players_routes, "run_import_job", lambda job_id: None)
+    r = app_client.post(
+        "/api/players/upload/jobs",
+        json={"event_id": "event-1", "players": _players(4)},
+        headers=organizer_headers,
+    )
+    job_id = r.json()["job_id"]
+    assert r.json()["status"] == "queued"
+
+    # Simulate a worker that claimed the job and died without finishing.
+    assert job_store.claim(job_id)
+    assert job_store.resumable_job_ids() == []
+    with job_store._connect() as conn:
+        conn.execute("UPDATE import_jobs SET heartbeat = ? WHERE id = ?", (time.time() - 3600, job_id))
+    assert job_store.resumable_job_ids() == [job_id]
+
+    assert import_jobs.resume_pending_jobs() == 1
+    assert import_jobs.job_status(job_store.get(job_id))["status"] == "completed"
+
+    r = app_client.get(f"/api/players/upload/jobs/{job_id}", headers=coach_headers)
+    assert r.status_code == 404
+
+
+def _queue_job(app_client, organizer_headers, monkeypatch, rows=4):
+    from backend.routes import players as players_routes
+
+    monkeypatch.setattr(players_routes, "run_import_job", lambda job_id: None)
+    r = app_client.post(
+        "/api/players/upload/jobs",
+        json={"event_id": "event-1", "players": _players(rows)},
+        headers=organizer_headers,
+    )
+    return r.json()["job_id"]
+
+
+def test_job_owned_by_dead_process_is_reclaimed_at_startup(
+    app_client, fake_db, organizer_headers, job_store, monkeypatch
+):
+    _seed_event(fake_db)
+    job_id = _queue_job(app_client, organizer_headers, monkeypatch)
+
+    # Claimed by a previous boot that reused our pid: the lease is still fresh.
+    previous_boot = f"{import_jobs.current_owner().split(':')[0]}:previous"
+    assert job_store.claim(job_id, previous_boot)
+    assert job_store.resumable_job_ids() == []
+    other_live_job = _queue_job(app_client, organizer_headers, monkeypatch)
+    assert job_store.claim(other_live_job, f"1:{'f' * 12}")
+
+    assert import_jobs.resume_pending_jobs() == 1
+    job = job_store.get(job_id)
+    assert (job["status"], job["owner"], job["attempts"]) == ("completed", None, 2)
+    # A job held by a live process is left to its lease.
+    assert job_store.get(other_live_job)["status"] == "running"
+
+
+def test_resume_requeues_running_job_only_after_lease_expires(
+    app_client, fake_db, organizer_headers, job_store, monkeypatch
+):
+    _seed_event(fake_db)
+    job_id = _queue_job(app_client, organizer_headers, monkeypatch)
+    assert job_store.claim(job_id, f"1:{'f' * 12}")
+
+    r = app_client.post(f"/api/players/upload/jobs/{job_id}/resume", headers=organizer_headers)
+    assert r.status_code == 400
+
+    with job_store._connect() as conn:
+        conn.execute("UPDATE import_jobs SET heartbeat = ? WHERE id = ?", (time.time() - 3600, job_id))
+    r = app_client.post(f"/api/players/upload/jobs/{job_id}/resume", headers=organizer_headers)
+    assert r.status_code == 202, r.text
+    assert r.json()["status"] == "queued"
+
+
+def test_worker_stops_writing_once_job_is_reclaimed(fake_db, app_client, organizer_headers, job_store, monkeypatch):
+    _seed_event(fake_db)
+    job_id = _queue_job(app_client, organizer_headers, monkeypatch, rows=8)
+    real_checkpoint = job_store.checkpoint
+
+    def reclaimed_after_first_chunk(job_id, owner, processed_rows, state):
+        real_checkpoint(job_id, owner, processed_rows, state)
+        # Lease lapses and another worker takes the job over.
+        with job_store._connect() as conn:
+            conn.execute("UPDATE import_jobs SET heartbeat = 0 WHERE id = ?", (job_id,))
+        assert job_store.claim(job_id, "other-worker")
+
+    monkeypatch.setattr(job_store, "checkpoint", reclaimed_after_first_chunk)
+    import_jobs.run_import_job(job_id)
+
+    job = job_store.get(job_id)
+    assert (job["status"], job["owner"], job["processed_rows"]) == ("running", "other-worker", 3)
+    with pytest.raises(import_jobs.JobOwnershipLost):
+        job_store.finish(job_id, import_jobs.current_owner(), {})
@@ -35,7 +35,7 @@ def test_parse_import_csv_happy_path(app_client, fake_db, monkeypatch, organizer
     monkeypatch.setattr(
         importers.DataImporter,
         "parse_csv",
-        lambda content, event_id=None, disabled_drills=None: SimpleNamespace(
+        lambda content, event_id=None, disabled_drills=None, context=None: SimpleNamespace(
             valid_rows=[{"data": {"first_name": "P", "last_name": "1", "jersey_number": "1"}}],
             errors=[],
             detected_sport="football",
@@ -64,3 +64,323 @@ def test_import_history_empty(app_client, fake_db, organizer_headers):
     r = app_client.get("/api/events/event-1/history", headers=organizer_headers)
     assert r.status_code == 200
     assert isinstance(r.json(), list)
+
+
+def _csv_bytes(rows):
+    lines = ["first_name,last_name,jersey_number,40m_dash"]
+    lines.extend(rows)
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def test_stream_csv_matches_parse_csv_in_bounded_chunks():
+    import io
+
+    from backend.utils.importers import DataImporter
+
+    rows = [f"Kid,{i},{i},5.{i % 10}" for i in range(120)]
+    rows.insert(7, "Kid,Slow,3,fast")
+    content = _csv_bytes(rows)
+
+    full = DataImporter.parse_csv(content)
+    parsed = DataImporter.stream_csv(io.BytesIO(content), chunk_size=50)
+    chunks = list(parsed.chunks)
+
+    assert parsed.detected_sport == full.detected_sport
+    assert [len(c.valid_rows) + len(c.errors) for c in chunks] == [50, 50, 21]
+    assert [r for c in chunks for r in c.valid_rows] == full.valid_rows
+    assert [e for c in chunks for e in c.errors] == full.errors
+    assert full.errors[0]["row"] == 8
+
+
+def test_parse_import_stream_emits_ndjson(app_client, fake_db, organizer_headers):
+    import json
+
+    from backend.utils.identity import generate_player_id
+
+    _seed_event(fake_db)
+    existing_id = generate_player_id("event-1", "Kid", "1", 1)
+    fake_db.collection("events").document("event-1").collection("players").document(
+        existing_id
+    ).set({"name": "Kid 1"})
+
+    content = _csv_bytes([f"Kid,{i},{i},5.0" for i in range(120)] + ["Kid,Slow,9,fast"])
+    r = app_client.post(
+        "/api/events/event-1/parse-import/stream?chunk_size=50",
+        files={"file": ("big.csv", content, "text/csv")},
+        headers=organizer_headers,
+    )
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert lines[0] == {
+        "type": "meta",
+        "detected_sport": "football",
+        "confidence": "event",
+        "sheets": [],
+    }
+    assert [line["type"] for line in lines[1:]] == ["chunk", "chunk", "chunk", "summary"]
+    rows = [row for line in lines[1:-1] for row in line["valid_rows"]]
+    assert [row["row_id"] for row in rows] == list(range(1, 121))
+    assert [row["existing_player_id"] for row in rows if row["is_duplicate"]] == [existing_id]
+    assert lines[-1]["summary"] == {
+        "total_rows": 121,
+        "valid_count": 120,
+        "error_count": 1,
+        "duplicate_count": 1,
+    }
+
+    r = app_client.post(
+        "/api/events/event-1/parse-import/stream",
+        files={"file": ("roster.pdf", b"%PDF", "application/pdf")},
+        headers=organizer_headers,
+    )
+    assert r.status_code == 400
+
+
+def _xlsx_bytes(sheets):
+    import io
+
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for name, rows in sheets.items():
+        ws = wb.create_sheet(name)
+        for row in rows:
+            ws.append(row)
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def test_excel_sheet_metadata_is_cached_between_round_trips(monkeypatch):
+    import io
+
+    from backend.utils import importers
+
+    importers.clear_sheet_metadata_cache()
+    header = ["first_name", "last_name", "jersey_number", "40m_dash"]
+    content = _xlsx_bytes(
+        {
+            "Boys": [header] + [["Kid", f"B{i}", i, 5.0] for i in range(10)] + [[None] * 4],
+            "Girls": [header, ["Kid", "G1", 1, 5.5]],
+        }
+    )
+
+    opened = []
+    real_load = importers.openpyxl.load_workbook
+    monkeypatch.setattr(
+        importers.openpyxl,
+        "load_workbook",
+        lambda *a, **kw: opened.append(1) or real_load(*a, **kw),
+    )
+
+    first = importers.DataImporter.parse_excel(content)
+    assert [s["name"] for s in first.sheets] == ["Boys", "Girls"]
+    assert first.sheets[0]["preview"][0] == header
+    assert len(first.sheets[0]["preview"]) == 3
+
+    # Re-listing and rejecting unknown sheets are answered from the cache.
+    assert importers.DataImporter.parse_excel(content).sheets == first.sheets
+    missing = importers.DataImporter.parse_excel(content, sheet_name="Coaches")
+    assert missing.errors[0]["message"] == "Sheet 'Coaches' not found"
+    assert len(opened) == 1
+
+    buffered = importers.DataImporter.parse_excel(content, sheet_name="Boys")
+    assert len(buffered.valid_rows) == 10
+    parsed = importers.DataImporter.stream_excel(io.BytesIO(content), sheet_name="Boys", chunk_size=4)
+    chunks = list(parsed.chunks)
+    assert [len(c.valid_rows) for c in chunks] == [4, 4, 2]
+    assert [r for c in chunks for r in c.valid_rows] == buffered.valid_rows
+    assert len(opened) == 3
+
+
+def test_parse_import_stream_excel_lists_sheets_then_streams(app_client, fake_db, organizer_headers):
+    import json
+
+    _seed_event(fake_db)
+    header = ["first_name", "last_name", "jersey_number"]
+    content = _xlsx_bytes({"A": [header, ["Kid", "A", 1]], "B": [header, ["Kid", "B", 2]]})
+
+    r = app_client.post(
+        "/api/events/event-1/parse-import/stream",
+        files={"file": ("roster.xlsx", content, "application/octet-stream")},
+        headers=organizer_headers,
+    )
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [s["name"] for s in lines[0]["sheets"]] == ["A", "B"]
+    assert lines[-1]["summary"]["total_rows"] == 0
+
+    r = app_client.post(
+        "/api/events/event-1/parse-import/stream",
+        files={"file": ("roster.xlsx", content, "application/octet-stream")},
+        data={"sheet_name": "B"},
+        headers=organizer_headers,
+    )
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["data"]["last_name"] for row in lines[1]["valid_rows"]] == ["B"]
+    assert lines[-1]["summary"]["valid_count"] == 1
+
+
+def test_parse_import_multi_file_shares_schema_and_keeps_order(
+    app_client, fake_db, organizer_headers, monkeypatch
+):
+    from backend.utils import event_schema
+
+    _seed_event(fake_db)
+    real_get_schema = event_schema.get_event_schema
+    schema_calls = []
+    monkeypatch.setattr(
+        event_schema,
+        "get_event_schema",
+        lambda *a, **kw: schema_calls.append(a) or real_get_schema(*a, **kw),
+    )
+
+    files = [
+        ("files", (f"station{s}.csv", _csv_bytes([f"Kid,S{s}R{i},{i},5.{s}" for i in range(5)]), "text/csv"))
+        for s in range(6)
+    ]
+    r = app_client.post("/api/events/event-1/parse-import", files=files, headers=organizer_headers)
+    assert r.status_code == 200, r.text
+    body = r.json()
+
+    assert len(schema_calls) == 1
+    assert body["summary"]["valid_count"] == 30
+    assert [row["source_file"] for row in body["valid_rows"]] == [
+        f"station{s}.csv" for s in range(6) for _ in range(5)
+    ]
+    assert body["valid_rows"][7]["data"]["last_name"] == "S1R2"
+
+
+def test_parse_import_duplicates_use_cached_identity_index(
+    app_client, fake_db, monkeypatch, organizer_headers
+):
+    from backend.utils import identity_index
+    from backend.utils.identity import generate_player_id
+
+    _seed_event(fake_db)
+    players_ref = fake_db.collection("events").document("event-1").collection("players")
+    players_ref.document("bib-player").set(
+        {"name": "Someone Else", "external_id": "B-7", "scores": {"40m_dash": 4.9}}
+    )
+
+    built = []
+    original_build = identity_index._build_identity_index
+
+    def counting_build(event_id):
+        index = original_build(event_id)
+        built.append(index)
+        return index
+
+    monkeypatch.setattr(identity_index, "_build_identity_index", counting_build)
+
+    def preview():
+        content = (
+            "first_name,last_name,jersey_number,external_id\n"
+            "Kid,One,1,B-7\n"
+            "Kid,Two,2,\n"
+        ).encode("utf-8")
+        r = app_client.post(
+            "/api/events/event-1/parse-import",
+            files={"file": ("roster.csv", content, "text/csv")},
+            headers=organizer_headers,
+        )
+        assert r.status_code == 200, r.text
+        return [row["existing_player_id"] for row in r.json()["valid_rows"]]
+
+    assert preview() == ["bib-player", None]
+    assert preview() == ["bib-player", None]
+    assert len(built) == 1
+    # Only ids and external ids are read.
+    assert built[0] == {"ids": frozenset({"bib-player"}), "external_ids": {"B-7": "bib-player"}}
+
+    r = app_client.post(
+        "/api/players/upload",
+        json={"event_id": "event-1", "players": [{"first_name": "Kid", "last_name": "Two", "jersey_number": 2}]},
+        headers=organizer_headers,
+    )
+    assert r.status_code == 200, r.text
+
+    assert preview() == ["bib-player", generate_player_id("event-1", "Kid", "Two", 2)]
+    assert len(built) == 2
+
+
+def test_parse_results_are_cached_by_content_schema_and_options(monkeypatch):
+    from backend.services.schema_registry import SchemaRegistry
+    from backend.utils import import_cache
+    from backend.utils.importers import DataImporter, ImportContext
+
+    processed = []
+    original = DataImporter._process_rows
+
+    def counting_process_rows(*args, **kwargs):
+        processed.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(DataImporter, "_process_rows", staticmethod(counting_process_rows))
+    content = _csv_bytes(["Kid,One,1,5.0", "Kid,Two,2,fast"])
+
+    first = DataImporter.parse_csv(content)
+    first.valid_rows[0]["is_duplicate"] = True
+    second = DataImporter.parse_csv(content)
+    assert len(processed) == 1
+    assert "is_duplicate" not in second.valid_rows[0]
+    assert (second.detected_sport, second.confidence) == (first.detected_sport, first.confidence)
+    assert len(second.valid_rows) == 1 and len(second.errors) == 1
+
+    # Different options or schema miss; the disk layer survives a cold memory cache.
+    DataImporter.parse_csv(content, disabled_drills=["40m_dash"])
+    football = SchemaRegistry.get_schema("football")
+    narrowed = football.model_copy(update={"drills": football.drills[1:]})
+    DataImporter.parse_csv(content, context=ImportContext("event-1", [], schema=football))
+    DataImporter.parse_csv(content, context=ImportContext("event-1", [], schema=narrowed))
+    assert len(processed) == 4
+
+    import_cache._CACHE._entries.clear()
+    DataImporter.parse_csv(content, context=ImportContext("event-1", [], schema=football))
+    assert len(processed) == 4
+
+    # File-level errors are not cached.
+    DataImporter.parse_csv(b"")
+    DataImporter.parse_csv(b"")
+    assert import_cache.get_cached_parse(ImportContext().parse_cache_key("csv", b"")) is None
+
+
+def test_header_table_is_compiled_once_per_schema_version(monkeypatch):
+    from backend.schemas import DrillDefinition
+    from backend.services.schema_registry import SchemaRegistry
+    from backend.utils import importers
+    from backend.utils.importers import DataImporter
+
+    importers.clear_header_caches()
+    football = SchemaRegistry.get_schema("football")
+    custom = football.model_copy(
+        update={
+            "drills": football.drills
+            + [DrillDefinition(key="x7hG4k", label="Bench Press", unit="reps", category="strength")]
+        }
+    )
+    headers = ["First Name", "#", "Bench Press", "40 Yard Dash (sec)", "Parent Email"]
+    expected = {
+        "First Name": "first_name",
+        "#": "jersey_number",
+        "Bench Press": "x7hG4k",
+        "40 Yard Dash (sec)": "40m_dash",
+        "Parent Email": "parent_email",
+    }
+    assert DataImporter._build_field_map(headers, custom) == expected
+
+    calls = []
+    original = DataImporter._normalize_header
+    monkeypatch.setattr(
+        DataImporter,
+        "_normalize_header",
+        staticmethod(lambda *args: calls.append(args[0]) or original(*args)),
+    )
+    # An equal schema (e.g. re-fetched for the next upload) reuses the table.
+    assert DataImporter._build_field_map(headers, custom.model_copy()) == expected
+    assert calls == []
+    # Without the custom drill the label is not a drill key.
+    assert DataImporter._build_field_map(["Bench Press"], football) == {"Bench Press": "bench_press"}
+    assert calls == ["Bench Press"]
@@ -0,0 +1,130 @@
+import contextvars
+import multiprocessing
+import re
+
+import pytest
+
+from backend.middleware import metrics
+from backend.middleware.metrics import LATENCY_BUCKETS, MetricsRegistry
+
+
+def _sample(text, name, **labels):
+    wanted = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    pattern = "^" + re.escape(name + ("{" + wanted + "}" if wanted else "")) + r" (\S+)$"
+    match = re.search(pattern, text, re.M)
+    return float(match.group(1)) if match else None
+
+
+def test_metrics_endpoint_reports_route_histograms_firestore_and_cache(monkeypatch):
+    from starlette.testclient import TestClient
+
+    from backend.main import app
+    from backend.middleware.observability import add_cache_deltas, record_firestore_call
+
+    metrics.REGISTRY.reset()
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", True)
+    client = TestClient(app, base_url="https://testserver")
+    for _ in range(3):
+        assert client.get("/api/meta").status_code == 200
+    record_firestore_call(30.0)
+    record_firestore_call(700.0)
+    add_cache_deltas(hits_delta=3, misses_delta=1)
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = r.text
+
+    route = {"method": "GET", "route": "/api/meta"}
+    assert _sample(text, "woo_http_requests_total", **route, status="200") == 3
+    assert _sample(text, "woo_http_request_duration_seconds_count", **route) == 3
+    # Every bound is present and cumulative, ending at the total.
+    buckets = re.findall(r'woo_http_request_duration_seconds_bucket\{method="GET",route="/api/meta",le="[^"]+"\} (\S+)', text)
+    assert len(buckets) == len(LATENCY_BUCKETS) + 1
+    assert [float(b) for b in buckets] == sorted(float(b) for b in buckets)
+    assert float(buckets[-1]) == 3
+
+    assert _sample(text, "woo_firestore_call_duration_seconds_bucket", le="0.05") == 1
+    assert _sample(text, "woo_firestore_call_duration_seconds_bucket", le="1.0") == 2
+    assert _sample(text, "woo_firestore_call_duration_seconds_sum") == pytest.approx(0.73)
+    assert _sample(text, "woo_cache_hit_ratio") == 0.75
+    assert _sample(text, "woo_admission_read_in_flight") == 0
+
+    monkeypatch.setattr(metrics, "METRICS_AUTH_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    authorized = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert authorized.status_code == 200
+
+
+def test_metrics_endpoint_is_off_by_default_and_needs_a_token_in_prod(monkeypatch):
+    from starlette.testclient import TestClient
+
+    from backend.main import app
+
+    client = TestClient(app, base_url="https://testserver")
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", False)
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", True)
+    monkeypatch.setenv("ENVIRONMENT", "production")
+    assert client.get("/metrics").status_code == 404
+    monkeypatch.setattr(metrics, "METRICS_AUTH_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    authorized = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert authorized.status_code == 200
+
+
+def test_firestore_calls_per_request_counts_calls_made_in_sync_routes():
+    from fastapi import FastAPI
+    from starlette.testclient import TestClient
+
+    from backend.middleware.observability import ObservabilityMiddleware, record_firestore_call
+
+    app = FastAPI()
+    app.add_middleware(ObservabilityMiddleware)
+
+    # Sync routes run in a worker thread on a copy of the request context.
+    @app.get("/sync-calls")
+    def sync_calls():
+        record_firestore_call(5.0)
+        record_firestore_call(5.0)
+        return {}
+
+    metrics.REGISTRY.reset()
+    # A fresh context, so values other tests left in context vars can't leak in.
+    response = contextvars.Context().run(TestClient(app).get, "/sync-calls")
+    assert response.status_code == 200
+    text = metrics.render_metrics({})
+    assert _sample(text, "woo_firestore_calls_per_request_bucket", le="1.0") == 0
+    assert _sample(text, "woo_firestore_calls_per_request_bucket", le="2.0") == 1
+    assert _sample(text, "woo_firestore_calls_per_request_sum") == 2
+
+
+def _worker(directory, requests):
+    registry = MetricsRegistry(directory)
+    for _ in range(requests):
+        registry.observe("http_request_duration_seconds", 0.02, LATENCY_BUCKETS, method="GET", route="/api/players")
+    registry.refresh_gauges(lambda: {"threadpool_in_use": 7}, min_interval=0)
+
+
+def test_multiprocess_mode_sums_counters_across_workers(tmp_path):
+    directory = str(tmp_path)
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_worker, args=(directory, n)) for n in (2, 3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(10)
+        assert worker.exitcode == 0
+
+    scraper = MetricsRegistry(directory)
+    scraper.observe("http_request_duration_seconds", 0.2, LATENCY_BUCKETS, method="GET", route="/api/players")
+    text = metrics.render(*scraper.collect({"threadpool_in_use": 1}))
+
+    route = {"method": "GET", "route": "/api/players"}
+    assert _sample(text, "woo_http_request_duration_seconds_count", **route) == 6
+    assert _sample(text, "woo_http_request_duration_seconds_bucket", **route, le="0.025") == 5
+    assert _sample(text, "woo_http_request_duration_seconds_bucket", **route, le="+Inf") == 6
+    # Gauges are per live worker; the exited workers' values are dropped.
+    gauges = re.findall(r"^woo_threadpool_in_use\{pid=\"\d+\"\} (\S+)$", text, re.M)
+    assert gauges == ["1.0"]
@@ -0,0 +1,150 @@
+import io
+
+import pytest
+from PIL import Image, ImageDraw, ImageStat
+
+from backend.utils import ocr
+from backend.utils.ocr import OCR_ENGINES, OCRProcessor, OCRScan, annotate_with_policy
+from backend.utils.ocr_local import annotations_from_tesseract_data, prepare_display_image
+
+
+def _tesseract_data(words):
+    """Minimal image_to_data(DICT) output: a line row, then word rows."""
+    data = {k: [] for k in ("text", "conf", "left", "top", "width", "height",
+                            "block_num", "par_num", "line_num")}
+
+    def add(text, conf, box, line):
+        left, top, width, height = box
+        for key, value in (("text", text), ("conf", conf), ("left", left), ("top", top),
+                           ("width", width), ("height", height), ("block_num", 1),
+                           ("par_num", 1), ("line_num", line)):
+            data[key].append(value)
+
+    add("", -1, (0, 0, 500, 300), 1)
+    for text, conf, box, line in words:
+        add(text, conf, box, line)
+    return data
+
+
+def _local(words):
+    return annotations_from_tesseract_data(_tesseract_data(words))
+
+
+def _scan_with(annotations):
+    scan = OCRScan(b"img")
+    scan._annotations = annotations
+    return scan
+
+
+def test_tesseract_data_feeds_existing_extraction_strategies():
+    annotations = _local(
+        [
+            ("LANE", 91, (10, 10, 60, 20), 1),
+            ("2", 88, (80, 10, 20, 20), 1),
+            ("07.13", 93, (40, 80, 300, 140), 2),
+        ]
+    )
+
+    assert annotations["full_text"] == "LANE 2\n07.13"
+    assert annotations["text_annotations"][0]["description"] == "LANE 2\n07.13"
+    assert [w["confidence"] for w in annotations["words"]] == [0.91, 0.88, 0.93]
+
+    value, confidence, _, _ = OCRProcessor.extract_largest_seconds_value_from_image(
+        _scan_with(annotations)
+    )
+    assert (value, confidence) == (7.13, 0.93)
+
+
+def test_prepare_display_image_inverts_light_digits_on_dark_panel():
+    img = Image.new("L", (400, 200), 15)
+    ImageDraw.Draw(img).rectangle((150, 40, 190, 160), fill=240)
+    out = io.BytesIO()
+    img.save(out, format="PNG")
+
+    prepared = prepare_display_image(out.getvalue())
+
+    assert prepared.size == (800, 400)  # small photos are upscaled
+    assert ImageStat.Stat(prepared).mean[0] > 200  # mostly white background
+    assert prepared.getpixel((340, 200)) == 0  # digit stroke is black
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    calls = []
+    results = {}
+
+    def fake(name):
+        def annotate(content):
+            calls.append(name)
+            result = results[name]
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        return annotate
+
+    for name in ("vision", "tesseract"):
+        monkeypatch.setattr(OCR_ENGINES[name], "annotate", fake(name))
+    monkeypatch.setattr(OCR_ENGINES["tesseract"], "available", lambda: True)
+    return calls, results
+
+
+def test_local_first_keeps_confident_local_read(engines):
+    calls, results = engines
+    results["tesseract"] = _local([("14.5", 92, (0, 0, 200, 100), 1)])
+
+    assert annotate_with_policy(b"confident", "local_first") is results["tesseract"]
+    assert calls == ["tesseract"]
+
+
+def test_local_first_falls_back_to_vision_on_low_confidence(engines):
+    calls, results = engines
+    results["tesseract"] = _local([("14.5", 31, (0, 0, 200, 100), 1)])
+    results["vision"] = {"full_text": "14.5", "words": [], "text_annotations": []}
+
+    assert annotate_with_policy(b"unsure", "local_first") is results["vision"]
+    assert calls == ["tesseract", "vision"]
+
+    # Both engine results are cached for the next submission of the photo.
+    assert annotate_with_policy(b"unsure", "local_first") == results["vision"]
+    assert calls == ["tesseract", "vision"]
+
+
+def test_local_first_uses_local_read_when_vision_is_unreachable(engines):
+    calls, results = engines
+    results["tesseract"] = _local([("14.5", 31, (0, 0, 200, 100), 1)])
+    results["vision"] = RuntimeError("network unreachable")
+
+    assert annotate_with_policy(b"offline", "local_first") is results["tesseract"]
+
+    results["tesseract"] = _local([])
+    with pytest.raises(RuntimeError, match="network unreachable"):
+        annotate_with_policy(b"blank", "local_first")
+
+
+def test_local_first_skips_missing_tesseract(engines, monkeypatch):
+    calls, results = engines
+    monkeypatch.setattr(OCR_ENGINES["tesseract"], "available", lambda: False)
+    results["vision"] = {"full_text": "7", "words": [], "text_annotations": []}
+
+    assert annotate_with_policy(b"no-binary", "local_first") is results["vision"]
+    assert calls == ["vision"]
+    assert ocr.OCR_ENGINE == "vision"  # default policy is unchanged
+
+
+def test_ocr_engine_policy_applies_to_scanner_only(engines, monkeypatch):
+    from backend.routes.scanner import _scan_image
+    from backend.utils.importers import DataImporter
+
+    calls, results = engines
+    monkeypatch.setattr(ocr, "OCR_ENGINE", "local_first")
+    results["tesseract"] = _local([("14.5", 92, (0, 0, 200, 100), 1)])
+    results["vision"] = {"full_text": "first_name,last_name\nAva,Lee", "words": [], "text_annotations": []}
+
+    # Tesseract's digit whitelist would strip the names from an import.
+    result = DataImporter.parse_image(b"roster-photo")
+    assert calls == ["vision"]
+    assert [(r["data"]["first_name"], r["data"]["last_name"]) for r in result.valid_rows] == [("Ava", "Lee")]
+
+    _scan_image(b"display-photo", "vertical_jump")
+    assert calls == ["vision", "tesseract"]
@@ -0,0 +1,62 @@
+import io
+
+from PIL import Image, ImageDraw
+
+from backend.utils.ocr import preprocess_image
+
+
+def _photo(width: int, height: int, *, orientation: int = 1, digits_box=None) -> bytes:
+    img = Image.new("RGB", (width, height), (200, 190, 180))
+    if digits_box:
+        draw = ImageDraw.Draw(img)
+        x0, y0, x1, y1 = digits_box
+        draw.rectangle(digits_box, fill=(10, 10, 10))
+        for i in range(x0 + 20, x1 - 20, 60):
+            draw.rectangle((i, y0 + 20, i + 30, y1 - 20), fill=(250, 250, 250))
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=95, exif=exif)
+    return out.getvalue()
+
+
+def _open(content: bytes) -> Image.Image:
+    return Image.open(io.BytesIO(content))
+
+
+def test_preprocess_downscales_to_grayscale_and_shrinks_payload():
+    original = _photo(4000, 3000, digits_box=(1500, 1200, 2500, 1800))
+
+    processed = preprocess_image(original, max_dimension=1600, crop_to_text=False)
+
+    img = _open(processed)
+    assert img.mode == "L"
+    assert img.size == (1600, 1200)
+    assert len(processed) < len(original)
+
+
+def test_preprocess_applies_exif_orientation():
+    # Orientation 6: stored landscape, displayed rotated 90 degrees (portrait).
+    original = _photo(800, 600, orientation=6)
+
+    img = _open(preprocess_image(original, max_dimension=1600, crop_to_text=False))
+
+    assert img.size == (600, 800)
+
+
+def test_preprocess_crops_to_text_band():
+    original = _photo(3000, 3000, digits_box=(1000, 1300, 2000, 1700))
+
+    img = _open(preprocess_image(original, max_dimension=4000, crop_to_text=True))
+
+    width, height = img.size
+    assert width < 1600 and height < 800
+    assert width >= 1000 and height >= 400
+
+    # Nothing text-like: keep the whole frame.
+    blank = _open(preprocess_image(_photo(1200, 900), max_dimension=4000, crop_to_text=True))
+    assert blank.size == (1200, 900)
+
+
+def test_preprocess_returns_original_when_not_decodable():
+    assert preprocess_image(b"not an image") == b"not an image"
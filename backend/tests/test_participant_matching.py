@@ -124,3 +124,90 @@ def test_infer_sibling_groups_marks_large_groups_as_suspicious():
         "parent_email",
         "street_parent_last_name",
     ]
+
+
+def _pairwise_components(players):
+    """The original O(n^2) pair scan, kept as the reference for equivalence."""
+    from backend.utils.participant_matching import household_keys, parse_bool
+
+    players = [p for p in players if p.get("id")]
+    adjacency = {str(p["id"]): set() for p in players}
+    signals = {}
+    for i, left in enumerate(players):
+        if parse_bool(left.get("siblingSeparationRequested")):
+            continue
+        left_keys = dict((s, v) for s, v in household_keys(left))
+        for right in players[i + 1 :]:
+            if parse_bool(right.get("siblingSeparationRequested")):
+                continue
+            shared = {s for s, v in household_keys(right) if left_keys.get(s) == v}
+            if shared:
+                a, b = str(left["id"]), str(right["id"])
+                adjacency[a].add(b)
+                adjacency[b].add(a)
+                signals[tuple(sorted((a, b)))] = shared
+    return adjacency, signals
+
+
+def _random_players(count, seed):
+    import random
+
+    rng = random.Random(seed)
+    players = []
+    for i in range(count):
+        household = rng.randrange(count // 3 + 1)
+        players.append(
+            {
+                "id": f"p{i}",
+                "age_group": rng.choice(["U8", "U10", "u10 ", None]),
+                "parentEmailNormalized": f"fam{household}@x.com" if rng.random() < 0.6 else None,
+                "cellPhoneNormalized": f"555{household % 40:04d}" if rng.random() < 0.4 else None,
+                "streetNormalized": f"{household % 25} main st" if rng.random() < 0.7 else None,
+                "parentLastNameNormalized": rng.choice(["smith", "jones", None]),
+                "siblingSeparationRequested": rng.random() < 0.05,
+            }
+        )
+    return players
+
+
+def test_blocking_key_inference_matches_pairwise_reference():
+    import hashlib
+
+    from backend.utils.participant_matching import normalize_match_text
+
+    for seed in range(5):
+        players = _random_players(300, seed)
+        assignments = infer_sibling_group_assignments(players, event_id="event-x")
+
+        by_division = {}
+        for p in players:
+            division = normalize_match_text(p.get("age_group")) or "__unknown_division__"
+            by_division.setdefault(division, []).append(p)
+
+        expected = {}
+        for division, division_players in by_division.items():
+            adjacency, signals = _pairwise_components(division_players)
+            for node in adjacency:
+                if node in expected:
+                    continue
+                stack, component = [node], set()
+                while stack:
+                    current = stack.pop()
+                    if current not in component:
+                        component.add(current)
+                        stack.extend(adjacency[current])
+                group_id, component_signals = None, []
+                if len(component) > 1:
+                    digest_seed = f"event-x|{division}|{'|'.join(sorted(component))}"
+                    group_id = "sg_" + hashlib.sha1(digest_seed.encode("utf-8")).hexdigest()[:12]
+                    component_signals = sorted(
+                        set().union(*(shared for (a, _b), shared in signals.items() if a in component))
+                    )
+                for pid in component:
+                    expected[pid] = (group_id, len(component), component_signals)
+
+        actual = {
+            pid: (a["siblingGroupId"], a["siblingGroupSize"], a["siblingInferenceSignals"])
+            for pid, a in assignments.items()
+        }
+        assert actual == expected
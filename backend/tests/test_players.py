@@ -105,3 +105,67 @@ def test_league_player_create_requires_organizer_scope(app_client, fake_db, coac
         headers=coach_headers,
     )
     assert response.status_code == 403, response.text
+
+
+def test_upload_recalculates_only_touched_households(app_client, fake_db, organizer_headers, monkeypatch):
+    from backend.middleware.observability import get_write_fanout_stats
+    from backend.services import player_bulk_upload
+    from backend.utils.participant_matching import infer_sibling_group_assignments
+
+    _seed_event(fake_db, event_id="event-1")
+    fake_db.collection("events").document("event-1").update({"drillTemplate": "football"})
+
+    def kid(last, number, **contact):
+        return {"first_name": "Kid", "last_name": last, "jersey_number": number, "age_group": "U10", **contact}
+
+    roster = [
+        kid("A1", 1, parent_email="a@example.com"),
+        kid("A2", 2, parent_email="A@example.com "),
+        kid("B1", 3, cell_phone="555-0100"),
+        kid("B2", 4, cell_phone="(555) 0100"),
+    ] + [kid(f"Solo{i}", 10 + i, parent_email=f"solo{i}@example.com") for i in range(30)]
+    r = app_client.post(
+        "/api/players/upload",
+        json={"event_id": "event-1", "players": roster},
+        headers=organizer_headers,
+    )
+    assert r.status_code == 200, r.text
+
+    loaded = []
+
+    def spy(players, *, event_id):
+        loaded.append(sorted(p["last"] for p in players))
+        return infer_sibling_group_assignments(players, event_id=event_id)
+
+    monkeypatch.setattr(player_bulk_upload, "infer_sibling_group_assignments", spy)
+    before = get_write_fanout_stats().get("players.sibling_groups", {"writes": 0})["writes"]
+
+    # A3 joins household A; B2 moves to a new phone, splitting household B.
+    r = app_client.post(
+        "/api/players/upload",
+        json={
+            "event_id": "event-1",
+            "players": [kid("A3", 5, parent_email="a@example.com"), kid("B2", 4, cell_phone="555-0199")],
+        },
+        headers=organizer_headers,
+    )
+    assert r.status_code == 200, r.text
+
+    assert loaded == [["A1", "A2", "A3", "B1", "B2"]]
+    # A1, A2 (size 2 -> 3), A3 (new), B1, B2 (group dissolved).
+    assert get_write_fanout_stats()["players.sibling_groups"]["writes"] - before == 5
+
+    players_ref = fake_db.collection("events").document("event-1").collection("players")
+    stored = []
+    for doc in players_ref.stream():
+        data = doc.to_dict()
+        data["id"] = doc.id
+        stored.append(data)
+    expected = infer_sibling_group_assignments(stored, event_id="event-1")
+    by_last = {}
+    for player in stored:
+        assert player.get("siblingGroupId") == expected[player["id"]]["siblingGroupId"]
+        assert player.get("siblingGroupSize", 1) == expected[player["id"]]["siblingGroupSize"]
+        by_last[player["last"]] = player
+    assert by_last["A3"]["siblingGroupSize"] == 3
+    assert by_last["B1"]["siblingGroupId"] is None and by_last["B2"]["siblingGroupId"] is None
@@ -61,3 +61,210 @@ def test_scanner_ocr_requires_event_scope_membership(app_client, fake_db):
     )
 
     assert response.status_code == 403, response.text
+
+
+def _box(x0, y0, x1, y1):
+    return {"vertices": [{"x": x0, "y": y0}, {"x": x1, "y": y0}, {"x": x1, "y": y1}, {"x": x0, "y": y1}]}
+
+
+def _word(text, box, confidence=0.9):
+    return {"symbols": [{"text": ch} for ch in text], "bounding_box": box, "confidence": confidence}
+
+
+def _recorded_response(document_words, full_text, tokens):
+    """Trimmed AnnotateImageResponse (document + text detection) as returned by Vision."""
+    return {
+        "error": {"message": ""},
+        "full_text_annotation": {
+            "text": full_text,
+            "pages": [{"blocks": [{"paragraphs": [{"words": document_words}]}]}],
+        },
+        "text_annotations": [{"description": full_text}]
+        + [{"description": text, "bounding_poly": box} for text, box in tokens],
+    }
+
+
+class RecordedVisionClient:
+    def __init__(self, response):
+        self.response = response
+        self.requests = []
+
+    def annotate_image(self, request):
+        self.requests.append(request)
+        return self.response
+
+
+def _scan(app_client, headers, drill_type):
+    return app_client.post(
+        "/api/scanner/ocr",
+        files={"image": ("x.png", b"fake", "image/png")},
+        data={"drill_type": drill_type, "event_id": "event-1"},
+        headers=headers,
+    )
+
+
+def test_scanner_ocr_uses_one_vision_request_for_all_strategies(
+    app_client, fake_db, monkeypatch, coach_headers
+):
+    from backend.utils import ocr as ocr_mod
+
+    _seed_event(fake_db)
+    # Jump app screen: full-text OCR reveals it is a vertical, then the largest
+    # token wins. This used to take document_text_detection + text_detection.
+    client = RecordedVisionClient(
+        _recorded_response(
+            [_word("Last", _box(0, 0, 40, 10)), _word("Jump", _box(45, 0, 90, 10))],
+            "Last Jump\n24.5\nAvg High 22",
+            [("24.5", _box(0, 20, 200, 120)), ("22", _box(0, 130, 30, 145))],
+        )
+    )
+    monkeypatch.setattr(ocr_mod, "get_vision_client", lambda: client)
+
+    r = _scan(app_client, coach_headers, "skill score")
+    assert r.status_code == 200, r.text
+    assert r.json()["value"] == 24.5
+    assert r.json()["all_numbers"] == [24.5, 22.0]
+    assert len(client.requests) == 1
+    assert len(client.requests[0]["features"]) == 2
+
+
+def test_scanner_seconds_fallback_reuses_the_same_annotations(
+    app_client, fake_db, monkeypatch, coach_headers
+):
+    from backend.utils import ocr as ocr_mod
+
+    _seed_event(fake_db)
+    # The document model finds no time; the sparse tokens do.
+    client = RecordedVisionClient(
+        _recorded_response(
+            [_word("TIMER", _box(0, 0, 50, 10), confidence=0.8)],
+            "TIMER",
+            [("07.13", _box(0, 20, 200, 120)), ("3", _box(0, 130, 10, 140))],
+        )
+    )
+    monkeypatch.setattr(ocr_mod, "get_vision_client", lambda: client)
+
+    r = _scan(app_client, coach_headers, "40yd dash")
+    assert r.status_code == 200, r.text
+    assert r.json()["value"] == 7.13
+    assert len(client.requests) == 1
+
+
+def test_scanner_ocr_cache_skips_vision_for_resubmitted_photo(
+    app_client, fake_db, monkeypatch, coach_headers, tmp_path
+):
+    from backend.utils import content_cache
+    from backend.utils import ocr as ocr_mod
+
+    _seed_event(fake_db)
+    monkeypatch.setenv("OCR_CACHE_DIR", str(tmp_path / "ocr"))
+    deltas = []
+    monkeypatch.setattr(
+        content_cache, "add_cache_deltas", lambda hits_delta=0, misses_delta=0: deltas.append((hits_delta, misses_delta))
+    )
+    client = RecordedVisionClient(
+        _recorded_response(
+            [_word("07.13", _box(0, 0, 200, 100))],
+            "07.13",
+            [("07.13", _box(0, 0, 200, 100))],
+        )
+    )
+    monkeypatch.setattr(ocr_mod, "get_vision_client", lambda: client)
+
+    for _ in range(2):
+        r = _scan(app_client, coach_headers, "40yd dash")
+        assert r.status_code == 200, r.text
+        assert r.json()["value"] == 7.13
+    assert len(client.requests) == 1
+    assert deltas == [(0, 1), (1, 0)]
+
+    # The disk tier survives a cold memory cache (e.g. another worker).
+    ocr_mod._ocr_cache._entries.clear()
+    assert _scan(app_client, coach_headers, "40yd dash").json()["value"] == 7.13
+    assert len(client.requests) == 1
+
+    # A different photo is a miss.
+    r = app_client.post(
+        "/api/scanner/ocr",
+        files={"image": ("y.png", b"other photo", "image/png")},
+        data={"drill_type": "40yd dash", "event_id": "event-1"},
+        headers=coach_headers,
+    )
+    assert r.status_code == 200, r.text
+    assert len(client.requests) == 2
+
+
+def test_scanner_batch_authorizes_once_and_matches_bibs(
+    app_client, fake_db, monkeypatch, coach_headers
+):
+    from backend.routes import scanner as scanner_mod
+    from backend.utils import ocr as ocr_mod
+
+    _seed_event(fake_db)
+    players = fake_db.collection("events").document("event-1").collection("players")
+    players.document("p-23").set({"name": "Ava Lee", "number": 23, "age_group": "U10"})
+    players.document("p-7a").set({"name": "Ben Ode", "number": 7, "age_group": "U10"})
+    players.document("p-7b").set({"name": "Cal Ode", "number": "7", "age_group": "U12"})
+
+    screens = {
+        b"img-23": ["BIB #23", "40yd 5.21"],
+        b"img-7": ["No. 07", "40yd 6.02"],
+        b"img-none": ["40yd 5.87"],
+        b"img-99": ["#99", "40yd 7.10"],
+    }
+
+    class FakeOCR:
+        @staticmethod
+        def extract_rows_from_image(image):
+            return (screens[image.content], 0.9)
+
+    monkeypatch.setattr(ocr_mod, "OCRProcessor", FakeOCR)
+    access_checks = []
+    original_access = scanner_mod.ensure_event_access
+
+    def counting_access(*args, **kwargs):
+        access_checks.append(args[1])
+        return original_access(*args, **kwargs)
+
+    monkeypatch.setattr(scanner_mod, "ensure_event_access", counting_access)
+
+    files = [("images", (f"{key.decode()}.png", key, "image/png")) for key in screens]
+    files.insert(2, ("images", ("notes.txt", b"nope", "text/plain")))
+    r = app_client.post(
+        "/api/scanner/ocr/batch",
+        files=files,
+        data={"drill_type": "40yd", "event_id": "event-1", "match_players": "true"},
+        headers=coach_headers,
+    )
+
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert access_checks == ["event-1"]
+    assert body["count"] == 5
+    results = body["results"]
+    assert [res["index"] for res in results] == [0, 1, 2, 3, 4]
+    assert [res["value"] for res in results] == [5.21, 6.02, None, 5.87, 7.1]
+    assert results[2]["error"] == "Invalid file type. Please upload an image."
+    assert "player_match" not in results[2]
+    assert [res.get("player_match") for res in results] == [
+        "matched", "ambiguous", None, "no_bib", "not_found"
+    ]
+    assert results[0]["bib"] == "23"
+    assert results[0]["player"]["id"] == "p-23"
+    assert results[1]["bib"] == "7" and results[1]["player"] is None
+
+
+def test_scanner_batch_rejects_too_many_images(app_client, fake_db, coach_headers):
+    from backend.routes.scanner import MAX_IMAGES_PER_BATCH
+
+    _seed_event(fake_db)
+    files = [
+        ("images", (f"{i}.png", b"fake", "image/png")) for i in range(MAX_IMAGES_PER_BATCH + 1)
+    ]
+    r = app_client.post(
+        "/api/scanner/ocr/batch",
+        files=files,
+        data={"drill_type": "40yd", "event_id": "event-1"},
+        headers=coach_headers,
+    )
+    assert r.status_code == 400
@@ -61,3 +61,136 @@ def test_health_rate_limit_enforced(monkeypatch):
     assert r2.status_code in (200, 429)
     if r2.status_code == 429:
         assert r2.json().get("category") == "rate_limit"
+
+
+def _middleware_app(monkeypatch):
+    from fastapi import FastAPI
+    from starlette.responses import StreamingResponse
+
+    from backend.middleware.abuse_protection import AbuseProtectionMiddleware
+    from backend.middleware.observability import ObservabilityMiddleware
+    from backend.middleware.security import (
+        RequestValidationMiddleware,
+        SecurityHeadersMiddleware,
+    )
+
+    monkeypatch.setenv("ABUSE_PROTECTION_ENABLED", "true")
+    monkeypatch.setenv("ABUSE_MAX_REQUESTS", "2")
+    app = FastAPI()
+
+    @app.get("/api/stream")
+    def stream():
+        return StreamingResponse((f"chunk{i}\n" for i in range(3)), media_type="text/plain")
+
+    @app.get("/api/users/me")
+    def me():
+        return {"ok": True}
+
+    app.add_middleware(ObservabilityMiddleware)
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(AbuseProtectionMiddleware)
+    app.add_middleware(RequestValidationMiddleware, config={"max_request_size": 10})
+    return app
+
+
+def test_asgi_middlewares_stream_and_decorate_responses(monkeypatch):
+    from starlette.testclient import TestClient
+
+    client = TestClient(_middleware_app(monkeypatch), base_url="https://testserver")
+    browser = {"User-Agent": "Mozilla/5.0 (test)"}
+
+    r = client.get("/api/stream", headers={**browser, "X-Request-ID": "req-1"})
+    assert r.status_code == 200
+    assert r.text == "chunk0\nchunk1\nchunk2\n"
+    assert r.headers["X-Request-ID"] == "req-1"
+    assert r.headers["X-Frame-Options"] == "DENY"
+    assert r.headers["X-Security-Headers"] == "enabled"
+    assert r.headers["Strict-Transport-Security"].startswith("max-age=")
+
+    # Auth endpoints only get the minimal header set.
+    r = client.get("/api/users/me", headers=browser)
+    assert r.headers["X-Content-Type-Options"] == "nosniff"
+    assert "X-Frame-Options" not in r.headers
+
+    # Rejections short-circuit before the app and inner middlewares.
+    r = client.get("/api/stream", headers={"User-Agent": "curl/8"})
+    assert (r.status_code, r.text) == (400, "Invalid request")
+    assert "X-Request-ID" not in r.headers
+    r = client.post("/api/stream", headers={**browser, "Content-Length": "11"}, content=b"x" * 11)
+    assert r.status_code == 413
+
+    statuses = [client.get("/api/users/me", headers=browser).status_code for _ in range(2)]
+    assert statuses == [200, 429]
+
+    plain = TestClient(client.app).get("/api/stream", headers=browser, follow_redirects=False)
+    assert plain.status_code == 308
+    assert plain.headers["location"] == "https://testserver/api/stream"
+    challenge = client.get("/api/users/me", headers=browser)
+    assert challenge.headers["X-Abuse-Mode"] == "pow"
+
+
+def test_admission_control_queues_then_sheds_per_route_class(monkeypatch, caplog):
+    import asyncio
+    import json
+    import logging
+    import threading
+
+    import httpx
+    from fastapi import FastAPI, Request
+
+    from backend.middleware import admission
+    from backend.middleware.observability import ObservabilityMiddleware
+    from backend.middleware.rate_limiting import health_rate_limit, limiter, read_rate_limit
+
+    monkeypatch.setattr(admission, "ADMISSION_QUEUE_SIZE", 1)
+    monkeypatch.setattr(admission, "ADMISSION_QUEUE_TIMEOUT_SECONDS", 5)
+    release = threading.Event()
+    app = FastAPI()
+
+    @app.get("/api/slow")
+    @read_rate_limit()
+    def slow(request: Request):
+        release.wait(5)
+        return {"ok": True}
+
+    @app.get("/api/health")
+    @health_rate_limit()
+    def health(request: Request):
+        return {"status": "ok"}
+
+    app.state.limiter = limiter
+    app.add_middleware(ObservabilityMiddleware)
+    admission.add_admission_control(app, limits={"read": 1, "health": 1})
+    gate = admission.get_admission_gates()["read"]
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="https://testserver") as client:
+            first = asyncio.create_task(client.get("/api/slow"))
+            while gate.in_flight < 1:
+                await asyncio.sleep(0.01)
+            queued = asyncio.create_task(client.get("/api/slow"))
+            while gate.queued < 1:
+                await asyncio.sleep(0.01)
+
+            # Read class saturated and its queue full: shed immediately.
+            shed = await client.get("/api/slow")
+            # Other classes still have threads.
+            healthy = await client.get("/api/health")
+            await asyncio.sleep(0.05)
+            release.set()
+            return shed, healthy, await first, await queued
+
+    with caplog.at_level(logging.INFO):
+        shed, healthy, first, queued = asyncio.run(scenario())
+
+    assert (shed.status_code, shed.headers["Retry-After"]) == (503, "2")
+    assert shed.json()["category"] == "overloaded"
+    assert healthy.status_code == 200
+    assert first.status_code == queued.status_code == 200
+    assert (gate.in_flight, gate.queued, gate.rejected) == (0, 0, 1)
+
+    logs = [json.loads(r.getMessage()) for r in caplog.records if r.getMessage().startswith("{")]
+    slow_logs = [entry for entry in logs if entry["endpoint"] == "/api/slow"]
+    assert {entry["route_class"] for entry in slow_logs} == {"read"}
+    assert max(entry["queue_ms"] for entry in slow_logs) >= 50
@@ -0,0 +1,258 @@
+import asyncio
+import hashlib
+import itertools
+import time
+import tracemalloc
+
+from backend.middleware.shared_state import MemoryAbuseStateStore, RedisAbuseStateStore
+
+
+class FakeRedis:
+    """In-process stand-in for the Redis commands the abuse store uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.round_trips += 1
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    def zrem(self, key, member):
+        self.round_trips += 1
+        self.data.get(key, {}).pop(member, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.ops.append((name, args, kwargs))
+
+    def execute(self):
+        self.redis.round_trips += 1
+        data = self.redis.data
+        results = []
+        for name, args, kwargs in self.ops:
+            if name == "get":
+                results.append(data.get(args[0]))
+            elif name == "zremrangebyscore":
+                key, _, max_score = args
+                exclusive = str(max_score).startswith("(")
+                limit = float(str(max_score).lstrip("("))
+                zset = data.setdefault(key, {})
+                stale = [m for m, s in zset.items() if s < limit or (not exclusive and s == limit)]
+                for member in stale:
+                    del zset[member]
+                results.append(len(stale))
+            elif name == "zadd":
+                data.setdefault(args[0], {}).update(args[1])
+                results.append(1)
+            elif name == "zcard":
+                results.append(len(data.get(args[0], {})))
+            elif name == "expire":
+                results.append(True)
+        return results
+
+
+def _solve(nonce, difficulty):
+    for i in itertools.count():
+        if hashlib.sha256(f"{nonce}:{i}".encode()).hexdigest().startswith("0" * difficulty):
+            return str(i)
+
+
+def _workers(monkeypatch, store_factory):
+    from fastapi import FastAPI
+    from starlette.testclient import TestClient
+
+    from backend.middleware.abuse_protection import AbuseProtectionMiddleware
+
+    monkeypatch.setenv("ABUSE_PROTECTION_ENABLED", "true")
+    monkeypatch.setenv("ABUSE_MAX_REQUESTS", "3")
+    monkeypatch.setenv("ABUSE_CHALLENGE_DIFFICULTY", "2")
+    clients = []
+    for _ in range(2):
+        app = FastAPI()
+
+        @app.get("/api/users/me")
+        def me():
+            return {"ok": True}
+
+        app.add_middleware(AbuseProtectionMiddleware, store=store_factory())
+        clients.append(TestClient(app, base_url="https://testserver"))
+    return clients
+
+
+def test_shared_abuse_state_applies_limit_and_allowlist_across_workers(monkeypatch):
+    redis = FakeRedis()
+    worker_a, worker_b = _workers(monkeypatch, lambda: RedisAbuseStateStore(redis))
+    headers = {"User-Agent": "Mozilla/5.0 (test)"}
+
+    statuses = [
+        client.get("/api/users/me", headers=headers).status_code
+        for client in (worker_a, worker_b, worker_a, worker_b)
+    ]
+    assert statuses == [200, 200, 200, 429]
+
+    # Solved on one worker, honored by the other.
+    nonce = worker_a.get("/api/users/me", headers=headers).headers["X-Abuse-Nonce"]
+    solved = {**headers, "X-Abuse-Nonce": nonce, "X-Abuse-Answer": _solve(nonce, 2)}
+    assert worker_a.get("/api/users/me", headers=solved).status_code == 200
+    assert worker_b.get("/api/users/me", headers=headers).status_code == 200
+
+    # Allowlisted requests are not counted in the window.
+    ua_hash = hashlib.sha256(b"Mozilla/5.0 (test)").hexdigest()[:8]
+    assert len(redis.data[f"woo:abuse:req:testclient:{ua_hash}"]) == 5
+    # One round trip per counted request, plus the allowlist write and the
+    # un-count of the allowlisted request.
+    assert redis.round_trips == 5 + 1 + 2
+
+
+def test_memory_abuse_state_stays_per_worker(monkeypatch):
+    worker_a, worker_b = _workers(monkeypatch, MemoryAbuseStateStore)
+    headers = {"User-Agent": "Mozilla/5.0 (test)"}
+
+    statuses = [
+        client.get("/api/users/me", headers=headers).status_code
+        for client in (worker_a, worker_b, worker_a, worker_b)
+    ]
+    assert statuses == [200, 200, 200, 200]
+
+
+def test_shared_abuse_state_fails_open_when_store_is_down():
+    class DownRedis:
+        def pipeline(self, transaction=True):
+            raise ConnectionError("connection refused")
+
+        def set(self, *args, **kwargs):
+            raise ConnectionError("connection refused")
+
+    store = RedisAbuseStateStore(DownRedis())
+    assert store.hit("client", 100.0, 30) == (False, 0)
+    store.allow("client", 220.0)  # logged, not raised
+
+
+def test_memory_abuse_state_sliding_window_counts():
+    store = MemoryAbuseStateStore()
+    assert [store.hit("c", 100.0 + i, 30)[1] for i in range(3)] == [1, 2, 3]
+    # Half of the previous window still overlaps: 3 * 0.5 + 1.
+    assert store.hit("c", 145.0, 30) == (False, 2)
+    # Two full windows later nothing is remembered.
+    assert store.hit("c", 200.0, 30) == (False, 1)
+
+    now = time.time()
+    store.allow("c", now + 120)
+    assert store.hit("c", now, 30) == (True, 0)
+    assert store.hit("c", now + 121, 30)[0] is False
+    assert store.stats()["allowlisted_clients"] == 0
+
+
+def test_memory_abuse_state_expires_and_evicts_clients():
+    store = MemoryAbuseStateStore(max_clients=100)
+    for i in range(150):
+        store.hit(f"scan-{i}", 100.0, 30)
+    assert store.stats() == {"tracked_clients": 100, "allowlisted_clients": 0, "evictions": 50}
+    # Recently seen clients survive eviction; the least recently seen go first.
+    store.hit("scan-60", 101.0, 30)
+    store.hit("new", 101.0, 30)
+    assert "scan-60" in store._windows and "scan-50" not in store._windows
+
+    # Once their windows have elapsed, idle clients are dropped on the next insert.
+    store.hit("late", 200.0, 30)
+    assert store.stats()["tracked_clients"] == 1
+
+
+def test_memory_abuse_state_memory_is_bounded_under_client_churn():
+    # The million-client RSS soak lives in scripts/perf/bench_abuse_state_soak.py.
+    store = MemoryAbuseStateStore(max_clients=1_000, max_allowlisted=100)
+
+    def churn(first, count):
+        for i in range(first, first + count):
+            store.hit(f"198.51.{i >> 16}.{i & 0xFFFF}:{i:08x}", 100.0 + i / 100_000, 30)
+
+    tracemalloc.start()
+    try:
+        churn(0, 1_000)
+        at_ceiling, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        churn(1_000, 20_000)
+        _, churn_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert store.stats()["tracked_clients"] == store.max_clients
+    assert store.stats()["evictions"] == 20_000
+    # Unbounded, 20x the clients would be 20x the memory.
+    assert churn_peak < at_ceiling * 2
+
+
+class SlowStore:
+    """A shared store whose every round trip takes a while (e.g. a stalled Redis)."""
+
+    def hit(self, client_id, now, window_seconds):
+        time.sleep(0.3)
+        return False, 1
+
+    def allow(self, client_id, until):
+        time.sleep(0.3)
+
+    def stats(self):
+        return {}
+
+
+def test_slow_shared_store_does_not_stall_other_requests(monkeypatch):
+    from backend.middleware.abuse_protection import AbuseProtectionMiddleware
+
+    monkeypatch.setenv("ABUSE_PROTECTION_ENABLED", "true")
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    middleware = AbuseProtectionMiddleware(app, store=SlowStore())
+
+    async def request(path, delay=0.0):
+        await asyncio.sleep(delay)
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "headers": [(b"host", b"testserver")],
+            "scheme": "https",
+            "server": ("testserver", 443),
+            "client": ("203.0.113.9", 1234),
+            "root_path": "",
+        }
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            sent.append(message)
+
+        await middleware(scope, receive, send)
+        assert sent[0]["status"] == 200
+        return time.perf_counter()
+
+    async def scenario():
+        started = time.perf_counter()
+        slow_done, fast_done = await asyncio.gather(
+            request("/api/users/me"), request("/api/players", delay=0.05)
+        )
+        return slow_done - started, fast_done - started
+
+    slow, fast = asyncio.run(scenario())
+    assert slow >= 0.3
+    # The other request isn't queued behind the store's round trip.
+    assert fast < 0.2
@@ -0,0 +1,201 @@
+import random
+
+from backend.services.team_balancer import generate_balanced_teams
+
+
+def _normalize(value):
+    return value.strip().lower() if value else None
+
+
+def _generate(players, team_ids, **kwargs):
+    kwargs.setdefault("team_cap", None)
+    kwargs.setdefault("time_budget_seconds", 1.0)
+    kwargs.setdefault("seed", 1)
+    return generate_balanced_teams(
+        players=players,
+        team_ids=team_ids,
+        composite_for=lambda p: float(p.get("composite_score") or 0.0),
+        normalize_name=_normalize,
+        **kwargs,
+    )
+
+
+def _team_of(result):
+    return {pid: team_id for team_id, ids in result["teams"].items() for pid in ids}
+
+
+def test_balances_averages_and_team_sizes():
+    rng = random.Random(3)
+    players = {
+        f"p{i:03d}": {"name": f"Player {i}", "composite_score": round(rng.uniform(20, 95), 1)}
+        for i in range(120)
+    }
+    result = _generate(players, [f"t{t}" for t in range(8)])
+
+    sizes = sorted(len(ids) for ids in result["teams"].values())
+    assert sizes == [15] * 8
+    assert result["composite_avg_gap"] <= result["seeded_composite_avg_gap"]
+    assert result["composite_avg_gap"] < 0.5
+    assert sorted(_team_of(result)) == sorted(players)
+
+
+def test_sibling_units_pins_and_cap_are_respected():
+    players = {f"p{i}": {"name": f"Player {i}", "composite_score": 50 + i} for i in range(10)}
+    for pid in ("p0", "p9"):
+        players[pid].update({"siblingGroupId": "sg", "forceSameTeamWithSibling": True})
+    # p1 is a sibling too, but without the force flag it may go anywhere.
+    players["p1"].update({"siblingGroupId": "sg"})
+
+    result = _generate(players, ["a", "b", "c"], team_cap=4, pinned={"p5": "c"})
+    team_of = _team_of(result)
+
+    assert team_of["p0"] == team_of["p9"]
+    assert team_of["p5"] == "c"
+    assert all(len(ids) <= 4 for ids in result["teams"].values())
+    assert result["unassigned_player_ids"] == []
+
+    # A cap too small for the pool leaves the remainder unassigned.
+    result = _generate(players, ["a", "b"], team_cap=3)
+    assert all(len(ids) <= 3 for ids in result["teams"].values())
+    assert len(result["unassigned_player_ids"]) == 4
+
+
+def test_buddy_requests_are_matched_when_balance_allows():
+    players = {}
+    for i in range(12):
+        players[f"p{i}"] = {"name": f"Kid {i}", "composite_score": 60.0}
+    # Pairs (0,1), (2,3), (4,5) ask for each other; equal scores make it free.
+    for a, b in ((0, 1), (2, 3), (4, 5)):
+        players[f"p{a}"]["buddyRequestNormalized"] = f"kid {b}"
+        players[f"p{b}"]["buddyRequestNormalized"] = f"kid {a}"
+
+    result = _generate(players, ["a", "b", "c"])
+    team_of = _team_of(result)
+
+    assert result["buddy_matches"] == 6
+    for a, b in ((0, 1), (2, 3), (4, 5)):
+        assert team_of[f"p{a}"] == team_of[f"p{b}"]
+
+
+def test_unplaced_buddy_requesters_are_left_out_of_the_search():
+    players = {f"p{i}": {"name": f"Kid {i}", "composite_score": 40.0 + i} for i in range(10)}
+    # Everyone asks for a buddy, so the units the cap leaves out do too.
+    for i in range(10):
+        players[f"p{i}"]["buddyRequestNormalized"] = f"kid {(i + 1) % 10}"
+
+    for seed in range(5):
+        result = _generate(players, ["a", "b"], team_cap=4, seed=seed)
+        assert len(result["unassigned_player_ids"]) == 2
+        assert sorted(len(ids) for ids in result["teams"].values()) == [4, 4]
+
+
+def test_thousand_players_forty_teams_within_budget():
+    rng = random.Random(11)
+    players = {
+        f"p{i:04d}": {
+            "name": f"Player {i}",
+            "composite_score": round(rng.gauss(60, 15), 2),
+            "buddyRequestNormalized": f"player {rng.randrange(1000)}" if i % 4 == 0 else None,
+        }
+        for i in range(1000)
+    }
+    result = _generate(players, [f"t{t:02d}" for t in range(40)], team_cap=26, time_budget_seconds=1.5)
+
+    assert result["elapsed_ms"] < 2000
+    assert result["composite_avg_gap"] < 1.0
+    assert sorted(len(ids) for ids in result["teams"].values()) == [25] * 40
+
+
+def _seed_setup_draft(fake_db, *, draft_id="gen-draft", players=6):
+    fake_db.collection("drafts").document(draft_id).set(
+        {
+            "id": draft_id,
+            "name": "Gen Draft",
+            "league_id": "league-1",
+            "created_by": "org-1",
+            "status": "setup",
+            "draft_type": "snake",
+            "event_id": None,
+            "event_ids": [],
+        }
+    )
+    for order, team_id in enumerate(("team-a", "team-b")):
+        fake_db.collection("draft_teams").document(team_id).set(
+            {
+                "id": team_id,
+                "draft_id": draft_id,
+                "team_name": team_id,
+                "pick_order": order,
+                "coach_user_id": None,
+                "pre_slotted_player_ids": ["dp-1"] if team_id == "team-b" else [],
+            }
+        )
+    for idx in range(1, players + 1):
+        fake_db.collection("draft_players").document(f"dp-{idx}").set(
+            {"id": f"dp-{idx}", "draft_id": draft_id, "name": f"Player {idx}", "composite_score": 10 * idx}
+        )
+    return fake_db.collection("drafts").document(draft_id)
+
+
+def test_generate_teams_preview_and_apply(app_client, fake_db, organizer_headers):
+    draft_ref = _seed_setup_draft(fake_db)
+
+    r = app_client.post(
+        "/api/drafts/gen-draft/generate-teams", json={"seed": 1}, headers=organizer_headers
+    )
+    assert r.status_code == 200, r.text
+    preview = r.json()
+    assert preview["applied"] is False
+    assert "dp-1" in preview["teams"]["team-b"]
+    assert draft_ref.get().to_dict()["status"] == "setup"
+    assert list(fake_db.collection("draft_picks").stream()) == []
+
+    r = app_client.post(
+        "/api/drafts/gen-draft/generate-teams",
+        json={"seed": 1, "apply": True},
+        headers=organizer_headers,
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["applied"] is True
+
+    draft = draft_ref.get().to_dict()
+    assert draft["status"] == "completed"
+    assert draft["num_rounds"] == 3
+    picks = [p.to_dict() for p in fake_db.collection("draft_picks").stream()]
+    assert len(picks) == 6
+    assert {p["pick_type"] for p in picks} == {"generated"}
+    by_team = {}
+    for pick in picks:
+        by_team.setdefault(pick["team_id"], set()).add(pick["player_id"])
+    assert by_team == {team_id: set(ids) for team_id, ids in body["teams"].items()}
+    assert len(list(fake_db.collection("team_rosters").stream())) == 2
+
+    events = [e.to_dict() for e in draft_ref.collection("events").stream()]
+    assert [e["type"] for e in events] == ["generate"]
+
+    r = app_client.post(
+        "/api/drafts/gen-draft/generate-teams", json={"apply": True}, headers=organizer_headers
+    )
+    assert r.status_code == 400, r.text
+
+
+def test_generate_teams_refuses_to_apply_with_unassigned_players(app_client, fake_db, organizer_headers):
+    draft_ref = _seed_setup_draft(fake_db, players=10)
+    draft_ref.update({"max_players_per_team": 4})
+    for idx in range(1, 11):
+        fake_db.collection("draft_players").document(f"dp-{idx}").update(
+            {"buddyRequestNormalized": f"player {idx % 10 + 1}"}
+        )
+
+    r = app_client.post("/api/drafts/gen-draft/generate-teams", json={"seed": 1}, headers=organizer_headers)
+    assert r.status_code == 200, r.text
+    assert len(r.json()["unassigned_player_ids"]) == 2
+
+    r = app_client.post(
+        "/api/drafts/gen-draft/generate-teams", json={"seed": 1, "apply": True}, headers=organizer_headers
+    )
+    assert r.status_code == 400
+    assert "2 players do not fit" in r.json()["detail"]
+    assert draft_ref.get().to_dict()["status"] == "setup"
+    assert list(fake_db.collection("draft_picks").stream()) == []
@@ -0,0 +1,184 @@
+"""Bounded cache for JSON results derived from uploaded content.
+
+Entries are stored as compressed JSON, keyed by callers (typically a content
+digest plus whatever else the result depends on). The in-process LRU is
+bounded in bytes. The optional disk tier survives restarts, is shared by
+workers on the same host, and is size-capped. Both tiers expire entries
+after ``ttl_seconds``. Every hit decodes a fresh copy, so callers may mutate
+results. Hits and misses are recorded with add_cache_deltas.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..middleware.observability import add_cache_deltas
+
+_SUFFIX = ".json.z"
+
+
+def _json_default(value: Any) -> Any:
+    # Same encoding FastAPI uses for responses (e.g. Excel date cells).
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class ContentCache:
+    """Memory LRU in front of an optional size-capped directory. Thread-safe.
+
+    ``directory`` is called on every disk access (so tests and deployments can
+    point it elsewhere at runtime); returning None disables the disk tier.
+    """
+
+    def __init__(
+        self,
+        memory_bytes: int,
+        disk_bytes: int,
+        ttl_seconds: float,
+        directory: Callable[[], Optional[str]] = lambda: None,
+    ):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> (stored_at, compressed payload)
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._memory_used = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        blob = self._get_memory(key)
+        if blob is None:
+            blob = self._get_disk(key)
+        if blob is None:
+            add_cache_deltas(misses_delta=1)
+            return None
+        add_cache_deltas(hits_delta=1)
+        # Callers may mutate results, so every hit decodes a fresh copy.
+        return json.loads(zlib.decompress(blob))
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        blob = zlib.compress(json.dumps(payload, default=_json_default).encode("utf-8"), 6)
+        self._put_memory(key, time.time(), blob)
+        try:
+            self._put_disk(key, blob)
+        except OSError as e:
+            logging.warning(f"[CONTENT_CACHE] Disk write failed: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._memory_used = 0
+        directory = self.directory()
+        if directory and os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if name.endswith(_SUFFIX):
+                    try:
+                        os.remove(os.path.join(directory, name))
+                    except OSError:
+                        pass
+
+    def _get_memory(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] >= self.ttl_seconds:
+                self._entries.pop(key)
+                self._memory_used -= len(entry[1])
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _put_memory(self, key: str, stored_at: float, blob: bytes) -> None:
+        if len(blob) > self.memory_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_used -= len(previous[1])
+            self._entries[key] = (stored_at, blob)
+            self._memory_used += len(blob)
+            while self._memory_used > self.memory_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._memory_used -= len(evicted)
+
+    def _get_disk(self, key: str) -> Optional[bytes]:
+        directory = self.directory()
+        if not directory:
+            return None
+        path = os.path.join(directory, key + _SUFFIX)
+        try:
+            stored_at = os.path.getmtime(path)
+            if time.time() - stored_at >= self.ttl_seconds:
+                os.remove(path)
+                return None
+            with open(path, "rb") as f:
+                blob = f.read()
+            zlib.decompress(blob)  # reject truncated/corrupt files
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        self._put_memory(key, stored_at, blob)
+        return blob
+
+    def _put_disk(self, key: str, blob: bytes) -> None:
+        directory = self.directory()
+        if not directory or len(blob) > self.disk_bytes:
+            return
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # mkstemp creates the file 0600; the rename makes the entry appear atomically.
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, os.path.join(directory, key + _SUFFIX))
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._prune_disk(directory)
+
+    def _prune_disk(self, directory: str) -> None:
+        """Drop expired files, then the oldest until the directory fits."""
+        now = time.time()
+        files = []
+        for entry in os.scandir(directory):
+            if not entry.name.endswith(_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime >= self.ttl_seconds:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
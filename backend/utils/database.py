@@ -1,9 +1,13 @@
 import logging
 import concurrent.futures
 import time
+from typing import Iterable, Optional, Tuple
 from fastapi import HTTPException
 
-from ..middleware.observability import record_firestore_call
+from ..middleware.observability import record_firestore_call, record_firestore_writes
+
+# Firestore rejects batches over 500 writes; stay well under it.
+WRITE_BATCH_SIZE = 400
 
 
 def execute_with_timeout(
@@ -48,3 +52,36 @@ def execute_with_timeout(
         raise HTTPException(
             status_code=500, detail=f"{operation_name} failed: {str(e)}"
         )
+
+
+def commit_batched_writes(
+    db,
+    writes: Iterable[Tuple[str, object, Optional[dict]]],
+    *,
+    operation: str,
+    chunk_size: int = WRITE_BATCH_SIZE,
+) -> int:
+    """
+    Commit ``(op, doc_ref, data)`` writes in chunked batches.
+
+    ``op`` is "set", "merge" (set with merge=True), "update" or "delete". Each
+    chunk is atomic on its own; callers needing all-or-nothing across chunks
+    must make the writes idempotent. Returns the number of writes committed.
+    """
+    writes = list(writes)
+    commits = 0
+    for start in range(0, len(writes), chunk_size):
+        batch = db.batch()
+        for op, ref, data in writes[start : start + chunk_size]:
+            if op == "delete":
+                batch.delete(ref)
+            elif op == "update":
+                batch.update(ref, data)
+            elif op == "merge":
+                batch.set(ref, data, merge=True)
+            else:
+                batch.set(ref, data)
+        batch.commit()
+        commits += 1
+    record_firestore_writes(operation, len(writes), commits)
+    return len(writes)
@@ -0,0 +1,87 @@
+"""Per-event player identity index for import duplicate detection.
+
+Duplicate detection only needs to know which players exist, not what their
+documents contain. Player ids are generated from name + number
+(utils.identity.generate_player_id), so the document id doubles as the
+name+number key. The index is therefore built from a field-masked query that
+returns ids plus ``external_id`` and no other document payload.
+
+Entries are cached per event and keyed by the event's roster version. Write
+paths that create, rename or delete players call ``bump_roster_version``,
+which invalidates the entry on this instance. Entries also expire after
+IDENTITY_INDEX_TTL_SECONDS so writes made through other instances are picked
+up. The index is advisory (preview flags); upload writes still read the
+player documents they match.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from ..firestore_client import db
+from ..middleware.observability import add_cache_deltas
+from .database import execute_with_timeout
+
+IDENTITY_INDEX_CACHE_SIZE = 128
+IDENTITY_INDEX_TTL_SECONDS = 30
+
+_LOCK = threading.Lock()
+_VERSIONS: Dict[str, int] = {}
+# event_id -> (roster version, built at, index)
+_CACHE: "OrderedDict[str, Tuple[int, float, Dict[str, Any]]]" = OrderedDict()
+
+
+def bump_roster_version(event_id: str) -> None:
+    """Record that the event's set of players changed."""
+    with _LOCK:
+        _VERSIONS[event_id] = _VERSIONS.get(event_id, 0) + 1
+        _CACHE.pop(event_id, None)
+
+
+def clear_identity_index_cache() -> None:
+    with _LOCK:
+        _CACHE.clear()
+
+
+def _build_identity_index(event_id: str) -> Dict[str, Any]:
+    players_ref = db.collection("events").document(event_id).collection("players")
+    docs = execute_with_timeout(
+        lambda: list(players_ref.select(["external_id"]).stream()),
+        timeout=10,
+        operation_name="fetch player identities",
+    )
+    ids = set()
+    external_ids: Dict[str, str] = {}
+    for doc in docs:
+        ids.add(doc.id)
+        external_id = str((doc.to_dict() or {}).get("external_id") or "").strip()
+        if external_id:
+            external_ids[external_id] = doc.id
+    return {"ids": frozenset(ids), "external_ids": external_ids}
+
+
+def get_identity_index(event_id: str) -> Dict[str, Any]:
+    """Return ``{"ids": frozenset, "external_ids": {external_id: player_id}}``."""
+    now = time.monotonic()
+    with _LOCK:
+        version = _VERSIONS.get(event_id, 0)
+        entry = _CACHE.get(event_id)
+        if entry and entry[0] == version and now - entry[1] < IDENTITY_INDEX_TTL_SECONDS:
+            _CACHE.move_to_end(event_id)
+            add_cache_deltas(hits_delta=1)
+            return entry[2]
+
+    add_cache_deltas(misses_delta=1)
+    index = _build_identity_index(event_id)
+    with _LOCK:
+        # A bump during the build leaves a stale version here, so the next
+        # lookup rebuilds instead of trusting this entry.
+        _CACHE[event_id] = (version, now, index)
+        _CACHE.move_to_end(event_id)
+        while len(_CACHE) > IDENTITY_INDEX_CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return index
+
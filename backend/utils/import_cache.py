@@ -0,0 +1,53 @@
+"""Content-addressed cache of parsed import files.
+
+Organizers typically send the same file two or three times (preview, fix the
+mapping, confirm). Parse results are cached under a key derived from the
+file's sha256, the event schema and the parse options (see
+``ImportContext.parse_cache_key``), so repeats skip decoding, sport detection,
+header mapping and row validation.
+
+Entries live in an in-process LRU and in a directory on local disk
+(``IMPORT_CACHE_DIR``) that survives restarts and is shared by workers on the
+same host (utils.content_cache). Parsed rows contain contact details, so
+entries expire after IMPORT_CACHE_TTL_SECONDS and files are private to the
+process user.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+from .content_cache import ContentCache
+
+IMPORT_CACHE_MEMORY_BYTES = 32 * 1024 * 1024
+IMPORT_CACHE_DISK_BYTES = 256 * 1024 * 1024
+# Long enough for preview -> confirm, short enough not to keep rosters around.
+IMPORT_CACHE_TTL_SECONDS = 3600
+
+
+def _cache_dir() -> str:
+    return os.getenv("IMPORT_CACHE_DIR") or os.path.join(
+        tempfile.gettempdir(), "woo_import_cache"
+    )
+
+
+_CACHE = ContentCache(
+    IMPORT_CACHE_MEMORY_BYTES,
+    IMPORT_CACHE_DISK_BYTES,
+    IMPORT_CACHE_TTL_SECONDS,
+    directory=_cache_dir,
+)
+
+
+def get_cached_parse(key: str) -> Optional[Dict[str, Any]]:
+    return _CACHE.get(key)
+
+
+def put_cached_parse(key: str, payload: Dict[str, Any]) -> None:
+    _CACHE.put(key, payload)
+
+
+def clear_import_cache() -> None:
+    _CACHE.clear()
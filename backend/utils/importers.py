@@ -1,10 +1,19 @@
 import csv
+import hashlib
 import io
+import json
 import logging
 import re
-from typing import List, Dict, Any, Optional, Tuple
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 import openpyxl
 from .validation import DRILL_SCORE_RANGES
+from .import_cache import get_cached_parse, put_cached_parse
+from .. import __version__
+from ..middleware.observability import add_cache_deltas
 from ..services.schema_registry import SchemaRegistry
 
 logger = logging.getLogger(__name__)
@@ -26,6 +35,341 @@ class ImportResult:
         self.sheets = sheets or []
 
 
+class ImportStream:
+    """
+    Lazily parsed import: sport detection and header errors are known up
+    front, rows arrive as bounded ImportResult chunks from ``chunks``.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[ImportResult],
+        detected_sport: str = "unknown",
+        confidence: str = "low",
+        errors: List[Dict[str, Any]] = None,
+        sheets: List[Dict[str, Any]] = None,
+    ):
+        self.chunks = chunks
+        self.detected_sport = detected_sport
+        self.confidence = confidence
+        self.errors = errors or []
+        self.sheets = sheets or []
+
+
+class ImportContext:
+    """
+    Schema-derived state for one import request, shared by all its files.
+
+    The event schema is fetched at most once, and header maps and drill
+    validation sets are memoized, so station files with identical headers
+    reuse them. Safe to share between parser threads.
+    """
+
+    def __init__(
+        self,
+        event_id: Optional[str] = None,
+        disabled_drills: List[str] = None,
+        schema=None,
+    ):
+        self.event_id = event_id
+        self.disabled_drills = list(disabled_drills or [])
+        self._event_schema = schema
+        self._lock = threading.Lock()
+        self._field_maps: Dict[Tuple[str, Tuple[str, ...]], Dict[str, str]] = {}
+        self._validation: Dict[str, Tuple[set, Dict[str, Any]]] = {}
+        self._schema_version: Optional[str] = None
+
+    def schema_for(self, sport: str):
+        # CRITICAL FIX: If event_id provided, use event schema (includes custom drills)
+        # Otherwise fall back to base sport schema
+        if self.event_id:
+            if self._event_schema is None:
+                with self._lock:
+                    if self._event_schema is None:
+                        from ..utils.event_schema import get_event_schema
+
+                        self._event_schema = get_event_schema(self.event_id)
+            return self._event_schema
+        return SchemaRegistry.get_schema(sport)
+
+    def schema_version(self) -> str:
+        """Digest of the event schema; base templates are versioned with the code."""
+        if not self.event_id:
+            return "base"
+        if self._schema_version is None:
+            schema_json = self.schema_for("").model_dump_json()
+            self._schema_version = hashlib.sha256(schema_json.encode("utf-8")).hexdigest()
+        return self._schema_version
+
+    def parse_cache_key(self, kind: str, content: bytes, sheet_name: Optional[str] = None) -> str:
+        """Key for utils.import_cache: content digest + schema + parse options."""
+        parts = [
+            __version__,
+            kind,
+            _content_digest(content),
+            self.schema_version(),
+            sheet_name,
+            sorted(self.disabled_drills),
+        ]
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def field_map(self, headers: List[str], sport: str) -> Dict[str, str]:
+        key = (sport, tuple(headers))
+        field_map = self._field_maps.get(key)
+        if field_map is None:
+            field_map = DataImporter._build_field_map(list(headers), self.schema_for(sport))
+            self._field_maps[key] = field_map
+        return field_map
+
+    def validation(self, sport_id: str) -> Tuple[set, Dict[str, Any]]:
+        """Return (drill_keys, drill_defs) used to validate rows."""
+        cached = self._validation.get(sport_id)
+        if cached is not None:
+            return cached
+
+        # Load Schema for Validation
+        # CRITICAL FIX: If event_id is provided, use get_event_schema to include CUSTOM DRILLS
+        # Otherwise fall back to static template registry
+        schema = self.schema_for(sport_id)
+
+        if not schema:
+            # Fallback to football if detection failed completely
+            schema = SchemaRegistry.get_schema("football")
+
+        # Identify which columns map to drill scores from Schema
+        # NOTE: If using get_event_schema(), disabled drills are already filtered out
+        # The disabled_drills parameter is only needed for base schema fallback
+        drill_keys = set(d.key for d in schema.drills)
+
+        # FILTER DISABLED DRILLS (only if using base schema, not event schema)
+        # Custom drills should NEVER be filtered - if created, they should be used
+        if self.disabled_drills and not self.event_id:
+            # Only filter when using base schema (no event_id means base schema)
+            drill_keys = drill_keys - set(self.disabled_drills)
+
+        cached = (drill_keys, {d.key: d for d in schema.drills})
+        self._validation[sport_id] = cached
+        return cached
+
+
+# Rows per chunk for streaming imports; bounds memory per step.
+STREAM_CHUNK_SIZE = 500
+
+# Sheet previews show the first rows/columns only.
+SHEET_PREVIEW_ROWS = 3
+SHEET_PREVIEW_MAX_COLUMNS = 50
+
+# Workbook metadata (sheet names + previews) keyed by content digest, so the
+# "choose a sheet" round trip does not reopen the same upload just to list it.
+SHEET_METADATA_CACHE_SIZE = 32
+_sheet_metadata_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_sheet_metadata_lock = threading.Lock()
+
+
+def _content_digest(source) -> str:
+    """sha256 of bytes or a seekable binary file (read in blocks, rewound)."""
+    if isinstance(source, (bytes, bytearray)):
+        return hashlib.sha256(source).hexdigest()
+    digest = hashlib.sha256()
+    source.seek(0)
+    for block in iter(lambda: source.read(1024 * 1024), b""):
+        digest.update(block)
+    source.seek(0)
+    return digest.hexdigest()
+
+
+def _get_sheet_metadata(digest: str) -> Optional[Dict[str, Any]]:
+    with _sheet_metadata_lock:
+        metadata = _sheet_metadata_cache.get(digest)
+        if metadata is not None:
+            _sheet_metadata_cache.move_to_end(digest)
+    if metadata is None:
+        add_cache_deltas(misses_delta=1)
+    else:
+        add_cache_deltas(hits_delta=1)
+    return metadata
+
+
+def _put_sheet_metadata(digest: str, metadata: Dict[str, Any]) -> None:
+    with _sheet_metadata_lock:
+        _sheet_metadata_cache[digest] = metadata
+        _sheet_metadata_cache.move_to_end(digest)
+        while len(_sheet_metadata_cache) > SHEET_METADATA_CACHE_SIZE:
+            _sheet_metadata_cache.popitem(last=False)
+
+
+def clear_sheet_metadata_cache() -> None:
+    with _sheet_metadata_lock:
+        _sheet_metadata_cache.clear()
+
+
+# Header resolution. Exports repeat the same headers on every upload, so raw
+# header -> field results are memoized: schema-independent steps in LRUs,
+# schema-dependent ones in a table per schema version (drill keys + labels).
+HEADER_CACHE_SIZE = 4096
+HEADER_TABLE_CACHE_SIZE = 64
+
+# Remove units in parentheses (e.g., "Lane Agility (sec)" -> "Lane Agility")
+_HEADER_UNITS_RE = re.compile(r"\s*\([^)]*\)\s*")
+_PARENT_COLUMN_PREFIXES = (
+    "user_first", "user_last", "user_name", "user_email",
+    "parent_first", "parent_last", "parent_name", "parent_email",
+    "guardian_first", "guardian_last", "guardian_name", "guardian_email",
+    "emergency_contact",
+)
+_THREE_POINT_MARKERS = ("3_point", "three_point", "3pt", "3_pt")
+
+
+def _normalize_label(label: str) -> str:
+    return label.strip().lower().replace(" ", "_").replace("-", "_")
+
+
+@lru_cache(maxsize=HEADER_CACHE_SIZE)
+def _clean_header(header: str) -> str:
+    return _normalize_label(_HEADER_UNITS_RE.sub(" ", header))
+
+
+@lru_cache(maxsize=HEADER_CACHE_SIZE)
+def _fuzzy_header(clean: str) -> str:
+    """Schema-independent fallback: legacy drill keys, then keyword rules."""
+    # Check if it matches any known legacy football drill keys
+    if clean in DRILL_SCORE_RANGES:
+        return clean
+
+    # Prioritize Specific Compounds that might overlap with generic terms
+    if "free" in clean and "throw" in clean:
+        return "free_throws"
+    if "exit" in clean and "vel" in clean:
+        return "exit_velocity"
+
+    # Basketball - check these before football to avoid conflicts
+    if "lane" in clean and "agil" in clean:
+        return "lane_agility"
+
+    # Robust 3-point matching (must come before fuzzy matching)
+    if any(marker in clean for marker in _THREE_POINT_MARKERS):
+        return "three_point"
+    if "spot" in clean and "shoot" in clean:
+        return "three_point"  # "Spot Shooting" -> three_point
+
+    # Football
+    if "40" in clean and "dash" in clean:
+        return "40m_dash"
+    if "jump" in clean or "vert" in clean:
+        return "vertical_jump"
+    if "catch" in clean:
+        return "catching"
+    if "throw" in clean and "vel" not in clean and "free" not in clean:
+        return "throwing"  # Avoid overlap with throwing_velocity and free_throws
+    if "agil" in clean and "lane" not in clean:
+        return "agility"  # Avoid overlap with lane_agility
+
+    # Baseball
+    if "pop" in clean:
+        return "pop_time"
+    if "fielding" in clean:
+        return "fielding_accuracy"
+
+    # Basketball (already checked above for lane_agility and three_point)
+    if "dribble" in clean or "handl" in clean or "ball_handl" in clean:
+        return "dribbling"
+    if "defensive" in clean and "slide" in clean:
+        return "defensive_slide"
+
+    # Soccer
+    if "ball" in clean and "control" in clean:
+        return "ball_control"
+    if "pass" in clean:
+        return "passing_accuracy"
+    if "shoot" in clean and "power" in clean:
+        return "shooting_power"
+
+    # Track
+    if "100" in clean:
+        return "sprint_100"
+    if "400" in clean:
+        return "sprint_400"
+    if "long" in clean and "jump" in clean:
+        return "long_jump"
+    if "shot" in clean:
+        return "shot_put"
+    if "mile" in clean:
+        return "mile_time"
+
+    # Volleyball
+    if "approach" in clean:
+        return "approach_jump"
+    if "serve" in clean:
+        return "serving_accuracy"
+    if "block" in clean:
+        return "blocking_reach"
+
+    return clean
+
+
+@lru_cache(maxsize=1)
+def _sport_drill_keys() -> Tuple[Tuple[str, frozenset], ...]:
+    """(sport id, drill keys) for every built-in template, in registry order."""
+    return tuple(
+        (schema.id, frozenset(d.key for d in schema.drills))
+        for schema in SchemaRegistry.get_all_schemas()
+    )
+
+
+class _HeaderTable:
+    """Compiled header resolution for one schema version."""
+
+    def __init__(self, schema):
+        self.drill_keys = frozenset(d.key for d in schema.drills) if schema else frozenset()
+        # CRITICAL FIX: Build drill label to key mapping for custom drills
+        label_map = {}
+        if schema:
+            for drill in schema.drills:
+                normalized_label = _normalize_label(drill.label)
+                # Map label to key if they're different
+                if normalized_label != _normalize_label(drill.key):
+                    label_map[normalized_label] = drill.key
+        self.label_map = label_map
+        self._resolved: Dict[str, str] = {}
+
+    def resolve(self, header: str) -> str:
+        field = self._resolved.get(header)
+        if field is None:
+            field = DataImporter._normalize_header(header, self.drill_keys, self.label_map)
+            if len(self._resolved) < HEADER_CACHE_SIZE:
+                self._resolved[header] = field
+        return field
+
+
+_header_tables: "OrderedDict[Any, _HeaderTable]" = OrderedDict()
+_header_tables_lock = threading.Lock()
+
+
+def _header_table_for(schema) -> _HeaderTable:
+    version = (
+        (schema.id, tuple((d.key, d.label) for d in schema.drills)) if schema else None
+    )
+    with _header_tables_lock:
+        table = _header_tables.get(version)
+        if table is not None:
+            _header_tables.move_to_end(version)
+            return table
+    table = _HeaderTable(schema)
+    with _header_tables_lock:
+        _header_tables[version] = table
+        while len(_header_tables) > HEADER_TABLE_CACHE_SIZE:
+            _header_tables.popitem(last=False)
+    return table
+
+
+def clear_header_caches() -> None:
+    _clean_header.cache_clear()
+    _fuzzy_header.cache_clear()
+    _sport_drill_keys.cache_clear()
+    with _header_tables_lock:
+        _header_tables.clear()
+
+
 class DataImporter:
     """
     Utility class to parse and normalize input data (CSV, Excel, Text)
@@ -94,7 +438,7 @@ class DataImporter:
     @staticmethod
     def _normalize_header(
         header: str,
-        schema_drills: List[str] = None,
+        schema_drills: Iterable[str] = None,
         drill_label_map: Dict[str, str] = None,
     ) -> str:
         """
@@ -102,7 +446,7 @@ class DataImporter:
 
         Args:
             header: Raw header from CSV/Excel
-            schema_drills: List of valid drill keys
+            schema_drills: Valid drill keys
             drill_label_map: Dict mapping normalized labels to drill keys (e.g., {"bench_press": "x7hG4kL9mN2pQ8vW"})
 
         Returns:
@@ -111,21 +455,13 @@ class DataImporter:
         if not header:
             return ""
 
-        # Remove units in parentheses (e.g., "Lane Agility (sec)" -> "Lane Agility")
-        header_no_units = re.sub(r"\s*\([^)]*\)\s*", " ", str(header))
-        clean = header_no_units.strip().lower().replace(" ", "_").replace("-", "_")
+        clean = _clean_header(str(header))
 
         # Keep parent/guardian columns for sibling inference.
         # They should not map to athlete identity fields, but they still need to be
         # preserved in parsed rows so import mapping can route them into household
         # metadata fields.
-        PARENT_COLUMN_PREFIXES = (
-            "user_first", "user_last", "user_name", "user_email",
-            "parent_first", "parent_last", "parent_name", "parent_email",
-            "guardian_first", "guardian_last", "guardian_name", "guardian_email",
-            "emergency_contact",
-        )
-        if clean.startswith(PARENT_COLUMN_PREFIXES):
+        if clean.startswith(_PARENT_COLUMN_PREFIXES):
             return clean
 
         # Check exact matches first
@@ -140,108 +476,7 @@ class DataImporter:
         if schema_drills and clean in schema_drills:
             return clean
 
-        # Check if it matches any known legacy football drill keys
-        if clean in DRILL_SCORE_RANGES:
-            return clean
-
-        # Fuzzy Matching Logic
-
-        # Prioritize Specific Compounds that might overlap with generic terms
-        if "free" in clean and "throw" in clean:
-            return "free_throws"
-        if "exit" in clean and "vel" in clean:
-            return "exit_velocity"
-
-        # Basketball - check these before football to avoid conflicts
-        if "lane" in clean and "agil" in clean:
-            return "lane_agility"
-
-        # Robust 3-point matching (must come before fuzzy matching)
-        if clean in (
-            "3_point",
-            "3pt",
-            "three_point",
-            "3_point_made",
-            "3pt_made",
-            "three_point_made",
-            "3_point_shooting",
-            "3_pt",
-            "3_pt_made",
-        ):
-            return "three_point"
-        if (
-            "3_point" in clean
-            or "three_point" in clean
-            or "3pt" in clean
-            or "3_pt" in clean
-        ):
-            return "three_point"
-
-        if (
-            "3pt" in clean
-            or "3_pt" in clean
-            or "three_point" in clean
-            or "3_point" in clean
-        ) and "shoot" in clean:
-            return "three_point"
-        if "3_point" in clean or "three_point" in clean:
-            return "three_point"  # Catch-all for "3 Point"
-        if "spot" in clean and "shoot" in clean:
-            return "three_point"  # "Spot Shooting" -> three_point
-
-        # Football
-        if "40" in clean and "dash" in clean:
-            return "40m_dash"
-        if "jump" in clean or "vert" in clean:
-            return "vertical_jump"
-        if "catch" in clean:
-            return "catching"
-        if "throw" in clean and "vel" not in clean and "free" not in clean:
-            return "throwing"  # Avoid overlap with throwing_velocity and free_throws
-        if "agil" in clean and "lane" not in clean:
-            return "agility"  # Avoid overlap with lane_agility
-
-        # Baseball
-        if "pop" in clean:
-            return "pop_time"
-        if "fielding" in clean:
-            return "fielding_accuracy"
-
-        # Basketball (already checked above for lane_agility and three_point)
-        if "dribble" in clean or "handl" in clean or "ball_handl" in clean:
-            return "dribbling"
-        if "defensive" in clean and "slide" in clean:
-            return "defensive_slide"
-
-        # Soccer
-        if "ball" in clean and "control" in clean:
-            return "ball_control"
-        if "pass" in clean:
-            return "passing_accuracy"
-        if "shoot" in clean and "power" in clean:
-            return "shooting_power"
-
-        # Track
-        if "100" in clean:
-            return "sprint_100"
-        if "400" in clean:
-            return "sprint_400"
-        if "long" in clean and "jump" in clean:
-            return "long_jump"
-        if "shot" in clean:
-            return "shot_put"
-        if "mile" in clean:
-            return "mile_time"
-
-        # Volleyball
-        if "approach" in clean:
-            return "approach_jump"
-        if "serve" in clean:
-            return "serving_accuracy"
-        if "block" in clean:
-            return "blocking_reach"
-
-        return clean
+        return _fuzzy_header(clean)
 
     @staticmethod
     def _clean_value(value: Any) -> Optional[float]:
@@ -283,23 +518,18 @@ class DataImporter:
         Returns (sport_id, confidence)
         """
         normalized = [DataImporter._normalize_header(h) for h in headers]
-        schemas = SchemaRegistry.get_all_schemas()
 
         best_sport = "football"  # Default
         max_score = 0
 
-        for schema in schemas:
-            score = 0
-            drill_keys = [d.key for d in schema.drills]
-            for h in normalized:
-                if h in drill_keys:
-                    score += 1
+        for sport_id, drill_keys in _sport_drill_keys():
+            score = sum(1 for h in normalized if h in drill_keys)
 
             # Normalize score by number of drills to avoid bias toward larger schemas
             # But prefer higher absolute matches too.
             if score > max_score:
                 max_score = score
-                best_sport = schema.id
+                best_sport = sport_id
 
         if max_score >= 3:
             return best_sport, "high"
@@ -308,16 +538,73 @@ class DataImporter:
 
         return "football", "low"
 
+    @staticmethod
+    def _build_field_map(headers: List[str], schema) -> Dict[str, str]:
+        """Map raw headers to canonical field names / drill keys for ``schema``."""
+        table = _header_table_for(schema)
+        return {field: table.resolve(field) for field in headers}
+
+    @staticmethod
+    def _open_csv_reader(stream) -> csv.DictReader:
+        # Decode incrementally instead of materializing the whole upload as one
+        # string; utf-8-sig drops a BOM if present.
+        text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        return csv.DictReader(text_stream)
+
+    @staticmethod
+    def _cached_parse(
+        kind: str,
+        content: bytes,
+        sheet_name: Optional[str],
+        context: ImportContext,
+        parse,
+    ) -> ImportResult:
+        """
+        Return the cached result for identical content/schema/options, or
+        parse and cache it. File-level failures (row 0) are cheap and may be
+        transient (e.g. schema lookup), so they are never cached.
+        """
+        try:
+            key = context.parse_cache_key(kind, content, sheet_name)
+        except Exception as e:
+            logger.warning(f"Import cache key unavailable: {e}")
+            return parse()
+
+        cached = get_cached_parse(key)
+        if cached is not None:
+            return ImportResult(**cached)
+
+        result = parse()
+        if not any(error.get("row") == 0 for error in result.errors):
+            put_cached_parse(
+                key,
+                {
+                    "valid_rows": result.valid_rows,
+                    "errors": result.errors,
+                    "detected_sport": result.detected_sport,
+                    "confidence": result.confidence,
+                    "sheets": result.sheets,
+                },
+            )
+        return result
+
     @staticmethod
     def parse_csv(
-        content: bytes, event_id: str = None, disabled_drills: List[str] = None
+        content: bytes,
+        event_id: str = None,
+        disabled_drills: List[str] = None,
+        context: Optional[ImportContext] = None,
     ) -> ImportResult:
         """Parse CSV content"""
+        context = context or ImportContext(event_id, disabled_drills)
+        return DataImporter._cached_parse(
+            "csv", content, None, context, lambda: DataImporter._parse_csv(content, context)
+        )
+
+    @staticmethod
+    def _parse_csv(content: bytes, context: ImportContext) -> ImportResult:
         try:
-            # Decode bytes to string
-            text = content.decode("utf-8-sig")  # Handle BOM if present
-            f = io.StringIO(text)
-            reader = csv.DictReader(f)
+            reader = DataImporter._open_csv_reader(io.BytesIO(content))
 
             # Normalize headers
             if not reader.fieldnames:
@@ -325,41 +612,10 @@ class DataImporter:
 
             # Detect Sport
             sport, confidence = DataImporter._detect_sport(reader.fieldnames)
-
-            # CRITICAL FIX: If event_id provided, use event schema (includes custom drills)
-            # Otherwise fall back to base sport schema
-            if event_id:
-                from ..utils.event_schema import get_event_schema
-
-                schema = get_event_schema(event_id)
-            else:
-                schema = SchemaRegistry.get_schema(sport)
-
-            schema_drills = [d.key for d in schema.drills] if schema else []
-
-            # CRITICAL FIX: Build drill label to key mapping for custom drills
-            drill_label_map = {}
-            if schema:
-                for drill in schema.drills:
-                    normalized_label = (
-                        drill.label.strip().lower().replace(" ", "_").replace("-", "_")
-                    )
-                    normalized_key = (
-                        drill.key.strip().lower().replace(" ", "_").replace("-", "_")
-                    )
-                    # Map label to key if they're different
-                    if normalized_label != normalized_key:
-                        drill_label_map[normalized_label] = drill.key
-
-            normalized_field_map = {
-                field: DataImporter._normalize_header(
-                    field, schema_drills, drill_label_map
-                )
-                for field in reader.fieldnames
-            }
+            normalized_field_map = context.field_map(reader.fieldnames, sport)
 
             result = DataImporter._process_rows(
-                reader, normalized_field_map, sport, event_id, disabled_drills
+                reader, normalized_field_map, sport, context=context
             )
             result.detected_sport = sport
             result.confidence = confidence
@@ -372,106 +628,194 @@ class DataImporter:
             )
 
     @staticmethod
-    def parse_excel(
-        content: bytes,
-        sheet_name: Optional[str] = None,
+    def stream_csv(
+        stream,
         event_id: str = None,
         disabled_drills: List[str] = None,
-    ) -> ImportResult:
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        context: Optional[ImportContext] = None,
+    ) -> ImportStream:
         """
-        Parse Excel (XLSX) content.
-        If multiple sheets exist and no sheet_name provided, returns list of sheets.
+        Parse a binary CSV file object lazily.
+
+        Only the header is read up front; rows are decoded, normalized and
+        validated ``chunk_size`` at a time as ``chunks`` is consumed, so peak
+        memory does not grow with the file.
         """
+        context = context or ImportContext(event_id, disabled_drills)
         try:
-            wb = openpyxl.load_workbook(
-                filename=io.BytesIO(content), read_only=True, data_only=True
+            reader = DataImporter._open_csv_reader(stream)
+            if not reader.fieldnames:
+                return ImportStream(iter(()), errors=[{"row": 0, "message": "Empty CSV file"}])
+
+            sport, confidence = DataImporter._detect_sport(reader.fieldnames)
+            field_map = context.field_map(reader.fieldnames, sport)
+        except Exception as e:
+            logger.error(f"CSV Parse Error: {e}")
+            return ImportStream(
+                iter(()), errors=[{"row": 0, "message": f"Failed to parse CSV: {str(e)}"}]
             )
 
-            # Handle multi-sheet detection
-            if not sheet_name and len(wb.sheetnames) > 1:
-                sheets_info = []
-                for name in wb.sheetnames:
-                    ws = wb[name]
-                    # Get first 3 rows for preview
-                    preview = []
-                    for i, row in enumerate(
-                        ws.iter_rows(min_row=1, max_row=3, values_only=True)
-                    ):
-                        preview.append([str(cell or "") for cell in row])
-                    sheets_info.append({"name": name, "preview": preview})
-                return ImportResult([], [], sheets=sheets_info)
-
-            # Select worksheet
-            if sheet_name:
-                if sheet_name in wb.sheetnames:
-                    ws = wb[sheet_name]
+        return ImportStream(
+            DataImporter._iter_chunks(reader, field_map, sport, context, chunk_size),
+            detected_sport=sport,
+            confidence=confidence,
+        )
+
+    @staticmethod
+    def _iter_chunks(
+        rows: Iterable[Dict[str, Any]],
+        field_map: Dict[str, str],
+        sport_id: str,
+        context: ImportContext,
+        chunk_size: int,
+    ) -> Iterator[ImportResult]:
+        drill_keys, drill_defs = context.validation(sport_id)
+        chunk = ImportResult([], [])
+        try:
+            for idx, row in enumerate(rows, start=1):
+                item, error = DataImporter._process_row(idx, row, field_map, drill_keys, drill_defs)
+                if error:
+                    chunk.errors.append(error)
                 else:
-                    return ImportResult(
-                        [], [{"row": 0, "message": f"Sheet '{sheet_name}' not found"}]
-                    )
-            else:
-                ws = wb.active
+                    chunk.valid_rows.append(item)
+                if len(chunk.valid_rows) + len(chunk.errors) >= chunk_size:
+                    yield chunk
+                    chunk = ImportResult([], [])
+        except Exception as e:
+            # A malformed tail should not discard the rows already streamed.
+            logger.error(f"Streaming import error: {e}")
+            chunk.errors.append({"row": 0, "message": f"Failed to parse file: {str(e)}"})
+        if chunk.valid_rows or chunk.errors:
+            yield chunk
 
-            # Read rows
-            rows = list(ws.iter_rows(values_only=True))
-            if not rows:
-                return ImportResult([], [{"row": 0, "message": "Empty Excel sheet"}])
+    @staticmethod
+    def _sheet_previews(wb) -> List[Dict[str, Any]]:
+        sheets_info = []
+        for name in wb.sheetnames:
+            ws = wb[name]
+            # Get first rows for preview; stop reading the sheet right after them
+            rows = ws.iter_rows(min_row=1, max_row=SHEET_PREVIEW_ROWS, values_only=True)
+            preview = [
+                [str(cell or "") for cell in islice(row, SHEET_PREVIEW_MAX_COLUMNS)]
+                for row in islice(rows, SHEET_PREVIEW_ROWS)
+            ]
+            sheets_info.append({"name": name, "preview": preview})
+        return sheets_info
 
-            # Extract headers from first row
-            headers = [str(cell or "").strip() for cell in rows[0]]
+    @staticmethod
+    def _open_excel_sheet(source, sheet_name: Optional[str]):
+        """
+        Open a workbook read-only and resolve the worksheet to parse.
 
-            # Detect Sport
-            sport, confidence = DataImporter._detect_sport(headers)
+        Returns (workbook, worksheet, sheets, error). When the workbook has
+        several sheets and none was chosen, ``sheets`` carries the previews and
+        no worksheet is returned. Sheet metadata is cached by content digest.
+        The caller closes the workbook.
+        """
+        digest = _content_digest(source)
+        metadata = _get_sheet_metadata(digest)
+        if metadata is not None:
+            if not sheet_name and metadata["sheets"]:
+                return None, None, metadata["sheets"], None
+            if sheet_name and sheet_name not in metadata["sheetnames"]:
+                return None, None, [], {"row": 0, "message": f"Sheet '{sheet_name}' not found"}
+
+        wb = openpyxl.load_workbook(
+            filename=io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source,
+            read_only=True,
+            data_only=True,
+        )
+        if metadata is None:
+            multi_sheet = len(wb.sheetnames) > 1
+            metadata = {
+                "sheetnames": list(wb.sheetnames),
+                "sheets": DataImporter._sheet_previews(wb) if multi_sheet else [],
+            }
+            _put_sheet_metadata(digest, metadata)
 
-            # CRITICAL FIX: If event_id provided, use event schema (includes custom drills)
-            # Otherwise fall back to base sport schema
-            if event_id:
-                from ..utils.event_schema import get_event_schema
+        # Handle multi-sheet detection
+        if not sheet_name and metadata["sheets"]:
+            wb.close()
+            return None, None, metadata["sheets"], None
 
-                schema = get_event_schema(event_id)
-            else:
-                schema = SchemaRegistry.get_schema(sport)
+        # Select worksheet
+        if sheet_name:
+            if sheet_name not in wb.sheetnames:
+                wb.close()
+                return None, None, [], {"row": 0, "message": f"Sheet '{sheet_name}' not found"}
+            return wb, wb[sheet_name], [], None
+        return wb, wb.active, [], None
 
-            schema_drills = [d.key for d in schema.drills] if schema else []
+    @staticmethod
+    def _iter_excel_rows(rows: Iterator[tuple], headers: List[str]) -> Iterator[Dict[str, Any]]:
+        """Turn worksheet value tuples into row dicts, skipping blank rows."""
+        for row in rows:
+            row_data = {}
+            has_data = False
+            for col_idx, cell_value in enumerate(row):
+                if col_idx < len(headers):
+                    key = headers[col_idx]
+                    if cell_value is not None and str(cell_value).strip() != "":
+                        row_data[key] = cell_value
+                        has_data = True
+            if has_data:
+                yield row_data
 
-            # CRITICAL FIX: Build drill label to key mapping for custom drills
-            drill_label_map = {}
-            if schema:
-                for drill in schema.drills:
-                    normalized_label = (
-                        drill.label.strip().lower().replace(" ", "_").replace("-", "_")
-                    )
-                    normalized_key = (
-                        drill.key.strip().lower().replace(" ", "_").replace("-", "_")
-                    )
-                    if normalized_label != normalized_key:
-                        drill_label_map[normalized_label] = drill.key
+    @staticmethod
+    def _prepare_excel(ws, context: ImportContext):
+        """Read only the header row; returns (rows_iter, field_map, sport, confidence)."""
+        rows = ws.iter_rows(values_only=True)
+        first = next(rows, None)
+        if first is None:
+            return None
 
-            # Map headers
-            normalized_field_map = {
-                headers[i]: DataImporter._normalize_header(
-                    headers[i], schema_drills, drill_label_map
-                )
-                for i in range(len(headers))
-            }
+        # Extract headers from first row
+        headers = [str(cell or "").strip() for cell in first]
+        sport, confidence = DataImporter._detect_sport(headers)
+        field_map = context.field_map(headers, sport)
+        return DataImporter._iter_excel_rows(rows, headers), field_map, sport, confidence
 
-            # Convert to dict list for processing
-            data_rows = []
-            for row_idx, row in enumerate(rows[1:], start=2):
-                row_data = {}
-                has_data = False
-                for col_idx, cell_value in enumerate(row):
-                    if col_idx < len(headers):
-                        key = headers[col_idx]
-                        if cell_value is not None and str(cell_value).strip() != "":
-                            row_data[key] = cell_value
-                            has_data = True
-                if has_data:
-                    data_rows.append(row_data)
+    @staticmethod
+    def parse_excel(
+        content: bytes,
+        sheet_name: Optional[str] = None,
+        event_id: str = None,
+        disabled_drills: List[str] = None,
+        context: Optional[ImportContext] = None,
+    ) -> ImportResult:
+        """
+        Parse Excel (XLSX) content.
+        If multiple sheets exist and no sheet_name provided, returns list of sheets.
+        """
+        context = context or ImportContext(event_id, disabled_drills)
+        return DataImporter._cached_parse(
+            "excel",
+            content,
+            sheet_name,
+            context,
+            lambda: DataImporter._parse_excel(content, sheet_name, context),
+        )
 
-            result = DataImporter._process_rows(
-                data_rows, normalized_field_map, sport, event_id, disabled_drills
-            )
+    @staticmethod
+    def _parse_excel(
+        content: bytes, sheet_name: Optional[str], context: ImportContext
+    ) -> ImportResult:
+        wb = None
+        try:
+            wb, ws, sheets, error = DataImporter._open_excel_sheet(content, sheet_name)
+            if error:
+                return ImportResult([], [error])
+            if ws is None:
+                return ImportResult([], [], sheets=sheets)
+
+            prepared = DataImporter._prepare_excel(ws, context)
+            if prepared is None:
+                return ImportResult([], [{"row": 0, "message": "Empty Excel sheet"}])
+            rows, field_map, sport, confidence = prepared
+
+            # Rows are pulled from the sheet lazily while they are processed
+            result = DataImporter._process_rows(rows, field_map, sport, context=context)
             result.detected_sport = sport
             result.confidence = confidence
             return result
@@ -481,10 +825,61 @@ class DataImporter:
             return ImportResult(
                 [], [{"row": 0, "message": f"Failed to parse Excel file: {str(e)}"}]
             )
+        finally:
+            if wb is not None:
+                wb.close()
+
+    @staticmethod
+    def stream_excel(
+        stream,
+        sheet_name: Optional[str] = None,
+        event_id: str = None,
+        disabled_drills: List[str] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        context: Optional[ImportContext] = None,
+    ) -> ImportStream:
+        """
+        Parse a seekable binary XLSX file object lazily (see ``stream_csv``).
+
+        Multi-sheet workbooks without ``sheet_name`` return ``sheets`` previews
+        and no rows. The workbook is closed once ``chunks`` is exhausted.
+        """
+        context = context or ImportContext(event_id, disabled_drills)
+        wb = None
+        try:
+            wb, ws, sheets, error = DataImporter._open_excel_sheet(stream, sheet_name)
+            if error:
+                return ImportStream(iter(()), errors=[error])
+            if ws is None:
+                return ImportStream(iter(()), sheets=sheets)
+
+            prepared = DataImporter._prepare_excel(ws, context)
+            if prepared is None:
+                wb.close()
+                return ImportStream(iter(()), errors=[{"row": 0, "message": "Empty Excel sheet"}])
+            rows, field_map, sport, confidence = prepared
+        except Exception as e:
+            logger.error(f"Excel Parse Error: {e}")
+            if wb is not None:
+                wb.close()
+            return ImportStream(
+                iter(()), errors=[{"row": 0, "message": f"Failed to parse Excel file: {str(e)}"}]
+            )
+
+        def chunks():
+            try:
+                yield from DataImporter._iter_chunks(rows, field_map, sport, context, chunk_size)
+            finally:
+                wb.close()
+
+        return ImportStream(chunks(), detected_sport=sport, confidence=confidence)
 
     @staticmethod
     def parse_image(
-        content: bytes, event_id: str = None, disabled_drills: List[str] = None
+        content: bytes,
+        event_id: str = None,
+        disabled_drills: List[str] = None,
+        context: Optional[ImportContext] = None,
     ) -> ImportResult:
         """
         Parse image content using OCR.
@@ -504,7 +899,10 @@ class DataImporter:
 
             # Reuse parse_text logic
             result = DataImporter.parse_text(
-                csv_text, event_id=event_id, disabled_drills=disabled_drills
+                csv_text,
+                event_id=event_id,
+                disabled_drills=disabled_drills,
+                context=context,
             )
 
             # Override confidence if needed, but for now rely on structure detection
@@ -523,12 +921,26 @@ class DataImporter:
 
     @staticmethod
     def parse_text(
-        text: str, event_id: str = None, disabled_drills: List[str] = None
+        text: str,
+        event_id: str = None,
+        disabled_drills: List[str] = None,
+        context: Optional[ImportContext] = None,
     ) -> ImportResult:
         """
         Parse pasted text. Assumes either CSV-like structure or specific format.
         For now, implements a robust delimiter sniffer (tab, comma, pipe).
         """
+        context = context or ImportContext(event_id, disabled_drills)
+        return DataImporter._cached_parse(
+            "text",
+            text.encode("utf-8"),
+            None,
+            context,
+            lambda: DataImporter._parse_text(text, context),
+        )
+
+    @staticmethod
+    def _parse_text(text: str, context: ImportContext) -> ImportResult:
         try:
             # Trim and split lines
             lines = [line.strip() for line in text.split("\n") if line.strip()]
@@ -558,40 +970,10 @@ class DataImporter:
 
             # Detect Sport
             sport, confidence = DataImporter._detect_sport(reader.fieldnames)
-
-            # CRITICAL FIX: If event_id provided, use event schema (includes custom drills)
-            # Otherwise fall back to base sport schema
-            if event_id:
-                from ..utils.event_schema import get_event_schema
-
-                schema = get_event_schema(event_id)
-            else:
-                schema = SchemaRegistry.get_schema(sport)
-
-            schema_drills = [d.key for d in schema.drills] if schema else []
-
-            # CRITICAL FIX: Build drill label to key mapping for custom drills
-            drill_label_map = {}
-            if schema:
-                for drill in schema.drills:
-                    normalized_label = (
-                        drill.label.strip().lower().replace(" ", "_").replace("-", "_")
-                    )
-                    normalized_key = (
-                        drill.key.strip().lower().replace(" ", "_").replace("-", "_")
-                    )
-                    if normalized_label != normalized_key:
-                        drill_label_map[normalized_label] = drill.key
-
-            normalized_field_map = {
-                field: DataImporter._normalize_header(
-                    field, schema_drills, drill_label_map
-                )
-                for field in reader.fieldnames
-            }
+            normalized_field_map = context.field_map(reader.fieldnames, sport)
 
             result = DataImporter._process_rows(
-                reader, normalized_field_map, sport, event_id, disabled_drills
+                reader, normalized_field_map, sport, context=context
             )
             result.detected_sport = sport
             result.confidence = confidence
@@ -610,127 +992,115 @@ class DataImporter:
         sport_id: str,
         event_id: Optional[str] = None,
         disabled_drills: List[str] = None,
+        context: Optional[ImportContext] = None,
     ) -> ImportResult:
         """Common processing logic for all input types"""
         valid_rows = []
         errors = []
 
-        # Load Schema for Validation
-        # CRITICAL FIX: If event_id is provided, use get_event_schema to include CUSTOM DRILLS
-        # Otherwise fall back to static template registry
-        if event_id:
-            from ..utils.event_schema import get_event_schema
-
-            schema = get_event_schema(event_id)
-        else:
-            schema = SchemaRegistry.get_schema(sport_id)
-
-        if not schema:
-            # Fallback to football if detection failed completely
-            schema = SchemaRegistry.get_schema("football")
-
-        # Identify which columns map to drill scores from Schema
-        # NOTE: If using get_event_schema(), disabled drills are already filtered out
-        # The disabled_drills parameter is only needed for base schema fallback
-        drill_keys = set(d.key for d in schema.drills)
-
-        # FILTER DISABLED DRILLS (only if using base schema, not event schema)
-        # Custom drills should NEVER be filtered - if created, they should be used
-        if disabled_drills and not event_id:
-            # Only filter when using base schema (no event_id means base schema)
-            drill_keys = drill_keys - set(disabled_drills)
-
-        drill_defs = {d.key: d for d in schema.drills}
+        context = context or ImportContext(event_id, disabled_drills)
+        drill_keys, drill_defs = context.validation(sport_id)
 
         for idx, row in enumerate(rows, start=1):
-            processed_row = {}
-            row_errors = []
-            found_canonical_keys = set()
-
-            # Map fields
-            for original_key, value in row.items():
-                mapped_key = field_map.get(original_key)
-                if not mapped_key:
-                    continue
+            item, error = DataImporter._process_row(idx, row, field_map, drill_keys, drill_defs)
+            if error:
+                errors.append(error)
+            else:
+                valid_rows.append(item)
 
-                clean_val = str(value).strip() if value is not None else ""
+        return ImportResult(valid_rows, errors)
 
-                if mapped_key in drill_keys and clean_val:
-                    found_canonical_keys.add(mapped_key)
-                    # SMART ERROR CORRECTION: Try to fix common formatting issues
-                    cleaned_num = DataImporter._clean_value(clean_val)
-                    drill_def = drill_defs.get(mapped_key)
-
-                    if cleaned_num is not None:
-                        # Validate Range from Schema
-                        if drill_def:
-                            min_v = (
-                                drill_def.min_value
-                                if drill_def.min_value is not None
-                                else -1000
+    @staticmethod
+    def _process_row(
+        idx: int,
+        row: Dict[str, Any],
+        field_map: Dict[str, str],
+        drill_keys: set,
+        drill_defs: Dict[str, Any],
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Normalize and validate one row; returns (valid_item, error)."""
+        processed_row = {}
+        row_errors = []
+        found_canonical_keys = set()
+
+        # Map fields
+        for original_key, value in row.items():
+            mapped_key = field_map.get(original_key)
+            if not mapped_key:
+                continue
+
+            clean_val = str(value).strip() if value is not None else ""
+
+            if mapped_key in drill_keys and clean_val:
+                found_canonical_keys.add(mapped_key)
+                # SMART ERROR CORRECTION: Try to fix common formatting issues
+                cleaned_num = DataImporter._clean_value(clean_val)
+                drill_def = drill_defs.get(mapped_key)
+
+                if cleaned_num is not None:
+                    # Validate Range from Schema
+                    if drill_def:
+                        min_v = (
+                            drill_def.min_value
+                            if drill_def.min_value is not None
+                            else -1000
+                        )
+                        max_v = (
+                            drill_def.max_value
+                            if drill_def.max_value is not None
+                            else 10000
+                        )
+                        if not (min_v <= cleaned_num <= max_v):
+                            row_errors.append(
+                                f"Value {cleaned_num} for '{original_key}' out of range ({min_v}-{max_v})"
                             )
-                            max_v = (
-                                drill_def.max_value
-                                if drill_def.max_value is not None
-                                else 10000
+                            processed_row[original_key] = (
+                                cleaned_num  # Keep value to show error
                             )
-                            if not (min_v <= cleaned_num <= max_v):
-                                row_errors.append(
-                                    f"Value {cleaned_num} for '{original_key}' out of range ({min_v}-{max_v})"
-                                )
-                                processed_row[original_key] = (
-                                    cleaned_num  # Keep value to show error
-                                )
-                            else:
-                                processed_row[original_key] = cleaned_num
                         else:
                             processed_row[original_key] = cleaned_num
                     else:
-                        row_errors.append(
-                            f"Invalid number format for '{original_key}': '{clean_val}'"
-                        )
-                        processed_row[original_key] = clean_val  # Keep raw value
+                        processed_row[original_key] = cleaned_num
+                else:
+                    row_errors.append(
+                        f"Invalid number format for '{original_key}': '{clean_val}'"
+                    )
+                    processed_row[original_key] = clean_val  # Keep raw value
 
-                elif mapped_key == "jersey_number" and clean_val:
+            elif mapped_key == "jersey_number" and clean_val:
+                found_canonical_keys.add(mapped_key)
+                try:
+                    num = int(float(clean_val))  # Handle "10.0" from Excel
+                    processed_row[original_key] = num
+                except ValueError:
+                    row_errors.append(f"Invalid player number: {clean_val}")
+                    processed_row[original_key] = clean_val
+
+            else:
+                # Regular string fields
+                if mapped_key:
                     found_canonical_keys.add(mapped_key)
-                    try:
-                        num = int(float(clean_val))  # Handle "10.0" from Excel
-                        processed_row[original_key] = num
-                    except ValueError:
-                        row_errors.append(f"Invalid player number: {clean_val}")
-                        processed_row[original_key] = clean_val
 
-                else:
-                    # Regular string fields
-                    if mapped_key:
-                        found_canonical_keys.add(mapped_key)
-
-                    if clean_val:
-                        processed_row[original_key] = clean_val
-
-            # Check required fields
-            if "first_name" not in found_canonical_keys:
-                row_errors.append("Missing First Name")
-            if "last_name" not in found_canonical_keys:
-                row_errors.append("Missing Last Name")
-
-            # Construct result item
-            item = {
-                "row_id": idx,
+                if clean_val:
+                    processed_row[original_key] = clean_val
+
+        # Check required fields
+        if "first_name" not in found_canonical_keys:
+            row_errors.append("Missing First Name")
+        if "last_name" not in found_canonical_keys:
+            row_errors.append("Missing Last Name")
+
+        if row_errors:
+            return None, {
+                "row": idx,
                 "data": processed_row,
-                "errors": row_errors,
-                "original": str(row),  # Debug helper
+                "message": "; ".join(row_errors),
             }
 
-            if row_errors:
-                errors.append(
-                    {
-                        "row": idx,
-                        "data": processed_row,
-                        "message": "; ".join(row_errors),
-                    }
-                )
-            else:
-                valid_rows.append(item)
-
-        return ImportResult(valid_rows, errors)
+        # Construct result item
+        return {
+            "row_id": idx,
+            "data": processed_row,
+            "errors": row_errors,
+            "original": str(row),  # Debug helper
+        }, None
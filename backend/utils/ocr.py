@@ -1,14 +1,219 @@
 import os
+import hashlib
+import io
 import json
 import logging
 import re
-from typing import Any, List, Tuple
+import multiprocessing
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+from . import ocr_local
+from .content_cache import ContentCache
 
 
 logger = logging.getLogger(__name__)
 
 _vision_client = None
 
+# Annotations are cached by image sha256 + extraction mode, so a re-submitted
+# photo (retry after a failed save, import preview -> confirm) skips Vision.
+# The disk tier is opt-in via OCR_CACHE_DIR.
+OCR_CACHE_MEMORY_BYTES = 16 * 1024 * 1024
+OCR_CACHE_DISK_BYTES = 128 * 1024 * 1024
+OCR_CACHE_TTL_SECONDS = 3600
+# Images are preprocessed before OCR (see preprocess_image). Vision reads
+# scanner displays and score sheets fine at this size; phone photos are 3-4x it.
+OCR_MAX_DIMENSION = int(os.getenv("OCR_MAX_DIMENSION", "1600"))
+OCR_JPEG_QUALITY = 85
+# Cropping to the densest text band helps single-display photos; off by default.
+OCR_CROP_TO_TEXT = os.getenv("OCR_CROP_TO_TEXT", "").lower() in ("1", "true", "yes")
+# Preprocessing is CPU-bound; bound it independently of request concurrency.
+OCR_PREPROCESS_WORKERS = int(os.getenv("OCR_PREPROCESS_WORKERS", str(os.cpu_count() or 2)))
+# Bump when the request features, preprocessing or the annotation format change.
+VISION_OCR_MODE = (
+    f"vision:document+text:gray{OCR_MAX_DIMENSION}{':crop' if OCR_CROP_TO_TEXT else ''}:v2"
+)
+
+# Engine selection for scanner photos (see annotate_with_policy):
+#   vision      - Google Vision only (default)
+#   local       - local Tesseract only, no network
+#   local_first - Tesseract first, Vision when the local read is unsure
+# Tesseract is tuned for digit displays, so image imports (rosters, score
+# sheets) always use Vision.
+OCR_ENGINE = os.getenv("OCR_ENGINE", "vision").lower()
+# Mean confidence of numeric words below which local_first asks Vision.
+OCR_LOCAL_MIN_CONFIDENCE = float(os.getenv("OCR_LOCAL_MIN_CONFIDENCE", "0.6"))
+OCR_LOCAL_WORKERS = int(os.getenv("OCR_LOCAL_WORKERS", str(min(4, os.cpu_count() or 2))))
+OCR_LOCAL_TIMEOUT_SECONDS = 15
+LOCAL_OCR_MODE = (
+    f"tesseract:{ocr_local.OCR_TESSERACT_LANG}:psm{ocr_local.OCR_TESSERACT_PSM}:v1"
+)
+
+_ocr_cache = ContentCache(
+    OCR_CACHE_MEMORY_BYTES,
+    OCR_CACHE_DISK_BYTES,
+    OCR_CACHE_TTL_SECONDS,
+    directory=lambda: os.getenv("OCR_CACHE_DIR") or None,
+)
+
+
+def ocr_cache_key(content: bytes, mode: str) -> str:
+    return hashlib.sha256(mode.encode("utf-8") + b"\0" + content).hexdigest()
+
+
+def clear_ocr_cache() -> None:
+    _ocr_cache.clear()
+
+
+_preprocess_pool: Optional[ThreadPoolExecutor] = None
+_preprocess_pool_lock = threading.Lock()
+
+
+def _get_preprocess_pool() -> ThreadPoolExecutor:
+    global _preprocess_pool
+    with _preprocess_pool_lock:
+        if _preprocess_pool is None:
+            _preprocess_pool = ThreadPoolExecutor(
+                max_workers=max(1, OCR_PREPROCESS_WORKERS), thread_name_prefix="ocr-preprocess"
+            )
+        return _preprocess_pool
+
+
+_local_pool: Optional[ProcessPoolExecutor] = None
+_local_pool_lock = threading.Lock()
+
+
+def _get_local_pool() -> ProcessPoolExecutor:
+    """Worker processes for Tesseract, so OCR doesn't hold the GIL of the API."""
+    global _local_pool
+    with _local_pool_lock:
+        if _local_pool is None:
+            # spawn: forking a process with live gRPC/Firestore threads is unsafe.
+            _local_pool = ProcessPoolExecutor(
+                max_workers=max(1, OCR_LOCAL_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _local_pool
+
+
+# Edge-density probe used to find the text band; small enough to be cheap.
+_CROP_PROBE_SIZE = 256
+_CROP_EDGE_THRESHOLD = 40
+_CROP_MIN_EDGE_RATIO = 0.005
+_CROP_PADDING = 0.1
+# Crops that keep most of the image are not worth the risk of clipping text.
+_CROP_MAX_AREA_RATIO = 0.85
+
+
+def _densest_run(profile: List[int]) -> Tuple[int, int]:
+    """[start, end) of the above-average run with the largest total.
+
+    The profile is box-smoothed first so the gaps between strokes of one
+    digit don't split it into separate runs.
+    """
+    radius = max(1, len(profile) // 32)
+    prefix = [0]
+    for value in profile:
+        prefix.append(prefix[-1] + value)
+    profile = [
+        prefix[min(len(profile), i + radius + 1)] - prefix[max(0, i - radius)]
+        for i in range(len(profile))
+    ]
+    threshold = sum(profile) / len(profile) if profile else 0
+    best = (0, 0, len(profile))
+    start, mass = None, 0
+    for i, value in enumerate(profile + [0]):
+        if value > threshold:
+            if start is None:
+                start, mass = i, 0
+            mass += value
+        elif start is not None:
+            if mass > best[0]:
+                best = (mass, start, i)
+            start = None
+    return best[1], best[2]
+
+
+def _largest_text_box(gray) -> Optional[Tuple[int, int, int, int]]:
+    """Box around the densest band of edges (large digits on a display), or None."""
+    from PIL import ImageFilter  # type: ignore
+
+    probe = gray.copy()
+    probe.thumbnail((_CROP_PROBE_SIZE, _CROP_PROBE_SIZE))
+    edges = probe.filter(ImageFilter.FIND_EDGES).point(
+        lambda p: 1 if p > _CROP_EDGE_THRESHOLD else 0
+    )
+    # FIND_EDGES marks the image border itself; drop it (offset is negligible).
+    edges = edges.crop((1, 1, edges.width - 1, edges.height - 1))
+    w, h = edges.size
+    data = edges.tobytes()
+    if sum(data) < _CROP_MIN_EDGE_RATIO * w * h:
+        return None  # nothing text-like, only sensor/JPEG noise
+    y0, y1 = _densest_run([sum(data[y * w : (y + 1) * w]) for y in range(h)])
+    x0, x1 = _densest_run([sum(data[x::w]) for x in range(w)])
+    if x1 <= x0 or y1 <= y0:
+        return None
+
+    sx, sy = gray.width / w, gray.height / h
+    pad_x, pad_y = (x1 - x0) * _CROP_PADDING, (y1 - y0) * _CROP_PADDING
+    box = (
+        max(0, int((x0 - pad_x) * sx)),
+        max(0, int((y0 - pad_y) * sy)),
+        min(gray.width, int((x1 + pad_x) * sx + 1)),
+        min(gray.height, int((y1 + pad_y) * sy + 1)),
+    )
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    if area > _CROP_MAX_AREA_RATIO * gray.width * gray.height:
+        return None
+    return box
+
+
+def preprocess_image(
+    content: bytes,
+    *,
+    max_dimension: int = None,
+    crop_to_text: bool = None,
+) -> bytes:
+    """Prepare an upload for OCR: EXIF orientation, grayscale, optional text
+    crop, downscale to ``max_dimension`` and JPEG encode.
+
+    Returns the original bytes if the image cannot be decoded (e.g. HEIC
+    without a plugin) or if preprocessing would only make it bigger.
+    """
+    max_dimension = max_dimension or OCR_MAX_DIMENSION
+    crop_to_text = OCR_CROP_TO_TEXT if crop_to_text is None else crop_to_text
+    try:
+        from PIL import Image, ImageOps  # type: ignore
+
+        with Image.open(io.BytesIO(content)) as original:
+            # JPEG: decode at a reduced DCT scale (never below the target size);
+            # keep extra resolution when the crop may zoom into a small region.
+            target = max_dimension * (2 if crop_to_text else 1)
+            original.draft("L", (target, target))
+            rotated = original.getexif().get(0x0112, 1) not in (None, 1)  # Orientation
+            img = ImageOps.exif_transpose(original).convert("L")
+        cropped = False
+        if crop_to_text:
+            box = _largest_text_box(img)
+            if box:
+                img = img.crop(box)
+                cropped = True
+        # reducing_gap: integer box reduction first, LANCZOS only for the last step.
+        img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=OCR_JPEG_QUALITY, optimize=True)
+    except Exception as e:
+        logger.info(f"[OCR] Preprocessing skipped: {e}")
+        return content
+
+    processed = out.getvalue()
+    if len(processed) >= len(content) and not (rotated or cropped):
+        return content
+    return processed
+
 
 def _import_vision():
     try:
@@ -55,6 +260,138 @@ def get_vision_client():
         return None
 
 
+class OCREngine(ABC):
+    """Produces plain OCR annotations for image bytes.
+
+    Annotations are ``{"full_text", "words": [{"text", "area", "confidence"}],
+    "text_annotations": [{"description", "bounding_poly": {"vertices"}}]}``,
+    the format every OCRProcessor extraction strategy reads. ``mode`` is part
+    of the cache key; change it whenever an engine's output can change.
+    """
+
+    name = ""
+    mode = ""
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def annotate(self, content: bytes) -> dict:
+        ...
+
+
+class VisionOCREngine(OCREngine):
+    name = "vision"
+    mode = VISION_OCR_MODE
+
+    def annotate(self, content: bytes) -> dict:
+        payload = _get_preprocess_pool().submit(preprocess_image, content).result()
+        return OCRProcessor.annotate_image(payload)
+
+
+class TesseractOCREngine(OCREngine):
+    name = "tesseract"
+    mode = LOCAL_OCR_MODE
+
+    def available(self) -> bool:
+        return ocr_local.tesseract_available()
+
+    def annotate(self, content: bytes) -> dict:
+        if not self.available():
+            raise RuntimeError("Local OCR (tesseract) is not installed")
+        return (
+            _get_local_pool()
+            .submit(ocr_local.annotate_with_tesseract, content)
+            .result(timeout=OCR_LOCAL_TIMEOUT_SECONDS)
+        )
+
+
+OCR_ENGINES = {"vision": VisionOCREngine(), "tesseract": TesseractOCREngine()}
+
+_NUMERIC_RE = re.compile(r"\d")
+
+
+def local_confidence(annotations: dict) -> float:
+    """Mean confidence of the words that contain digits (0.0 if none)."""
+    scores = [w["confidence"] for w in annotations["words"] if _NUMERIC_RE.search(w["text"])]
+    return sum(scores) / len(scores) if scores else 0.0
+
+
+def _cached_annotate(engine: OCREngine, content: bytes) -> dict:
+    key = ocr_cache_key(content, engine.mode)
+    annotations = _ocr_cache.get(key)
+    if annotations is None:
+        annotations = engine.annotate(content)
+        _ocr_cache.put(key, annotations)
+    return annotations
+
+
+def annotate_with_policy(content: bytes, policy: str = "vision") -> dict:
+    """Annotate an image with the engines selected by ``policy``.
+
+    Scanner routes pass OCR_ENGINE; everything else stays on Vision.
+
+    local_first keeps a confident local read, otherwise asks Vision; if Vision
+    fails too (offline gym, no credentials) a low-confidence local read is
+    still better than nothing. Results are cached per engine.
+    """
+    policy = (policy or "vision").lower()
+    vision, local = OCR_ENGINES["vision"], OCR_ENGINES["tesseract"]
+    if policy == "local":
+        return _cached_annotate(local, content)
+    if policy != "local_first":
+        return _cached_annotate(vision, content)
+
+    local_result = None
+    if local.available():
+        try:
+            local_result = _cached_annotate(local, content)
+        except Exception as e:
+            logger.warning(f"[OCR] Local OCR failed, using Vision: {e}")
+        else:
+            confidence = local_confidence(local_result)
+            if confidence >= OCR_LOCAL_MIN_CONFIDENCE:
+                return local_result
+            logger.info(f"[OCR] Local OCR confidence {confidence:.2f}, asking Vision")
+    try:
+        return _cached_annotate(vision, content)
+    except Exception as e:
+        if local_result and local_result["full_text"].strip():
+            logger.warning(f"[OCR] Vision failed, using low-confidence local OCR: {e}")
+            return local_result
+        raise
+
+
+class OCRScan:
+    """OCR annotations for one image, shared by every extraction strategy.
+
+    The first strategy that needs them runs the engines ``policy`` selects
+    (annotate_with_policy): by default preprocessing (preprocess_image) and
+    a single Vision request (OCRProcessor.annotate_image), unless the same
+    image was annotated recently (see OCR_CACHE_*); later strategies and their
+    fallbacks read the same annotations. A failed request is remembered as
+    well, so it is not repeated by each strategy, and is never cached.
+    """
+
+    def __init__(self, content: bytes, policy: str = "vision"):
+        self.content = content
+        self.policy = policy
+        self._annotations: dict | None = None
+        self._error: Exception | None = None
+
+    @property
+    def annotations(self) -> dict:
+        if self._error is not None:
+            raise self._error
+        if self._annotations is None:
+            try:
+                self._annotations = annotate_with_policy(self.content, self.policy)
+            except Exception as e:
+                self._error = e
+                raise
+        return self._annotations
+
+
 class OCRProcessor:
     @staticmethod
     def _get_attr(obj: Any, name: str, default=None):
@@ -262,38 +599,115 @@ class OCRProcessor:
         return scored[0][1], all_candidates, raw_text
 
     @staticmethod
-    def extract_rows_from_image(content: bytes) -> Tuple[List[str], float]:
-        """Extract text from image bytes.
+    def annotate_image(content: bytes) -> dict:
+        """Run one Vision request for both text models and return plain annotations.
 
-        Returns (list of text lines, confidence score).
-
-        Note: This implementation intentionally has **no** local/Tesseract fallback.
-        Google Vision must be configured in the runtime environment.
+        Returns {"full_text", "words": [{"text", "area", "confidence"}],
+        "text_annotations": [{"description", "bounding_poly": {"vertices"}}]}.
         """
         client = get_vision_client()
         if not client:
             raise RuntimeError("Google Vision API client not available")
 
         vision, _ = _import_vision()
-        image = vision.Image(content=content)
+        response = client.annotate_image(
+            {
+                "image": {"content": content},
+                "features": [
+                    # Dense text with per-word confidences and word boxes.
+                    {"type_": vision.Feature.Type.DOCUMENT_TEXT_DETECTION},
+                    # Sparse tokens; can do better for simple LED digits.
+                    {"type_": vision.Feature.Type.TEXT_DETECTION},
+                ],
+            }
+        )
+        message = OCRProcessor._get_attr(
+            OCRProcessor._get_attr(response, "error", None), "message", ""
+        )
+        if message:
+            raise RuntimeError(f"OCR Error: {message}")
+        return OCRProcessor._annotations_from_response(response)
 
-        # 1) document_text_detection tends to work best for dense/structured text.
-        response = client.document_text_detection(image=image)
-        if response.error.message:
-            raise RuntimeError(f"OCR Error: {response.error.message}")
+    @staticmethod
+    def _vertices_to_dicts(vertices: list[Any]) -> list[dict]:
+        return [
+            {
+                "x": OCRProcessor._get_attr(v, "x", None),
+                "y": OCRProcessor._get_attr(v, "y", None),
+            }
+            for v in vertices or []
+        ]
+
+    @staticmethod
+    def _annotations_from_response(response: Any) -> dict:
+        get = OCRProcessor._get_attr
+        document = get(response, "full_text_annotation", None)
+
+        words: list[dict] = []
+        for page in get(document, "pages", None) or []:
+            for block in get(page, "blocks", None) or []:
+                for paragraph in get(block, "paragraphs", None) or []:
+                    for word in get(paragraph, "words", None) or []:
+                        # Reconstruct word text from symbols
+                        text = "".join(
+                            get(s, "text", "") or "" for s in get(word, "symbols", None) or []
+                        )
+                        # Word-level bounding box area
+                        bbox = OCRProcessor._vertices_to_bbox(
+                            get(get(word, "bounding_box", None), "vertices", None) or []
+                        )
+                        area = 0.0
+                        if bbox:
+                            area = max(0.0, bbox[2] - bbox[0]) * max(0.0, bbox[3] - bbox[1])
+                        words.append(
+                            {
+                                "text": text,
+                                "area": area,
+                                "confidence": float(get(word, "confidence", 0.0) or 0.0),
+                            }
+                        )
+
+        text_annotations = [
+            {
+                "description": get(ann, "description", "") or "",
+                "bounding_poly": {
+                    "vertices": OCRProcessor._vertices_to_dicts(
+                        get(get(ann, "bounding_poly", None), "vertices", None)
+                    )
+                },
+            }
+            for ann in get(response, "text_annotations", None) or []
+        ]
+
+        return {
+            "full_text": get(document, "text", "") or "",
+            "words": words,
+            "text_annotations": text_annotations,
+        }
 
-        full_text = (response.full_text_annotation.text or "").strip()
+    @staticmethod
+    def _scan(image: "bytes | OCRScan") -> "OCRScan":
+        return image if isinstance(image, OCRScan) else OCRScan(image)
+
+    @staticmethod
+    def extract_rows_from_image(image: "bytes | OCRScan") -> Tuple[List[str], float]:
+        """Extract text from image bytes (or a shared OCRScan).
+
+        Returns (list of text lines, confidence score).
+
+        Bytes are read with Google Vision; pass an OCRScan to choose another
+        policy (see annotate_with_policy).
+        """
+        annotations = OCRProcessor._scan(image).annotations
+
+        # 1) document_text_detection tends to work best for dense/structured text.
+        full_text = annotations["full_text"].strip()
 
         # Estimate confidence from pages -> blocks -> paragraphs -> words
-        total_conf = 0.0
-        count = 0
-        for page in response.full_text_annotation.pages:
-            for block in page.blocks:
-                for paragraph in block.paragraphs:
-                    for word in paragraph.words:
-                        total_conf += float(word.confidence or 0.0)
-                        count += 1
-        confidence = (total_conf / count) if count > 0 else 0.0
+        words = annotations["words"]
+        confidence = (
+            sum(w["confidence"] for w in words) / len(words) if words else 0.0
+        )
 
         if full_text:
             lines = [line.strip() for line in full_text.split("\n") if line.strip()]
@@ -302,13 +716,10 @@ class OCRProcessor:
 
         # 2) If document text came back empty, fall back to plain text_detection.
         # This can sometimes do better for simple LED digits / sparse text.
-        response2 = client.text_detection(image=image)
-        if response2.error.message:
-            raise RuntimeError(f"OCR Error: {response2.error.message}")
-
         # text_annotations[0] contains the full text for the image.
-        if response2.text_annotations:
-            text = (response2.text_annotations[0].description or "").strip()
+        text_annotations = annotations["text_annotations"]
+        if text_annotations:
+            text = (text_annotations[0]["description"] or "").strip()
             lines = [line.strip() for line in text.split("\n") if line.strip()]
             if lines:
                 # The API doesn't provide per-word confidences here in the same way.
@@ -317,29 +728,20 @@ class OCRProcessor:
         raise RuntimeError("OCR produced no text")
 
     @staticmethod
-    def extract_text_annotations_from_image(content: bytes) -> list[Any]:
+    def extract_text_annotations_from_image(image: "bytes | OCRScan") -> list[Any]:
         """Return Google Vision text_annotations for an image."""
-        client = get_vision_client()
-        if not client:
-            raise RuntimeError("Google Vision API client not available")
-
-        vision, _ = _import_vision()
-        image = vision.Image(content=content)
-        response = client.text_detection(image=image)
-        if response.error.message:
-            raise RuntimeError(f"OCR Error: {response.error.message}")
-        return list(response.text_annotations or [])
+        return list(OCRProcessor._scan(image).annotations["text_annotations"])
 
     @staticmethod
     def extract_largest_inches_value_from_image(
-        content: bytes,
+        image: "bytes | OCRScan",
     ) -> tuple[float | None, float, str, list[float]]:
         """Best-effort inches OCR for vertical leap.
 
         Uses Vision's text_annotations bounding boxes and selects the candidate with the
         largest bbox area.
         """
-        anns = OCRProcessor.extract_text_annotations_from_image(content)
+        anns = OCRProcessor.extract_text_annotations_from_image(image)
         value, candidates, raw_text = OCRProcessor.pick_largest_inches_from_text_annotations(
             anns
         )
@@ -347,7 +749,7 @@ class OCRProcessor:
 
     @staticmethod
     def extract_largest_seconds_value_from_image(
-        content: bytes,
+        image: "bytes | OCRScan",
     ) -> tuple[float | None, float, str, list[float]]:
         """Best-effort seconds OCR for timed drills.
 
@@ -356,57 +758,30 @@ class OCRProcessor:
         Selects the word-level candidate with the largest bounding box area.
         Returns real per-word confidence instead of 0.0.
         """
-        client = get_vision_client()
-        if not client:
-            raise RuntimeError("Google Vision API client not available")
-
-        vision, _ = _import_vision()
-        image = vision.Image(content=content)
-
-        response = client.document_text_detection(image=image)
-        if response.error.message:
-            raise RuntimeError(f"OCR Error: {response.error.message}")
-
-        raw_text = (response.full_text_annotation.text or "").strip()
+        annotations = OCRProcessor._scan(image).annotations
+        raw_text = annotations["full_text"].strip()
 
         scored: list[tuple[float, float, float]] = []  # (area, value, confidence)
         all_candidates: list[float] = []
 
-        for page in response.full_text_annotation.pages:
-            for block in page.blocks:
-                for paragraph in block.paragraphs:
-                    for word in paragraph.words:
-                        # Reconstruct word text from symbols
-                        word_text = "".join(
-                            s.text for s in word.symbols if s.text
-                        )
-                        if not word_text:
-                            continue
-
-                        val = OCRProcessor._parse_seconds_token(word_text)
-                        if val is None:
-                            continue
-                        if not (0.5 < val < 60.0):
-                            continue
+        for word in annotations["words"]:
+            if not word["text"]:
+                continue
 
-                        # Word-level bounding box area
-                        bbox = OCRProcessor._vertices_to_bbox(
-                            word.bounding_box.vertices if word.bounding_box else []
-                        )
-                        area = 0.0
-                        if bbox:
-                            w = max(0.0, bbox[2] - bbox[0])
-                            h = max(0.0, bbox[3] - bbox[1])
-                            area = w * h
+            val = OCRProcessor._parse_seconds_token(word["text"])
+            if val is None:
+                continue
+            if not (0.5 < val < 60.0):
+                continue
 
-                        word_conf = float(word.confidence or 0.0)
-                        all_candidates.append(val)
-                        scored.append((area, val, word_conf))
+            all_candidates.append(val)
+            scored.append((word["area"], val, word["confidence"]))
 
         if not scored:
             # Fallback to text_annotations approach
-            anns = OCRProcessor.extract_text_annotations_from_image(content)
-            value, candidates, _ = OCRProcessor.pick_largest_seconds_from_text_annotations(anns)
+            value, candidates, _ = OCRProcessor.pick_largest_seconds_from_text_annotations(
+                annotations["text_annotations"]
+            )
             return value, 0.0, raw_text, candidates
 
         # Pick largest bbox
@@ -0,0 +1,123 @@
+"""Local Tesseract OCR for scanner displays.
+
+Runs without network access, so scanning keeps working in gyms with poor
+connectivity. Output uses the same plain annotation format as
+``OCRProcessor.annotate_image`` (full_text / words / text_annotations), so
+every extraction strategy in utils.ocr works unchanged on local results.
+
+Functions here are CPU-bound and module-level so they can run in a worker
+process (see ``TesseractOCREngine`` in utils.ocr). Requires the ``tesseract``
+binary; ``OCR_TESSERACT_LANG`` can name a seven-segment model (e.g. ``ssd``
+traineddata) where one is installed.
+"""
+
+import io
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+OCR_TESSERACT_LANG = os.getenv("OCR_TESSERACT_LANG", "eng")
+# 6 = uniform block of text: handles single readouts and short score lists.
+OCR_TESSERACT_PSM = int(os.getenv("OCR_TESSERACT_PSM", "6"))
+# Displays only show digits and separators (an inches mark would break
+# pytesseract's shlex-parsed config, and the parsers don't need it).
+TESSERACT_WHITELIST = "0123456789.:"
+# Digits shorter than this (px) are upscaled; Tesseract is tuned for ~30px glyphs.
+_MIN_TEXT_DIMENSION = 1000
+_BINARY_THRESHOLD = 128
+
+
+@lru_cache(maxsize=1)
+def tesseract_available() -> bool:
+    try:
+        import pytesseract  # type: ignore
+
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+
+def prepare_display_image(content: bytes):
+    """Grayscale, normalize and binarize a display photo for Tesseract.
+
+    LED/LCD readouts are usually light digits on a dark panel; the image is
+    inverted to dark-on-light, and dark strokes are thickened slightly so the
+    gaps between seven-segment bars don't split a digit in two.
+    """
+    from PIL import Image, ImageFilter, ImageOps, ImageStat  # type: ignore
+
+    with Image.open(io.BytesIO(content)) as original:
+        img = ImageOps.exif_transpose(original).convert("L")
+    img = ImageOps.autocontrast(img, cutoff=1)
+    if ImageStat.Stat(img).mean[0] < _BINARY_THRESHOLD:
+        img = ImageOps.invert(img)
+    if max(img.size) < _MIN_TEXT_DIMENSION:
+        img = img.resize((img.width * 2, img.height * 2), Image.Resampling.LANCZOS)
+    img = img.point(lambda p: 255 if p > _BINARY_THRESHOLD else 0)
+    return img.filter(ImageFilter.MinFilter(3))
+
+
+def _box(left: int, top: int, width: int, height: int) -> Dict[str, List[Dict[str, int]]]:
+    right, bottom = left + width, top + height
+    return {
+        "vertices": [
+            {"x": left, "y": top},
+            {"x": right, "y": top},
+            {"x": right, "y": bottom},
+            {"x": left, "y": bottom},
+        ]
+    }
+
+
+def annotations_from_tesseract_data(data: Dict[str, List[Any]]) -> Dict[str, Any]:
+    """Convert ``pytesseract.image_to_data(..., output_type=DICT)`` output.
+
+    Word confidences are scaled to 0-1 like Vision's; boxes become
+    ``text_annotations`` entries after a full-text entry at index 0.
+    """
+    words: List[Dict[str, Any]] = []
+    token_annotations: List[Dict[str, Any]] = []
+    lines: Dict[Tuple[int, int, int], List[str]] = {}
+
+    for i, raw in enumerate(data.get("text") or []):
+        text = str(raw or "").strip()
+        try:
+            conf = float(data["conf"][i])
+        except (KeyError, IndexError, TypeError, ValueError):
+            conf = -1.0
+        # conf == -1 marks page/block/line rows rather than words.
+        if not text or conf < 0:
+            continue
+        left, top = int(data["left"][i]), int(data["top"][i])
+        width, height = int(data["width"][i]), int(data["height"][i])
+        words.append(
+            {"text": text, "area": float(width * height), "confidence": conf / 100.0}
+        )
+        token_annotations.append(
+            {"description": text, "bounding_poly": _box(left, top, width, height)}
+        )
+        line_key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(line_key, []).append(text)
+
+    full_text = "\n".join(" ".join(tokens) for tokens in lines.values())
+    text_annotations = []
+    if token_annotations:
+        text_annotations.append({"description": full_text, "bounding_poly": {"vertices": []}})
+        text_annotations.extend(token_annotations)
+    return {"full_text": full_text, "words": words, "text_annotations": text_annotations}
+
+
+def annotate_with_tesseract(content: bytes) -> Dict[str, Any]:
+    """Run Tesseract on image bytes and return plain annotations."""
+    import pytesseract  # type: ignore
+
+    image = prepare_display_image(content)
+    config = f"--psm {OCR_TESSERACT_PSM} -c tessedit_char_whitelist={TESSERACT_WHITELIST}"
+    data = pytesseract.image_to_data(
+        image,
+        lang=OCR_TESSERACT_LANG,
+        config=config,
+        output_type=pytesseract.Output.DICT,
+    )
+    return annotations_from_tesseract_data(data)
@@ -88,6 +88,83 @@ def has_explicit_sibling_separation_request(
     return any(marker in notes for marker in separation_markers)
 
 
+def household_keys(player: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """
+    Blocking keys for sibling inference: two players can only be linked if
+    they share one of these. (signal, value) pairs; empty when the player has
+    no usable contact data.
+    """
+    keys: List[Tuple[str, Any]] = []
+    email = player.get("parentEmailNormalized")
+    if email:
+        keys.append((_SIGNAL_EMAIL, email))
+    phone = player.get("cellPhoneNormalized")
+    if phone:
+        keys.append((_SIGNAL_PHONE, phone))
+    street = player.get("streetNormalized")
+    parent_last = player.get("parentLastNameNormalized")
+    if street and parent_last:
+        keys.append((_SIGNAL_STREET_PARENT_LAST, (street, parent_last)))
+    return keys
+
+
+def _division_components(
+    division_players: List[Dict[str, Any]],
+) -> List[Tuple[List[str], Set[str]]]:
+    """
+    Connected household components (size >= 2) within one division.
+
+    Players are bucketed by each household key and every bucket is unioned,
+    so the cost is linear in players instead of quadratic in pairs. Every pair
+    inside a bucket shares that key's signal, so a component's signals are
+    exactly the signals of the buckets that formed it.
+    """
+    parent: Dict[str, str] = {}
+    buckets: Dict[Tuple[str, Any], List[str]] = {}
+
+    for player in division_players:
+        player_id = player.get("id")
+        if not player_id:
+            continue
+        node = str(player_id)
+        parent.setdefault(node, node)
+        if parse_bool(player.get("siblingSeparationRequested")):
+            continue
+        for key in household_keys(player):
+            buckets.setdefault(key, []).append(node)
+
+    def find(node: str) -> str:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    linked_signals: List[Tuple[str, str]] = []
+    for (signal, _value), members in buckets.items():
+        if len(members) < 2:
+            continue
+        root = find(members[0])
+        for member in members[1:]:
+            other = find(member)
+            if other != root:
+                parent[other] = root
+        linked_signals.append((members[0], signal))
+
+    components: Dict[str, List[str]] = {}
+    for node in parent:
+        components.setdefault(find(node), []).append(node)
+
+    signals_by_root: Dict[str, Set[str]] = {}
+    for node, signal in linked_signals:
+        signals_by_root.setdefault(find(node), set()).add(signal)
+
+    return [
+        (members, signals_by_root.get(root, set()))
+        for root, members in components.items()
+        if len(members) > 1
+    ]
+
+
 def infer_sibling_group_assignments(
     players: List[Dict[str, Any]], *, event_id: str
 ) -> Dict[str, Dict[str, Any]]:
@@ -96,6 +173,8 @@ def infer_sibling_group_assignments(
     - same normalized parent email, OR
     - same normalized parent cell phone, OR
     - same normalized street AND same normalized parent last name
+
+    Candidate pairs come from household_keys buckets, never a full pair scan.
     """
     by_division: Dict[str, List[Dict[str, Any]]] = {}
     assignments: Dict[str, Dict[str, Any]] = {}
@@ -116,85 +195,10 @@ def infer_sibling_group_assignments(
         }
 
     for division_key, division_players in by_division.items():
-        n = len(division_players)
-        if n < 2:
+        if len(division_players) < 2:
             continue
 
-        adjacency: Dict[str, Set[str]] = {
-            str(p.get("id")): set() for p in division_players if p.get("id")
-        }
-        edge_signals: Dict[Tuple[str, str], Set[str]] = {}
-
-        for i in range(n):
-            left = division_players[i]
-            left_id = left.get("id")
-            if not left_id or parse_bool(left.get("siblingSeparationRequested")):
-                continue
-
-            for j in range(i + 1, n):
-                right = division_players[j]
-                right_id = right.get("id")
-                if not right_id or parse_bool(right.get("siblingSeparationRequested")):
-                    continue
-
-                same_email = bool(
-                    left.get("parentEmailNormalized")
-                    and left.get("parentEmailNormalized") == right.get("parentEmailNormalized")
-                )
-                same_phone = bool(
-                    left.get("cellPhoneNormalized")
-                    and left.get("cellPhoneNormalized") == right.get("cellPhoneNormalized")
-                )
-                same_street_and_parent_last = bool(
-                    left.get("streetNormalized")
-                    and right.get("streetNormalized")
-                    and left.get("streetNormalized") == right.get("streetNormalized")
-                    and left.get("parentLastNameNormalized")
-                    and right.get("parentLastNameNormalized")
-                    and left.get("parentLastNameNormalized")
-                    == right.get("parentLastNameNormalized")
-                )
-
-                if same_email or same_phone or same_street_and_parent_last:
-                    left_key = str(left_id)
-                    right_key = str(right_id)
-                    adjacency[left_key].add(right_key)
-                    adjacency[right_key].add(left_key)
-                    edge_key = tuple(sorted((left_key, right_key)))
-                    signals = edge_signals.setdefault(edge_key, set())
-                    if same_email:
-                        signals.add(_SIGNAL_EMAIL)
-                    if same_phone:
-                        signals.add(_SIGNAL_PHONE)
-                    if same_street_and_parent_last:
-                        signals.add(_SIGNAL_STREET_PARENT_LAST)
-
-        visited: Set[str] = set()
-        for node in list(adjacency.keys()):
-            if node in visited:
-                continue
-
-            stack = [node]
-            component: List[str] = []
-            while stack:
-                current = stack.pop()
-                if current in visited:
-                    continue
-                visited.add(current)
-                component.append(current)
-                for neighbor in adjacency.get(current, set()):
-                    if neighbor not in visited:
-                        stack.append(neighbor)
-
-            if len(component) <= 1:
-                continue
-
-            component_set = set(component)
-            component_signals: Set[str] = set()
-            for edge_key, signals in edge_signals.items():
-                if edge_key[0] in component_set and edge_key[1] in component_set:
-                    component_signals.update(signals)
-
+        for component, component_signals in _division_components(division_players):
             suspicious_reasons: List[str] = []
             if len(component) >= 4:
                 suspicious_reasons.append("large_group")
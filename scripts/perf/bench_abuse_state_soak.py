@@ -0,0 +1,51 @@
+"""Soak the in-process abuse-protection store with distinct client ids.
+
+Feeds --clients unique ids (a scanner rotating IPs/user agents) through
+MemoryAbuseStateStore and reports process peak RSS as it goes. Once the
+store reaches its ceiling, peak RSS should stop growing.
+
+Usage: python scripts/perf/bench_abuse_state_soak.py [--clients 1000000]
+       [--max-clients 10000]
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from backend.middleware.shared_state import MemoryAbuseStateStore  # noqa: E402
+
+
+def _peak_rss_mib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=1_000_000)
+    parser.add_argument("--max-clients", type=int, default=10_000)
+    args = parser.parse_args()
+
+    store = MemoryAbuseStateStore(max_clients=args.max_clients, max_allowlisted=1_000)
+    step = max(1, args.clients // 10)
+    start = time.perf_counter()
+    first_peak = None
+    for i in range(args.clients):
+        store.hit(f"198.51.{i >> 16}.{i & 0xFFFF}:{i:08x}", 100.0 + i / 100_000, 30)
+        if i % step == step - 1:
+            peak = _peak_rss_mib()
+            first_peak = first_peak if first_peak is not None else peak
+            print(f"clients={i + 1} peak_rss_mib={peak:.1f} {store.stats()}")
+
+    elapsed = time.perf_counter() - start
+    growth = _peak_rss_mib() - (first_peak or 0)
+    print(f"elapsed_s={elapsed:.1f} peak_rss_growth_mib={growth:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark the Monte Carlo mock-draft simulator.
+
+Usage: python scripts/perf/bench_draft_simulation.py [--teams 12] [--rounds 15]
+       [--iterations 5000] [--workers 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from backend.services.draft_simulation import (  # noqa: E402
+    build_simulation_state,
+    simulate_availability,
+)
+
+
+def _synthetic_draft(num_teams: int, num_rounds: int, seed: int = 7):
+    rng = random.Random(seed)
+    pool_size = num_teams * num_rounds + num_teams
+    players = {}
+    for i in range(pool_size):
+        players[f"p{i:04d}"] = {
+            "id": f"p{i:04d}",
+            "name": f"Player {i}",
+            "composite_score": round(rng.uniform(20, 95), 2),
+            "buddyRequestNormalized": f"player {rng.randrange(pool_size)}" if i % 5 == 0 else None,
+        }
+    for g in range(pool_size // 20):
+        for pid in (f"p{g * 20:04d}", f"p{g * 20 + 1:04d}"):
+            players[pid]["siblingGroupId"] = f"sg_{g}"
+            players[pid]["forceSameTeamWithSibling"] = True
+    team_order = [f"t{t}" for t in range(num_teams)]
+    pick_team_ids = []
+    for r in range(num_rounds):
+        order = team_order if r % 2 == 0 else list(reversed(team_order))
+        pick_team_ids.extend(order)
+    ranked = sorted(players, key=lambda pid: -players[pid]["composite_score"])
+    rankings = {team_order[0]: ranked[: num_rounds * 3][::-1]}
+    return players, team_order, pick_team_ids, rankings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--teams", type=int, default=12)
+    parser.add_argument("--rounds", type=int, default=15)
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    players, team_order, pick_team_ids, rankings = _synthetic_draft(args.teams, args.rounds)
+    start = time.perf_counter()
+    state = build_simulation_state(
+        players=players,
+        drafted_team_by_player={},
+        team_order=team_order,
+        pick_team_ids=pick_team_ids,
+        current_pick=1,
+        team_rankings=rankings,
+        team_cap=args.rounds,
+        composite_for=lambda p: float(p.get("composite_score") or 0.0),
+        normalize_name=lambda v: v.strip().lower() if v else None,
+    )
+    build_ms = (time.perf_counter() - start) * 1000
+    tracked = [i + 1 for i, t in enumerate(pick_team_ids) if t == team_order[-1]]
+
+    # Warm the pool so process start-up is not billed to the measured run.
+    simulate_availability(state, tracked_picks=tracked, iterations=10, seed=1, workers=args.workers)
+    start = time.perf_counter()
+    result = simulate_availability(
+        state, tracked_picks=tracked, iterations=args.iterations, seed=1, workers=args.workers
+    )
+    sim_ms = (time.perf_counter() - start) * 1000
+
+    workers = "auto" if args.workers is None else args.workers
+    print(
+        f"teams={args.teams} rounds={args.rounds} players={len(players)} "
+        f"iterations={args.iterations} workers={workers} cpus={os.cpu_count()}"
+    )
+    print(f"build_state_ms={build_ms:.1f} simulate_ms={sim_ms:.1f}")
+    top = sorted(result.items(), key=lambda item: -item[1][0])[:5]
+    for pid, probabilities in top:
+        print(f"  {pid} available@{tracked[0]}={probabilities[0]:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark import header resolution on wide registration exports.
+
+Compares a cold parse (header caches cleared first, i.e. every header goes
+through the regex/alias/keyword pipeline) with a warm one (compiled header
+table reused), for sport detection + field mapping alone and for a full CSV
+parse.
+
+Usage: python scripts/perf/bench_header_normalization.py [--columns 120]
+       [--rows 200] [--repeat 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from backend.services.schema_registry import SchemaRegistry  # noqa: E402
+from backend.utils.importers import (  # noqa: E402
+    DataImporter,
+    ImportContext,
+    clear_header_caches,
+)
+
+_BASE_HEADERS = [
+    "Player First Name", "Player Last Name", "Jersey #", "Division Name", "Bib Number",
+    "Parent First Name", "Parent Last Name", "Parent Email", "Cell Phone", "Street Address",
+    "Buddy Request 1", "Separate Siblings", "40 Yard Dash (sec)", "Vertical Jump (in)",
+    "Catching", "Throwing", "Agility (sec)",
+]
+
+
+def _wide_headers(count: int):
+    headers = list(_BASE_HEADERS)
+    i = 0
+    while len(headers) < count:
+        # Registration-form questions: shirt sizes, waivers, medical notes...
+        headers.append(f"Registration Question {i} - Answer (optional)")
+        i += 1
+    return headers[:count]
+
+
+def _csv_bytes(headers, rows: int) -> bytes:
+    lines = [",".join(f'"{h}"' for h in headers)]
+    for r in range(rows):
+        values = [f"Kid{r}", f"Family{r}", str(r), "U12", f"B-{r}"]
+        values += ["x"] * (len(headers) - len(values))
+        lines.append(",".join(values))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _time(fn, repeat: int, cold: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if cold:
+            clear_header_caches()
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--columns", type=int, default=120)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    headers = _wide_headers(args.columns)
+    schema = SchemaRegistry.get_schema("football")
+    content = _csv_bytes(headers, args.rows)
+
+    def resolve_headers():
+        sport, _ = DataImporter._detect_sport(headers)
+        DataImporter._build_field_map(headers, schema)
+        return sport
+
+    def parse():
+        # Bypass the parse-result cache so every run parses.
+        return DataImporter._parse_csv(content, ImportContext())
+
+    print(f"columns={args.columns} rows={args.rows} repeat={args.repeat}")
+    for label, fn, repeat in (
+        ("headers", resolve_headers, args.repeat),
+        ("parse_csv", parse, max(1, args.repeat // 10)),
+    ):
+        cold = _time(fn, repeat, cold=True)
+        warm = _time(fn, repeat, cold=False)
+        print(f"{label}: cold_ms={cold:.3f} warm_ms={warm:.3f} speedup={cold / warm:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Compare peak memory of the buffered and streaming import paths.
+
+Usage: python scripts/perf/bench_import_stream.py [--rows 100000] [--chunk 500]
+       [--format csv|xlsx]
+
+Wall times include tracemalloc overhead; compare peak_mb, not speed.
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from backend.utils.importers import DataImporter  # noqa: E402
+
+HEADER = "first_name,last_name,jersey_number,age_group,40m_dash,vertical_jump,catching,throwing,agility\n"
+
+
+def _write_synthetic_csv(handle, rows: int, seed: int = 5) -> None:
+    rng = random.Random(seed)
+    handle.write(HEADER.encode("utf-8"))
+    for i in range(rows):
+        handle.write(
+            (
+                f"First{i},Last{i},{i % 99},U{rng.randrange(8, 15)},"
+                f"{rng.uniform(4.5, 7.5):.2f},{rng.uniform(10, 35):.1f},"
+                f"{rng.randrange(1, 11)},{rng.randrange(1, 11)},{rng.randrange(1, 11)}\n"
+            ).encode("utf-8")
+        )
+
+
+def _write_synthetic_xlsx(handle, rows: int, seed: int = 5) -> None:
+    import openpyxl
+
+    rng = random.Random(seed)
+    wb = openpyxl.Workbook(write_only=True)
+    # A second sheet makes this the multi-sheet case the sheet picker handles.
+    wb.create_sheet("Notes").append(["generated"])
+    ws = wb.create_sheet("Roster")
+    ws.append(HEADER.strip().split(","))
+    for i in range(rows):
+        ws.append(
+            [
+                f"First{i}",
+                f"Last{i}",
+                i % 99,
+                f"U{rng.randrange(8, 15)}",
+                round(rng.uniform(4.5, 7.5), 2),
+                round(rng.uniform(10, 35), 1),
+                rng.randrange(1, 11),
+                rng.randrange(1, 11),
+                rng.randrange(1, 11),
+            ]
+        )
+    wb.save(handle)
+
+
+def _measure(label, fn):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} rows={rows} wall_s={elapsed:.2f} peak_mb={peak / 1024 / 1024:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--chunk", type=int, default=500)
+    parser.add_argument("--format", choices=("csv", "xlsx"), default="csv")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryFile() as handle:
+        if args.format == "xlsx":
+            _write_synthetic_xlsx(handle, args.rows)
+        else:
+            _write_synthetic_csv(handle, args.rows)
+        size_mb = handle.tell() / 1024 / 1024
+        print(f"format={args.format} rows={args.rows} file_mb={size_mb:.1f} chunk={args.chunk}")
+
+        def buffered():
+            handle.seek(0)
+            content = handle.read()
+            if args.format == "xlsx":
+                result = DataImporter.parse_excel(content, sheet_name="Roster")
+            else:
+                result = DataImporter.parse_csv(content)
+            return len(result.valid_rows) + len(result.errors)
+
+        def streaming():
+            handle.seek(0)
+            if args.format == "xlsx":
+                parsed = DataImporter.stream_excel(handle, sheet_name="Roster", chunk_size=args.chunk)
+            else:
+                parsed = DataImporter.stream_csv(handle, chunk_size=args.chunk)
+            total = 0
+            for chunk in parsed.chunks:
+                total += len(chunk.valid_rows) + len(chunk.errors)
+            return total
+
+        _measure("buffered", buffered)
+        _measure("streaming", streaming)
+
+if __name__ == "__main__":
+    main()
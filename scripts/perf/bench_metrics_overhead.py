@@ -0,0 +1,73 @@
+"""Benchmark the cost of recording request metrics.
+
+Times one request's worth of observations (latency histogram, request
+counter, Firestore calls-per-request histogram) from several threads, with
+the in-process registry and with the per-worker mmap files used when
+METRICS_MULTIPROC_DIR is set, plus the cost of rendering a scrape.
+
+Usage: python scripts/perf/bench_metrics_overhead.py [--observations 200000]
+       [--threads 8] [--routes 100]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from backend.middleware import metrics  # noqa: E402
+
+
+def _record(registry, count: int, routes: int) -> None:
+    for i in range(count):
+        route = f"/api/route{i % routes}/{{item_id}}"
+        registry.observe(
+            "http_request_duration_seconds", (i % 500) / 1000.0, metrics.LATENCY_BUCKETS,
+            method="GET", route=route,
+        )
+        registry.inc("http_requests_total", method="GET", route=route, status="200")
+        registry.observe("firestore_calls_per_request", i % 7, metrics.CALLS_BUCKETS)
+
+
+def _run(registry, args) -> None:
+    per_thread = args.observations // args.threads
+    threads = [
+        threading.Thread(target=_record, args=(registry, per_thread, args.routes))
+        for _ in range(args.threads)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    total = per_thread * args.threads
+
+    start = time.perf_counter()
+    text = metrics.render(*registry.collect({}))
+    render_ms = (time.perf_counter() - start) * 1000
+    print(
+        f"{'mmap' if registry.multiproc_dir else 'local'}: "
+        f"us_per_request={elapsed / total * 1e6:.2f} "
+        f"scrape_ms={render_ms:.1f} series_lines={text.count(chr(10))}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--observations", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--routes", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"observations={args.observations} threads={args.threads} routes={args.routes}")
+    _run(metrics.MetricsRegistry(), args)
+    with tempfile.TemporaryDirectory() as directory:
+        _run(metrics.MetricsRegistry(directory), args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark request throughput through the full middleware stack.
+
+Drives the ASGI app in-process (httpx ASGITransport, no sockets) against the
+in-memory Firestore fake used by the tests, and reports requests/s and
+p50/p99 latency for /health and an authenticated GET /api/players.
+Rate limits are raised so the limiter counts but never rejects.
+
+Usage: python scripts/perf/bench_middleware_throughput.py [--requests 2000]
+       [--concurrency 50] [--players 50]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+for _limit in ("READ", "HEALTH"):
+    os.environ.setdefault(f"RATE_LIMITS_{_limit}", "1000000/minute")
+
+import httpx  # noqa: E402
+
+from backend.tests.conftest import FakeFirestore, make_jwt  # noqa: E402
+
+_USER_AGENT = "Mozilla/5.0 (bench)"
+
+
+def _build_app(fake_db):
+    """Same wiring as the tests' app_client fixture, without pytest."""
+    import json
+    import base64
+
+    import backend.auth as auth_mod
+    import backend.firestore_client as fsc
+
+    def fake_verify(token, *args, **kwargs):
+        payload = token.split(".")[1]
+        payload += "=" * ((4 - len(payload) % 4) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload.encode()))
+
+    auth_mod.auth.verify_id_token = fake_verify
+    auth_mod._verify_id_token_strict = fake_verify
+    auth_mod._enforce_session_max_age = lambda decoded: None
+    auth_mod._is_user_disabled_cached = lambda _uid, _bucket: False
+    fsc.get_firestore_client = lambda: fake_db
+    auth_mod.get_firestore_client = lambda: fake_db
+
+    from backend.main import app
+
+    for name, module in list(sys.modules.items()):
+        if not name.startswith("backend"):
+            continue
+        if hasattr(module, "execute_with_timeout"):
+            module.execute_with_timeout = lambda func, **_kwargs: func()
+        if hasattr(module, "get_firestore_client"):
+            module.get_firestore_client = lambda: fake_db
+        if hasattr(module, "db"):
+            module.db = fake_db
+    return app
+
+
+def _seed(fake_db, players: int) -> dict:
+    uid = "org-1"
+    fake_db.collection("users").document(uid).set(
+        {"id": uid, "email": "o@example.com", "role": "organizer"}
+    )
+    fake_db.collection("user_memberships").document(uid).set(
+        {"leagues": {"league-1": {"role": "organizer"}}}
+    )
+    fake_db.collection("leagues").document("league-1").set({"name": "League"})
+    fake_db.collection("events").document("event-1").set(
+        {"name": "Bench Event", "league_id": "league-1", "drillTemplate": "football"}
+    )
+    roster = fake_db.collection("events").document("event-1").collection("players")
+    for i in range(players):
+        roster.document(f"p{i}").set(
+            {"name": f"Player {i}", "number": i, "age_group": "U12", "event_id": "event-1"}
+        )
+    return {
+        "Authorization": f"Bearer {make_jwt(uid=uid, email='o@example.com')}",
+        "User-Agent": _USER_AGENT,
+    }
+
+
+async def _run(app, path, headers, requests, concurrency, report=True):
+    latencies = []
+    statuses = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+        queue = iter(range(requests))
+
+        async def worker():
+            for _ in queue:
+                start = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    if not report:
+        return
+    latencies.sort()
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    print(
+        f"{path}: rps={requests / elapsed:.0f} p50_ms={statistics.median(latencies):.2f} "
+        f"p99_ms={p99:.2f} statuses={statuses}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--players", type=int, default=50)
+    args = parser.parse_args()
+
+    import logging
+
+    logging.disable(logging.CRITICAL)  # one JSON line per request would dominate
+    fake_db = FakeFirestore()
+    headers = _seed(fake_db, args.players)
+    app = _build_app(fake_db)
+
+    print(f"requests={args.requests} concurrency={args.concurrency} players={args.players}")
+    for path in ("/health", "/api/players?event_id=event-1"):
+        warmup = max(50, args.requests // 10)
+        asyncio.run(_run(app, path, headers, warmup, args.concurrency, report=False))
+        asyncio.run(_run(app, path, headers, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
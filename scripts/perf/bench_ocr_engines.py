@@ -0,0 +1,136 @@
+"""Benchmark OCR engines for latency and accuracy on scanner display photos.
+
+Runs each available engine (local Tesseract, Google Vision) and the
+local_first policy over a fixture set and reports p50/p95 latency and how
+many readings match the expected value. Fixtures are image files named
+``<expected value>__<anything>.<ext>`` (e.g. ``7.13__sklz_lane2.jpg``) in
+--fixtures; without it, synthetic seven-segment displays are generated.
+Engines that are not installed/configured are skipped.
+
+Usage: python scripts/perf/bench_ocr_engines.py [--fixtures DIR]
+       [--count 20] [--kind seconds|inches]
+"""
+
+import argparse
+import io
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from PIL import Image, ImageDraw, ImageFilter  # noqa: E402
+
+from backend.utils import ocr  # noqa: E402
+from backend.utils.ocr import (  # noqa: E402
+    OCR_ENGINES,
+    OCRProcessor,
+    OCRScan,
+    annotate_with_policy,
+)
+
+_EXTRACT = {
+    "seconds": OCRProcessor.extract_largest_seconds_value_from_image,
+    "inches": OCRProcessor.extract_largest_inches_value_from_image,
+}
+
+# Segments a-g per digit, standard seven-segment layout.
+_SEGMENTS = {
+    "0": "abcdef", "1": "bc", "2": "abged", "3": "abgcd", "4": "fgbc",
+    "5": "afgcd", "6": "afgedc", "7": "abc", "8": "abcdefg", "9": "abcdfg",
+}
+
+
+def _draw_digit(draw, x, y, w, h, digit, color):
+    t = max(4, w // 6)
+    bars = {
+        "a": (x, y, x + w, y + t),
+        "b": (x + w - t, y, x + w, y + h // 2),
+        "c": (x + w - t, y + h // 2, x + w, y + h),
+        "d": (x, y + h - t, x + w, y + h),
+        "e": (x, y + h // 2, x + t, y + h),
+        "f": (x, y, x + t, y + h // 2),
+        "g": (x, y + h // 2 - t // 2, x + w, y + h // 2 + t // 2),
+    }
+    for segment in _SEGMENTS[digit]:
+        draw.rectangle(bars[segment], fill=color)
+
+
+def _display_photo(value: float, seed: int) -> bytes:
+    rng = random.Random(seed)
+    img = Image.new("RGB", (1600, 1200), (rng.randint(90, 160),) * 3)
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((250, 400, 1350, 800), fill=(20, 25, 20))
+    text = f"{value:05.2f}"
+    x, w, h = 320, 160, 300
+    for ch in text:
+        if ch == ".":
+            draw.rectangle((x - 10, 720, x + 20, 750), fill=(230, 240, 230))
+            x += 40
+            continue
+        _draw_digit(draw, x, 450, w, h, ch, (230, 240, 230))
+        x += w + 50
+    img = img.rotate(rng.uniform(-3, 3), fillcolor=(120, 120, 120))
+    img = img.filter(ImageFilter.GaussianBlur(rng.uniform(0.5, 2.0)))
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=88)
+    return out.getvalue()
+
+
+def _fixtures(directory, count):
+    if directory:
+        for name in sorted(os.listdir(directory)):
+            expected = name.split("__", 1)[0]
+            with open(os.path.join(directory, name), "rb") as f:
+                yield name, float(expected), f.read()
+        return
+    rng = random.Random(7)
+    for i in range(count):
+        value = round(rng.uniform(4.5, 12.0), 2)
+        yield f"synthetic-{i}", value, _display_photo(value, i)
+
+
+def _run(label, annotate, fixtures, kind):
+    latencies, correct = [], 0
+    for _, expected, content in fixtures:
+        ocr.clear_ocr_cache()
+        start = time.perf_counter()
+        try:
+            annotations = annotate(content)
+        except Exception as e:
+            print(f"{label}: skipped ({e})")
+            return
+        latencies.append((time.perf_counter() - start) * 1000)
+        # Same large-digit strategy the scanner route uses, on these annotations.
+        scan = OCRScan(content)
+        scan._annotations = annotations
+        value = _EXTRACT[kind](scan)[0]
+        correct += value is not None and abs(value - expected) < 0.005
+    p95 = sorted(latencies)[max(0, int(len(latencies) * 0.95) - 1)]
+    print(
+        f"{label}: n={len(latencies)} accuracy={correct / len(latencies):.0%} "
+        f"p50_ms={statistics.median(latencies):.0f} p95_ms={p95:.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures")
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--kind", choices=sorted(_EXTRACT), default="seconds")
+    args = parser.parse_args()
+
+    fixtures = list(_fixtures(args.fixtures, args.count))
+    print(f"fixtures={len(fixtures)} kind={args.kind}")
+    for name, engine in OCR_ENGINES.items():
+        if not engine.available():
+            print(f"{name}: skipped (not installed)")
+            continue
+        _run(name, engine.annotate, fixtures, args.kind)
+    _run("local_first", lambda c: annotate_with_policy(c, "local_first"), fixtures, args.kind)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark OCR image preprocessing on synthetic phone photos.
+
+Generates scanner-display style photos at common phone resolutions (large
+digits on a noisy background, EXIF-rotated) and reports payload size and
+preprocessing time per image, with and without cropping to the text band.
+The Vision round trip is not included; payload bytes are what it uploads.
+
+Usage: python scripts/perf/bench_ocr_preprocess.py [--repeat 5]
+       [--max-dimension 1600]
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from PIL import Image, ImageDraw, ImageFilter  # noqa: E402
+
+from backend.utils.ocr import preprocess_image  # noqa: E402
+
+_RESOLUTIONS = [(3024, 4032), (4000, 3000), (4080, 3072)]
+
+
+def _phone_photo(width: int, height: int, seed: int) -> bytes:
+    rng = random.Random(seed)
+    img = Image.effect_noise((width // 4, height // 4), 40).convert("RGB").resize((width, height))
+    draw = ImageDraw.Draw(img)
+    # A backlit display with a seven-segment style reading.
+    x0, y0 = width // 4, height // 3
+    x1, y1 = x0 + width // 2, y0 + height // 6
+    draw.rectangle((x0, y0, x1, y1), fill=(20, 30, 20))
+    seg_w = (x1 - x0) // 8
+    for i in range(5):
+        sx = x0 + seg_w // 2 + i * (seg_w + seg_w // 2)
+        draw.rectangle((sx, y0 + 20, sx + seg_w, y1 - 20), outline=(220, 240, 220), width=24)
+        if rng.random() < 0.5:
+            draw.line((sx, (y0 + y1) // 2, sx + seg_w, (y0 + y1) // 2), fill=(220, 240, 220), width=24)
+    img = img.filter(ImageFilter.GaussianBlur(1.5))
+    exif = Image.Exif()
+    exif[0x0112] = 6  # phones store portrait shots rotated
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=92, exif=exif)
+    return out.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-dimension", type=int, default=1600)
+    args = parser.parse_args()
+
+    photos = [_phone_photo(w, h, seed) for seed, (w, h) in enumerate(_RESOLUTIONS)]
+    print(f"images={len(photos)} repeat={args.repeat} max_dimension={args.max_dimension}")
+    for (w, h), photo in zip(_RESOLUTIONS, photos):
+        for crop in (False, True):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                processed = preprocess_image(
+                    photo, max_dimension=args.max_dimension, crop_to_text=crop
+                )
+            elapsed = (time.perf_counter() - start) * 1000 / args.repeat
+            size = Image.open(io.BytesIO(processed)).size
+            print(
+                f"{w}x{h} crop={crop}: bytes {len(photo)} -> {len(processed)} "
+                f"({len(processed) / len(photo):.0%}) dims={size[0]}x{size[1]} ms={elapsed:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark per-request latency added by rate-limit and abuse-state storage.
+
+Times one limiter hit (``limits`` strategy on the configured storage, as
+SlowAPI does per request) and one abuse-protection window update, for the
+in-process store and, with --redis-url, a shared Redis-protocol server.
+
+Usage: python scripts/perf/bench_rate_limit_storage.py [--requests 20000]
+       [--clients 500] [--redis-url redis://localhost:6379/15]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from limits import parse  # noqa: E402
+from limits.storage import storage_from_string  # noqa: E402
+from limits.strategies import STRATEGIES  # noqa: E402
+
+from backend.middleware.shared_state import create_abuse_state_store  # noqa: E402
+
+
+def _report(label, samples):
+    samples.sort()
+    p99 = samples[max(0, int(len(samples) * 0.99) - 1)]
+    print(f"{label}: p50_us={statistics.median(samples):.1f} p99_us={p99:.1f}")
+
+
+def _time_calls(fn, requests, clients):
+    rng = random.Random(3)
+    samples = []
+    for _ in range(requests):
+        client_id = f"10.0.{rng.randrange(clients)}:ua"
+        start = time.perf_counter()
+        fn(client_id)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--redis-url")
+    args = parser.parse_args()
+
+    uris = ["memory://"] + ([args.redis_url] if args.redis_url else [])
+    limit = parse("300/minute")
+    print(f"requests={args.requests} clients={args.clients}")
+    for uri in uris:
+        storage = storage_from_string(uri)
+        for strategy in ("fixed-window", "moving-window", "sliding-window-counter"):
+            limiter = STRATEGIES[strategy](storage)
+            samples = _time_calls(
+                lambda client_id: limiter.hit(limit, "bench", client_id),
+                args.requests,
+                args.clients,
+            )
+            _report(f"{uri.split('://')[0]} limiter {strategy}", samples)
+        storage.reset()
+
+        store = create_abuse_state_store(uri)
+        samples = _time_calls(
+            lambda client_id: store.hit(client_id, time.time(), 30), args.requests, args.clients
+        )
+        _report(f"{uri.split('://')[0]} abuse window", samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark blocking-key sibling inference against the old pairwise scan.
+
+Usage: python scripts/perf/bench_sibling_inference.py [--sizes 500,2000,10000]
+       [--pairwise-max 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from backend.utils.participant_matching import (  # noqa: E402
+    infer_sibling_group_assignments,
+    parse_bool,
+)
+
+
+def _synthetic_division(count: int, seed: int = 3):
+    """One large division; ~1.6 kids per household, partial contact data."""
+    rng = random.Random(seed)
+    households = max(1, int(count / 1.6))
+    players = []
+    for i in range(count):
+        h = rng.randrange(households)
+        players.append(
+            {
+                "id": f"p{i:05d}",
+                "age_group": "U10",
+                "parentEmailNormalized": f"family{h}@example.com" if rng.random() < 0.8 else None,
+                "cellPhoneNormalized": f"555{h:07d}" if rng.random() < 0.6 else None,
+                "streetNormalized": f"{h} elm st" if rng.random() < 0.5 else None,
+                "parentLastNameNormalized": f"last{h}",
+                "siblingSeparationRequested": rng.random() < 0.01,
+            }
+        )
+    return players
+
+
+def _pairwise_scan(players):
+    """The previous implementation's inner loop: every pair compared once."""
+    linked = 0
+    for i, left in enumerate(players):
+        if parse_bool(left.get("siblingSeparationRequested")):
+            continue
+        for right in players[i + 1 :]:
+            if parse_bool(right.get("siblingSeparationRequested")):
+                continue
+            same_email = bool(
+                left.get("parentEmailNormalized")
+                and left.get("parentEmailNormalized") == right.get("parentEmailNormalized")
+            )
+            same_phone = bool(
+                left.get("cellPhoneNormalized")
+                and left.get("cellPhoneNormalized") == right.get("cellPhoneNormalized")
+            )
+            same_street_and_parent_last = bool(
+                left.get("streetNormalized")
+                and left.get("streetNormalized") == right.get("streetNormalized")
+                and left.get("parentLastNameNormalized")
+                and left.get("parentLastNameNormalized") == right.get("parentLastNameNormalized")
+            )
+            if same_email or same_phone or same_street_and_parent_last:
+                linked += 1
+    return linked
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="500,2000,10000")
+    parser.add_argument("--pairwise-max", type=int, default=2000)
+    args = parser.parse_args()
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        players = _synthetic_division(size)
+        start = time.perf_counter()
+        assignments = infer_sibling_group_assignments(players, event_id="bench")
+        blocked_ms = (time.perf_counter() - start) * 1000
+        groups = {a["siblingGroupId"] for a in assignments.values() if a["siblingGroupId"]}
+
+        line = (
+            f"players={size} pairs={size * (size - 1) // 2} groups={len(groups)} "
+            f"blocking_ms={blocked_ms:.1f}"
+        )
+        if size <= args.pairwise_max:
+            start = time.perf_counter()
+            _pairwise_scan(players)
+            line += f" pairwise_ms={(time.perf_counter() - start) * 1000:.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()